@@ -0,0 +1,11 @@
+"""
+Shared scraping engine behind 'scraper-oop.py' and 'scraper-fp.py'.
+
+The pipeline components live in one small module per stage ('football_engine.extractors', '.transformers',
+'.validators', '.uploaders', '.job_runner', ...); each league registers the components it uses with
+'league_registry' from a plugin module under 'football_engine.plugins', which is only imported when that league
+is asked for. Importing this package imports none of the stage modules, and they defer numpy/pandas, boto3 and
+Selenium (see 'football_engine.dependencies') to their first use.
+"""
+
+from football_engine.registry import LeaguePlugin, LeaguePluginRegistry, league_registry
@@ -0,0 +1,120 @@
+from __future__ import annotations
+import os
+import tempfile
+from typing import List
+from datetime import datetime
+from pathlib import Path
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.transformers import TableStandingsDataTransformer
+
+
+
+# ================================================ SNAPSHOT CACHE ================================================
+
+# Set up abstract base class for Snapshot Cache that defines interface for caching transformed snapshots
+class ISnapshotCache(ABC):
+    @abstractmethod
+    def write_snapshot(self, df: pd.DataFrame, match_date: str) -> str:
+        pass
+
+    @abstractmethod
+    def read_snapshots(self, start_date: str, end_date: str):
+        pass
+
+
+# Set up a concrete ArrowIPCSnapshotCache class that inherits from ISnapshotCache
+class ArrowIPCSnapshotCache(ISnapshotCache):
+    """
+    Keeps an uncompressed Arrow IPC (Feather v2) file per transformed snapshot. Uncompressed IPC files can be
+    memory-mapped, so 'read_snapshots' hands back Arrow tables whose buffers point straight into the page
+    cache - concatenating hundreds of snapshots only stitches their chunks together and copies nothing.
+
+    Arrow needs unique column names, so the blank spacer columns are dropped and the repeated home/away stat
+    headers are stored as 'home_W', 'away_W', etc.
+    """
+
+    def __init__(self, cache_path: str, file_name: str='prem_league_table', coloured_console_logs: bool=False, file_logger=FileLogger()):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("The Arrow snapshot cache needs 'pyarrow' - install it with 'pip install pyarrow'.")
+
+        self.pa = pyarrow
+        self.cache_path = cache_path
+        self.file_name = file_name
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def _get_snapshot_path(self, match_date: str) -> str:
+        return f'{self.cache_path}/{self.file_name}_{match_date}.arrow'
+
+
+    # Implement ArrowIPCSnapshotCache method for caching a transformed snapshot
+    def write_snapshot(self, df: pd.DataFrame, match_date: str) -> str:
+        os.makedirs(self.cache_path, exist_ok=True)
+        unique_columns = TableStandingsDataTransformer.get_unique_columns(list(df.columns))
+        cache_df = df.iloc[:, list(unique_columns.keys())].set_axis(list(unique_columns.values()), axis=1)
+        table = self.pa.Table.from_pandas(cache_df, preserve_index=False)
+
+        snapshot_path = self._get_snapshot_path(match_date)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_path, prefix=f'.{self.file_name}_{match_date}-', suffix='.tmp')
+        os.close(file_descriptor)
+        try:
+            with self.pa.OSFile(temp_path, 'wb') as sink, self.pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(temp_path, snapshot_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.file_logger.log_event_as_debug(f">>> Cached snapshot for {match_date} in '{snapshot_path}' ...")
+        return snapshot_path
+
+
+    # Memory-map one cached snapshot without reading its buffers into memory
+    def read_snapshot(self, match_date: str):
+        return self.pa.ipc.open_file(self.pa.memory_map(self._get_snapshot_path(match_date), 'r')).read_all()
+
+
+    def get_cached_match_dates(self, start_date: str, end_date: str) -> List[str]:
+        start, end = datetime.strptime(start_date, '%Y-%b-%d'), datetime.strptime(end_date, '%Y-%b-%d')
+        file_prefix = f'{self.file_name}_'
+        cached_match_dates = []
+
+        for cached_file in Path(self.cache_path).glob(f'{file_prefix}*.arrow'):
+            match_date = cached_file.stem[len(file_prefix):]
+            try:
+                if start <= datetime.strptime(match_date, '%Y-%b-%d') <= end:
+                    cached_match_dates.append(match_date)
+            except ValueError:
+                continue
+
+        return sorted(cached_match_dates, key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+
+
+    # Implement ArrowIPCSnapshotCache method for reading a date range as one zero-copy Arrow table
+    def read_snapshots(self, start_date: str, end_date: str):
+        cached_match_dates = self.get_cached_match_dates(start_date, end_date)
+        self.console_logger.log_event_as_debug(f">>> Memory-mapping {len(cached_match_dates)} cached snapshot(s) between {start_date} and {end_date} ...")
+
+        tables = []
+        for match_date in cached_match_dates:
+            try:
+                tables.append(self.read_snapshot(match_date))
+            except (self.pa.ArrowInvalid, OSError) as e:
+
+                # The cache only holds copies of loaded snapshots, so a truncated or corrupt file is dropped instead of failing the whole range
+                self.console_logger.log_event_as_warning(f">>> Dropping unreadable cached snapshot for {match_date} ({e}) - it is cached again the next time the date is loaded ...")
+                os.remove(self._get_snapshot_path(match_date))
+
+        if not tables:
+            return None
+        return self.pa.concat_tables(tables)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+import os
+import json
+import tempfile
+from typing import List, Dict, Optional, Callable
+from datetime import datetime
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.manifest import IJobManifest, JSONFileJobManifest
+from football_engine.job_runner import PremLeagueTableScrapeJobRunner
+
+
+
+# ================================================ CHANGE CALENDAR ================================================
+
+# Set up abstract base class for Change Calendar that defines interface for remembering when each league table changed
+class IChangeCalendar(ABC):
+    @abstractmethod
+    def get_probed_hash(self, league: str, match_date: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def record_probes(self, league: str, table_hashes: Dict[str, str]):
+        pass
+
+    @abstractmethod
+    def record_change_dates(self, league: str, change_dates: List[str]):
+        pass
+
+    @abstractmethod
+    def get_change_dates(self, league: str) -> List[str]:
+        pass
+
+
+# Set up a concrete JSONFileChangeCalendar class that inherits from IChangeCalendar
+class JSONFileChangeCalendar(IChangeCalendar):
+    """
+    Keeps, per league, the table hash seen on every probed date and the dates on which the table changed.
+    A change date is a date whose table differs from the one on the previous scheduled date, i.e. a day on which
+    at least one match finished. Like the job manifest, the file is rewritten atomically on every update.
+    """
+
+    def __init__(self, calendar_path: str, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.calendar_path = calendar_path
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        self.leagues: Dict[str, Dict] = self._read_calendar()
+
+
+    def _read_calendar(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.calendar_path):
+            return {}
+
+        try:
+            with open(self.calendar_path, 'r') as calendar_file:
+                return json.load(calendar_file).get('leagues', {})
+        except Exception as e:
+            self.console_logger.log_event_as_warning(f">>> Unable to read change calendar '{self.calendar_path}', starting a fresh one: {e}")
+            return {}
+
+
+    def _write_calendar(self):
+        calendar_folder = os.path.dirname(os.path.abspath(self.calendar_path))
+        os.makedirs(calendar_folder, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=calendar_folder, prefix='.calendar-', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w') as temp_file:
+                json.dump({'leagues': self.leagues}, temp_file, indent=2, sort_keys=True)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.calendar_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    def _get_league(self, league: str) -> Dict:
+        return self.leagues.setdefault(league, {'probes': {}, 'change_dates': []})
+
+
+    # Implement JSONFileChangeCalendar methods for recording probes and change dates
+    def get_probed_hash(self, league: str, match_date: str) -> Optional[str]:
+        return self.leagues.get(league, {}).get('probes', {}).get(match_date)
+
+
+    def record_probes(self, league: str, table_hashes: Dict[str, str]):
+        self._get_league(league)['probes'].update(table_hashes)
+        self._write_calendar()
+
+
+    def record_change_dates(self, league: str, change_dates: List[str]):
+        known_change_dates = set(self._get_league(league)['change_dates']) | set(change_dates)
+        self._get_league(league)['change_dates'] = sorted(known_change_dates, key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+        self._write_calendar()
+        self.file_logger.log_event_as_debug(f">>> Change calendar: '{league}' now has {len(known_change_dates)} known change date(s) ...")
+
+
+    def get_change_dates(self, league: str) -> List[str]:
+        return list(self.leagues.get(league, {}).get('change_dates', []))
+
+
+
+# Set up a ChangeDateScheduler class that only scrapes and loads the dates on which a league table changed
+class ChangeDateScheduler:
+    """
+    The twtd table for a date covers every match from the season start up to that date, so it only ever grows:
+    two dates with the same table cannot have a change between them. The scheduler probes both ends of the date
+    range and bisects only the intervals whose ends differ, which finds k change dates among n dates in roughly
+    k * log2(n) page loads instead of n.
+
+    Change dates are loaded through the job runner as usual. Every other date is marked complete in the job
+    manifest with the output location and content hash of the snapshot it shares with the last change date
+    before it. Probe hashes are kept in the change calendar, so dates already probed (and loaded) by an earlier
+    run are not fetched again - a daily run only has to probe the new date.
+
+    A probe that fails (timeout, open circuit breaker, invalid table) does not stop the run: the date gets a
+    hash of its own, so the bisection treats it as a change and keeps going around it, and it is marked failed
+    in the manifest for the next run to retry. The date after it is loaded too, since it can no longer be
+    compared with its predecessor; neither date is recorded as a known change date.
+    """
+
+    def __init__(self, job_runner: PremLeagueTableScrapeJobRunner, change_calendar: IChangeCalendar, job_manifest: IJobManifest, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.job_runner = job_runner
+        self.change_calendar = change_calendar
+        self.job_manifest = job_manifest
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # The content hash leaves out the 'match_date' column, so equal standings on different dates hash the same
+    @staticmethod
+    def compute_table_hash(df: pd.DataFrame) -> str:
+        return JSONFileJobManifest.compute_content_hash(df)
+
+
+    # Implement ChangeDateScheduler method for locating the change dates in a sorted list of dates by bisection
+    def find_change_dates(self, league: str, match_dates: List[str], probe_table: Callable[[str], str]) -> List[str]:
+        table_hashes = {}
+
+        def probe(date_index: int) -> str:
+            if date_index not in table_hashes:
+                table_hashes[date_index] = probe_table(match_dates[date_index])
+            return table_hashes[date_index]
+
+        change_indexes = {0}
+        intervals = [(0, len(match_dates) - 1)] if len(match_dates) > 1 else []
+        while intervals:
+            low_index, high_index = intervals.pop()
+            if probe(low_index) == probe(high_index):
+                continue
+            if high_index - low_index == 1:
+                change_indexes.add(high_index)
+                continue
+            middle_index = (low_index + high_index) // 2
+            intervals += [(low_index, middle_index), (middle_index, high_index)]
+
+        self.console_logger.log_event_as_debug(f">>> Change calendar: probed {len(table_hashes)} of {len(match_dates)} '{league}' date(s), found {len(change_indexes)} change date(s) ...")
+        return [match_dates[date_index] for date_index in sorted(change_indexes)]
+
+
+    # Implement ChangeDateScheduler method for scraping the change dates and pointing every other date at the prior snapshot
+    def run(self, league: str, match_dates: List[str]) -> Dict[str, Optional[str]]:
+        match_dates = sorted(set(match_dates), key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+        if not match_dates:
+            return {}
+
+        scraped_snapshots = {}
+        probe_errors = {}
+
+        def probe_table(match_date: str) -> str:
+            probed_hash = self.change_calendar.get_probed_hash(league, match_date)
+            if probed_hash is not None and self.job_manifest.is_complete(league, match_date):
+                return probed_hash
+
+            try:
+                df = self.job_runner.scrape_snapshot(league, match_date)
+            except Exception as e:
+                self.console_logger.log_event_as_error(f">>> Change calendar: unable to probe '{league}' table for {match_date}, treating it as changed: {e}")
+                probe_errors[match_date] = e
+                return f'probe-failed:{match_date}'
+
+            scraped_snapshots[match_date] = df
+            table_hash = self.compute_table_hash(df)
+            self.change_calendar.record_probes(league, {match_date: table_hash})
+            return table_hash
+
+        change_dates = self.find_change_dates(league, match_dates, probe_table)
+        uncertain_dates = set(probe_errors) | {match_dates[date_index + 1] for date_index, match_date in enumerate(match_dates[:-1]) if match_date in probe_errors}
+        self.change_calendar.record_change_dates(league, [match_date for match_date in change_dates if match_date not in uncertain_dates])
+
+
+        # Walk the dates in order - load each change date, then alias the dates after it to its snapshot
+        output_locations = {}
+        aliased_hashes = {}
+        prior_unit = {}
+        for match_date in match_dates:
+            if match_date in probe_errors:
+                self.job_manifest.mark_started(league, match_date)
+                self.job_manifest.mark_failed(league, match_date, error=probe_errors[match_date])
+                prior_unit = {}
+                output_locations[match_date] = None
+
+            elif match_date in change_dates:
+                table_hash = self.change_calendar.get_probed_hash(league, match_date)
+                if self.job_manifest.is_complete(league, match_date):
+                    prior_unit = dict(self.job_manifest.get_unit(league, match_date), table_hash=table_hash)
+                    output_locations[match_date] = prior_unit.get('output_location')
+                    continue
+
+                self.job_manifest.mark_started(league, match_date)
+                try:
+                    df = scraped_snapshots.pop(match_date, None)
+                    if df is None:
+                        df = self.job_runner.scrape_snapshot(league, match_date)
+                    output_location, content_hash = self.job_runner.load_snapshot(df, match_date=match_date)
+                except Exception as e:
+                    output_location, content_hash = None, None
+                    self.job_manifest.mark_failed(league, match_date, error=e)
+                else:
+                    if output_location is None:
+                        self.job_manifest.mark_failed(league, match_date, error='Upload did not complete')
+                    else:
+                        self.job_manifest.mark_complete(league, match_date, output_location=output_location, content_hash=content_hash)
+
+                prior_unit = {'output_location': output_location, 'content_hash': content_hash, 'table_hash': table_hash}
+                output_locations[match_date] = output_location
+
+            elif prior_unit.get('output_location') is not None:
+                self.job_manifest.mark_complete(league, match_date, output_location=prior_unit['output_location'], content_hash=prior_unit['content_hash'])
+                aliased_hashes[match_date] = prior_unit['table_hash']
+                output_locations[match_date] = prior_unit['output_location']
+
+            else:
+                output_locations[match_date] = None
+
+        # Aliased dates share the prior table, so later runs can use them as bisection end points without a page load
+        self.change_calendar.record_probes(league, aliased_hashes)
+
+        self.console_logger.log_event_as_info(f">>> Change calendar: loaded {len(change_dates)} change date(s) and pointed {len(match_dates) - len(change_dates)} unchanged '{league}' date(s) at their prior snapshot ...")
+        return output_locations
@@ -0,0 +1,237 @@
+from __future__ import annotations
+import io
+import csv
+import json
+from typing import List, Dict
+from datetime import datetime
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ResilientCaller
+from football_engine.transformers import TableStandingsDataTransformer
+
+
+
+# ================================================ SNAPSHOT COMPACTION ================================================
+
+# Set up a CompactedS3SnapshotReader class that reads snapshots from compacted files first and daily objects second
+class CompactedS3SnapshotReader:
+    """
+    Reads the snapshots for a date range from an S3 folder, whether or not they have been compacted yet.
+    Dates listed in the compaction manifest ('<S3_FOLDER>/compacted/_manifest.json') are read from their Parquet
+    file (one GET per file, however many dates it holds); any other date falls back to its daily CSV object.
+
+    Parquet needs unique column names, so snapshots always come back with the blank spacer columns dropped and
+    the repeated home/away stat headers named 'home_W', 'away_W', etc. - the same layout as the Arrow cache.
+    """
+
+    def __init__(self, s3_client, s3_bucket: str, s3_folder: str, file_name: str='prem_league_table', resilient_caller: ResilientCaller=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_folder = s3_folder
+        self.file_name = file_name
+        self.resilient_caller = resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @property
+    def manifest_key(self) -> str:
+        return f'{self.s3_folder}/compacted/_manifest.json'
+
+
+    def _get_object_bytes(self, s3_key: str) -> bytes:
+        response = self.resilient_caller.call(self.s3_client.get_object, host=f's3://{self.s3_bucket}', operation_name='get_object', Bucket=self.s3_bucket, Key=s3_key)
+        return response['Body'].read()
+
+
+    # A folder that was never compacted has no manifest - list for it instead of retrying a GET that cannot succeed,
+    # and let a manifest that exists but cannot be read fail the run rather than be taken for an empty one
+    def read_manifest(self) -> Dict:
+        response = self.resilient_caller.call(self.s3_client.list_objects_v2, host=f's3://{self.s3_bucket}', operation_name='list_objects_v2', Bucket=self.s3_bucket, Prefix=self.manifest_key, MaxKeys=1)
+        if not any(listed_object['Key'] == self.manifest_key for listed_object in response.get('Contents', [])):
+            return {'match_dates': {}, 'files': {}}
+
+        return json.loads(self._get_object_bytes(self.manifest_key))
+
+
+    @staticmethod
+    def is_match_date(file_suffix: str) -> bool:
+        try:
+            datetime.strptime(file_suffix, '%Y-%b-%d')
+        except ValueError:
+            return False
+        return True
+
+
+    # List the daily CSV objects in the folder as {match date: key}, following list pagination - other objects under
+    # the same prefix (such as streamed '<file name>_<first date>_to_<last date>.csv' files) are skipped
+    def list_daily_objects(self) -> Dict[str, str]:
+        key_prefix = f'{self.s3_folder}/{self.file_name}_'
+        daily_objects = {}
+        list_kwargs = {'Bucket': self.s3_bucket, 'Prefix': key_prefix}
+
+        while True:
+            response = self.resilient_caller.call(self.s3_client.list_objects_v2, host=f's3://{self.s3_bucket}', operation_name='list_objects_v2', **list_kwargs)
+            for listed_object in response.get('Contents', []):
+                match_date = listed_object['Key'][len(key_prefix):].rsplit('.', 1)[0]
+                if listed_object['Key'].endswith('.csv') and self.is_match_date(match_date):
+                    daily_objects[match_date] = listed_object['Key']
+            if not response.get('IsTruncated'):
+                return daily_objects
+            list_kwargs['ContinuationToken'] = response['NextContinuationToken']
+
+
+    # Read one daily CSV object with the raw (duplicated) header, then give its columns unique names
+    def read_daily_object(self, s3_key: str) -> pd.DataFrame:
+        payload = self._get_object_bytes(s3_key)
+        raw_columns = next(csv.reader(io.StringIO(payload.split(b'\n', 1)[0].decode('utf-8'))))
+        daily_df = pd.read_csv(io.BytesIO(payload), header=0)
+        daily_df.columns = raw_columns
+
+        unique_columns = TableStandingsDataTransformer.get_unique_columns(raw_columns)
+        return daily_df.iloc[:, list(unique_columns.keys())].set_axis(list(unique_columns.values()), axis=1)
+
+
+    def read_compacted_file(self, s3_key: str) -> pd.DataFrame:
+        return pd.read_parquet(io.BytesIO(self._get_object_bytes(s3_key)))
+
+
+    # Implement CompactedS3SnapshotReader method for reading a date range as one dataframe
+    def read_snapshots(self, start_date: str=None, end_date: str=None) -> pd.DataFrame:
+        start = datetime.strptime(start_date, '%Y-%b-%d') if start_date else datetime.min
+        end = datetime.strptime(end_date, '%Y-%b-%d') if end_date else datetime.max
+        in_range = lambda match_date: start <= datetime.strptime(match_date, '%Y-%b-%d') <= end
+
+        compacted_dates = {match_date: s3_key for match_date, s3_key in self.read_manifest()['match_dates'].items() if in_range(match_date)}
+        daily_dates = {match_date: s3_key for match_date, s3_key in self.list_daily_objects().items() if in_range(match_date) and match_date not in compacted_dates}
+
+        snapshot_dfs = []
+        for s3_key in sorted(set(compacted_dates.values())):
+            compacted_df = self.read_compacted_file(s3_key)
+            snapshot_dfs.append(compacted_df[compacted_df['match_date'].isin([match_date for match_date, key in compacted_dates.items() if key == s3_key])])
+        snapshot_dfs += [self.read_daily_object(s3_key) for s3_key in daily_dates.values()]
+
+        self.console_logger.log_event_as_debug(f'>>> Read {len(compacted_dates)} compacted and {len(daily_dates)} daily snapshot(s) from {len(set(compacted_dates.values())) + len(daily_dates)} S3 object(s) ...')
+        if not snapshot_dfs:
+            return pd.DataFrame()
+
+        snapshots_df = pd.concat(snapshot_dfs, ignore_index=True)
+        snapshots_df['_match_date_sort_key'] = pd.to_datetime(snapshots_df['match_date'], format='%Y-%b-%d')
+        return snapshots_df.sort_values(['_match_date_sort_key', 'Pos'], kind='stable').drop(columns=['_match_date_sort_key']).reset_index(drop=True)
+
+
+
+# Set up an S3SnapshotCompactor class that merges the daily snapshot objects into per-month or per-season Parquet files
+class S3SnapshotCompactor:
+    """
+    Merges the daily 'prem_league_table_<date>.csv' objects into one Parquet file per month ('2023-04') or per
+    season ('2022-23', seasons starting in July) under '<S3_FOLDER>/compacted/', and records which file holds
+    each date in the compaction manifest read by CompactedS3SnapshotReader.
+
+    Compaction is idempotent: a period that already has a compacted file is rebuilt from that file plus any new
+    daily objects, with the daily object winning for a date that appears in both; switching between the month and
+    season layouts rebuilds the affected periods and drops the old files. The manifest is only updated
+    after the new files are written, and the daily objects are only deleted (when asked to) after that, so a
+    crash at any point leaves every date readable.
+    """
+
+    PERIODS = ('month', 'season')
+
+    def __init__(self, snapshot_reader: CompactedS3SnapshotReader, period: str='month', coloured_console_logs: bool=False, file_logger=FileLogger()):
+        if period not in self.PERIODS:
+            raise ValueError(f"Unknown compaction period '{period}' - choose one of {self.PERIODS}")
+
+        self.snapshot_reader = snapshot_reader
+        self.period = period
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def get_period_label(self, match_date: str) -> str:
+        parsed_date = datetime.strptime(match_date, '%Y-%b-%d')
+        if self.period == 'month':
+            return parsed_date.strftime('%Y-%m')
+
+        season_start_year = parsed_date.year if parsed_date.month >= 7 else parsed_date.year - 1
+        return f'{season_start_year}-{(season_start_year + 1) % 100:02d}'
+
+
+    def get_compacted_key(self, period_label: str) -> str:
+        return f'{self.snapshot_reader.s3_folder}/compacted/{self.snapshot_reader.file_name}_{period_label}.parquet'
+
+
+    def _put_object_bytes(self, s3_key: str, payload: bytes):
+        snapshot_reader = self.snapshot_reader
+        snapshot_reader.resilient_caller.call(snapshot_reader.s3_client.put_object, host=f's3://{snapshot_reader.s3_bucket}', operation_name='put_object', Bucket=snapshot_reader.s3_bucket, Key=s3_key, Body=payload)
+
+
+    # Implement S3SnapshotCompactor method for compacting every daily object in the folder
+    def compact(self, delete_daily_objects: bool=False) -> Dict[str, List[str]]:
+        snapshot_reader = self.snapshot_reader
+        manifest = snapshot_reader.read_manifest()
+        daily_objects = snapshot_reader.list_daily_objects()
+
+        # Rebuild every period with new daily objects, plus any period whose dates sit in a file of another layout (e.g. month -> season)
+        dates_by_period = {}
+        for match_date in set(manifest['match_dates']) | set(daily_objects):
+            dates_by_period.setdefault(self.get_period_label(match_date), []).append(match_date)
+
+        periods_to_rebuild = {self.get_period_label(match_date) for match_date in daily_objects}
+        periods_to_rebuild |= {self.get_period_label(match_date) for match_date, s3_key in manifest['match_dates'].items() if s3_key != self.get_compacted_key(self.get_period_label(match_date))}
+
+        compacted_files = {}
+        compacted_dates_by_period = {}
+        for period_label in sorted(periods_to_rebuild):
+            compacted_key = self.get_compacted_key(period_label)
+            period_dfs = []
+
+            for match_date in dates_by_period[period_label]:
+                if match_date in daily_objects:
+                    period_dfs.append(snapshot_reader.read_daily_object(daily_objects[match_date]))
+                    continue
+
+                source_key = manifest['match_dates'][match_date]
+                if source_key not in compacted_files:
+                    compacted_files[source_key] = snapshot_reader.read_compacted_file(source_key)
+                period_dfs.append(compacted_files[source_key][compacted_files[source_key]['match_date'] == match_date])
+
+            period_df = pd.concat(period_dfs, ignore_index=True)
+            period_df['_match_date_sort_key'] = pd.to_datetime(period_df['match_date'], format='%Y-%b-%d')
+            period_df = period_df.sort_values(['_match_date_sort_key', 'Pos'], kind='stable').drop(columns=['_match_date_sort_key']).reset_index(drop=True)
+
+            parquet_buffer = io.BytesIO()
+            period_df.to_parquet(parquet_buffer, index=False, compression='zstd')
+            self._put_object_bytes(compacted_key, parquet_buffer.getvalue())
+
+            compacted_dates = sorted(period_df['match_date'].unique(), key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+            compacted_dates_by_period[period_label] = compacted_dates
+            manifest['files'][compacted_key] = {'period': period_label, 'match_dates': compacted_dates, 'rows': len(period_df), 'bytes': parquet_buffer.getbuffer().nbytes}
+            manifest['match_dates'].update({match_date: compacted_key for match_date in compacted_dates})
+            self.console_logger.log_event_as_debug(f">>> Compacted {len(compacted_dates)} date(s) into 's3://{snapshot_reader.s3_bucket}/{compacted_key}' ({parquet_buffer.getbuffer().nbytes} bytes) ...")
+
+        stale_keys = set(manifest['files']) - set(manifest['match_dates'].values())
+        for stale_key in stale_keys:
+            manifest['files'].pop(stale_key)
+
+
+        # Publish the manifest only once every compacted file is in place
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._put_object_bytes(snapshot_reader.manifest_key, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+        # Daily objects (when asked) and files from an older layout are only deleted once nothing points at them
+        keys_to_delete = list(stale_keys) + (list(daily_objects.values()) if delete_daily_objects else [])
+        if keys_to_delete:
+            for key_batch_start in range(0, len(keys_to_delete), 1000):
+                snapshot_reader.resilient_caller.call(snapshot_reader.s3_client.delete_objects, host=f's3://{snapshot_reader.s3_bucket}', operation_name='delete_objects', Bucket=snapshot_reader.s3_bucket,
+                                                      Delete={'Objects': [{'Key': s3_key} for s3_key in keys_to_delete[key_batch_start:key_batch_start + 1000]], 'Quiet': True})
+
+        self.console_logger.log_event_as_info(f">>> Compacted {len(daily_objects)} daily snapshot object(s) into {len(compacted_dates_by_period)} rebuilt {self.period} file(s){' and deleted the daily objects' if delete_daily_objects else ''} ...")
+        return compacted_dates_by_period
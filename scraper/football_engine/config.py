@@ -0,0 +1,51 @@
+from __future__ import annotations
+import os
+from football_engine.dependencies import boto3
+
+
+
+# ================================================ CONFIG ================================================
+
+
+# Set up a class to enable external classes to access environment variables
+class Config:
+    def __init__(self, WRITE_FILES_TO_CLOUD: bool = False, WRITE_FILES_TO_LOCAL: bool = False):
+        self._AWS_ACCESS_KEY             =   os.getenv("ACCESS_KEY")
+        self._AWS_SECRET_KEY             =   os.getenv("SECRET_ACCESS_KEY")
+        self._S3_REGION                  =   os.getenv("REGION_NAME")
+        self._S3_BUCKET                  =   os.getenv("S3_BUCKET")
+        self._S3_FOLDER                  =   os.getenv("S3_FOLDER")
+        self._S3_ENDPOINT_URL            =   os.getenv("S3_ENDPOINT_URL")    # e.g. a local MinIO/LocalStack stand-in
+        self.LOCAL_TARGET_PATH           =   os.getenv("LOCAL_TARGET_PATH")
+        self.JOB_MANIFEST_PATH           =   os.getenv("JOB_MANIFEST_PATH", "temp_storage/job_manifests/prem_league_table_manifest.json")
+        self.STREAM_MAX_BUFFER_BYTES     =   int(os.getenv("STREAM_MAX_BUFFER_BYTES", 8 * 1024 * 1024))
+        self.QUARANTINE_PATH             =   os.getenv("QUARANTINE_PATH", "temp_storage/quarantine")
+        self.SNAPSHOT_CACHE_PATH         =   os.getenv("SNAPSHOT_CACHE_PATH", "temp_storage/snapshot_cache")
+        self.SQLITE_DATABASE_PATH        =   os.getenv("SQLITE_DATABASE_PATH", "temp_storage/warehouse/football_scraper.db")
+        self.JOB_QUEUE_URL               =   os.getenv("JOB_QUEUE_URL")
+        self.JOB_QUEUE_PATH              =   os.getenv("JOB_QUEUE_PATH", "temp_storage/job_queue/scrape_jobs.db")
+        self.RUN_LOCK_PATH               =   os.getenv("RUN_LOCK_PATH", "temp_storage/run_locks")
+        self.S3_CONNECT_TIMEOUT_SECONDS  =   float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", 10))
+        self.S3_READ_TIMEOUT_SECONDS     =   float(os.getenv("S3_READ_TIMEOUT_SECONDS", 60))
+        self.CHANGE_CALENDAR_PATH        =   os.getenv("CHANGE_CALENDAR_PATH", "temp_storage/job_manifests/league_table_change_calendar.json")
+        self.PIPELINE_STATE_PATH         =   os.getenv("PIPELINE_STATE_PATH", "temp_storage/job_manifests/pipeline_state.json")
+        self.PIPELINE_ARTIFACTS_PATH     =   os.getenv("PIPELINE_ARTIFACTS_PATH", "temp_storage/pipeline_artifacts")
+
+        # The S3 client is only created when something first uses it (see 'S3_CLIENT')
+        self._s3_client                 =   None
+        
+        # Add a flag for saving CSV files to the cloud 
+        self.WRITE_FILES_TO_CLOUD = WRITE_FILES_TO_CLOUD
+
+        # Add a flag for also saving CSV files locally when writing to the cloud
+        self.WRITE_FILES_TO_LOCAL = WRITE_FILES_TO_LOCAL
+
+
+    # Set up constants for S3 file to be imported - local-only runs never import boto3 or build a client
+    @property
+    def S3_CLIENT(self):
+        if self._s3_client is None:
+            from botocore.config import Config as BotoConfig
+            self._s3_client = boto3.client('s3', aws_access_key_id=self._AWS_ACCESS_KEY, aws_secret_access_key=self._AWS_SECRET_KEY, region_name=self._S3_REGION, endpoint_url=self._S3_ENDPOINT_URL,
+                                           config=BotoConfig(connect_timeout=self.S3_CONNECT_TIMEOUT_SECONDS, read_timeout=self.S3_READ_TIMEOUT_SECONDS))
+        return self._s3_client
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import os
+import fcntl
+import signal
+import socket
+import threading
+from typing import List, Dict, Optional
+from datetime import datetime
+from time import monotonic
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+
+
+
+# ================================================ RUN COORDINATOR ================================================
+
+# Set up custom exceptions raised when a run cannot start or has to stop early
+class RunLockHeldError(Exception):
+    def __init__(self, lock_path: str, holder: str):
+        self.lock_path = lock_path
+        self.holder = holder
+        super().__init__(f"Another run already holds '{lock_path}' ({holder or 'unknown holder'}) - not starting a second one")
+
+
+class RunCancelledError(Exception):
+    def __init__(self, stage_name: str, reason: str):
+        self.stage_name = stage_name
+        self.reason = reason
+        super().__init__(f"Run cancelled before stage '{stage_name}': {reason}")
+
+
+# Set up a FileRunLock class that lets only one run per (league, job type) execute on a host at a time
+class FileRunLock:
+    """
+    Holds an exclusive, non-blocking flock on 'temp_storage/run_locks/<league>_<job type>.lock' for the whole run
+    and writes the holder's host, pid and start time into the file. The kernel drops the lock when the process
+    exits, so a run that crashed or was killed never leaves a stale lock behind.
+    """
+
+    def __init__(self, lock_folder: str, league: str, job_type: str, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.lock_path = f'{lock_folder}/{league}_{job_type}.lock'
+        self.lock_file = None
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+        lock_file = open(self.lock_path, 'a+')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.seek(0)
+            holder = lock_file.read().strip()
+            lock_file.close()
+            raise RunLockHeldError(self.lock_path, holder)
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f'host={socket.gethostname()} pid={os.getpid()} started_at={datetime.now().isoformat(timespec="seconds")}\n')
+        lock_file.flush()
+        self.lock_file = lock_file
+        self.file_logger.log_event_as_debug(f">>> Acquired run lock '{self.lock_path}' ...")
+
+
+    def release(self):
+        if self.lock_file is None:
+            return
+        self.lock_file.seek(0)
+        self.lock_file.truncate()
+        fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+        self.lock_file.close()
+        self.lock_file = None
+        self.file_logger.log_event_as_debug(f">>> Released run lock '{self.lock_path}' ...")
+
+
+
+# Set up a RunBudget class that gives a run an overall deadline and splits it across its stages
+class RunBudget:
+    """
+    The run gets 'total_seconds' from the moment it starts. Each stage is capped at its share of the total
+    ('stage_shares', e.g. {'load_page': 0.4, ...}) and never beyond the run's own deadline, so one hanging stage
+    cannot eat the whole budget of every date after it. Stages without a share only get the run deadline.
+
+    'start_stage' is called at the start of every stage and returns that stage's deadline (a 'monotonic()'
+    timestamp, as taken by ResilientCaller); it raises RunCancelledError once the budget is spent or the run was
+    cancelled, which stops the remaining stages from starting at all.
+    """
+
+    def __init__(self, total_seconds: Optional[float], stage_shares: Dict[str, float]=None):
+        self.total_seconds = total_seconds
+        self.stage_shares = stage_shares or {}
+        self.started_at = monotonic()
+        self.deadline = self.started_at + total_seconds if total_seconds is not None else None
+        self.cancel_event = threading.Event()
+        self.cancel_reason = None
+
+
+    def get_remaining_seconds(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - monotonic())
+
+
+    def cancel(self, reason: str):
+        if not self.cancel_event.is_set():
+            self.cancel_reason = reason
+            self.cancel_event.set()
+
+
+    def start_stage(self, stage_name: str) -> Optional[float]:
+        if self.deadline is not None and monotonic() >= self.deadline:
+            self.cancel(f'run budget of {self.total_seconds:.0f}s spent')
+        if self.cancel_event.is_set():
+            raise RunCancelledError(stage_name, self.cancel_reason)
+
+        if self.deadline is None:
+            return None
+        if stage_name not in self.stage_shares:
+            return self.deadline
+        return min(self.deadline, monotonic() + self.total_seconds * self.stage_shares[stage_name])
+
+
+    def get_stage_timeout_seconds(self, stage_name: str, default_seconds: float) -> float:
+        stage_deadline = self.start_stage(stage_name)
+        return default_seconds if stage_deadline is None else max(0.0, min(default_seconds, stage_deadline - monotonic()))
+
+
+
+# Set up a RunCoordinator class that owns the run lock, the run budget and the teardown of the browser
+class RunCoordinator:
+    """
+    Takes the run lock for (league, job type), starts the run budget and, when the budget is spent or the
+    process receives SIGTERM/SIGINT, cancels the run: the budget refuses to start any further stage and the
+    browser is quit from a watchdog thread, which also unblocks a Selenium call that is hanging mid-stage.
+    Browsers are attached as anything with a 'quit' method - a Chrome driver, or a web page loader that may not
+    have started its browser yet. 'release' tears the browser down (if it is still up) and drops the lock - call it from a 'finally'. Runs that
+    are meant to overlap (queue workers) pass no lock.
+    """
+
+    def __init__(self, run_lock: Optional[FileRunLock], run_budget: RunBudget, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.run_lock = run_lock
+        self.run_budget = run_budget
+        self.browsers: List = []
+        self.teardown_lock = threading.Lock()
+        self.watchdog_thread = None
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def acquire(self):
+        if self.run_lock is not None:
+            self.run_lock.acquire()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signal_number, self._handle_signal)
+
+        self.watchdog_thread = threading.Thread(target=self._watch_budget, daemon=True)
+        self.watchdog_thread.start()
+        self.console_logger.log_event_as_debug(f">>> Run started with a budget of {self.run_budget.total_seconds}s ...")
+
+
+    def attach_browser(self, browser):
+        self.browsers.append(browser)
+
+
+    def _handle_signal(self, signal_number, frame):
+        self.cancel(f'received signal {signal.Signals(signal_number).name}')
+
+
+    def _watch_budget(self):
+        if not self.run_budget.cancel_event.wait(self.run_budget.get_remaining_seconds()):
+            self.run_budget.cancel(f'run budget of {self.run_budget.total_seconds:.0f}s spent')
+        self.teardown_browsers()
+
+
+    def cancel(self, reason: str):
+        self.console_logger.log_event_as_warning(f'>>> Cancelling run: {reason} ...')
+        self.run_budget.cancel(reason)
+
+
+    def teardown_browsers(self):
+        with self.teardown_lock:
+            while self.browsers:
+                browser = self.browsers.pop()
+                try:
+                    browser.quit()
+                except Exception as e:
+                    self.console_logger.log_event_as_warning(f'>>> Unable to quit browser cleanly: {e}')
+
+
+    def release(self):
+        self.run_budget.cancel('run finished')
+        self.teardown_browsers()
+        if self.run_lock is not None:
+            self.run_lock.release()
+        if self.run_budget.cancel_reason != 'run finished':
+            self.console_logger.log_event_as_warning(f'>>> Run stopped early: {self.run_budget.cancel_reason}')
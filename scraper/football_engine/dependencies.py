@@ -0,0 +1,22 @@
+import sys
+import importlib.util
+
+
+
+# Defer the heavy imports (numpy/pandas, boto3, Selenium) to their first use, so a run only loads what it actually uses
+def import_lazily(module_name: str):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    module_spec = importlib.util.find_spec(module_name)
+    module_spec.loader = importlib.util.LazyLoader(module_spec.loader)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[module_name] = module
+    module_spec.loader.exec_module(module)
+    return module
+
+
+np = import_lazily('numpy')
+pd = import_lazily('pandas')
+boto3 = import_lazily('boto3')
+webdriver = import_lazily('selenium.webdriver')
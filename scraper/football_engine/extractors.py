@@ -0,0 +1,299 @@
+from __future__ import annotations
+import re
+import sys
+from typing import List, Dict, Iterable, Iterator, Optional, Callable, NamedTuple
+from array import array
+from urllib.parse import urlparse
+from html.parser import HTMLParser
+from abc import ABC, abstractmethod
+from football_engine.dependencies import np, pd, webdriver
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ResilientCaller
+
+
+
+# ================================================ DATA EXTRACTOR ================================================
+
+# Set up abstract base class for Data Extractor that defines interface for data extractors
+class IDataExtractor(ABC):
+    @abstractmethod
+    def scrape_data(self):
+        pass
+
+
+# Set up a concrete TableStandingsDataExtractor class that inherits from IDataExtractor
+class TableStandingsDataExtractor(IDataExtractor):
+    @abstractmethod
+    def scrape_data(self):
+        pass
+
+
+# Set up a StandingsColumnarBatch class that holds a scraped table column by column instead of as lists of strings
+class StandingsColumnarBatch:
+    """
+    Compact stand-in for 'scraped_content' (header row + one list of cell strings per row). Rows are appended one
+    at a time as they are scraped and split into columns on the way in:
+
+    - stat columns go into typed C int 'array' buffers (4 bytes per value instead of a ~50-byte str + pointer)
+    - team names are interned, so every snapshot of a season shares one str object per club
+    - blank spacer cells are dropped - only the header keeps their positions, to rebuild the original layout
+
+    'to_dataframe' copies each stat buffer into its own numpy array, so the dataframe is writable and the batch
+    can keep growing after it was built. A stat column that holds a non-integer cell falls back to a list of
+    strings, so odd values still reach the validator untouched.
+    """
+
+    __slots__ = ('raw_columns', 'spacer_positions', 'text_positions', 'columns', 'row_count')
+
+    TEXT_COLUMNS = {'Team'}
+
+    def __init__(self, raw_columns: List[str]):
+        self.raw_columns = list(raw_columns)
+        self.spacer_positions = {column_position for column_position, column in enumerate(self.raw_columns) if not column.strip()}
+        self.text_positions = {column_position for column_position, column in enumerate(self.raw_columns) if column in self.TEXT_COLUMNS}
+        self.columns = {column_position: [] if column_position in self.text_positions else array('i')
+                        for column_position in range(len(self.raw_columns)) if column_position not in self.spacer_positions}
+        self.row_count = 0
+
+
+    @classmethod
+    def from_scraped_content(cls, scraped_content: Iterable[List[str]]) -> 'StandingsColumnarBatch':
+        scraped_rows = iter(scraped_content)
+        columnar_batch = cls(next(scraped_rows, []))
+        for scraped_row in scraped_rows:
+            columnar_batch.append_row(scraped_row)
+        return columnar_batch
+
+
+    def __len__(self) -> int:
+        return self.row_count
+
+
+    # Rebuild each row in the raw layout (' ' in the spacer columns), with stats as ints where they parsed
+    def iter_rows(self) -> Iterator[list]:
+        for row_number in range(self.row_count):
+            yield [' ' if column_position in self.spacer_positions else self.columns[column_position][row_number] for column_position in range(len(self.raw_columns))]
+
+
+    def append_row(self, cells: List[str]):
+        if not cells:
+            return
+
+        for column_position, column_values in self.columns.items():
+            cell = cells[column_position] if column_position < len(cells) else ''
+            if column_position in self.text_positions:
+                column_values.append(sys.intern(cell))
+                continue
+
+            if isinstance(column_values, array):
+                try:
+                    column_values.append(int(cell))
+                    continue
+                except ValueError:
+                    column_values = self.columns[column_position] = [str(value) for value in column_values]
+            column_values.append(cell)
+
+        self.row_count += 1
+
+
+    # Build the transformer's dataframe (original header, spacer columns included) around the column buffers
+    def to_dataframe(self, match_date: str) -> pd.DataFrame:
+        column_data = {}
+        for column_position in range(len(self.raw_columns)):
+            if column_position in self.spacer_positions:
+                column_data[column_position] = ' '
+            elif isinstance(self.columns[column_position], array):
+                column_data[column_position] = np.array(self.columns[column_position], dtype=np.intc)
+            else:
+                column_data[column_position] = self.columns[column_position]
+
+        table_df = pd.DataFrame(column_data, index=pd.RangeIndex(self.row_count))
+        table_df.columns = self.raw_columns
+        table_df['match_date'] = match_date
+        return table_df
+
+
+
+# Set up a concrete PremLeagueTableStandingsDataExtractor class that inherits from TableStandingsDataExtractor
+class PremLeagueTableStandingsDataExtractor(TableStandingsDataExtractor):
+
+    def __init__(self, chrome_driver: webdriver.Chrome, match_date: str, coloured_console_logs: bool=False, file_logger=FileLogger(), resilient_caller: ResilientCaller=None):
+        self.chrome_driver = chrome_driver
+        self.match_date = match_date
+        self.file_logger = file_logger
+        self.resilient_caller = resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+    
+    # Implement PremLeagueTableStandingsDataExtractor method for scraping data from webpage
+    def scrape_data(self, deadline: Optional[float]=None):
+        scraped_content = []
+        try:
+            scraped_content = self.resilient_caller.call(lambda: list(self.iter_scraped_rows()), host=urlparse(self.chrome_driver.current_url).netloc, operation_name='scrape_data', deadline=deadline)
+        except Exception as e:
+            self.console_logger.log_event_as_error(e)
+
+        return scraped_content
+
+
+    # Implement PremLeagueTableStandingsDataExtractor method for scraping straight into a columnar batch
+    def scrape_columnar(self, deadline: Optional[float]=None) -> StandingsColumnarBatch:
+        columnar_batch = StandingsColumnarBatch([])
+        try:
+            columnar_batch = self.resilient_caller.call(lambda: StandingsColumnarBatch.from_scraped_content(self.iter_scraped_rows()), host=urlparse(self.chrome_driver.current_url).netloc, operation_name='scrape_data', deadline=deadline)
+        except Exception as e:
+            self.console_logger.log_event_as_error(e)
+
+        return columnar_batch
+
+
+    # Yield each table row as soon as it is scraped, so streaming runs never hold the whole table in memory
+    def iter_scraped_rows(self) -> Iterator[List[str]]:
+        from selenium.webdriver.common.by import By
+
+        table                   =   self.chrome_driver.find_element(By.CLASS_NAME, 'leaguetable')
+        table_rows              =   table.find_elements(By.XPATH, './/tr')
+        table_row_counter       =   0
+        self.console_logger.log_event_as_debug(f'>>>>   Extracting content from HTML elements ...')
+
+        for table_row in table_rows:
+            table_row_counter   +=  1
+            self.console_logger.log_event_as_debug(f'>>>>>>>   Table no {table_row_counter} <<<<<<  ')
+            cells           =   table_row.find_elements(By.TAG_NAME, 'td')
+            row_data        =   []
+            cell_counter    =   0
+
+            for cell in cells:
+                cell_counter += 1
+                row_data.append(cell.text)
+                self.file_logger.log_event_as_debug(f'>>>>   Table row no "{table_row_counter}", Cell no "{cell_counter}" appended ...')
+                self.file_logger.log_event_as_debug(f'>>>>   ')
+
+            yield row_data
+
+
+
+class BundesligaTableStandingsDataExtractor(TableStandingsDataExtractor):
+    pass
+
+
+class LaligaTableStandingsDataExtractor(TableStandingsDataExtractor):
+    pass
+
+
+class SerieATableStandingsDataExtractor(TableStandingsDataExtractor):
+    pass
+
+
+class Ligue1TableStandingsDataExtractor(TableStandingsDataExtractor):
+    pass
+
+
+
+# ================================================ MULTI-TABLE EXTRACTOR ================================================
+
+# Set up a TableExtractionSpec record that declares how to find, name and type one table on a page
+class TableExtractionSpec(NamedTuple):
+    data_type: str                                  # e.g. 'league-standings', 'top-scorers' - used to route the table
+    table_class: Optional[str] = None               # CSS class of the <table> (e.g. 'leaguetable')
+    table_id: Optional[str] = None                  # id of the <table>, if it has one
+    table_index: int = 0                            # which of the matching tables to take
+    column_mapping: Dict[str, str] = {}             # optional header renames applied by the transformer
+    column_types: Dict[str, Callable] = {}          # optional casts applied by the transformer (after renaming)
+
+
+# Set up an HTMLTableParser class that collects every table on a page in a single pass over the HTML
+class HTMLTableParser(HTMLParser):
+    """
+    Streams through the page source once and records each <table> as its attributes plus a list of rows of cell
+    text. Cell text is whitespace-collapsed and non-breaking spaces are kept as ' ', which matches what Selenium's
+    'cell.text' returns for the blank spacer columns.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables: List[Dict] = []
+        self.open_tables: List[Dict] = []
+        self.current_row: Optional[List[str]] = None
+        self.current_cell: Optional[List[str]] = None
+
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]):
+        if tag == 'table':
+            table_attributes = dict(attrs)
+            self.open_tables.append({'classes': (table_attributes.get('class') or '').split(), 'id': table_attributes.get('id'), 'rows': []})
+        elif tag == 'tr' and self.open_tables:
+            self.current_row = []
+        elif tag in ('td', 'th') and self.current_row is not None:
+            self.current_cell = []
+
+
+    def handle_endtag(self, tag: str):
+        if tag in ('td', 'th') and self.current_cell is not None:
+            cell_text = re.sub(r'[ \t\n\r\f]+', ' ', ''.join(self.current_cell)).strip(' \t\n\r\f').replace('\xa0', ' ')
+            self.current_row.append(cell_text)
+            self.current_cell = None
+        elif tag == 'tr' and self.current_row is not None:
+            self.open_tables[-1]['rows'].append(self.current_row)
+            self.current_row = None
+        elif tag == 'table' and self.open_tables:
+            self.tables.append(self.open_tables.pop())
+
+
+    def handle_data(self, data: str):
+        if self.current_cell is not None:
+            self.current_cell.append(data)
+
+
+# Set up a concrete MultiTableDataExtractor class that inherits from IDataExtractor
+class MultiTableDataExtractor(IDataExtractor):
+    """
+    Extracts every table declared in 'extraction_specs' from one loaded page (or an already fetched HTML body).
+    The page source is pulled from the browser once and parsed once, instead of one WebDriver round trip per
+    cell, and each table comes back in the same 'scraped_content' shape (header row first) that the existing
+    transformers expect, keyed by the spec's data type.
+    """
+
+    def __init__(self, extraction_specs: List[TableExtractionSpec], chrome_driver: webdriver.Chrome=None, page_source: str=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.extraction_specs = extraction_specs
+        self.chrome_driver = chrome_driver
+        self.page_source = page_source
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @staticmethod
+    def find_table(tables: List[Dict], extraction_spec: TableExtractionSpec) -> Optional[Dict]:
+        matching_tables = [table for table in tables
+                           if (extraction_spec.table_class is None or extraction_spec.table_class in table['classes'])
+                           and (extraction_spec.table_id is None or extraction_spec.table_id == table['id'])]
+        return matching_tables[extraction_spec.table_index] if len(matching_tables) > extraction_spec.table_index else None
+
+
+    # Implement MultiTableDataExtractor method for extracting every declared table in one parse pass
+    def scrape_data(self) -> Dict[str, List[List[str]]]:
+        page_source = self.page_source if self.page_source is not None else self.chrome_driver.page_source
+
+        html_table_parser = HTMLTableParser()
+        html_table_parser.feed(page_source)
+        html_table_parser.close()
+        self.console_logger.log_event_as_debug(f'>>>>   Parsed {len(html_table_parser.tables)} table(s) from a single page load ...')
+
+        scraped_tables = {}
+        for extraction_spec in self.extraction_specs:
+            table = self.find_table(html_table_parser.tables, extraction_spec)
+            if table is None:
+                self.console_logger.log_event_as_error(f">>>>   No table found for '{extraction_spec.data_type}' (class: {extraction_spec.table_class}, id: {extraction_spec.table_id}, index: {extraction_spec.table_index}) ...")
+                continue
+
+            scraped_tables[extraction_spec.data_type] = [row for row in table['rows'] if row]
+            self.file_logger.log_event_as_debug(f">>>>   Extracted {len(scraped_tables[extraction_spec.data_type])} row(s) for '{extraction_spec.data_type}' ...")
+
+        return scraped_tables
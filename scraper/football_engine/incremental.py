@@ -0,0 +1,311 @@
+from __future__ import annotations
+import os
+import csv
+import sys
+import json
+import hashlib
+import inspect
+import tempfile
+from typing import Dict, Iterable, Optional, Callable, Tuple
+from datetime import datetime
+from collections import Counter
+from time import time
+from pathlib import Path
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.extractors import StandingsColumnarBatch
+from football_engine.validators import LeagueTableValidationError
+from football_engine.manifest import JSONFileJobManifest
+from football_engine.uploaders import MultiSinkFileUploader
+from football_engine.job_runner import IScrapeJobRunner, PremLeagueTableScrapeJobRunner
+
+
+
+# ================================================ INCREMENTAL PIPELINE ================================================
+
+# Set up a PipelineStateStore class that records the input fingerprint and output reference of every stage run
+class PipelineStateStore:
+    """
+    Keeps one record per '<league>|<match date>|<stage>' - the fingerprint of the stage's inputs, a reference to
+    its output (an artifact path or an upload location), a hash of that output and when it ran - in a JSON file
+    that is rewritten atomically after every stage, like the job manifest.
+    """
+
+    def __init__(self, state_path: str, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.state_path = state_path
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        self.stage_records: Dict[str, Dict] = self._read_state()
+
+
+    def _read_state(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.state_path):
+            return {}
+
+        try:
+            with open(self.state_path, 'r') as state_file:
+                return json.load(state_file).get('stages', {})
+        except Exception as e:
+            self.console_logger.log_event_as_warning(f">>> Unable to read pipeline state '{self.state_path}', starting a fresh one: {e}")
+            return {}
+
+
+    def _write_state(self):
+        state_folder = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(state_folder, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=state_folder, prefix='.pipeline-state-', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w') as temp_file:
+                json.dump({'stages': self.stage_records}, temp_file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.state_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    @staticmethod
+    def _get_stage_key(league: str, match_date: str, stage_name: str) -> str:
+        return f'{league}|{match_date}|{stage_name}'
+
+
+    def get_record(self, league: str, match_date: str, stage_name: str) -> Optional[Dict]:
+        return self.stage_records.get(self._get_stage_key(league, match_date, stage_name))
+
+
+    def record_stage(self, league: str, match_date: str, stage_name: str, fingerprint: str, output_ref: str, output_hash: str) -> Dict:
+        stage_record = {'fingerprint': fingerprint, 'output_ref': output_ref, 'output_hash': output_hash, 'ran_at': time()}
+        self.stage_records[self._get_stage_key(league, match_date, stage_name)] = stage_record
+        self._write_state()
+        return stage_record
+
+
+    def forget_stage(self, league: str, match_date: str, stage_name: str):
+        if self.stage_records.pop(self._get_stage_key(league, match_date, stage_name), None) is not None:
+            self._write_state()
+
+
+
+# Set up a concrete IncrementalPipelineRunner class that inherits from IScrapeJobRunner and only re-runs stale stages
+class IncrementalPipelineRunner(IScrapeJobRunner):
+    """
+    Runs the job runner's stages as a small make-style DAG per (league, match date):
+
+        extract   (load page, close popup, scrape)  ->  '<artifacts>/<league>/<date>/extract.json'
+        transform (transform, validate)             ->  '<artifacts>/<league>/<date>/transform.csv'
+        load      (uploaders, warehouse, cache)     ->  the output location
+
+    A stage's fingerprint hashes the output hash of the stage before it (the URL for 'extract') together with a
+    code version - a hash of the source of every module that the stage's classes (and their parents) live in,
+    plus the engine modules listed for the stage in 'STAGE_DEPENDENCY_MODULES', so a change to a shared helper
+    such as 'STANDINGS_COLUMN_MAPPING' or 'serialise_df' invalidates the stage too. A stage is skipped when its
+    recorded fingerprint matches and its output is still there; otherwise it runs and everything downstream is
+    re-checked. A downstream stage only runs if the new output actually differs (early cut-off), so fixing the
+    transformer re-runs 'transform', and 'load' only for the dates whose snapshot changed.
+
+    Tables for past dates never change, so their extracts stay valid until the extractor code changes. The table
+    for today (or a future date) can, so its extract is only reused for 'volatile_ttl_seconds'.
+
+    Artifacts are plain files - the extract as JSON and the validated table as the same CSV the uploaders write
+    - so nothing that is read back from the artifacts folder can run code.
+    """
+
+    STAGES = ('extract', 'transform', 'load')
+
+    # Engine modules whose module-level helpers each stage relies on, on top of the modules of its own classes
+    STAGE_DEPENDENCY_MODULES = {
+        'extract':      ('football_engine.extractors', 'football_engine.resilience'),
+        'transform':    ('football_engine.extractors', 'football_engine.transformers', 'football_engine.validators'),
+        'load':         ('football_engine.transformers', 'football_engine.uploaders', 'football_engine.sinks', 'football_engine.manifest'),
+    }
+
+    module_source_hashes: Dict[str, bytes] = {}
+
+    def __init__(self, job_runner: PremLeagueTableScrapeJobRunner, state_store: PipelineStateStore, artifacts_path: str, volatile_ttl_seconds: float=15 * 60, force_stages: Iterable[str]=(), coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.job_runner = job_runner
+        self.state_store = state_store
+        self.artifacts_path = artifacts_path
+        self.volatile_ttl_seconds = volatile_ttl_seconds
+        self.force_stages = set(force_stages)
+        self.stage_outcomes = Counter()
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Hash a module's source once per process - 'inspect.getsource' re-reads the whole file on every call
+    @classmethod
+    def get_module_source_hash(cls, module_name: str) -> bytes:
+        if module_name not in cls.module_source_hashes:
+            try:
+                module_source = inspect.getsource(sys.modules[module_name])
+            except (KeyError, OSError, TypeError):
+                module_source = module_name
+            cls.module_source_hashes[module_name] = hashlib.sha256(module_source.encode('utf-8')).digest()
+        return cls.module_source_hashes[module_name]
+
+
+    # Hash the name of each component's class and the source of every module holding it or one of its parents, plus the given modules
+    @classmethod
+    def get_code_version(cls, *components, dependency_modules: Iterable[str]=()) -> str:
+        code_hash = hashlib.sha256()
+        module_names = set(dependency_modules)
+        for component in components:
+            if component is None:
+                continue
+            component_class = component if isinstance(component, type) else type(component)
+            code_hash.update(f'{component_class.__module__}.{component_class.__qualname__}'.encode('utf-8'))
+            module_names.update(parent_class.__module__ for parent_class in component_class.__mro__ if parent_class.__module__ != 'builtins')
+
+        for module_name in sorted(module_names):
+            code_hash.update(module_name.encode('utf-8'))
+            code_hash.update(cls.get_module_source_hash(module_name))
+        return code_hash.hexdigest()
+
+
+    @staticmethod
+    def get_fingerprint(**inputs) -> str:
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+    def get_stage_fingerprint(self, league: str, match_date: str, upstream_hash: str, stage_name: str) -> str:
+        job_runner = self.job_runner
+        stage_components = {
+            'extract':      (job_runner.webpage_loader, job_runner.popup_handler_class, job_runner.data_extractor_class),
+            'transform':    (StandingsColumnarBatch, job_runner.data_transformer, job_runner.data_validator),
+            'load':         (job_runner.data_uploader, *getattr(job_runner.data_uploader, 'sinks', []), job_runner.warehouse_uploader, job_runner.snapshot_cache),
+        }
+        code_version = self.get_code_version(*stage_components[stage_name], dependency_modules=self.STAGE_DEPENDENCY_MODULES[stage_name])
+        return self.get_fingerprint(stage=stage_name, upstream=upstream_hash, code=code_version)
+
+
+    def get_url(self, league: str, match_date: str) -> str:
+        return self.job_runner.get_url(league, match_date)
+
+
+    def is_volatile(self, match_date: str) -> bool:
+        return datetime.strptime(match_date, '%Y-%b-%d').date() >= datetime.now().date()
+
+
+    def is_fresh(self, stage_record: Optional[Dict], fingerprint: str, stage_name: str, match_date: str) -> bool:
+        if stage_name in self.force_stages or stage_record is None or stage_record['fingerprint'] != fingerprint or stage_record['output_ref'] is None:
+            return False
+        if stage_name == 'extract' and self.is_volatile(match_date) and time() - stage_record['ran_at'] > self.volatile_ttl_seconds:
+            return False
+        return stage_name == 'load' or os.path.exists(stage_record['output_ref'])
+
+
+    def get_artifact_path(self, league: str, match_date: str, file_name: str) -> str:
+        return f'{self.artifacts_path}/{league}/{match_date}/{file_name}'
+
+
+    # Write an artifact to a temp file next to its target and rename it into place
+    @staticmethod
+    def _write_artifact(artifact_path: str, write_artifact: Callable):
+        os.makedirs(os.path.dirname(os.path.abspath(artifact_path)), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(artifact_path)), prefix='.artifact-', suffix='.tmp')
+        os.close(file_descriptor)
+        try:
+            write_artifact(temp_path)
+            os.replace(temp_path, artifact_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    def _log_stage(self, league: str, match_date: str, stage_name: str, outcome: str):
+        self.stage_outcomes[(stage_name, outcome)] += 1
+        self.file_logger.log_event_as_debug(f">>> Incremental pipeline | {league} | {match_date} | stage: '{stage_name}' | {outcome}")
+
+
+    # Implement IncrementalPipelineRunner method for the extract stage
+    def run_extract(self, league: str, match_date: str, force: bool=False) -> Dict:
+        fingerprint = self.get_stage_fingerprint(league, match_date, self.job_runner.get_url(league, match_date), 'extract')
+        stage_record = self.state_store.get_record(league, match_date, 'extract')
+        if not force and self.is_fresh(stage_record, fingerprint, 'extract', match_date):
+            self._log_stage(league, match_date, 'extract', 'skipped')
+            return stage_record
+
+        scraped_content = self.job_runner.extract_snapshot(league, match_date, columnar=False)
+        payload = json.dumps(scraped_content).encode('utf-8')
+        artifact_path = self.get_artifact_path(league, match_date, 'extract.json')
+        self._write_artifact(artifact_path, lambda temp_path: Path(temp_path).write_bytes(payload))
+
+        self._log_stage(league, match_date, 'extract', 'ran')
+        return self.state_store.record_stage(league, match_date, 'extract', fingerprint, artifact_path, hashlib.sha256(payload).hexdigest())
+
+
+    # Implement IncrementalPipelineRunner method for the transform stage, re-extracting while the table fails validation
+    def run_transform(self, league: str, match_date: str) -> Tuple[Dict, Optional[pd.DataFrame]]:
+        max_validation_attempts = self.job_runner.max_validation_attempts
+
+        for validation_attempt in range(1, max_validation_attempts + 1):
+            extract_record = self.run_extract(league, match_date, force=validation_attempt > 1)
+            fingerprint = self.get_stage_fingerprint(league, match_date, extract_record['output_hash'], 'transform')
+            stage_record = self.state_store.get_record(league, match_date, 'transform')
+            if self.is_fresh(stage_record, fingerprint, 'transform', match_date):
+                self._log_stage(league, match_date, 'transform', 'skipped')
+                return stage_record, None
+
+            with open(extract_record['output_ref'], 'r') as extract_file:
+                scraped_content = json.load(extract_file)
+            df = self.job_runner.transform_snapshot(StandingsColumnarBatch.from_scraped_content(scraped_content), match_date=match_date)
+
+            try:
+                self.job_runner.validate_snapshot(df, match_date=match_date)
+                break
+            except LeagueTableValidationError as validation_error:
+                if validation_attempt == max_validation_attempts:
+                    self.job_runner.snapshot_quarantine.quarantine_snapshot(df, league, match_date, validation_error.failed_checks)
+                    raise
+
+        artifact_path = self.get_artifact_path(league, match_date, 'transform.csv')
+        payload = MultiSinkFileUploader.serialise_df(df)
+        self._write_artifact(artifact_path, lambda temp_path: Path(temp_path).write_bytes(payload))
+
+        self._log_stage(league, match_date, 'transform', 'ran')
+        return self.state_store.record_stage(league, match_date, 'transform', fingerprint, artifact_path, JSONFileJobManifest.compute_content_hash(df)), df
+
+
+    # Rebuild a validated table from its CSV artifact - the raw layout minus 'match_date' is what the extractor returns
+    def read_transform_artifact(self, artifact_path: str, match_date: str):
+        with open(artifact_path, 'r', newline='', encoding='utf-8') as artifact_file:
+            scraped_content = [csv_row[:-1] for csv_row in csv.reader(artifact_file)]
+        return self.job_runner.transform_snapshot(StandingsColumnarBatch.from_scraped_content(scraped_content), match_date=match_date)
+
+
+    # Implement IncrementalPipelineRunner method for running only the stale stages of one match date
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+        transform_record, df = self.run_transform(league, match_date)
+
+        fingerprint = self.get_stage_fingerprint(league, match_date, transform_record['output_hash'], 'load')
+        stage_record = self.state_store.get_record(league, match_date, 'load')
+        if self.is_fresh(stage_record, fingerprint, 'load', match_date):
+            self._log_stage(league, match_date, 'load', 'skipped')
+            return stage_record['output_ref'], transform_record['output_hash']
+
+        if df is None:
+            df = self.read_transform_artifact(transform_record['output_ref'], match_date)
+        output_location, content_hash = self.job_runner.load_snapshot(df, match_date=match_date)
+        if output_location is None:
+            self.state_store.forget_stage(league, match_date, 'load')
+            return None, None
+
+        self._log_stage(league, match_date, 'load', 'ran')
+        self.state_store.record_stage(league, match_date, 'load', fingerprint, output_location, content_hash)
+        return output_location, content_hash
+
+
+    def log_stage_outcomes(self):
+        outcomes = ', '.join(f"{stage_name} {self.stage_outcomes[(stage_name, 'ran')]} ran / {self.stage_outcomes[(stage_name, 'skipped')]} skipped" for stage_name in self.STAGES)
+        self.console_logger.log_event_as_info(f'>>> Incremental pipeline: {outcomes} ...')
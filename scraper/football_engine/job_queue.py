@@ -0,0 +1,275 @@
+from __future__ import annotations
+import os
+import json
+import socket
+import sqlite3
+from typing import Dict, Optional, NamedTuple
+from collections import Counter
+from contextlib import closing
+from time import time
+from abc import ABC, abstractmethod
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.job_runner import IScrapeJobRunner
+from football_engine.coordinator import RunBudget, RunCancelledError
+
+
+
+# ================================================ JOB QUEUE ================================================
+
+# Set up a ScrapeJob record for a single unit of work leased from a job queue
+class ScrapeJob(NamedTuple):
+    league: str
+    match_date: str
+    data_type: str
+    attempts: int
+    receipt: str
+
+
+# Set up abstract base class for Job Queue that defines interface for queues shared between workers
+class IJobQueue(ABC):
+    @abstractmethod
+    def enqueue(self, league: str, match_date: str, data_type: str='league-standings'):
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id: str) -> Optional[ScrapeJob]:
+        pass
+
+    @abstractmethod
+    def acknowledge(self, job: ScrapeJob, worker_id: str):
+        pass
+
+    @abstractmethod
+    def release(self, job: ScrapeJob, worker_id: str, error: str, count_attempt: bool=True):
+        pass
+
+
+# Set up a concrete SQLiteJobQueue class that inherits from IJobQueue
+class SQLiteJobQueue(IJobQueue):
+    """
+    Job queue kept in a SQLite file - enough for several worker processes on one machine or on a shared volume,
+    and for testing the worker mode locally.
+
+    Leasing a job hides it from other workers until 'visibility_timeout_seconds' have passed. A worker that dies
+    mid-job never acknowledges it, so the lease simply expires and another worker picks the job up. Released
+    (failed) jobs become visible again after 'retry_delay_seconds', until 'max_attempts' is reached and the job
+    is parked as 'failed' - as is a job whose lease keeps expiring (its worker died with it) once it has used
+    up 'max_attempts' leases. Jobs are unique per (league, match_date, data_type), so enqueueing is idempotent
+    for queued, leased and done jobs; enqueueing a failed job queues it again with a fresh attempt count.
+    A job released with 'count_attempt=False' (the worker was cancelled mid-job) is handed back straight away
+    and the attempt is not counted against it.
+    """
+
+    QUEUED      =   'queued'
+    LEASED      =   'leased'
+    DONE        =   'done'
+    FAILED      =   'failed'
+
+    def __init__(self, queue_path: str, visibility_timeout_seconds: float=600.0, retry_delay_seconds: float=60.0, max_attempts: int=5, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.queue_path = queue_path
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_attempts = max_attempts
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.queue_path)), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute('''
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    league TEXT NOT NULL,
+    match_date TEXT NOT NULL,
+    data_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    visible_at REAL NOT NULL,
+    last_error TEXT,
+    UNIQUE (league, match_date, data_type)
+)''')
+            connection.execute('CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status_visible_at ON scrape_jobs (status, visible_at)')
+
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.queue_path, timeout=30, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+
+    # Implement SQLiteJobQueue methods for enqueueing, leasing, acknowledging and releasing jobs
+    def enqueue(self, league: str, match_date: str, data_type: str='league-standings'):
+        with closing(self._connect()) as connection:
+            connection.execute('INSERT INTO scrape_jobs (league, match_date, data_type, status, visible_at) VALUES (?, ?, ?, ?, ?) '
+                               'ON CONFLICT (league, match_date, data_type) DO UPDATE SET status = excluded.status, attempts = 0, lease_owner = NULL, visible_at = excluded.visible_at, last_error = NULL '
+                               'WHERE scrape_jobs.status = ?', (league, match_date, data_type, self.QUEUED, time(), self.FAILED))
+        self.file_logger.log_event_as_debug(f">>> Enqueued '{data_type}' job for '{league}' on {match_date} ...")
+
+
+    def lease(self, worker_id: str) -> Optional[ScrapeJob]:
+        now = time()
+        with closing(self._connect()) as connection:
+
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers can never lease the same job
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+
+                # Park the expired leases that already used up their attempts instead of handing them out again
+                connection.execute('UPDATE scrape_jobs SET status = ?, last_error = ? WHERE status = ? AND visible_at <= ? AND attempts >= ?', (self.FAILED, f'Lease expired {self.max_attempts} time(s) without an acknowledgement', self.LEASED, now, self.max_attempts))
+                row = connection.execute('SELECT job_id, league, match_date, data_type, attempts FROM scrape_jobs WHERE status IN (?, ?) AND visible_at <= ? ORDER BY visible_at, job_id LIMIT 1', (self.QUEUED, self.LEASED, now)).fetchone()
+                if row is None:
+                    connection.execute('COMMIT')
+                    return None
+
+                job_id, league, match_date, data_type, attempts = row
+                connection.execute('UPDATE scrape_jobs SET status = ?, lease_owner = ?, attempts = ?, visible_at = ? WHERE job_id = ?', (self.LEASED, worker_id, attempts + 1, now + self.visibility_timeout_seconds, job_id))
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+        return ScrapeJob(league=league, match_date=match_date, data_type=data_type, attempts=attempts + 1, receipt=str(job_id))
+
+
+    def acknowledge(self, job: ScrapeJob, worker_id: str):
+        with closing(self._connect()) as connection:
+            connection.execute('UPDATE scrape_jobs SET status = ?, last_error = NULL WHERE job_id = ? AND lease_owner = ?', (self.DONE, int(job.receipt), worker_id))
+
+
+    def release(self, job: ScrapeJob, worker_id: str, error: str, count_attempt: bool=True):
+        with closing(self._connect()) as connection:
+            if not count_attempt:
+                connection.execute('UPDATE scrape_jobs SET status = ?, attempts = attempts - 1, visible_at = ?, last_error = ? WHERE job_id = ? AND lease_owner = ?', (self.QUEUED, time(), str(error), int(job.receipt), worker_id))
+                return
+
+            status = self.FAILED if job.attempts >= self.max_attempts else self.QUEUED
+            connection.execute('UPDATE scrape_jobs SET status = ?, visible_at = ?, last_error = ? WHERE job_id = ? AND lease_owner = ?', (status, time() + self.retry_delay_seconds, str(error), int(job.receipt), worker_id))
+
+
+    def get_status_counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as connection:
+            return dict(connection.execute('SELECT status, COUNT(*) FROM scrape_jobs GROUP BY status').fetchall())
+
+
+# Set up a concrete SQSJobQueue class that inherits from IJobQueue
+class SQSJobQueue(IJobQueue):
+    """
+    Job queue backed by Amazon SQS for workers spread across several nodes. Leases map onto SQS visibility
+    timeouts and acknowledgements onto 'delete_message'. Jobs that keep failing should be moved aside by a
+    redrive policy (dead-letter queue) on the SQS queue itself. SQS cannot take back a receive, so a job released
+    with 'count_attempt=False' is only made visible again at once - its receive count still goes up.
+    """
+
+    def __init__(self, sqs_client, queue_url: str, visibility_timeout_seconds: int=600, retry_delay_seconds: int=60, wait_time_seconds: int=10, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.wait_time_seconds = wait_time_seconds
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement SQSJobQueue methods for enqueueing, leasing, acknowledging and releasing jobs
+    def enqueue(self, league: str, match_date: str, data_type: str='league-standings'):
+        self.sqs_client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps({'league': league, 'match_date': match_date, 'data_type': data_type}))
+        self.file_logger.log_event_as_debug(f">>> Enqueued '{data_type}' job for '{league}' on {match_date} ...")
+
+
+    def lease(self, worker_id: str) -> Optional[ScrapeJob]:
+        response = self.sqs_client.receive_message(QueueUrl=self.queue_url, MaxNumberOfMessages=1, VisibilityTimeout=self.visibility_timeout_seconds, WaitTimeSeconds=self.wait_time_seconds, AttributeNames=['ApproximateReceiveCount'])
+        messages = response.get('Messages', [])
+        if not messages:
+            return None
+
+        message = messages[0]
+        job_fields = json.loads(message['Body'])
+        return ScrapeJob(league=job_fields['league'], match_date=job_fields['match_date'], data_type=job_fields['data_type'], attempts=int(message['Attributes']['ApproximateReceiveCount']), receipt=message['ReceiptHandle'])
+
+
+    def acknowledge(self, job: ScrapeJob, worker_id: str):
+        self.sqs_client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=job.receipt)
+
+
+    def release(self, job: ScrapeJob, worker_id: str, error: str, count_attempt: bool=True):
+        self.sqs_client.change_message_visibility(QueueUrl=self.queue_url, ReceiptHandle=job.receipt, VisibilityTimeout=self.retry_delay_seconds if count_attempt else 0)
+
+
+
+# Set up a ScrapeJobWorker class that leases jobs from a queue and runs them with the existing ETL components
+class ScrapeJobWorker:
+    """
+    Leases jobs one at a time and runs each with the job runner registered for its data type. Once the run budget
+    is cancelled (SIGTERM/SIGINT) the worker stops leasing, and a job cut short by the cancellation is handed back
+    to the queue without counting the attempt, so a redeploy never pushes jobs towards 'failed'.
+    """
+
+    def __init__(self, job_queue: IJobQueue, job_runners: Dict[str, IScrapeJobRunner], worker_id: str=None, idle_sleep_seconds: float=5.0, max_idle_polls: Optional[int]=None, run_budget: RunBudget=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.job_queue = job_queue
+        self.job_runners = job_runners
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.idle_sleep_seconds = idle_sleep_seconds
+        self.max_idle_polls = max_idle_polls
+        self.run_budget = run_budget or RunBudget(total_seconds=None)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement ScrapeJobWorker method for running one leased job and acknowledging or releasing it
+    def run_job(self, job: ScrapeJob) -> str:
+        self.console_logger.log_event_as_debug(f">>> Worker '{self.worker_id}' running '{job.data_type}' job for '{job.league}' on {job.match_date} (attempt {job.attempts}) ...")
+        try:
+            job_runner = self.job_runners.get(job.data_type)
+            if job_runner is None:
+                raise ValueError(f"No job runner registered for data type '{job.data_type}'")
+
+            output_location, _ = job_runner.run_job(job.league, job.match_date)
+            if output_location is None:
+                raise IOError('Upload did not complete')
+
+        except RunCancelledError as e:
+            self.console_logger.log_event_as_warning(f">>> Worker '{self.worker_id}' handing back '{job.data_type}' job for '{job.league}' on {job.match_date}: {e}")
+            self.job_queue.release(job, self.worker_id, error=str(e), count_attempt=False)
+            return 'cancelled'
+
+        except Exception as e:
+            self.console_logger.log_event_as_error(f">>> Worker '{self.worker_id}' failed '{job.data_type}' job for '{job.league}' on {job.match_date}: {e}")
+            self.job_queue.release(job, self.worker_id, error=str(e))
+            return 'failed'
+
+        self.job_queue.acknowledge(job, self.worker_id)
+        return 'succeeded'
+
+
+    # Implement ScrapeJobWorker method for polling the queue until it stays empty for 'max_idle_polls' polls (or the run is cancelled)
+    def run(self) -> Counter:
+        job_outcomes = Counter()
+        idle_polls = 0
+
+        while self.max_idle_polls is None or idle_polls < self.max_idle_polls:
+            if self.run_budget.cancel_event.is_set():
+                break
+
+            job = self.job_queue.lease(self.worker_id)
+            if job is None:
+                idle_polls += 1
+                self.run_budget.cancel_event.wait(self.idle_sleep_seconds)
+                continue
+
+            idle_polls = 0
+            job_outcomes[self.run_job(job)] += 1
+
+        self.console_logger.log_event_as_info(f">>> Worker '{self.worker_id}' stopping after {sum(job_outcomes.values())} job(s): {dict(job_outcomes)}")
+        return job_outcomes
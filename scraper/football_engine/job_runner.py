@@ -0,0 +1,235 @@
+from __future__ import annotations
+import hashlib
+from typing import List, Optional, NamedTuple, Tuple
+import logging
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ResilientCaller
+from football_engine.profiler import StageProfiler
+from football_engine.webpage_loader import PremLeagueTableWebPageLoader
+from football_engine.popup_handler import PremLeagueTablePopUpHandler
+from football_engine.extractors import MultiTableDataExtractor, PremLeagueTableStandingsDataExtractor, TableExtractionSpec
+from football_engine.transformers import IDataTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.validators import IDataValidator, LeagueTableValidationError, LocalSnapshotQuarantine, TableStandingsDataValidator
+from football_engine.uploaders import IFileUploader
+from football_engine.cache import ISnapshotCache
+from football_engine.manifest import JSONFileJobManifest
+from football_engine.coordinator import RunBudget
+
+
+
+# ================================================ JOB RUNNER ================================================
+
+# Set up abstract base class for Scrape Job Runner that defines interface for running one (league, match date) unit
+class IScrapeJobRunner(ABC):
+    @abstractmethod
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+        pass
+
+
+# Set up a TwtdScrapeJobRunner class that inherits from IScrapeJobRunner and builds the twtd.co.uk table URLs
+class TwtdScrapeJobRunner(IScrapeJobRunner):
+    season_start_date: str
+    base_url: str = 'https://www.twtd.co.uk'
+
+    def get_url(self, league: str, match_date: str) -> str:
+        return f'{self.base_url}/league-tables/competition:{league}/daterange/fromdate:{self.season_start_date}/todate:{match_date}/type:home-and-away/'
+
+    @abstractmethod
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+        pass
+
+
+# Set up a concrete PremLeagueTableScrapeJobRunner class that inherits from TwtdScrapeJobRunner
+class PremLeagueTableScrapeJobRunner(TwtdScrapeJobRunner):
+    """
+    Runs the loader -> popup handler -> extractor -> transformer -> validator -> uploader chain for one match date.
+    The entry point's date loop and the queue workers both run their units through this class. The popup
+    handler and data extractor classes come from the league plugin, so other leagues reuse the same chain.
+
+    'run_job' returns the output location and content hash of the loaded snapshot; the output location is None
+    when the upload did not complete. Validation failures are retried by re-scraping the same date, and the last
+    failing snapshot is quarantined before the error is raised.
+    """
+
+    def __init__(self, webpage_loader: PremLeagueTableWebPageLoader, data_transformer: PremierLeagueTableStandingsDataTransformer, data_validator: TableStandingsDataValidator, snapshot_quarantine: LocalSnapshotQuarantine, data_uploader: IFileUploader, season_start_date: str, max_validation_attempts: int=3, warehouse_uploader: IFileUploader=None, snapshot_cache: ISnapshotCache=None, stage_profiler: StageProfiler=None, resilient_caller: ResilientCaller=None, run_budget: RunBudget=None,
+                 popup_handler_class: type=PremLeagueTablePopUpHandler, data_extractor_class: type=PremLeagueTableStandingsDataExtractor, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.webpage_loader = webpage_loader
+        self.data_transformer = data_transformer
+        self.data_validator = data_validator
+        self.snapshot_quarantine = snapshot_quarantine
+        self.data_uploader = data_uploader
+        self.season_start_date = season_start_date
+        self.max_validation_attempts = max_validation_attempts
+        self.warehouse_uploader = warehouse_uploader
+        self.snapshot_cache = snapshot_cache
+        self.stage_profiler = stage_profiler or StageProfiler(profile_folder=None, enabled=False)
+        self.resilient_caller = resilient_caller or webpage_loader.resilient_caller
+        self.run_budget = run_budget or RunBudget(total_seconds=None)
+        self.popup_handler_class = popup_handler_class
+        self.data_extractor_class = data_extractor_class
+        self.logger = logging.getLogger(__name__)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement PremLeagueTableScrapeJobRunner method for loading the page of one match date and extracting its table
+    def extract_snapshot(self, league: str, match_date: str, columnar: bool=False):
+        with self.stage_profiler.profile_stage('load_page'):
+            self.webpage_loader.load_page(self.get_url(league, match_date), deadline=self.run_budget.start_stage('load_page'))
+
+
+        # Close popup boxes if they appear on webpage
+        with self.stage_profiler.profile_stage('close_popup'):
+            popup_handler = self.popup_handler_class(self.webpage_loader.chrome_driver, self.logger, coloured_console_logs=self.coloured_console_logs, resilient_caller=self.resilient_caller)
+            popup_handler.close_popup(wait_seconds=self.run_budget.get_stage_timeout_seconds('close_popup', 5))
+
+
+        # Extract data (E)
+        with self.stage_profiler.profile_stage('extract'):
+            data_extractor = self.data_extractor_class(chrome_driver=self.webpage_loader.chrome_driver, match_date=match_date, coloured_console_logs=self.coloured_console_logs, resilient_caller=self.resilient_caller)
+            if columnar:
+                return data_extractor.scrape_columnar(deadline=self.run_budget.start_stage('extract'))
+            return data_extractor.scrape_data(deadline=self.run_budget.start_stage('extract'))
+
+
+    # Implement PremLeagueTableScrapeJobRunner method for transforming one extracted table
+    def transform_snapshot(self, scraped_content, match_date: str) -> pd.DataFrame:
+        self.run_budget.start_stage('transform')
+        with self.stage_profiler.profile_stage('transform'):
+            df = self.data_transformer.transform_data(scraped_content=scraped_content, match_date=match_date)
+        self.console_logger.log_event_as_debug(f'>>>>   Transformed {len(df)} row(s) for {match_date} ...')
+        return df
+
+
+    def validate_snapshot(self, df: pd.DataFrame, match_date: str) -> pd.DataFrame:
+        self.run_budget.start_stage('validate')
+        with self.stage_profiler.profile_stage('validate'):
+            return self.data_validator.validate_data(df, match_date=match_date)
+
+
+    # Implement PremLeagueTableScrapeJobRunner method for scraping and validating one match date (without loading it)
+    def scrape_snapshot(self, league: str, match_date: str) -> pd.DataFrame:
+
+        # Re-scrape only this date while its table fails validation, then quarantine it
+        for validation_attempt in range(1, self.max_validation_attempts + 1):
+            df = self.transform_snapshot(self.extract_snapshot(league, match_date), match_date=match_date)
+
+            # Validate data before it reaches any target location
+            try:
+                self.validate_snapshot(df, match_date=match_date)
+                break
+            except LeagueTableValidationError as validation_error:
+                if validation_attempt == self.max_validation_attempts:
+                    self.snapshot_quarantine.quarantine_snapshot(df, league, match_date, validation_error.failed_checks)
+                    raise
+
+        return df
+
+
+    # Implement PremLeagueTableScrapeJobRunner method for loading an already scraped snapshot into every target location
+    def load_snapshot(self, df: pd.DataFrame, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+
+        # Load data (L)
+        self.run_budget.start_stage('upload')
+        with self.stage_profiler.profile_stage('upload'):
+            output_location = self.data_uploader.upload_file(df, match_date=match_date)
+            if output_location is not None and self.warehouse_uploader is not None and self.warehouse_uploader.upload_file(df, match_date=match_date) is None:
+                output_location = None
+
+        if output_location is None:
+            return None, None
+
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.write_snapshot(df, match_date=match_date)
+
+        return output_location, JSONFileJobManifest.compute_content_hash(df)
+
+
+    # Implement PremLeagueTableScrapeJobRunner method for scraping, validating and loading one match date
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+        df = self.scrape_snapshot(league, match_date)
+        return self.load_snapshot(df, match_date=match_date)
+
+
+
+# Set up a TableExtractionRoute record that sends one extracted table to its own transformer and uploader
+class TableExtractionRoute(NamedTuple):
+    extraction_spec: TableExtractionSpec
+    data_transformer: IDataTransformer
+    data_uploader: IFileUploader
+    data_validator: Optional[IDataValidator] = None
+
+
+# Set up a concrete MultiTableScrapeJobRunner class that inherits from TwtdScrapeJobRunner
+class MultiTableScrapeJobRunner(TwtdScrapeJobRunner):
+    """
+    Loads a page once and pulls every routed table out of it in a single parse pass, then sends each table
+    through its own transformer, (optional) validator and uploader. Adding a data type that lives on the same
+    page adds a route, not another page load. Every stage is started on the run budget, as in the single-table runner.
+    """
+
+    def __init__(self, webpage_loader: PremLeagueTableWebPageLoader, extraction_routes: List[TableExtractionRoute], season_start_date: str, stage_profiler: StageProfiler=None, resilient_caller: ResilientCaller=None, run_budget: RunBudget=None,
+                 popup_handler_class: type=PremLeagueTablePopUpHandler, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.webpage_loader = webpage_loader
+        self.extraction_routes = extraction_routes
+        self.season_start_date = season_start_date
+        self.stage_profiler = stage_profiler or StageProfiler(profile_folder=None, enabled=False)
+        self.resilient_caller = resilient_caller or webpage_loader.resilient_caller
+        self.run_budget = run_budget or RunBudget(total_seconds=None)
+        self.popup_handler_class = popup_handler_class
+        self.logger = logging.getLogger(__name__)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement MultiTableScrapeJobRunner method for extracting and routing every table from one page load
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[List[str]], Optional[str]]:
+        with self.stage_profiler.profile_stage('load_page'):
+            self.webpage_loader.load_page(self.get_url(league, match_date), deadline=self.run_budget.start_stage('load_page'))
+
+        with self.stage_profiler.profile_stage('close_popup'):
+            popup_handler = self.popup_handler_class(self.webpage_loader.chrome_driver, self.logger, coloured_console_logs=self.coloured_console_logs, resilient_caller=self.resilient_caller)
+            popup_handler.close_popup(wait_seconds=self.run_budget.get_stage_timeout_seconds('close_popup', 5))
+
+        # The single parse pass has no waits of its own, so the budget is only checked before it starts
+        self.run_budget.start_stage('extract')
+        with self.stage_profiler.profile_stage('extract'):
+            data_extractor = MultiTableDataExtractor([extraction_route.extraction_spec for extraction_route in self.extraction_routes], chrome_driver=self.webpage_loader.chrome_driver, coloured_console_logs=self.coloured_console_logs)
+            scraped_tables = data_extractor.scrape_data()
+
+        output_locations = []
+        content_hash = hashlib.sha256()
+        for extraction_route in self.extraction_routes:
+            data_type = extraction_route.extraction_spec.data_type
+            if data_type not in scraped_tables:
+                raise ValueError(f"Table for '{data_type}' was not found on the page for {match_date}")
+
+            self.run_budget.start_stage('transform')
+            with self.stage_profiler.profile_stage('transform'):
+                df = extraction_route.data_transformer.transform_data(scraped_content=scraped_tables[data_type], match_date=match_date)
+
+            if extraction_route.data_validator is not None:
+                self.run_budget.start_stage('validate')
+                with self.stage_profiler.profile_stage('validate'):
+                    extraction_route.data_validator.validate_data(df, match_date=match_date)
+
+            self.run_budget.start_stage('upload')
+            with self.stage_profiler.profile_stage('upload'):
+                output_location = extraction_route.data_uploader.upload_file(df, match_date=match_date)
+            if output_location is None:
+                return None, None
+
+            output_locations.append(output_location)
+            content_hash.update(JSONFileJobManifest.compute_content_hash(df).encode())
+
+        return output_locations, content_hash.hexdigest()
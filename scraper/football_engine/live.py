@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import List, Dict, Optional
+from datetime import datetime
+from collections import Counter
+from time import monotonic
+from football_engine.dependencies import webdriver
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.webpage_loader import PremLeagueTableWebPageLoader
+from football_engine.extractors import StandingsColumnarBatch
+from football_engine.transformers import IDataTransformer
+from football_engine.streaming import IStreamingFileWriter
+from football_engine.uploaders import IFileUploader
+from football_engine.coordinator import RunBudget
+
+
+
+# ================================================ LIVE MODE ================================================
+
+# Set up a LiveTableObserver class that watches the league table inside the page instead of reloading it
+class LiveTableObserver:
+    """
+    Installs a MutationObserver on the table element. Every burst of DOM changes is debounced in the page
+    ('debounce_seconds' after the last change) and then published as one snapshot of every row's cell text.
+    'wait_for_snapshots' long-polls for those snapshots with an async script, so the browser does the watching
+    and Python only wakes up when the table has actually changed.
+
+    The observer takes the web page loader rather than its driver and only asks it for the browser when a
+    script is first run, so building an observer never starts Chrome.
+    """
+
+    INSTALL_SCRIPT = '''
+        const tableClass = arguments[0], debounceMs = arguments[1];
+        const table = document.getElementsByClassName(tableClass)[0];
+        if (!table) { return false; }
+        if (window.__liveTable) { window.__liveTable.observer.disconnect(); }
+
+        const state = {snapshots: [], timer: null, waiter: null, sequence: 0};
+        const readRows = () => Array.from(table.querySelectorAll('tr')).map(
+            row => Array.from(row.querySelectorAll('td')).map(cell => cell.innerText.replace(/\\u00a0/g, ' ').trim() || ' '));
+        const publish = () => {
+            state.timer = null;
+            state.sequence += 1;
+            state.snapshots.push({sequence: state.sequence, rows: readRows()});
+            if (state.snapshots.length > 50) { state.snapshots.shift(); }
+            if (state.waiter) { const waiter = state.waiter; state.waiter = null; waiter(state.snapshots.splice(0)); }
+        };
+        state.readRows = readRows;
+        state.observer = new MutationObserver(() => { clearTimeout(state.timer); state.timer = setTimeout(publish, debounceMs); });
+        state.observer.observe(table, {subtree: true, childList: true, characterData: true});
+        window.__liveTable = state;
+        return true;
+    '''
+
+    WAIT_SCRIPT = '''
+        const waitMs = arguments[0], done = arguments[arguments.length - 1];
+        const state = window.__liveTable;
+        if (!state) { done(null); return; }
+        if (state.snapshots.length) { done(state.snapshots.splice(0)); return; }
+        state.waiter = done;
+        setTimeout(() => { if (state.waiter === done) { state.waiter = null; done([]); } }, waitMs);
+    '''
+
+    def __init__(self, webpage_loader: PremLeagueTableWebPageLoader, table_class: str='leaguetable', debounce_seconds: float=2.0, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.webpage_loader = webpage_loader
+        self.table_class = table_class
+        self.debounce_seconds = debounce_seconds
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @property
+    def chrome_driver(self) -> webdriver.Chrome:
+        return self.webpage_loader.chrome_driver
+
+
+    def install(self) -> bool:
+        installed = self.chrome_driver.execute_script(self.INSTALL_SCRIPT, self.table_class, int(self.debounce_seconds * 1000))
+        self.console_logger.log_event_as_debug(f">>> Live table observer {'installed' if installed else 'could not find the table'} on '.{self.table_class}' ...")
+        return bool(installed)
+
+
+    def read_rows(self) -> List[List[str]]:
+        return self.chrome_driver.execute_script('return window.__liveTable ? window.__liveTable.readRows() : null;') or []
+
+
+    # Block for up to 'timeout_seconds' - returns the debounced snapshots (oldest first), or None if the observer is gone
+    def wait_for_snapshots(self, timeout_seconds: float) -> Optional[List[List[List[str]]]]:
+        self.chrome_driver.set_script_timeout(timeout_seconds + 10)
+        snapshots = self.chrome_driver.execute_async_script(self.WAIT_SCRIPT, int(timeout_seconds * 1000))
+        if snapshots is None:
+            return None
+        return [snapshot['rows'] for snapshot in snapshots]
+
+
+
+# Set up a LiveTableStreamer class that pushes only the changed rows of a live table through the transformer and sinks
+class LiveTableStreamer:
+    """
+    Keeps one page open for the whole match day. Each observed snapshot is compared row by row (keyed on team)
+    with the last one pushed, and only the rows that changed are transformed - with an 'observed_at' timestamp -
+    and handed to the sinks: appended to the streaming writers (flushed straight away, so consumers see each
+    update as it happens) and upserted into the warehouse.
+
+    If the site does not update the table in place, nothing is observed; after 'refresh_seconds' without a
+    change the page is reloaded and the observer re-installed, so the same diffing still applies.
+    """
+
+    def __init__(self, webpage_loader: PremLeagueTableWebPageLoader, table_observer: LiveTableObserver, data_transformer: IDataTransformer, football_url: str, match_date: str, streaming_writers: List[IStreamingFileWriter],
+                 warehouse_uploader: IFileUploader=None, refresh_seconds: Optional[float]=300.0, run_budget: RunBudget=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.webpage_loader = webpage_loader
+        self.table_observer = table_observer
+        self.data_transformer = data_transformer
+        self.football_url = football_url
+        self.match_date = match_date
+        self.streaming_writers = streaming_writers
+        self.warehouse_uploader = warehouse_uploader
+        self.refresh_seconds = refresh_seconds
+        self.run_budget = run_budget or RunBudget(total_seconds=None)
+        self.pushed_rows: Dict[str, List[str]] = {}
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Keep the header and only the rows whose cells differ from the last pushed version of that team's row
+    def get_changed_rows(self, scraped_rows: List[List[str]]) -> List[List[str]]:
+        if not scraped_rows:
+            return []
+
+        header = scraped_rows[0]
+        team_position = header.index('Team') if 'Team' in header else 1
+        changed_rows = [row for row in scraped_rows[1:] if row and self.pushed_rows.get(row[team_position]) != row]
+        return [header] + changed_rows if changed_rows else []
+
+
+    # Implement LiveTableStreamer method for transforming and pushing the changed rows of one snapshot
+    def push_snapshot(self, scraped_rows: List[List[str]]) -> int:
+        changed_rows = self.get_changed_rows(scraped_rows)
+        if not changed_rows:
+            return 0
+
+        changed_df = self.data_transformer.transform_data(StandingsColumnarBatch.from_scraped_content(changed_rows), match_date=self.match_date)
+        changed_df['observed_at'] = datetime.now().isoformat(timespec='seconds')
+
+        for streaming_writer in self.streaming_writers:
+            streaming_writer.write_chunk(changed_df)
+            streaming_writer.flush()
+        if self.warehouse_uploader is not None:
+            self.warehouse_uploader.upload_file(changed_df.drop(columns=['observed_at']), match_date=self.match_date)
+
+        team_position = changed_rows[0].index('Team') if 'Team' in changed_rows[0] else 1
+        self.pushed_rows.update({row[team_position]: row for row in changed_rows[1:]})
+        self.console_logger.log_event_as_info(f'>>> Live update: pushed {len(changed_rows) - 1} changed row(s) for {self.match_date} ...')
+        return len(changed_rows) - 1
+
+
+    def _reload_page(self):
+        self.webpage_loader.load_page(self.football_url, deadline=self.run_budget.start_stage('load_page'))
+        if not self.table_observer.install():
+            raise ValueError(f"No '.{self.table_observer.table_class}' table found on '{self.football_url}'")
+
+
+    # Implement LiveTableStreamer method for following the table until 'duration_seconds' have passed
+    def run(self, duration_seconds: float, poll_seconds: float=30.0) -> Counter:
+        live_outcomes = Counter()
+        stop_at = monotonic() + duration_seconds
+        last_change_at = monotonic()
+
+        self._reload_page()
+        live_outcomes['rows_pushed'] += self.push_snapshot(self.table_observer.read_rows())
+
+        while monotonic() < stop_at:
+            self.run_budget.start_stage('live_update')
+            snapshots = self.table_observer.wait_for_snapshots(min(poll_seconds, max(0.0, stop_at - monotonic())))
+
+            # The observer only disappears if the page navigated away - re-install it on a fresh load
+            if snapshots is None:
+                live_outcomes['reinstalls'] += 1
+                self._reload_page()
+                continue
+
+            # Debounced snapshots can queue up while a push is running - only the latest one matters
+            if snapshots:
+                live_outcomes['snapshots'] += len(snapshots)
+                rows_pushed = self.push_snapshot(snapshots[-1])
+                live_outcomes['rows_pushed'] += rows_pushed
+                if rows_pushed:
+                    live_outcomes['updates'] += 1
+                    last_change_at = monotonic()
+
+            if self.refresh_seconds is not None and monotonic() - last_change_at >= self.refresh_seconds:
+                live_outcomes['refreshes'] += 1
+                self._reload_page()
+                live_outcomes['rows_pushed'] += self.push_snapshot(self.table_observer.read_rows())
+                last_change_at = monotonic()
+
+        self.console_logger.log_event_as_info(f'>>> Live mode finished for {self.match_date}: {dict(live_outcomes)}')
+        return live_outcomes
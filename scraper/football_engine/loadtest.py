@@ -0,0 +1,422 @@
+from __future__ import annotations
+import io
+import os
+import re
+import csv
+import html
+import json
+import queue
+import random
+import hashlib
+import resource
+import tempfile
+import threading
+from typing import List, Dict, Optional, Tuple
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, perf_counter
+from pathlib import Path
+from football_engine.dependencies import webdriver
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ConcurrencyController, ResilientCaller
+from football_engine.validators import LocalSnapshotQuarantine
+from football_engine.sinks import S3SnapshotSink
+from football_engine.uploaders import MultiSinkFileUploader
+from football_engine.job_runner import IScrapeJobRunner
+from football_engine.registry import league_registry
+
+
+
+# ================================================ LOAD TEST ================================================
+
+# Set up an InMemoryS3Client class that stands in for the boto3 S3 client in load tests and local checks
+class InMemoryS3Client:
+    """
+    Keeps objects in a dict behind a lock and implements the subset of the boto3 S3 client API the uploaders
+    and streaming writers use (put/get/list/delete objects and multipart uploads), so the S3 code paths can be
+    exercised end to end without an AWS account or network calls.
+    """
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.multipart_uploads: Dict[str, Dict[int, bytes]] = {}
+        self.request_counts = Counter()
+        self.lock = threading.Lock()
+
+
+    @staticmethod
+    def _to_bytes(body) -> bytes:
+        if isinstance(body, str):
+            return body.encode('utf-8')
+        if hasattr(body, 'read'):
+            return body.read()
+        return bytes(body)
+
+
+    def put_object(self, Bucket: str, Key: str, Body, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['put_object'] += 1
+            self.objects[(Bucket, Key)] = self._to_bytes(Body)
+        return {'ETag': f'"{hashlib.md5(self.objects[(Bucket, Key)]).hexdigest()}"'}
+
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['get_object'] += 1
+            if (Bucket, Key) not in self.objects:
+                raise KeyError(f'NoSuchKey: s3://{Bucket}/{Key}')
+            body = self.objects[(Bucket, Key)]
+        return {'Body': io.BytesIO(body), 'ContentLength': len(body)}
+
+
+    def list_objects_v2(self, Bucket: str, Prefix: str='', ContinuationToken: str=None, MaxKeys: int=1000, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['list_objects_v2'] += 1
+            keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+            start_index = int(ContinuationToken or 0)
+            page_keys = keys[start_index:start_index + MaxKeys]
+            response = {'Contents': [{'Key': key, 'Size': len(self.objects[(Bucket, key)])} for key in page_keys], 'KeyCount': len(page_keys), 'IsTruncated': start_index + MaxKeys < len(keys)}
+        if response['IsTruncated']:
+            response['NextContinuationToken'] = str(start_index + MaxKeys)
+        return response
+
+
+    def delete_objects(self, Bucket: str, Delete: Dict, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['delete_objects'] += 1
+            for deleted_object in Delete['Objects']:
+                self.objects.pop((Bucket, deleted_object['Key']), None)
+        return {'Deleted': Delete['Objects']}
+
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['create_multipart_upload'] += 1
+            upload_id = f'upload-{len(self.multipart_uploads) + 1}'
+            self.multipart_uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body, **kwargs) -> Dict:
+        part_bytes = self._to_bytes(Body)
+        with self.lock:
+            self.request_counts['upload_part'] += 1
+            self.multipart_uploads[UploadId][PartNumber] = part_bytes
+        return {'ETag': f'"{hashlib.md5(part_bytes).hexdigest()}"'}
+
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['complete_multipart_upload'] += 1
+            parts = self.multipart_uploads.pop(UploadId)
+            self.objects[(Bucket, Key)] = b''.join(parts[part['PartNumber']] for part in MultipartUpload['Parts'])
+        return {'Bucket': Bucket, 'Key': Key}
+
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> Dict:
+        with self.lock:
+            self.request_counts['abort_multipart_upload'] += 1
+            self.multipart_uploads.pop(UploadId, None)
+        return {}
+
+
+
+# Set up a ReplayPageServer class that serves recorded league table pages from a local HTTP server
+class ReplayPageServer:
+    """
+    Serves one recorded page per match date on 127.0.0.1, under the same '/league-tables/.../todate:<date>/...'
+    paths the job runners request from twtd.co.uk. Every response is delayed by 'latency_seconds' +/- a uniform
+    'jitter_seconds', a fraction ('error_rate') of requests fail with a 503, and a fraction ('popup_rate') of
+    pages rendered from CSV snapshots get the cookie popup injected where the popup handler looks for it.
+
+    Pages come either from saved '<match date>.html' page sources or are rendered from the CSV snapshots in
+    'temp_storage/dirty_data', which keep the real column layout (spacer columns and repeated home/away headers).
+    """
+
+    POPUP_HTML = ('<div id="cookie-popup"><div></div><div><div><div>'
+                  '<button onclick="document.getElementById(\'cookie-popup\').remove()"><i>x</i></button>'
+                  '</div></div></div></div>')
+
+    def __init__(self, recorded_pages: Dict[str, str], latency_seconds: float=0.0, jitter_seconds: float=0.0, error_rate: float=0.0, popup_rate: float=0.0, seed: int=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.recorded_pages = recorded_pages
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.popup_rate = popup_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.response_counts = Counter()
+        self.http_server = None
+        self.server_thread = None
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.http_server.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+    @staticmethod
+    def load_recorded_pages(pages_path: str) -> Dict[str, str]:
+        return {page_path.stem: page_path.read_text(encoding='utf-8') for page_path in sorted(Path(pages_path).glob('*.html'))}
+
+
+    # Render a twtd-style page (header row as <td> cells, blank spacer cells) around the rows of one table
+    @staticmethod
+    def render_table_page(table_rows: List[List[str]], league_title: str='Premier League') -> str:
+        table_html = ''.join('<tr>' + ''.join(f'<td>{html.escape(cell) if cell.strip() else "&nbsp;"}</td>' for cell in table_row) + '</tr>\n' for table_row in table_rows)
+        return (f'<!DOCTYPE html>\n<html><head><title>{league_title} Table | TWTD</title></head><body>\n'
+                f'<div>header</div><div><table class="leaguetable">\n{table_html}</table></div>'
+                f'<div></div><div></div><div></div><div></div><div></div>\n<!-- popup -->\n</body></html>')
+
+
+    @staticmethod
+    def render_pages_from_csv_folder(csv_folder: str, league_title: str='Premier League') -> Dict[str, str]:
+        rendered_pages = {}
+        for csv_path in sorted(Path(csv_folder).glob('*.csv')):
+            with open(csv_path, newline='', encoding='utf-8') as csv_file:
+                csv_rows = list(csv.reader(csv_file))
+
+            match_date_position = csv_rows[0].index('match_date')
+            match_date = csv_rows[1][match_date_position]
+            table_rows = [[cell for position, cell in enumerate(csv_row) if position != match_date_position] for csv_row in csv_rows]
+            rendered_pages[match_date] = ReplayPageServer.render_table_page(table_rows, league_title=league_title)
+        return rendered_pages
+
+
+    def _draw(self) -> float:
+        with self.random_lock:
+            return self.random.random()
+
+
+    def _get_response(self, request_path: str) -> Tuple[int, str]:
+        delay_seconds = max(0.0, self.latency_seconds + (self._draw() * 2 - 1) * self.jitter_seconds)
+        sleep(delay_seconds)
+
+        if self._draw() < self.error_rate:
+            return 503, '<html><head><title>503 Service Unavailable</title></head><body></body></html>'
+
+        match_date = re.search(r'todate:([^/]+)', request_path)
+        page = self.recorded_pages.get(match_date.group(1)) if match_date else None
+        if page is None:
+            return 404, '<html><head><title>404 Not Found</title></head><body></body></html>'
+
+        if '<!-- popup -->' in page and self._draw() < self.popup_rate:
+            page = page.replace('<!-- popup -->', self.POPUP_HTML)
+        return 200, page
+
+
+    # Start serving on a free local port in a background thread
+    def start(self) -> str:
+        replay_server = self
+
+        class ReplayRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status_code, page = replay_server._get_response(self.path)
+                with replay_server.random_lock:
+                    replay_server.response_counts[status_code] += 1
+
+                page_bytes = page.encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(page_bytes)))
+                self.end_headers()
+                self.wfile.write(page_bytes)
+
+            def log_message(self, format, *args):
+                replay_server.file_logger.log_event_as_debug(f'>>> Replay server: {format % args}')
+
+        self.http_server = ThreadingHTTPServer(('127.0.0.1', 0), ReplayRequestHandler)
+        self.server_thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.console_logger.log_event_as_debug(f'>>> Replay server serving {len(self.recorded_pages)} page(s) on {self.base_url} ...')
+        return self.base_url
+
+
+    def stop(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.server_thread.join()
+            self.http_server = None
+
+
+
+# Set up a LoadTestHarness class that drives the full pipeline against the replay server at increasing concurrency
+class LoadTestHarness:
+    """
+    For every concurrency level, starts that many workers - each with its own headless browser and job runner -
+    and runs 'jobs_per_level' (league, match date) units through loader -> popup handler -> extractor ->
+    transformer -> validator -> S3 uploader, with the pages coming from the replay server and the snapshots going
+    to an in-memory S3 stand-in. Each level reports throughput, p50/p99 job latency, failures and resource use.
+
+    CPU time and peak RSS come from getrusage for this process and its reaped children (browser sessions count
+    once they quit at the end of the level). When psutil is installed, the RSS of the whole process tree,
+    including the running browsers, is also sampled during the level.
+
+    With 'adaptive_concurrency=True' each level's concurrency is only the ceiling: page loads and uploads go
+    through ConcurrencyControllers that start at one call at a time and move within that ceiling, and the
+    final limits and every decision are added to the level's report.
+    """
+
+    def __init__(self, replay_server: ReplayPageServer, league: str, season_start_date: str, match_dates: List[str], concurrency_levels: List[int], jobs_per_level: int, s3_client: InMemoryS3Client=None, s3_bucket: str='load-test',
+                 adaptive_concurrency: bool=False, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.replay_server = replay_server
+        self.league = league
+        self.season_start_date = season_start_date
+        self.match_dates = match_dates
+        self.concurrency_levels = concurrency_levels
+        self.jobs_per_level = jobs_per_level
+        self.adaptive_concurrency = adaptive_concurrency
+        self.s3_client = s3_client or InMemoryS3Client()
+        self.s3_bucket = s3_bucket
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @staticmethod
+    def get_percentile(sorted_values: List[float], percentile: float) -> Optional[float]:
+        if not sorted_values:
+            return None
+        return sorted_values[min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))]
+
+
+    # Build one worker's pipeline - the same plugin components the entry point uses, pointed at the local stand-ins
+    def build_job_runner(self, concurrency: int, quarantine_path: str, page_load_controller: ConcurrencyController=None, upload_controller: ConcurrencyController=None) -> IScrapeJobRunner:
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+
+        resilient_caller = ResilientCaller(base_delay_seconds=0.1, max_delay_seconds=1.0, coloured_console_logs=self.coloured_console_logs)
+        league_plugin = league_registry.get(self.league)
+        webpage_loader = league_plugin.webpage_loader(options=chrome_options, webpage_title=league_plugin.title_check, resilient_caller=resilient_caller, concurrency_controller=page_load_controller)
+        data_uploader = MultiSinkFileUploader(sinks=[S3SnapshotSink(s3_client=self.s3_client, s3_bucket=self.s3_bucket, s3_folder=f'concurrency_{concurrency}', file_name=league_plugin.file_name, resilient_caller=resilient_caller, concurrency_controller=upload_controller)])
+
+        job_runner = league_plugin.job_runner(webpage_loader=webpage_loader, data_transformer=league_plugin.data_transformer(), data_validator=league_plugin.data_validator(),
+                                              snapshot_quarantine=LocalSnapshotQuarantine(quarantine_path=quarantine_path, file_name=league_plugin.file_name), data_uploader=data_uploader, season_start_date=self.season_start_date, resilient_caller=resilient_caller,
+                                              popup_handler_class=league_plugin.popup_handler, data_extractor_class=league_plugin.data_extractor)
+        job_runner.base_url = self.replay_server.base_url
+        return job_runner
+
+
+    @staticmethod
+    def sample_process_tree_rss(stop_event: threading.Event, rss_samples: List[int], interval_seconds: float=0.5):
+        try:
+            import psutil
+        except ImportError:
+            return
+
+        process = psutil.Process()
+        while not stop_event.wait(interval_seconds):
+            try:
+                rss_samples.append(sum(tree_process.memory_info().rss for tree_process in [process] + process.children(recursive=True)))
+            except psutil.Error:
+                continue
+
+
+    # Implement LoadTestHarness method for running every job of one concurrency level and measuring it
+    def run_level(self, concurrency: int) -> Dict:
+        job_queue = queue.Queue()
+        for job_number in range(self.jobs_per_level):
+            job_queue.put(self.match_dates[job_number % len(self.match_dates)])
+
+        job_latencies, job_errors = [], Counter()
+        results_lock = threading.Lock()
+        quarantine_path = tempfile.mkdtemp(prefix='load-test-quarantine-')
+
+        concurrency_controllers = {}
+        if self.adaptive_concurrency:
+            concurrency_controllers = {controller_name: ConcurrencyController(name=controller_name, initial_limit=1, max_limit=concurrency, adjust_interval_seconds=2.0, coloured_console_logs=self.coloured_console_logs)
+                                       for controller_name in ('page_loads', 'uploads')}
+
+        def run_worker():
+            job_runner = self.build_job_runner(concurrency, quarantine_path, page_load_controller=concurrency_controllers.get('page_loads'), upload_controller=concurrency_controllers.get('uploads'))
+            try:
+                while True:
+                    try:
+                        match_date = job_queue.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    started_at = perf_counter()
+                    try:
+                        output_location, _ = job_runner.run_job(self.league, match_date)
+                        error = None if output_location is not None else 'UploadIncomplete'
+                    except Exception as e:
+                        error = type(e).__name__
+
+                    with results_lock:
+                        if error is None:
+                            job_latencies.append(perf_counter() - started_at)
+                        else:
+                            job_errors[error] += 1
+            finally:
+                job_runner.webpage_loader.quit()
+
+        rss_samples, stop_event = [], threading.Event()
+        rss_sampler = threading.Thread(target=self.sample_process_tree_rss, args=(stop_event, rss_samples), daemon=True)
+        usage_before = [resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)]
+        started_at = perf_counter()
+
+        rss_sampler.start()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for worker_future in [executor.submit(run_worker) for _ in range(concurrency)]:
+                worker_future.result()
+        stop_event.set()
+        rss_sampler.join()
+
+        elapsed_seconds = perf_counter() - started_at
+        usage_after = [resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)]
+        cpu_seconds = sum((after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime) for before, after in zip(usage_before, usage_after))
+        sorted_latencies = sorted(job_latencies)
+
+        level_report = {
+            'concurrency':              concurrency,
+            'jobs':                     self.jobs_per_level,
+            'succeeded':                len(job_latencies),
+            'failed':                   dict(job_errors),
+            'elapsed_seconds':          round(elapsed_seconds, 3),
+            'throughput_jobs_per_sec':  round(len(job_latencies) / elapsed_seconds, 3),
+            'p50_latency_seconds':      self.get_percentile(sorted_latencies, 50),
+            'p99_latency_seconds':      self.get_percentile(sorted_latencies, 99),
+            'cpu_seconds':              round(cpu_seconds, 3),
+            'peak_rss_kib':             max(usage_after[0].ru_maxrss, usage_after[1].ru_maxrss),
+            'peak_tree_rss_kib':        max(rss_samples) // 1024 if rss_samples else None,
+        }
+        if concurrency_controllers:
+            level_report['adaptive_limits'] = {controller_name: controller.limit for controller_name, controller in concurrency_controllers.items()}
+            level_report['concurrency_decisions'] = [decision for controller in concurrency_controllers.values() for decision in controller.decisions]
+        return level_report
+
+
+    # Implement LoadTestHarness method for running every concurrency level and writing the report
+    def run(self, report_path: str) -> List[Dict]:
+        level_reports = []
+        for concurrency in self.concurrency_levels:
+            self.console_logger.log_event_as_info(f'>>> Load test: running {self.jobs_per_level} job(s) at concurrency {concurrency} ...')
+            level_report = self.run_level(concurrency)
+            level_reports.append(level_report)
+            self.console_logger.log_event_as_info(f">>> Load test: concurrency {concurrency} -> {level_report['throughput_jobs_per_sec']} jobs/s, p50 {level_report['p50_latency_seconds']}s, p99 {level_report['p99_latency_seconds']}s, "
+                                                  f"{level_report['succeeded']}/{level_report['jobs']} succeeded, {level_report['cpu_seconds']} CPU s, peak RSS {level_report['peak_rss_kib']} KiB")
+
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, 'w') as report_file:
+            json.dump({'replay_server': {'latency_seconds': self.replay_server.latency_seconds, 'jitter_seconds': self.replay_server.jitter_seconds, 'error_rate': self.replay_server.error_rate, 'popup_rate': self.replay_server.popup_rate,
+                                         'responses': dict(self.replay_server.response_counts)},
+                       's3_requests': dict(self.s3_client.request_counts),
+                       'levels': level_reports}, report_file, indent=2)
+
+        self.console_logger.log_event_as_info(f">>> Load test: wrote report to '{report_path}' ...")
+        return level_reports
@@ -0,0 +1,190 @@
+from __future__ import annotations
+import os
+import sys
+from pathlib import Path
+import logging, coloredlogs
+from abc import ABC, abstractmethod
+
+
+
+# ================================================ LOGGER ================================================
+
+# Name the log file after the script that runs the engine ('scraper-oop', 'scraper-fp', ...)
+ENTRY_POINT_NAME = Path(sys.argv[0]).stem if sys.argv and sys.argv[0].endswith('.py') else 'football_engine'
+
+
+# Set up abstract base class for Logger that defines interface for logging events 
+class ILogger(ABC):
+
+    # Define abstract methods to be implemented in child classes
+    @abstractmethod
+    def log_event_as_debug(self, message: str):
+        pass
+
+    @abstractmethod
+    def log_event_as_info(self, message: str):
+        pass
+
+    @abstractmethod
+    def log_event_as_warning(self, message: str):
+        pass
+    
+    @abstractmethod
+    def log_event_as_critical(self, message: str):
+        pass
+    
+    @abstractmethod
+    def log_event_as_error(self, message: str):
+        pass
+
+
+# Set up a concrete FileLogger class that inherits from ILogger
+class FileLogger(ILogger):
+    def __init__(self, local_filepath: str = ENTRY_POINT_NAME, log_format: str='%(asctime)s | %(process)d | %(levelname)s | %(message)s', level=logging.DEBUG):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(level)
+
+        # Append (never truncate) so overlapping or consecutive runs keep each other's logs, and attach one handler per file
+        log_path = os.path.abspath('logs/scraper/' +  local_filepath + '.log')
+        existing_handlers = [handler for handler in self.logger.handlers if isinstance(handler, logging.FileHandler) and handler.baseFilename == log_path]
+        if existing_handlers:
+            self.file_handler = existing_handlers[0]
+            return
+
+        self.file_handler = logging.FileHandler(log_path, mode='a')
+        self.file_handler.setLevel(level)
+        self.formatter = logging.Formatter(log_format)
+        self.file_handler.setFormatter(self.formatter)
+        self.logger.addHandler(self.file_handler)
+        
+
+    # Implement FileLogger methods to log events for different severity levels 
+    def log_event_as_debug(self, message: str):
+        self.logger.debug(message)
+
+    def log_event_as_info(self, message: str):
+        self.logger.info(message)
+
+    def log_event_as_warning(self, message: str):
+        self.logger.warning(message)
+
+    def log_event_as_critical(self, message: str):
+        self.logger.critical(message)
+    
+    def log_event_as_error(self, message: str):
+        self.logger.error(message)
+
+
+# Set up a concrete ConsoleLogger class that inherits from ILogger
+class ConsoleLogger(ILogger):
+
+    # Every engine component builds its own console logger on the same logging.Logger, so they share one console handler
+    @staticmethod
+    def get_console_handler(logger: logging.Logger):
+        return next((handler for handler in logger.handlers if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler)), None)
+
+    # Define abstract methods to be implemented in child classes
+    @abstractmethod
+    def log_event_as_debug(self, message: str):
+        pass
+
+    @abstractmethod
+    def log_event_as_info(self, message: str):
+        pass
+
+    @abstractmethod
+    def log_event_as_warning(self, message: str):
+        pass
+    
+    @abstractmethod
+    def log_event_as_critical(self, message: str):
+        pass
+    
+    @abstractmethod
+    def log_event_as_error(self, message: str):
+        pass
+
+
+# Set up a concrete ColouredConsoleLogger class that inherits from ConsoleLogger 
+class ColouredConsoleLogger(ConsoleLogger):
+    def __init__(self, coloured: bool =True, level=logging.DEBUG):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(level)
+        self.coloured = coloured
+        self.console_handler = self.get_console_handler(self.logger)
+        if self.console_handler is not None:
+            return
+
+        self.console_handler = logging.StreamHandler()
+        self.console_formatter = coloredlogs.ColoredFormatter(fmt    =   '%(message)s', level_styles=dict(
+                                                                                                debug           =   dict    (color  =   'white'),
+                                                                                                info            =   dict    (color  =   'green'),
+                                                                                                warning         =   dict    (color  =   'cyan'),
+                                                                                                error           =   dict    (color  =   'red',      bold    =   True,   bright      =   True),
+                                                                                                critical        =   dict    (color  =   'black',    bold    =   True,   background  =   'red')
+                                                                                            ),
+
+                                                                                    field_styles=dict(
+                                                                                        messages            =   dict    (color  =   'white')
+                                                                                    )
+                                                                                    )
+        self.console_handler.setFormatter(self.console_formatter)
+        self.logger.addHandler(self.console_handler)
+
+        
+    # Implement ColouredConsoleLogger methods to log events for different severity levels 
+    def log_event_as_debug(self, message: str):
+        self.logger.debug(message)
+        
+    def log_event_as_info(self, message: str):
+        self.logger.info(message)
+
+    def log_event_as_warning(self, message: str):
+        self.logger.warning(message)
+
+    def log_event_as_critical(self, message: str):
+        self.logger.critical(message)
+    
+    def log_event_as_error(self, message: str):
+        self.logger.error(message)
+
+
+
+# Set up a concrete NonColouredConsoleLogger class that inherits from ConsoleLogger  
+class NonColouredConsoleLogger(ConsoleLogger):
+    def __init__(self, detailed_logs: bool= False, level=logging.DEBUG):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(level)
+        self.detailed_logs = detailed_logs
+        self.console_handler = self.get_console_handler(self.logger)
+        if self.console_handler is not None:
+            return
+
+        self.console_handler = logging.StreamHandler()
+        self.logger.addHandler(self.console_handler)
+        if self.detailed_logs:
+            detailed_log_format: str='%(asctime)s | %(levelname)s | %(message)s'
+            self.console_formatter = logging.Formatter(detailed_log_format)
+            self.console_handler.setFormatter(self.console_formatter)
+        else:
+            simple_log_format: str='%(message)s'
+            self.console_formatter = logging.Formatter(simple_log_format)
+            self.console_handler.setFormatter(self.console_formatter)
+        
+
+    # Implement NonColouredConsoleLogger methods to log events for different severity levels 
+    def log_event_as_debug(self, message: str):
+        self.logger.debug(message)
+        
+    def log_event_as_info(self, message: str):
+        self.logger.info(message)
+
+    def log_event_as_warning(self, message: str):
+        self.logger.warning(message)
+
+    def log_event_as_critical(self, message: str):
+        self.logger.critical(message)
+    
+    def log_event_as_error(self, message: str):
+        self.logger.error(message)
+ 
@@ -0,0 +1,162 @@
+from __future__ import annotations
+import io
+import os
+import json
+import hashlib
+import tempfile
+from typing import List, Dict
+from datetime import datetime
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.transformers import LeanStandingsTable
+
+
+
+# ================================================ JOB MANIFEST ================================================
+
+# Set up abstract base class for Job Manifest that defines interface for tracking the status of each scrape unit
+class IJobManifest(ABC):
+    @abstractmethod
+    def is_complete(self, league: str, match_date: str) -> bool:
+        pass
+
+    @abstractmethod
+    def mark_started(self, league: str, match_date: str):
+        pass
+
+    @abstractmethod
+    def mark_complete(self, league: str, match_date: str, output_location: str, content_hash: str):
+        pass
+
+    @abstractmethod
+    def mark_failed(self, league: str, match_date: str, error: str):
+        pass
+
+    @abstractmethod
+    def get_pending_match_dates(self, league: str, match_dates: List[str]) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_unit(self, league: str, match_date: str) -> Dict:
+        pass
+
+
+# Set up a concrete JSONFileJobManifest class that inherits from IJobManifest
+class JSONFileJobManifest(IJobManifest):
+    """
+    Records the status, output location and content hash of every (league, match date) unit in a JSON file.
+
+    The manifest is rewritten atomically (temp file + rename) each time a unit changes status, so a crashed
+    job leaves behind either the previous or the latest manifest - never a half-written one. A restarted job
+    only needs to scrape the units that are not yet marked as complete.
+    """
+
+    STARTED     =   'started'
+    COMPLETE    =   'complete'
+    FAILED      =   'failed'
+
+    def __init__(self, manifest_path: str, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.manifest_path = manifest_path
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        self.units: Dict[str, Dict] = self._read_manifest()
+
+
+    # Read the existing manifest from disk (if any) so previously completed units are skipped
+    def _read_manifest(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+
+        try:
+            with open(self.manifest_path, 'r') as manifest_file:
+                return json.load(manifest_file).get('units', {})
+        except Exception as e:
+            self.console_logger.log_event_as_warning(f">>> Unable to read job manifest '{self.manifest_path}', starting a fresh one: {e}")
+            return {}
+
+
+    # Write the manifest to a temp file in the same folder, then swap it in with an atomic rename
+    def _write_manifest(self):
+        manifest_folder = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(manifest_folder, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=manifest_folder, prefix='.manifest-', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w') as temp_file:
+                json.dump({'units': self.units}, temp_file, indent=2, sort_keys=True)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    @staticmethod
+    def _get_unit_key(league: str, match_date: str) -> str:
+        return f'{league}|{match_date}'
+
+
+    def _update_unit(self, league: str, match_date: str, **fields):
+        unit_key = self._get_unit_key(league, match_date)
+        unit = self.units.setdefault(unit_key, {'league': league, 'match_date': match_date, 'attempts': 0})
+        unit.update(fields)
+        unit['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._write_manifest()
+
+
+    # Implement JSONFileJobManifest methods for tracking the status of each unit
+    def is_complete(self, league: str, match_date: str) -> bool:
+        unit = self.units.get(self._get_unit_key(league, match_date), {})
+        return unit.get('status') == self.COMPLETE
+
+
+    def mark_started(self, league: str, match_date: str):
+        attempts = self.units.get(self._get_unit_key(league, match_date), {}).get('attempts', 0)
+        self._update_unit(league, match_date, status=self.STARTED, attempts=attempts + 1, error=None)
+        self.file_logger.log_event_as_debug(f">>> Job manifest: started '{league}' unit for {match_date} ...")
+
+
+    def mark_complete(self, league: str, match_date: str, output_location: str, content_hash: str):
+        self._update_unit(league, match_date, status=self.COMPLETE, output_location=output_location, content_hash=content_hash, error=None)
+        self.file_logger.log_event_as_debug(f">>> Job manifest: completed '{league}' unit for {match_date} -> {output_location} ...")
+
+
+    def mark_failed(self, league: str, match_date: str, error: str):
+        self._update_unit(league, match_date, status=self.FAILED, error=str(error))
+        self.console_logger.log_event_as_error(f">>> Job manifest: failed '{league}' unit for {match_date}: {error}")
+
+
+    def get_pending_match_dates(self, league: str, match_dates: List[str]) -> List[str]:
+        pending_match_dates = [match_date for match_date in match_dates if not self.is_complete(league, match_date)]
+        self.console_logger.log_event_as_debug(f">>> Job manifest: {len(match_dates) - len(pending_match_dates)} of {len(match_dates)} '{league}' units already complete, {len(pending_match_dates)} to run ...")
+        return pending_match_dates
+
+
+    def get_unit(self, league: str, match_date: str) -> Dict:
+        return dict(self.units.get(self._get_unit_key(league, match_date), {}))
+
+
+    # Serialise a transformed table (dataframe or lean) to the one CSV form both are hashed in - without 'match_date'
+    @staticmethod
+    def get_canonical_csv_bytes(df: pd.DataFrame, header: bool=True) -> bytes:
+        if isinstance(df, LeanStandingsTable):
+            return df.to_csv_bytes(include_match_date=False, header=header)
+
+        csv_buffer = io.BytesIO()
+        df.drop(columns=['match_date'], errors='ignore').to_csv(csv_buffer, index=False, header=header, encoding='utf-8', lineterminator='\n')
+        return csv_buffer.getvalue()
+
+
+    # Hash the content of the transformed table so reruns can tell whether a snapshot changed - equal standings
+    # hash the same whichever transformer built them and whichever date they were scraped for
+    @classmethod
+    def compute_content_hash(cls, df: pd.DataFrame) -> str:
+        return hashlib.sha256(cls.get_canonical_csv_bytes(df)).hexdigest()
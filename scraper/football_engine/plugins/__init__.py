@@ -0,0 +1 @@
+# League plugins - each module registers one league's components with 'football_engine.registry.league_registry'
@@ -0,0 +1,20 @@
+from football_engine.registry import LeaguePlugin, league_registry
+
+
+
+# Register the Premier League components - nothing below is imported until a run looks it up
+league_registry.register(LeaguePlugin(
+    league                  =   'premier-league',
+    title_check             =   'Premier League',
+    file_name               =   'prem_league_table',
+    webpage_loader          =   'football_engine.webpage_loader:PremLeagueTableWebPageLoader',
+    popup_handler           =   'football_engine.popup_handler:PremLeagueTablePopUpHandler',
+    data_extractor          =   'football_engine.extractors:PremLeagueTableStandingsDataExtractor',
+    data_transformer        =   'football_engine.transformers:PremierLeagueTableStandingsDataTransformer',
+    lean_data_transformer   =   'football_engine.transformers:PremierLeagueTableLeanStandingsTransformer',
+    data_validator          =   'football_engine.validators:PremierLeagueTableStandingsDataValidator',
+    s3_uploader             =   'football_engine.uploaders:PremierLeagueTableS3CSVUploader',
+    local_uploader          =   'football_engine.uploaders:PremierLeagueTableLocalCSVUploader',
+    warehouse_uploader      =   'football_engine.uploaders:PremierLeagueTableSQLiteUploader',
+    job_runner              =   'football_engine.job_runner:PremLeagueTableScrapeJobRunner',
+))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from urllib.parse import urlparse
+import logging
+from abc import ABC, abstractmethod
+from football_engine.dependencies import webdriver
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ResilientCaller
+
+
+
+# ================================================ POPUP HANDLER ================================================
+
+# Set up abstract base class for PopUpHandler that defines interface for popup handlers
+class IPopUpHandler(ABC):
+    @abstractmethod
+    def close_popup(self):
+        pass
+
+
+# Set up a concrete PopUpHandler class that inherits from IPopUpHandler
+class PopUpHandler(IPopUpHandler):
+    @abstractmethod
+    def close_popup(self):
+        pass
+
+
+# Set up a concrete PremLeagueTablePopUpHandler class that inherits from PopUpHandler
+class PremLeagueTablePopUpHandler(PopUpHandler):
+
+    def __init__(self, chrome_driver: webdriver.Chrome, logger: logging.Logger, coloured_console_logs: bool=False, file_logger=FileLogger(), resilient_caller: ResilientCaller=None):
+        self.chrome_driver = chrome_driver
+        self.file_logger = file_logger  
+        self.resilient_caller = resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        
+        self.coloured_console_logs = coloured_console_logs
+        if coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+        
+        self.logger = logger
+        self.logger.propagate = True
+        
+
+    # Implement PopUpHandler method for closing popup windows in browser
+    def close_popup(self, wait_seconds: float=5):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        try:
+            wait = WebDriverWait(self.chrome_driver, wait_seconds)
+            close_popup_box = wait.until(EC.presence_of_element_located((By.XPATH, '/html/body/div[8]/div[2]/div[1]/div[1]/button/i')))
+        
+        except TimeoutException:
+            self.console_logger.log_event_as_error(f'No cookie pop-up window to close...let\'s begin scraping for league standings !!')
+            return
+
+        # Only a popup that is present but refuses to close is worth retrying
+        try:
+            self.resilient_caller.call(close_popup_box.click, host=urlparse(self.chrome_driver.current_url).netloc, operation_name='close_popup')
+            self.console_logger.log_event_as_debug(f'>>>>   Closing cookie pop-up window ...')
+        
+        except Exception as e:
+            self.console_logger.log_event_as_error(f'>>>>   Unable to close cookie pop-up window: {e}')
+
+
+class BundesligaTablePopUpHandler(PopUpHandler):
+    pass
+
+
+class LaLigaTablePopUpHandler(PopUpHandler):
+    pass
+
+
+class SerieATablePopUpHandler(PopUpHandler):
+    pass
+
+
+class Ligue1TablePopUpHandler(PopUpHandler):
+    pass
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import os
+import sys
+import pstats
+import cProfile
+import tracemalloc
+import threading
+from typing import List, Dict, Tuple
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from pathlib import Path
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+
+
+
+# ================================================ PROFILER ================================================
+
+# Set up a StackSampler class that periodically samples the call stack of one thread
+class StackSampler:
+    """
+    Samples the stack of 'thread_id' every 'interval_seconds' from a background thread and counts each stack in
+    the folded format ('outer;inner;leaf <count>') read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float=0.005):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.folded_stacks = Counter()
+        self.stop_event = threading.Event()
+        self.sampler_thread = None
+
+
+    def _sample(self):
+        while not self.stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f'{frame.f_code.co_name} ({Path(frame.f_code.co_filename).name}:{frame.f_code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.folded_stacks[';'.join(reversed(stack))] += 1
+
+
+    def start(self):
+        self.stop_event.clear()
+        self.sampler_thread = threading.Thread(target=self._sample, daemon=True)
+        self.sampler_thread.start()
+
+
+    def stop(self):
+        self.stop_event.set()
+        if self.sampler_thread is not None:
+            self.sampler_thread.join()
+
+
+# Set up a StageProfiler class that profiles each pipeline stage for CPU time and memory allocations
+class StageProfiler:
+    """
+    Wraps each pipeline stage (load, popup, extract, transform, validate, upload) with a deterministic profiler
+    (cProfile), a stack sampler and tracemalloc snapshots. Stages that run once per match date accumulate into
+    the same per-stage report. 'write_reports' then leaves, per stage, in 'profile_folder':
+
+        - <stage>.prof                   - cProfile stats (snakeviz, flameprof, pstats)
+        - <stage>.folded                 - sampled stacks in folded format (flamegraph.pl, speedscope)
+        - <stage>_allocations.txt        - top allocation sites for every run of the stage
+
+    Stages can run on several threads at once (queue workers, load tests): each thread gets its own cProfile
+    and stack sampler per stage, and 'write_reports' merges them into the one per-stage report. Python 3.12+
+    allows a single active cProfile per process, so a stage run that overlaps another profiled run there is
+    only sampled. The tracemalloc figures are process-wide and include allocations made by other threads.
+
+    When 'enabled' is False every method is a no-op, so the entry point can always wrap its stages.
+    """
+
+    def __init__(self, profile_folder: str, enabled: bool=True, top_allocations: int=25, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.profile_folder = profile_folder
+        self.enabled = enabled
+        self.top_allocations = top_allocations
+        self.cpu_profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self.stack_samplers: Dict[Tuple[str, int], StackSampler] = {}
+        self.allocation_reports: Dict[str, List[str]] = {}
+        self.profiles_lock = threading.Lock()
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+
+    # Implement StageProfiler method for profiling one run of a stage
+    @contextmanager
+    def profile_stage(self, stage_name: str):
+        if not self.enabled:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        with self.profiles_lock:
+            if (stage_name, thread_id) not in self.cpu_profiles:
+                self.cpu_profiles[(stage_name, thread_id)] = cProfile.Profile()
+                self.stack_samplers[(stage_name, thread_id)] = StackSampler(thread_id)
+            cpu_profile, stack_sampler = self.cpu_profiles[(stage_name, thread_id)], self.stack_samplers[(stage_name, thread_id)]
+        memory_before = tracemalloc.take_snapshot()
+        started_at = perf_counter()
+
+        stack_sampler.start()
+        try:
+            cpu_profile.enable()
+            cpu_profiled = True
+        except ValueError:
+            cpu_profiled = False
+        try:
+            yield
+        finally:
+            if cpu_profiled:
+                cpu_profile.disable()
+            stack_sampler.stop()
+
+            elapsed_seconds = perf_counter() - started_at
+            allocation_stats = tracemalloc.take_snapshot().compare_to(memory_before, 'lineno')
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+            report_lines = [f'=== {stage_name} | {elapsed_seconds:.3f}s | traced memory: {current_bytes / 1024:.1f} KiB (peak {peak_bytes / 1024:.1f} KiB) ===']
+            report_lines += [str(allocation_stat) for allocation_stat in allocation_stats[:self.top_allocations]]
+            with self.profiles_lock:
+                self.allocation_reports.setdefault(stage_name, []).extend(report_lines + [''])
+            self.file_logger.log_event_as_debug(f">>> Profiled stage '{stage_name}' in {elapsed_seconds:.3f}s ...")
+
+
+    # Implement StageProfiler method for writing the per-stage reports to disk
+    def write_reports(self):
+        if not self.enabled:
+            return
+
+        os.makedirs(self.profile_folder, exist_ok=True)
+        stage_names = list(dict.fromkeys(stage_name for stage_name, _ in self.cpu_profiles))
+        for stage_name in stage_names:
+            thread_keys = [profile_key for profile_key in self.cpu_profiles if profile_key[0] == stage_name]
+
+            # Merge the stage's per-thread profiles and samples into one report
+            cpu_stats = pstats.Stats(self.cpu_profiles[thread_keys[0]])
+            for profile_key in thread_keys[1:]:
+                cpu_stats.add(self.cpu_profiles[profile_key])
+            cpu_stats.dump_stats(f'{self.profile_folder}/{stage_name}.prof')
+
+            folded_stacks = Counter()
+            for profile_key in thread_keys:
+                folded_stacks.update(self.stack_samplers[profile_key].folded_stacks)
+            with open(f'{self.profile_folder}/{stage_name}.folded', 'w') as folded_file:
+                for stack, count in folded_stacks.most_common():
+                    folded_file.write(f'{stack} {count}\n')
+
+            with open(f'{self.profile_folder}/{stage_name}_allocations.txt', 'w') as allocations_file:
+                allocations_file.write('\n'.join(self.allocation_reports.get(stage_name, [])))
+
+        self.console_logger.log_event_as_info(f">>> Wrote profiling reports for {len(stage_names)} stage(s) to '{self.profile_folder}' ...")
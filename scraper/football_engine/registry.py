@@ -0,0 +1,100 @@
+import importlib
+from typing import Dict, List
+
+
+
+# ================================================ LEAGUE PLUGIN REGISTRY ================================================
+
+# Set up a LeaguePlugin class that names the pipeline components of one league without importing them
+class LeaguePlugin:
+    """
+    Holds the components of one league's pipeline as 'module:ClassName' paths - the web page loader, popup
+    handler, data extractor, transformers, validator, uploaders and job runner - plus the league's page title
+    and output file name. A component is only imported the first time it is looked up ('plugin.data_extractor'),
+    and then kept, so a run only pays for the modules it actually uses.
+    """
+
+    COMPONENTS = ('webpage_loader', 'popup_handler', 'data_extractor', 'data_transformer', 'lean_data_transformer', 'data_validator', 's3_uploader', 'local_uploader', 'warehouse_uploader', 'job_runner')
+
+    def __init__(self, league: str, title_check: str, file_name: str, **component_paths: str):
+        unknown_components = set(component_paths) - set(self.COMPONENTS)
+        if unknown_components:
+            raise ValueError(f'Unknown component(s) {sorted(unknown_components)} for league plugin \'{league}\' - choose from {self.COMPONENTS}')
+
+        self.league = league
+        self.title_check = title_check
+        self.file_name = file_name
+        self.component_paths = component_paths
+        self.resolved_components: Dict[str, type] = {}
+
+
+    def __repr__(self) -> str:
+        return f"LeaguePlugin(league='{self.league}', components={sorted(self.component_paths)})"
+
+
+    def has_component(self, component_name: str) -> bool:
+        return component_name in self.component_paths
+
+
+    # Implement LeaguePlugin method for importing a component on first use
+    def get_component(self, component_name: str) -> type:
+        if component_name not in self.resolved_components:
+            if component_name not in self.component_paths:
+                raise NotImplementedError(f"League plugin '{self.league}' does not provide a '{component_name}' component")
+
+            module_path, class_name = self.component_paths[component_name].split(':')
+            self.resolved_components[component_name] = getattr(importlib.import_module(module_path), class_name)
+        return self.resolved_components[component_name]
+
+
+    def __getattr__(self, component_name: str) -> type:
+        if component_name in LeaguePlugin.COMPONENTS:
+            return self.get_component(component_name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{component_name}'")
+
+
+
+# Set up a LeaguePluginRegistry class that loads each league's plugin module the first time the league is asked for
+class LeaguePluginRegistry:
+    """
+    Maps each league to the module that registers its plugin ('premier-league' -> 'football_engine.plugins.
+    premier_league'). 'get' imports that module on demand, so asking for one league never imports the plugins
+    (or components) of the others. A new league only needs a plugin module that calls 'register', plus one
+    'register_module' call (or an entry in 'PLUGIN_MODULES').
+    """
+
+    PLUGIN_MODULES = {
+        'premier-league':   'football_engine.plugins.premier_league',
+    }
+
+    def __init__(self, plugin_modules: Dict[str, str]=None):
+        self.plugin_modules = dict(self.PLUGIN_MODULES if plugin_modules is None else plugin_modules)
+        self.league_plugins: Dict[str, LeaguePlugin] = {}
+
+
+    def register(self, league_plugin: LeaguePlugin) -> LeaguePlugin:
+        self.league_plugins[league_plugin.league] = league_plugin
+        return league_plugin
+
+
+    def register_module(self, league: str, module_path: str):
+        self.plugin_modules[league] = module_path
+
+
+    def get_leagues(self) -> List[str]:
+        return sorted(set(self.plugin_modules) | set(self.league_plugins))
+
+
+    # Implement LeaguePluginRegistry method for looking up (and lazily loading) the plugin of a league
+    def get(self, league: str) -> LeaguePlugin:
+        if league not in self.league_plugins and league in self.plugin_modules:
+            importlib.import_module(self.plugin_modules[league])
+
+        if league not in self.league_plugins:
+            raise KeyError(f"No plugin registered for league '{league}' - available leagues: {self.get_leagues()}")
+        return self.league_plugins[league]
+
+
+
+# Share one registry between the engine, the plugins and the entry points
+league_registry = LeaguePluginRegistry()
@@ -0,0 +1,345 @@
+from __future__ import annotations
+import os
+import json
+import random
+import threading
+from typing import List, Dict, Optional, Callable, Tuple
+from datetime import datetime
+from collections import Counter
+from contextlib import contextmanager
+from time import sleep, monotonic
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+
+
+
+# ================================================ RESILIENCE ================================================
+
+# Set up custom exceptions raised by the resilience layer instead of calling a failing host again
+class CircuitOpenError(Exception):
+    def __init__(self, host: str, retry_after_seconds: float):
+        self.host = host
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(f"Circuit breaker for '{host}' is open - not calling it again for another {retry_after_seconds:.1f} seconds")
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self, operation_name: str, last_error: Optional[Exception]=None):
+        self.operation_name = operation_name
+        self.last_error = last_error
+        super().__init__(f"Deadline exceeded while retrying '{operation_name}' (last error: {last_error})")
+
+
+# Set up a CircuitBreaker class that stops calls to a host after repeated failures
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker. After 'failure_threshold' consecutive failures the circuit
+    opens and every call is rejected straight away for 'reset_timeout_seconds'. The first call after that is
+    let through as a trial: success closes the circuit again, failure re-opens it. 'clock' is injectable so the
+    transitions can be tested without waiting.
+    """
+
+    CLOSED      =   'closed'
+    OPEN        =   'open'
+    HALF_OPEN   =   'half_open'
+
+    def __init__(self, failure_threshold: int=5, reset_timeout_seconds: float=60.0, clock: Callable[[], float]=monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+
+    def get_retry_after_seconds(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout_seconds - self.clock())
+
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.state == self.OPEN and self.get_retry_after_seconds() <= 0:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+# Set up a ResilientCaller class shared by the loader, extractor and uploader classes
+class ResilientCaller:
+    """
+    Runs an operation with jittered exponential backoff, a per-host circuit breaker and an optional deadline.
+
+    The delay before retry 'n' is drawn uniformly from [0, min(max_delay, base_delay * 2 ** (n - 1))] ("full
+    jitter"), which spreads retries from parallel workers out instead of hammering the host in lockstep. A retry
+    is never started if its backoff would run past the deadline. Every outcome is counted per host in
+    'outcome_counters' so runs can report how often they had to retry, gave up or were short-circuited.
+
+    Only the exceptions in 'retry_on' are retried and count against the host's circuit. Any other exception
+    means the host answered but the answer was wrong (e.g. a page with an unexpected title), so it is raised
+    straight away and counted as 'not_retried'. The deadline is read from 'clock' (the monotonic clock
+    'RunBudget' deadlines use) and backoffs go through 'sleep', so both can be swapped out in tests.
+    """
+
+    def __init__(self, max_attempts: int=4, base_delay_seconds: float=1.0, max_delay_seconds: float=30.0, failure_threshold: int=5, reset_timeout_seconds: float=60.0, clock: Callable[[], float]=monotonic, sleep: Callable[[float], None]=sleep,
+                 coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.outcome_counters = Counter()
+        self.lock = threading.Lock()
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def get_circuit_breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            if host not in self.circuit_breakers:
+                self.circuit_breakers[host] = CircuitBreaker(failure_threshold=self.failure_threshold, reset_timeout_seconds=self.reset_timeout_seconds, clock=self.clock)
+            return self.circuit_breakers[host]
+
+
+    def _count_outcome(self, host: str, outcome: str):
+        with self.lock:
+            self.outcome_counters[(host, outcome)] += 1
+
+
+    def get_backoff_seconds(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)))
+
+
+    # Implement ResilientCaller method for calling an operation with retries, backoff and circuit breaking
+    def call(self, operation: Callable, *args, host: str, operation_name: str=None, deadline: Optional[float]=None, retry_on: tuple=(Exception,), **kwargs):
+        operation_name = operation_name or getattr(operation, '__name__', 'operation')
+        circuit_breaker = self.get_circuit_breaker(host)
+        last_error = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            if deadline is not None and self.clock() >= deadline:
+                self._count_outcome(host, 'deadline_exceeded')
+                raise DeadlineExceededError(operation_name, last_error)
+
+            if not circuit_breaker.allow_request():
+                self._count_outcome(host, 'circuit_open')
+                raise CircuitOpenError(host, circuit_breaker.get_retry_after_seconds())
+
+            try:
+                result = operation(*args, **kwargs)
+                circuit_breaker.record_success()
+                self._count_outcome(host, 'success' if attempt == 1 else 'success_after_retry')
+                return result
+
+            except Exception as e:
+                if not isinstance(e, retry_on):
+                    # The host answered, so a half-open circuit's trial call has still gone through
+                    circuit_breaker.record_success()
+                    self._count_outcome(host, 'not_retried')
+                    raise
+
+                last_error = e
+                circuit_breaker.record_failure()
+
+                if attempt == self.max_attempts:
+                    break
+
+                backoff_seconds = self.get_backoff_seconds(attempt)
+                if deadline is not None and self.clock() + backoff_seconds >= deadline:
+                    self._count_outcome(host, 'deadline_exceeded')
+                    raise DeadlineExceededError(operation_name, last_error) from e
+
+                self._count_outcome(host, 'retry')
+                self.console_logger.log_event_as_warning(f">>> '{operation_name}' failed on attempt {attempt} of {self.max_attempts} against '{host}' ({e}) - retrying in {backoff_seconds:.2f} seconds ...")
+                self.sleep(backoff_seconds)
+
+        self._count_outcome(host, 'failure')
+        self.console_logger.log_event_as_error(f">>> '{operation_name}' failed after {self.max_attempts} attempts against '{host}' ...")
+        raise last_error
+
+
+    def log_outcome_counters(self):
+        for (host, outcome), count in sorted(self.outcome_counters.items()):
+            self.file_logger.log_event_as_info(f">>> Resilience outcomes | host: '{host}' | outcome: '{outcome}' | count: {count}")
+
+
+
+# Set up a ConcurrencyController class shared by the loader and uploader classes
+class ConcurrencyController:
+    """
+    Caps how many calls of one kind (e.g. page loads, uploads) run at once, and moves that cap at runtime
+    instead of leaving it at a guessed pool size. Each call runs inside 'slot()', which waits for a free slot
+    and records the call's latency and whether it raised.
+
+    Every 'adjust_interval_seconds' (once at least 'min_samples' calls have finished) the limit is revisited,
+    additive-increase / multiplicative-decrease style:
+
+    - host memory in use at or above 'max_memory_used_fraction'  ->  limit * decrease_factor
+    - 1-minute load average per CPU above 'max_load_per_cpu'     ->  limit * decrease_factor
+    - failure rate above 'max_failure_rate'                      ->  limit * decrease_factor
+    - p90 latency above 'target_latency_seconds'                 ->  limit * decrease_factor
+    - otherwise, if the current limit was actually reached       ->  limit + 1
+
+    always within [min_limit, max_limit]. The samples are cleared after every change, so the next decision only
+    sees calls made under the new limit. Every decision - including holding the limit - is appended to
+    'decisions' and the file log, and to 'decision_log_path' as JSON lines when one is given.
+    """
+
+    def __init__(self, name: str, initial_limit: int=2, min_limit: int=1, max_limit: int=8, target_latency_seconds: float=15.0, max_failure_rate: float=0.2, max_memory_used_fraction: float=0.85, max_load_per_cpu: Optional[float]=None,
+                 decrease_factor: float=0.5, adjust_interval_seconds: float=10.0, min_samples: int=5, window_size: int=100, decision_log_path: str=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(f"Concurrency limits for '{name}' must satisfy 1 <= min_limit <= initial_limit <= max_limit (got {min_limit}, {initial_limit}, {max_limit})")
+
+        self.name = name
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_seconds = target_latency_seconds
+        self.max_failure_rate = max_failure_rate
+        self.max_memory_used_fraction = max_memory_used_fraction
+        self.max_load_per_cpu = max_load_per_cpu
+        self.decrease_factor = decrease_factor
+        self.adjust_interval_seconds = adjust_interval_seconds
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.decision_log_path = decision_log_path
+        self.samples: List[Tuple[float, bool]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.last_adjusted_at = monotonic()
+        self.decisions: List[Dict] = []
+        self.condition = threading.Condition()
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Read the fraction of host memory in use - psutil if it is installed, '/proc/meminfo' otherwise (None if neither is available)
+    @staticmethod
+    def get_memory_used_fraction() -> Optional[float]:
+        try:
+            import psutil
+            return psutil.virtual_memory().percent / 100
+        except ImportError:
+            pass
+
+        try:
+            with open('/proc/meminfo') as meminfo_file:
+                meminfo = {line.split(':')[0]: int(line.split()[1]) for line in meminfo_file if len(line.split()) >= 2}
+            return 1 - meminfo['MemAvailable'] / meminfo['MemTotal']
+        except (OSError, KeyError, ValueError, ZeroDivisionError):
+            return None
+
+
+    @staticmethod
+    def get_load_per_cpu() -> Optional[float]:
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except OSError:
+            return None
+
+
+    @contextmanager
+    def slot(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        started_at = monotonic()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            with self.condition:
+                self.in_flight -= 1
+                self.samples.append((monotonic() - started_at, succeeded))
+                del self.samples[:-self.window_size]
+                self.condition.notify()
+            self.maybe_adjust()
+
+
+    # Wrap an operation so every call of it (e.g. every retry attempt made by ResilientCaller) runs inside a slot
+    def wrap(self, operation: Callable) -> Callable:
+        def run_in_slot(*args, **kwargs):
+            with self.slot():
+                return operation(*args, **kwargs)
+        return run_in_slot
+
+
+    # Implement ConcurrencyController method for deciding whether to raise, lower or hold the limit
+    def maybe_adjust(self) -> Optional[Dict]:
+        with self.condition:
+            if monotonic() - self.last_adjusted_at < self.adjust_interval_seconds or len(self.samples) < self.min_samples:
+                return None
+
+            latencies = sorted(latency for latency, _ in self.samples)
+            p90_latency_seconds = latencies[min(len(latencies) - 1, int(round(0.9 * (len(latencies) - 1))))]
+            failure_rate = sum(1 for _, succeeded in self.samples if not succeeded) / len(self.samples)
+            memory_used_fraction = self.get_memory_used_fraction()
+            load_per_cpu = self.get_load_per_cpu() if self.max_load_per_cpu is not None else None
+
+            if memory_used_fraction is not None and memory_used_fraction >= self.max_memory_used_fraction:
+                action, reason = 'decrease', f'memory in use {memory_used_fraction:.0%} >= {self.max_memory_used_fraction:.0%}'
+            elif load_per_cpu is not None and load_per_cpu > self.max_load_per_cpu:
+                action, reason = 'decrease', f'load per CPU {load_per_cpu:.2f} > {self.max_load_per_cpu:.2f}'
+            elif failure_rate > self.max_failure_rate:
+                action, reason = 'decrease', f'failure rate {failure_rate:.0%} > {self.max_failure_rate:.0%}'
+            elif p90_latency_seconds > self.target_latency_seconds:
+                action, reason = 'decrease', f'p90 latency {p90_latency_seconds:.2f}s > {self.target_latency_seconds:.2f}s'
+            elif self.peak_in_flight >= self.limit:
+                action, reason = 'increase', 'healthy and the limit was reached'
+            else:
+                action, reason = 'hold', 'healthy but the limit was not reached'
+
+            previous_limit = self.limit
+            if action == 'decrease':
+                self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            elif action == 'increase':
+                self.limit = min(self.max_limit, self.limit + 1)
+            if self.limit == previous_limit:
+                action = 'hold'
+            else:
+                self.samples.clear()
+                self.condition.notify_all()
+
+            decision = {'at': datetime.now().isoformat(timespec='seconds'), 'controller': self.name, 'action': action, 'reason': reason, 'previous_limit': previous_limit, 'limit': self.limit,
+                        'p90_latency_seconds': round(p90_latency_seconds, 3), 'failure_rate': round(failure_rate, 3), 'memory_used_fraction': None if memory_used_fraction is None else round(memory_used_fraction, 3),
+                        'load_per_cpu': None if load_per_cpu is None else round(load_per_cpu, 3), 'peak_in_flight': self.peak_in_flight}
+            self.decisions.append(decision)
+            self.last_adjusted_at = monotonic()
+            self.peak_in_flight = self.in_flight
+
+        self.file_logger.log_event_as_info(f">>> Concurrency decision | controller: '{self.name}' | action: '{action}' | limit: {previous_limit} -> {self.limit} | reason: {reason}")
+        if action != 'hold':
+            self.console_logger.log_event_as_debug(f">>> Concurrency limit for '{self.name}' {action}d from {previous_limit} to {self.limit} ({reason}) ...")
+        if self.decision_log_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.decision_log_path)), exist_ok=True)
+            with open(self.decision_log_path, 'a') as decision_log_file:
+                decision_log_file.write(json.dumps(decision) + '\n')
+        return decision
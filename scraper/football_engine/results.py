@@ -0,0 +1,374 @@
+from __future__ import annotations
+import re
+from typing import List, Dict, Iterable, Optional, NamedTuple, Tuple
+from datetime import datetime
+from football_engine.dependencies import np, webdriver
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.extractors import HTMLTableParser, StandingsColumnarBatch
+from football_engine.transformers import IDataTransformer, LeanStandingsTable, STANDINGS_COLUMN_MAPPING, TableStandingsDataTransformer
+from football_engine.validators import TableStandingsDataValidator
+from football_engine.job_runner import PremLeagueTableScrapeJobRunner, TwtdScrapeJobRunner
+
+
+
+# ================================================ RESULTS-BASED STANDINGS ================================================
+
+# Set up a MatchResult record - one played match, as scraped from a results page
+class MatchResult(NamedTuple):
+    match_date: str                 # '%Y-%b-%d', like the table match dates
+    home_team: str
+    away_team: str
+    home_goals: int
+    away_goals: int
+
+
+# Set up a custom exception raised when derived standings disagree with the scraped table for the same date
+class StandingsReconciliationError(Exception):
+    def __init__(self, match_date: str, reconciliation_report: Dict):
+        self.match_date = match_date
+        self.reconciliation_report = reconciliation_report
+        super().__init__(f"Derived standings for {match_date} do not match the scraped table: {reconciliation_report['mismatched_teams']} team(s) differ, "
+                         f"missing {reconciliation_report['missing_teams']}, unexpected {reconciliation_report['unexpected_teams']}")
+
+
+# Set up a MatchResultsExtractor class that pulls every played match off a results page in one parse pass
+class MatchResultsExtractor:
+    """
+    Parses the results page (from the browser or an already fetched HTML body) with HTMLTableParser and keeps
+    every row that holds a score cell ('2-1', '2 - 1', '2–1'): the nearest non-blank cell before the score is the
+    home team and the one after it the away team. The match date is taken from a date cell in the same row, or
+    else from the last date-only row above it (results pages group matches under date headings). Rows without a
+    score - postponed or not yet played fixtures - are skipped.
+    """
+
+    SCORE_PATTERN   =   re.compile(r'^(\d+)\s*[-–]\s*(\d+)$')
+    DATE_FORMATS    =   ('%Y-%b-%d', '%d/%m/%Y', '%d/%m/%y', '%d %b %Y', '%d %B %Y', '%a %d %b %Y', '%A %d %B %Y', '%a %d %B %Y', '%d-%m-%Y')
+
+    def __init__(self, chrome_driver: webdriver.Chrome=None, page_source: str=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.chrome_driver = chrome_driver
+        self.page_source = page_source
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @classmethod
+    def parse_date(cls, cell: str) -> Optional[str]:
+        cell = re.sub(r'(\d)(st|nd|rd|th)\b', r'\1', cell.strip())
+        for date_format in cls.DATE_FORMATS:
+            try:
+                return datetime.strptime(cell, date_format).strftime('%Y-%b-%d')
+            except ValueError:
+                continue
+        return None
+
+
+    # Implement MatchResultsExtractor method for extracting the played matches of the page
+    def scrape_results(self) -> List[MatchResult]:
+        page_source = self.page_source if self.page_source is not None else self.chrome_driver.page_source
+
+        html_table_parser = HTMLTableParser()
+        html_table_parser.feed(page_source)
+        html_table_parser.close()
+
+        match_results = []
+        current_date = None
+        for table in html_table_parser.tables:
+            for row in table['rows']:
+                cells = [cell.strip() for cell in row]
+                score_positions = [cell_position for cell_position, cell in enumerate(cells) if self.SCORE_PATTERN.match(cell)]
+                row_dates = [match_date for match_date in map(self.parse_date, cells) if match_date is not None]
+
+                if not score_positions:
+                    if row_dates and len([cell for cell in cells if cell]) == 1:
+                        current_date = row_dates[0]
+                    continue
+
+                score_position = score_positions[0]
+                home_teams = [cell for cell in cells[:score_position] if cell and self.parse_date(cell) is None and not re.fullmatch(r'[\d:.]+', cell)]
+                away_teams = [cell for cell in cells[score_position + 1:] if cell]
+                match_date = row_dates[0] if row_dates else current_date
+                if not home_teams or not away_teams or match_date is None:
+                    self.file_logger.log_event_as_debug(f'>>>>   Skipping results row without teams or a date: {cells} ...')
+                    continue
+
+                home_goals, away_goals = map(int, self.SCORE_PATTERN.match(cells[score_position]).groups())
+                match_results.append(MatchResult(match_date, home_teams[-1], away_teams[0], home_goals, away_goals))
+
+        self.console_logger.log_event_as_debug(f'>>>>   Extracted {len(match_results)} match result(s) from the results page ...')
+        return match_results
+
+
+
+# Set up a ResultsStandingsCalculator class that derives the home/away table for any date from the season's results
+class ResultsStandingsCalculator:
+    """
+    Builds the league table for any date from one season of match results instead of one scraped page per date.
+
+    The results are bucketed by match date into a (date, team, stat) array of the home 'W D L GF GA' and away
+    'W D L GF GA' counts with 'np.add.at', and a cumulative sum over the date axis turns that into the running
+    totals after every match date - so the table for a date is one 'searchsorted' and one row lookup. P, GD and
+    Pts follow from those ten stats, exactly as on the scraped table.
+
+    Teams are ordered by 'tie_breakers', applied in turn:
+
+    - 'points', 'goal_difference', 'goals_for'      ->  higher first
+    - 'head_to_head_points'                         ->  points in the matches between the teams still level
+    - 'head_to_head_away_goals'                     ->  away goals in those matches
+    - 'team'                                        ->  alphabetical, so the order is always fully defined
+
+    The default is the Premier League order (points, goal difference, goals scored, head-to-head points,
+    head-to-head away goals). Head-to-head breakers only look at the groups still level after the breakers
+    before them, which is rare enough to handle per group.
+    """
+
+    RAW_COLUMNS     =   ['Pos', 'Team', 'P', ' ', 'W', 'D', 'L', 'GF', 'GA', ' ', 'W', 'D', 'L', 'GF', 'GA', ' ', 'GD', 'Pts']
+    TIE_BREAKERS    =   ('points', 'goal_difference', 'goals_for', 'head_to_head_points', 'head_to_head_away_goals', 'team')
+
+    def __init__(self, match_results: List[MatchResult], team_names: List[str]=None, tie_breakers: Tuple[str, ...]=TIE_BREAKERS, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        unknown_tie_breakers = set(tie_breakers) - set(self.TIE_BREAKERS)
+        if unknown_tie_breakers:
+            raise ValueError(f'Unknown tie breaker(s) {sorted(unknown_tie_breakers)} - choose from {self.TIE_BREAKERS}')
+
+        self.match_results = sorted(match_results, key=lambda match_result: datetime.strptime(match_result.match_date, '%Y-%b-%d'))
+        self.tie_breakers = tuple(tie_breakers) if 'team' in tie_breakers else tuple(tie_breakers) + ('team',)
+        self.team_names = sorted(set(team_names or []) | {team for match_result in match_results for team in (match_result.home_team, match_result.away_team)})
+        self.team_positions = {team: team_position for team_position, team in enumerate(self.team_names)}
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        self._build_cumulative_stats()
+
+
+    def _build_cumulative_stats(self):
+        match_ordinals = np.array([datetime.strptime(match_result.match_date, '%Y-%b-%d').toordinal() for match_result in self.match_results], dtype=np.int64)
+        self.date_ordinals, self.match_date_positions = np.unique(match_ordinals, return_inverse=True)
+        self.home_positions = np.array([self.team_positions[match_result.home_team] for match_result in self.match_results], dtype=np.int64)
+        self.away_positions = np.array([self.team_positions[match_result.away_team] for match_result in self.match_results], dtype=np.int64)
+        self.home_goals = np.array([match_result.home_goals for match_result in self.match_results], dtype=np.int64)
+        self.away_goals = np.array([match_result.away_goals for match_result in self.match_results], dtype=np.int64)
+
+        # Result of each match from the home side: +1 home win, 0 draw, -1 away win
+        home_results = np.sign(self.home_goals - self.away_goals)
+
+        daily_stats = np.zeros((len(self.date_ordinals), len(self.team_names), 10), dtype=np.int64)
+        np.add.at(daily_stats, (self.match_date_positions, self.home_positions, 1 - home_results), 1)
+        np.add.at(daily_stats, (self.match_date_positions, self.home_positions, 3), self.home_goals)
+        np.add.at(daily_stats, (self.match_date_positions, self.home_positions, 4), self.away_goals)
+        np.add.at(daily_stats, (self.match_date_positions, self.away_positions, 6 + home_results), 1)
+        np.add.at(daily_stats, (self.match_date_positions, self.away_positions, 8), self.away_goals)
+        np.add.at(daily_stats, (self.match_date_positions, self.away_positions, 9), self.home_goals)
+        self.cumulative_stats = daily_stats.cumsum(axis=0)
+
+        self.file_logger.log_event_as_debug(f'>>>> Accumulated {len(self.match_results)} results over {len(self.date_ordinals)} match dates for {len(self.team_names)} teams ...')
+
+
+    # Running home/away totals (one row of 10 ints per team) including every match played on or before 'match_date'
+    def get_team_stats(self, match_date: str) -> np.ndarray:
+        date_position = np.searchsorted(self.date_ordinals, datetime.strptime(match_date, '%Y-%b-%d').toordinal(), side='right') - 1
+        if date_position < 0:
+            return np.zeros((len(self.team_names), 10), dtype=np.int64)
+        return self.cumulative_stats[date_position]
+
+
+    # Points and away goals of each team in the matches among 'tied_teams' played up to 'match_date'
+    def get_head_to_head_stats(self, tied_teams: List[int], match_date: str) -> Dict[str, np.ndarray]:
+        played_matches = self.match_date_positions <= np.searchsorted(self.date_ordinals, datetime.strptime(match_date, '%Y-%b-%d').toordinal(), side='right') - 1
+        tied_matches = played_matches & np.isin(self.home_positions, tied_teams) & np.isin(self.away_positions, tied_teams)
+
+        home_results = np.sign(self.home_goals[tied_matches] - self.away_goals[tied_matches])
+        head_to_head_points = np.zeros(len(self.team_names), dtype=np.int64)
+        head_to_head_away_goals = np.zeros(len(self.team_names), dtype=np.int64)
+        np.add.at(head_to_head_points, self.home_positions[tied_matches], np.choose(home_results + 1, [0, 1, 3]))
+        np.add.at(head_to_head_points, self.away_positions[tied_matches], np.choose(home_results + 1, [3, 1, 0]))
+        np.add.at(head_to_head_away_goals, self.away_positions[tied_matches], self.away_goals[tied_matches])
+        return {'head_to_head_points': head_to_head_points, 'head_to_head_away_goals': head_to_head_away_goals}
+
+
+    # Order the teams by each tie breaker in turn, only splitting the groups the breakers before it left level
+    def get_table_order(self, table_stats: Dict[str, np.ndarray], match_date: str) -> List[int]:
+        groups = [list(range(len(self.team_names)))]
+        for tie_breaker in self.tie_breakers:
+            ordered_groups = []
+            for group in groups:
+                if len(group) == 1:
+                    ordered_groups.append(group)
+                    continue
+
+                if tie_breaker == 'team':
+                    ordered_groups.extend([team] for team in sorted(group, key=lambda team: self.team_names[team]))
+                    continue
+
+                breaker_values = table_stats[tie_breaker] if tie_breaker in table_stats else self.get_head_to_head_stats(group, match_date)[tie_breaker]
+                for breaker_value in sorted({breaker_values[team] for team in group}, reverse=True):
+                    ordered_groups.append([team for team in group if breaker_values[team] == breaker_value])
+            groups = ordered_groups
+
+        return [team for group in groups for team in group]
+
+
+    # Implement ResultsStandingsCalculator method for building the scraped-table layout for one date
+    def get_scraped_content(self, match_date: str) -> List[List[str]]:
+        team_stats = self.get_team_stats(match_date)
+        home_stats, away_stats = team_stats[:, :5], team_stats[:, 5:]
+        goals_for, goals_against = home_stats[:, 3] + away_stats[:, 3], home_stats[:, 4] + away_stats[:, 4]
+        table_stats = {
+            'played':           home_stats[:, :3].sum(axis=1) + away_stats[:, :3].sum(axis=1),
+            'points':           3 * (home_stats[:, 0] + away_stats[:, 0]) + home_stats[:, 1] + away_stats[:, 1],
+            'goal_difference':  goals_for - goals_against,
+            'goals_for':        goals_for,
+        }
+
+        scraped_content = [list(self.RAW_COLUMNS)]
+        for position, team in enumerate(self.get_table_order(table_stats, match_date), start=1):
+            scraped_content.append([str(position), self.team_names[team], str(table_stats['played'][team]), ' '] + [str(stat) for stat in home_stats[team]] + [' '] + [str(stat) for stat in away_stats[team]]
+                                   + [' ', str(table_stats['goal_difference'][team]), str(table_stats['points'][team])])
+        return scraped_content
+
+
+    # Implement ResultsStandingsCalculator method for deriving the transformed table of one date
+    def get_standings(self, match_date: str, data_transformer: IDataTransformer):
+        return data_transformer.transform_data(StandingsColumnarBatch.from_scraped_content(self.get_scraped_content(match_date)), match_date=match_date)
+
+
+
+# Set up a StandingsReconciler class that compares derived standings with a scraped table for the same date
+class StandingsReconciler:
+    """
+    Matches the two tables on team and compares the position and every stat column (the warehouse columns of
+    'STANDINGS_COLUMN_MAPPING'). Works on dataframes and lean tables alike. The report lists the teams missing
+    from or unexpected in the derived table and, per mismatched team, each differing column as '(derived, scraped)'.
+    """
+
+    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @staticmethod
+    def get_standard_rows(table) -> Dict[str, Dict]:
+        if isinstance(table, LeanStandingsTable):
+            return {str(row.team).strip(): row._replace(match_date=None)._asdict() for row in table.rows}
+
+        column_mapping = STANDINGS_COLUMN_MAPPING
+        unique_columns = TableStandingsDataTransformer.get_unique_columns(list(table.columns))
+        standard_positions = {column_mapping[column]: column_position for column_position, column in unique_columns.items() if column in column_mapping}
+        return {str(row[standard_positions['team']]).strip(): {column: row[column_position] for column, column_position in standard_positions.items()}
+                for row in table.itertuples(index=False, name=None)}
+
+
+    # Implement StandingsReconciler method for comparing derived and scraped standings
+    def reconcile(self, derived_table, scraped_table, match_date: str) -> Dict:
+        derived_rows, scraped_rows = self.get_standard_rows(derived_table), self.get_standard_rows(scraped_table)
+        to_number = TableStandingsDataValidator._to_number
+
+        mismatches = {}
+        for team in sorted(derived_rows.keys() & scraped_rows.keys()):
+            differing_columns = {column: (derived_value, scraped_rows[team].get(column)) for column, derived_value in derived_rows[team].items()
+                                 if column not in ('team', 'match_date') and to_number(derived_value) != to_number(scraped_rows[team].get(column))}
+            if differing_columns:
+                mismatches[team] = differing_columns
+
+        reconciliation_report = {
+            'match_date':           match_date,
+            'matched':              not mismatches and derived_rows.keys() == scraped_rows.keys(),
+            'mismatched_teams':     len(mismatches),
+            'missing_teams':        sorted(scraped_rows.keys() - derived_rows.keys()),
+            'unexpected_teams':     sorted(derived_rows.keys() - scraped_rows.keys()),
+            'mismatches':           mismatches,
+        }
+
+        if reconciliation_report['matched']:
+            self.console_logger.log_event_as_debug(f'>>> Derived standings for {match_date} match the scraped table ...')
+        else:
+            self.console_logger.log_event_as_warning(f'>>> Derived standings for {match_date} differ from the scraped table: {reconciliation_report}')
+        return reconciliation_report
+
+
+
+# Set up a concrete ResultsStandingsJobRunner class that inherits from TwtdScrapeJobRunner
+class ResultsStandingsJobRunner(TwtdScrapeJobRunner):
+    """
+    Derives each date's table from the season's match results instead of loading one table page per date. The
+    results page of a league is fetched once per run (on the first date asked for) and fed to a
+    ResultsStandingsCalculator; every date after that is a local computation. The derived table goes through
+    the same validator and uploaders as a scraped one.
+
+    For each date in 'reconcile_dates' the table page is still scraped and reconciled with the derived table;
+    a mismatch raises StandingsReconciliationError before anything is loaded, so a results page that is
+    missing matches or team names that do not line up never reach the target locations silently.
+
+    'results_path' is the path of the league's results page on twtd.co.uk, with '{league}', '{from_date}' and
+    '{to_date}' placeholders. It has no default: the path has not been confirmed against the live site (only the
+    table pages are used by the rest of the scraper), so it must be passed in explicitly.
+    """
+
+    def __init__(self, job_runner: PremLeagueTableScrapeJobRunner, results_path: str, reconciler: StandingsReconciler=None, reconcile_dates: Iterable[str]=(), results_to_date: str=None,
+                 tie_breakers: Tuple[str, ...]=ResultsStandingsCalculator.TIE_BREAKERS, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        if not results_path:
+            raise ValueError("No 'results_path' given for the results page - confirm the page's path on the site first")
+
+        self.job_runner = job_runner
+        self.results_path = results_path
+        self.season_start_date = job_runner.season_start_date
+        self.reconciler = reconciler or StandingsReconciler(coloured_console_logs=coloured_console_logs)
+        self.reconcile_dates = set(reconcile_dates)
+        self.results_to_date = results_to_date or datetime.now().strftime('%Y-%b-%d')
+        self.tie_breakers = tie_breakers
+        self.standings_calculators: Dict[str, ResultsStandingsCalculator] = {}
+        self.reconciliation_reports: List[Dict] = []
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def get_results_url(self, league: str) -> str:
+        return self.base_url + self.results_path.format(league=league, from_date=self.season_start_date, to_date=self.results_to_date)
+
+
+    # Load the results page of the league once and keep its calculator for every other date of the run
+    def get_standings_calculator(self, league: str) -> ResultsStandingsCalculator:
+        if league not in self.standings_calculators:
+            webpage_loader, run_budget = self.job_runner.webpage_loader, self.job_runner.run_budget
+            webpage_loader.load_page(self.get_results_url(league), deadline=run_budget.start_stage('load_page'))
+            self.job_runner.popup_handler_class(webpage_loader.chrome_driver, self.job_runner.logger, coloured_console_logs=self.coloured_console_logs, resilient_caller=self.job_runner.resilient_caller) \
+                .close_popup(wait_seconds=run_budget.get_stage_timeout_seconds('close_popup', 5))
+
+            match_results = MatchResultsExtractor(chrome_driver=webpage_loader.chrome_driver, coloured_console_logs=self.coloured_console_logs).scrape_results()
+            if not match_results:
+                raise ValueError(f"No match results found on '{self.get_results_url(league)}'")
+
+            self.standings_calculators[league] = ResultsStandingsCalculator(match_results, tie_breakers=self.tie_breakers, coloured_console_logs=self.coloured_console_logs)
+            self.console_logger.log_event_as_info(f">>> Loaded {len(match_results)} '{league}' results up to {self.results_to_date} in one fetch ...")
+        return self.standings_calculators[league]
+
+
+    # Implement ResultsStandingsJobRunner method for deriving, reconciling, validating and loading one match date
+    def run_job(self, league: str, match_date: str) -> Tuple[Optional[str], Optional[str]]:
+        self.console_logger.log_event_as_info(f'>>> Deriving {league} standings for {match_date} from match results ...')
+        self.job_runner.run_budget.start_stage('transform')
+        with self.job_runner.stage_profiler.profile_stage('derive_standings'):
+            df = self.get_standings_calculator(league).get_standings(match_date, data_transformer=self.job_runner.data_transformer)
+
+        if match_date in self.reconcile_dates:
+            reconciliation_report = self.reconciler.reconcile(df, self.job_runner.scrape_snapshot(league, match_date), match_date=match_date)
+            self.reconciliation_reports.append(reconciliation_report)
+            if not reconciliation_report['matched']:
+                raise StandingsReconciliationError(match_date, reconciliation_report)
+
+        self.job_runner.validate_snapshot(df, match_date=match_date)
+        return self.job_runner.load_snapshot(df, match_date=match_date)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.resilience import ConcurrencyController, ResilientCaller
+
+
+
+# ================================================ SNAPSHOT SINKS ================================================
+
+# Set up abstract base class for Snapshot Sink that defines interface for writing an already-serialised snapshot
+class ISnapshotSink(ABC):
+    @abstractmethod
+    def write_bytes(self, payload: bytes, match_date: str) -> str:
+        pass
+
+
+# Set up a concrete LocalSnapshotSink class that inherits from ISnapshotSink
+class LocalSnapshotSink(ISnapshotSink):
+    def __init__(self, target_path: str, file_name: str='prem_league_table', file_extension: str='csv', coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.target_path = target_path
+        self.file_name = file_name
+        self.file_extension = file_extension
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Write into a temp file in the target folder first, so readers never see a half-written snapshot
+    def write_bytes(self, payload: bytes, match_date: str) -> str:
+        os.makedirs(self.target_path, exist_ok=True)
+        file_path = f'{self.target_path}/{self.file_name}_{match_date}.{self.file_extension}'
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.target_path, prefix=f'.{self.file_name}_{match_date}-', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_path, file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.file_logger.log_event_as_debug(f">>> Wrote {len(payload)} bytes to local sink '{file_path}' ...")
+        return file_path
+
+
+# Set up a concrete S3SnapshotSink class that inherits from ISnapshotSink
+class S3SnapshotSink(ISnapshotSink):
+    def __init__(self, s3_client, s3_bucket: str, s3_folder: str, file_name: str='prem_league_table', file_extension: str='csv', resilient_caller: ResilientCaller=None, concurrency_controller: ConcurrencyController=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_folder = s3_folder
+        self.file_name = file_name
+        self.file_extension = file_extension
+        self.resilient_caller = resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        self.concurrency_controller = concurrency_controller
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def write_bytes(self, payload: bytes, match_date: str) -> str:
+        s3_key = f'{self.s3_folder}/{self.file_name}_{match_date}.{self.file_extension}'
+        put_object = self.s3_client.put_object if self.concurrency_controller is None else self.concurrency_controller.wrap(self.s3_client.put_object)
+        self.resilient_caller.call(put_object, host=f's3://{self.s3_bucket}', operation_name='put_object', Bucket=self.s3_bucket, Key=s3_key, Body=payload)
+
+        self.file_logger.log_event_as_debug(f">>> Wrote {len(payload)} bytes to S3 sink 's3://{self.s3_bucket}/{s3_key}' ...")
+        return f's3://{self.s3_bucket}/{s3_key}'
@@ -0,0 +1,413 @@
+from __future__ import annotations
+import io
+import os
+import json
+import zlib
+import tempfile
+from typing import Dict, Iterator, Optional
+from datetime import datetime
+from pathlib import Path
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.transformers import STANDINGS_COLUMN_MAPPING, LeanStandingsTable, StandingsRow, TableStandingsDataTransformer
+
+
+
+# ================================================ STREAMING WRITER ================================================
+
+# Set up abstract base class for Streaming File Writer that defines interface for writing dataframes chunk by chunk
+class IStreamingFileWriter(ABC):
+    @abstractmethod
+    def write_chunk(self, chunk_df: pd.DataFrame):
+        pass
+
+    @abstractmethod
+    def flush(self):
+        pass
+
+    @abstractmethod
+    def close(self) -> Optional[str]:
+        pass
+
+
+# Set up a StreamingCSVFileWriter class that inherits from IStreamingFileWriter
+class StreamingCSVFileWriter(IStreamingFileWriter):
+    """
+    Serialises each incoming chunk into an in-memory CSV buffer and hands the buffer to '_write_buffer'
+    whenever it grows past 'max_buffer_bytes'. The buffer is the only thing that grows with the data, so
+    peak memory stays flat no matter how many snapshots are streamed through the writer.
+
+    Between 'begin_part' and 'commit_part' the chunks are staged in a separate part buffer (one snapshot's
+    rows), so a snapshot that fails partway or fails validation is dropped with 'discard_part' and none of its
+    rows reach the output. The header is written once, with the first committed part.
+    """
+
+    def __init__(self, max_buffer_bytes: int, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.max_buffer_bytes = max_buffer_bytes
+        self.csv_buffer = io.StringIO()
+        self.header_written = False
+        self.rows_written = 0
+        self.part_buffer = None
+        self.part_header = None
+        self.part_rows = 0
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @abstractmethod
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        pass
+
+
+    # Implement StreamingCSVFileWriter methods for staging the chunks of one snapshot as a part
+    def begin_part(self):
+        self.part_buffer = io.StringIO()
+        self.part_header = None
+        self.part_rows = 0
+
+
+    def commit_part(self):
+        if self.part_buffer is None:
+            raise RuntimeError('No part to commit - call begin_part first')
+        if not self.header_written and self.part_header is not None:
+            self.csv_buffer.write(self.part_header)
+            self.header_written = True
+
+        self.csv_buffer.write(self.part_buffer.getvalue())
+        self.rows_written += self.part_rows
+        self.part_buffer = None
+
+        if self.csv_buffer.tell() >= self.max_buffer_bytes:
+            self.flush()
+
+
+    def discard_part(self):
+        self.part_buffer = None
+
+
+    # Implement StreamingCSVFileWriter methods for buffering and flushing chunks
+    def write_chunk(self, chunk_df: pd.DataFrame):
+        if self.part_buffer is not None:
+            if self.part_header is None:
+                self.part_header = chunk_df.head(0).to_csv(index=False)
+            chunk_df.to_csv(self.part_buffer, index=False, header=False)
+            self.part_rows += len(chunk_df)
+            return
+
+        chunk_df.to_csv(self.csv_buffer, index=False, header=not self.header_written)
+        self.header_written = True
+        self.rows_written += len(chunk_df)
+
+        if self.csv_buffer.tell() >= self.max_buffer_bytes:
+            self.flush()
+
+
+    def flush(self, is_last: bool=False):
+        buffer_bytes = self.csv_buffer.getvalue().encode('utf-8')
+        if not buffer_bytes and not is_last:
+            return
+
+        self.file_logger.log_event_as_debug(f'>>> Flushing {len(buffer_bytes)} bytes from the streaming CSV buffer ...')
+        self._write_buffer(buffer_bytes, is_last=is_last)
+
+        self.csv_buffer.seek(0)
+        self.csv_buffer.truncate(0)
+
+
+# Set up a concrete LocalStreamingCSVFileWriter class that inherits from StreamingCSVFileWriter
+class LocalStreamingCSVFileWriter(StreamingCSVFileWriter):
+
+    def __init__(self, file_path: str, max_buffer_bytes: int=8 * 1024 * 1024, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        super().__init__(max_buffer_bytes=max_buffer_bytes, coloured_console_logs=coloured_console_logs, file_logger=file_logger)
+        self.file_path = file_path
+        self.output_file = open(self.file_path, 'wb')
+
+
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        self.output_file.write(buffer_bytes)
+        self.output_file.flush()
+
+
+    # Drop the partly written file, so a failed stream never leaves a truncated output behind
+    def abort(self):
+        self.output_file.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+
+    def close(self) -> Optional[str]:
+        try:
+            self.flush(is_last=True)
+            self.output_file.close()
+        except Exception as e:
+            self.console_logger.log_event_as_warning(e)
+            self.abort()
+            return None
+
+        self.console_logger.log_event_as_debug(f">>> Successfully streamed {self.rows_written} rows to local target location '{self.file_path}' ... ")
+        return self.file_path
+
+
+# Set up an S3MultipartUpload class that sends a stream of buffers to one S3 object
+class S3MultipartUpload:
+    """
+    Sends each buffer as the next part of a multipart upload. S3 rejects parts smaller than 5 MiB (except the
+    last one), so writers must buffer at least 'MIN_PART_BYTES' between parts. Streams that never fill a single
+    part are sent with one 'put_object' call instead.
+    """
+
+    MIN_PART_BYTES = 5 * 1024 * 1024
+
+    def __init__(self, s3_client, s3_bucket: str, s3_key: str, object_args: Dict[str, str]=None):
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_key = s3_key
+        self.object_args = object_args or {}
+        self.upload_id = None
+        self.uploaded_parts = []
+
+
+    def write_part(self, buffer_bytes: bytes, is_last: bool):
+        if is_last and self.upload_id is None:
+            self.s3_client.put_object(Bucket=self.s3_bucket, Key=self.s3_key, Body=buffer_bytes, **self.object_args)
+            return
+
+        if self.upload_id is None:
+            self.upload_id = self.s3_client.create_multipart_upload(Bucket=self.s3_bucket, Key=self.s3_key, **self.object_args)['UploadId']
+
+        if buffer_bytes:
+            part_number = len(self.uploaded_parts) + 1
+            response = self.s3_client.upload_part(Bucket=self.s3_bucket, Key=self.s3_key, UploadId=self.upload_id, PartNumber=part_number, Body=buffer_bytes)
+            self.uploaded_parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
+        if is_last:
+            self.s3_client.complete_multipart_upload(Bucket=self.s3_bucket, Key=self.s3_key, UploadId=self.upload_id, MultipartUpload={'Parts': self.uploaded_parts})
+
+
+    def abort(self):
+        if self.upload_id is not None:
+            self.s3_client.abort_multipart_upload(Bucket=self.s3_bucket, Key=self.s3_key, UploadId=self.upload_id)
+            self.upload_id = None
+
+
+
+# Set up a concrete S3StreamingCSVFileWriter class that inherits from StreamingCSVFileWriter
+class S3StreamingCSVFileWriter(StreamingCSVFileWriter):
+    """
+    Streams chunks into a single S3 object through a multipart upload. The buffer ceiling is raised to the
+    5 MiB minimum part size if needed.
+    """
+
+    MIN_PART_BYTES = S3MultipartUpload.MIN_PART_BYTES
+
+    def __init__(self, s3_client, s3_bucket: str, s3_key: str, max_buffer_bytes: int=8 * 1024 * 1024, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        super().__init__(max_buffer_bytes=max(max_buffer_bytes, self.MIN_PART_BYTES), coloured_console_logs=coloured_console_logs, file_logger=file_logger)
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_key = s3_key
+        self.multipart_upload = S3MultipartUpload(s3_client=s3_client, s3_bucket=s3_bucket, s3_key=s3_key)
+
+
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        self.multipart_upload.write_part(buffer_bytes, is_last=is_last)
+
+
+    def abort(self):
+        self.multipart_upload.abort()
+
+
+    def close(self) -> Optional[str]:
+        try:
+            self.flush(is_last=True)
+        except Exception as e:
+            self.console_logger.log_event_as_warning(e)
+            self.abort()
+            return None
+
+        self.console_logger.log_event_as_debug(f">>> Successfully streamed {self.rows_written} rows to cloud target location 's3://{self.s3_bucket}/{self.s3_key}' ... ")
+        return f"s3://{self.s3_bucket}/{self.s3_key}"
+
+
+# Set up a StreamingNDJSONFileWriter class that encodes chunks as typed newline-delimited JSON records
+class StreamingNDJSONFileWriter(IStreamingFileWriter):
+    """
+    Encodes each incoming chunk row by row into newline-delimited JSON and (optionally) pushes the bytes
+    through a streaming gzip compressor, so only the current chunk's lines and the output buffer are ever in
+    memory - never the whole batch as one string. The buffer is handed to '_write_buffer' whenever it grows
+    past 'max_buffer_bytes'.
+
+    Records are typed for downstream consumers: the stat columns get the warehouse names ('home_W' ->
+    'home_won') and are written as JSON integers, 'match_date' is an ISO date and each record carries its league.
+    Chunks can be dataframes or LeanStandingsTables (whose StandingsRow fields already carry the warehouse names);
+    anything else raises a TypeError.
+    """
+
+    STAT_FIELDS = [field for field in STANDINGS_COLUMN_MAPPING.values() if field != 'team']
+
+    def __init__(self, league: str, max_buffer_bytes: int, compress: bool=False, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.league = league
+        self.max_buffer_bytes = max_buffer_bytes
+        self.compress = compress
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None      # wbits=31 writes a gzip stream
+        self.output_buffer = io.BytesIO()
+        self.rows_written = 0
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @abstractmethod
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        pass
+
+
+    # Split a dataframe into chunks of at most 'chunk_size' rows - a lean table is small enough to go as one
+    @staticmethod
+    def iter_table_chunks(table: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+        if isinstance(table, LeanStandingsTable) or not isinstance(table, pd.DataFrame):      # Lean tables never import pandas
+            yield table
+            return
+
+        for chunk_start in range(0, len(table), chunk_size):
+            yield table.iloc[chunk_start:chunk_start + chunk_size]
+
+
+    # Yield one typed JSON line per row of a transformed chunk
+    def iter_encoded_lines(self, chunk_df: pd.DataFrame) -> Iterator[bytes]:
+        if isinstance(chunk_df, LeanStandingsTable):
+            field_names, rows = StandingsRow._fields, chunk_df.rows
+        elif isinstance(chunk_df, pd.DataFrame):
+            unique_columns = TableStandingsDataTransformer.get_unique_columns(list(chunk_df.columns))
+            field_names = [STANDINGS_COLUMN_MAPPING.get(column, column) for column in unique_columns.values()]
+            rows = chunk_df.iloc[:, list(unique_columns.keys())].itertuples(index=False, name=None)
+        else:
+            raise TypeError(f"Cannot encode a '{type(chunk_df).__name__}' chunk as NDJSON - expected a dataframe or a LeanStandingsTable")
+        iso_dates = {}
+
+        for row in rows:
+            record = {'league': self.league}
+            for field_name, value in zip(field_names, row):
+                if field_name in self.STAT_FIELDS:
+                    value = int(value) if str(value).strip().lstrip('-').isdigit() else None
+                elif field_name == 'match_date':
+                    value = iso_dates.setdefault(value, datetime.strptime(value, '%Y-%b-%d').date().isoformat())
+                record[field_name] = value
+            yield (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+
+
+    # Implement StreamingNDJSONFileWriter methods for encoding, compressing and flushing chunks
+    def write_chunk(self, chunk_df: pd.DataFrame):
+        for encoded_line in self.iter_encoded_lines(chunk_df):
+            self.output_buffer.write(self.compressor.compress(encoded_line) if self.compress else encoded_line)
+            self.rows_written += 1
+
+            if self.output_buffer.tell() >= self.max_buffer_bytes:
+                self.flush()
+
+
+    def flush(self, is_last: bool=False):
+        if is_last and self.compress:
+            self.output_buffer.write(self.compressor.flush())
+
+        buffer_bytes = self.output_buffer.getvalue()
+        if not buffer_bytes and not is_last:
+            return
+
+        self.file_logger.log_event_as_debug(f'>>> Flushing {len(buffer_bytes)} bytes from the streaming NDJSON buffer ...')
+        self._write_buffer(buffer_bytes, is_last=is_last)
+
+        self.output_buffer.seek(0)
+        self.output_buffer.truncate(0)
+
+
+# Set up a concrete LocalStreamingNDJSONFileWriter class that inherits from StreamingNDJSONFileWriter
+class LocalStreamingNDJSONFileWriter(StreamingNDJSONFileWriter):
+    """
+    Writes to a temp file next to 'file_path' and renames it into place on close, so readers never see a
+    half-written file. Live feeds that consumers tail while they grow pass 'atomic=False' to append to
+    'file_path' directly.
+    """
+
+    def __init__(self, file_path: str, league: str, max_buffer_bytes: int=8 * 1024 * 1024, compress: bool=False, atomic: bool=True, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        super().__init__(league=league, max_buffer_bytes=max_buffer_bytes, compress=compress, coloured_console_logs=coloured_console_logs, file_logger=file_logger)
+        self.file_path = file_path
+        self.atomic = atomic
+        target_folder = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(target_folder, exist_ok=True)
+        if self.atomic:
+            file_descriptor, self.temp_path = tempfile.mkstemp(dir=target_folder, prefix=f'.{Path(file_path).name}-', suffix='.tmp')
+            self.output_file = os.fdopen(file_descriptor, 'wb')
+        else:
+            self.temp_path = None
+            self.output_file = open(self.file_path, 'ab')
+
+
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        self.output_file.write(buffer_bytes)
+        self.output_file.flush()
+
+
+    def abort(self):
+        self.output_file.close()
+        if self.temp_path is not None and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+    def close(self) -> Optional[str]:
+        try:
+            self.flush(is_last=True)
+            self.output_file.close()
+            if self.temp_path is not None:
+                os.replace(self.temp_path, self.file_path)
+        except Exception as e:
+            self.console_logger.log_event_as_warning(e)
+            self.abort()
+            return None
+
+        self.console_logger.log_event_as_debug(f">>> Successfully streamed {self.rows_written} NDJSON records to local target location '{self.file_path}' ... ")
+        return self.file_path
+
+
+# Set up a concrete S3StreamingNDJSONFileWriter class that inherits from StreamingNDJSONFileWriter
+class S3StreamingNDJSONFileWriter(StreamingNDJSONFileWriter):
+    """
+    Streams the encoded records into one S3 object, switching to a multipart upload once the batch outgrows a
+    single 'max_buffer_bytes' part (at least 5 MiB). Compressed objects are tagged with 'Content-Encoding: gzip'.
+    """
+
+    def __init__(self, s3_client, s3_bucket: str, s3_key: str, league: str, max_buffer_bytes: int=8 * 1024 * 1024, compress: bool=False, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        super().__init__(league=league, max_buffer_bytes=max(max_buffer_bytes, S3MultipartUpload.MIN_PART_BYTES), compress=compress, coloured_console_logs=coloured_console_logs, file_logger=file_logger)
+        self.s3_bucket = s3_bucket
+        self.s3_key = s3_key
+        object_args = {'ContentType': 'application/x-ndjson'}
+        if compress:
+            object_args['ContentEncoding'] = 'gzip'
+        self.multipart_upload = S3MultipartUpload(s3_client=s3_client, s3_bucket=s3_bucket, s3_key=s3_key, object_args=object_args)
+
+
+    def _write_buffer(self, buffer_bytes: bytes, is_last: bool):
+        self.multipart_upload.write_part(buffer_bytes, is_last=is_last)
+
+
+    def abort(self):
+        self.multipart_upload.abort()
+
+
+    def close(self) -> Optional[str]:
+        try:
+            self.flush(is_last=True)
+        except Exception as e:
+            self.console_logger.log_event_as_warning(e)
+            self.abort()
+            return None
+
+        self.console_logger.log_event_as_debug(f">>> Successfully streamed {self.rows_written} NDJSON records to cloud target location 's3://{self.s3_bucket}/{self.s3_key}' ... ")
+        return f"s3://{self.s3_bucket}/{self.s3_key}"
@@ -0,0 +1,265 @@
+from __future__ import annotations
+import json
+import random
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from datetime import datetime
+from collections import Counter
+from pathlib import Path
+from football_engine.dependencies import np
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.extractors import StandingsColumnarBatch
+from football_engine.transformers import IDataTransformer
+from football_engine.loadtest import ReplayPageServer
+from football_engine.results import MatchResult
+
+
+
+# ================================================ SYNTHETIC DATA ================================================
+
+# Set up a SyntheticLeagueTableGenerator class that plays out whole seasons and emits twtd-style tables for them
+class SyntheticLeagueTableGenerator:
+    """
+    Generates league tables with the same layout the extractor scrapes from twtd.co.uk - 'Pos', 'Team', 'P', a
+    blank spacer, the home 'W D L GF GA' block, a spacer, the repeated away block, a spacer, 'GD', 'Pts' - for
+    any league size, season or league, without touching the site.
+
+    A season is a double round robin (every team hosts every other team once, circle-method fixtures, one
+    matchday per week from the second Saturday of August). Scores are drawn from Poisson distributions with a
+    home advantage and a fixed strength per team, and the table after each matchday is accumulated from those
+    results, so every snapshot satisfies the validator's invariants: P = W + D + L, Pts = 3W + D, GD = GF - GA,
+    positions 1..N ordered by points, goal difference, goals scored and name.
+
+    Everything is driven by one seeded generator, so the same arguments always give the same tables. The
+    results played out by the last 'iter_season' are kept in 'match_results'.
+    """
+
+    RAW_COLUMNS         =   ['Pos', 'Team', 'P', ' ', 'W', 'D', 'L', 'GF', 'GA', ' ', 'W', 'D', 'L', 'GF', 'GA', ' ', 'GD', 'Pts']
+    LEAGUE_TITLES       =   {'premier-league': 'Premier League', 'bundesliga': 'Bundesliga', 'la-liga': 'La Liga', 'serie-a': 'Serie A', 'ligue-1': 'Ligue 1'}
+    FILE_NAMES          =   {'premier-league': 'prem_league_table'}     # Same as the league plugins' file names; other leagues get '<league>_table'
+    TEAM_PLACE_NAMES    =   ['Ashford', 'Barnsworth', 'Castlebridge', 'Dunmore', 'Eastham', 'Fairhaven', 'Glenmouth', 'Harrowgate', 'Ironbridge', 'Kingsmere', 'Langdale', 'Marshfield',
+                             'Northwick', 'Oakham', 'Portland', 'Queensbury', 'Redcliffe', 'Stanmore', 'Thornbury', 'Upton', 'Westbrook', 'Yarmouth', 'Whitby', 'Brackley']
+    TEAM_SUFFIXES       =   ['United', 'City', 'Town', 'Rovers', 'Athletic', 'Wanderers', 'Albion', 'County']
+
+    def __init__(self, league: str='premier-league', league_size: int=20, team_names: List[str]=None, home_goals_mean: float=1.55, away_goals_mean: float=1.2, seed: int=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        if team_names is not None and len(team_names) != league_size:
+            raise ValueError(f'Expected {league_size} team names, got {len(team_names)}')
+        if league_size < 2 or (team_names is None and league_size > len(self.TEAM_PLACE_NAMES) * len(self.TEAM_SUFFIXES)):
+            raise ValueError(f'Unsupported league size {league_size}')
+
+        self.league = league
+        self.league_title = self.LEAGUE_TITLES.get(league, league.replace('-', ' ').title())
+        self.file_name = self.FILE_NAMES.get(league, f"{league.replace('-', '_')}_table")
+        self.league_size = league_size
+        self.home_goals_mean = home_goals_mean
+        self.away_goals_mean = away_goals_mean
+        self.random_generator = np.random.default_rng(seed)
+        self.team_names = team_names or self.generate_team_names(league_size)
+        self.match_results: List[MatchResult] = []
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Pair place names with suffixes ('Ashford United', 'Barnsworth City', ...) until there is one unique name per team
+    def generate_team_names(self, league_size: int) -> List[str]:
+        place_names = list(self.random_generator.permutation(self.TEAM_PLACE_NAMES))
+        team_names = []
+        for name_number in range(league_size):
+            suffix = self.TEAM_SUFFIXES[(name_number // len(place_names) + name_number) % len(self.TEAM_SUFFIXES)]
+            team_names.append(f'{place_names[name_number % len(place_names)]} {suffix}')
+        return team_names
+
+
+    # Circle method: one list of (home, away) team indexes per matchday, with home and away swapped in the second half
+    def get_fixtures(self) -> List[List[Tuple[int, int]]]:
+        team_slots = list(range(self.league_size)) + ([None] if self.league_size % 2 else [])
+        first_half = []
+        for round_number in range(len(team_slots) - 1):
+            pairings = [(team_slots[slot], team_slots[-1 - slot]) for slot in range(len(team_slots) // 2)]
+            first_half.append([(home, away) if (round_number + slot) % 2 == 0 else (away, home) for slot, (home, away) in enumerate(pairings) if home is not None and away is not None])
+            team_slots = [team_slots[0], team_slots[-1]] + team_slots[1:-1]
+        return first_half + [[(away, home) for home, away in matchday] for matchday in first_half]
+
+
+    @staticmethod
+    def get_match_dates(season_start_year: int, matchday_count: int) -> List[str]:
+        first_saturday = datetime(season_start_year, 8, 1)
+        first_saturday = first_saturday.fromordinal(first_saturday.toordinal() + (5 - first_saturday.weekday()) % 7 + 7)
+        return [first_saturday.fromordinal(first_saturday.toordinal() + 7 * matchday).strftime('%Y-%b-%d') for matchday in range(matchday_count)]
+
+
+    # Turn the accumulated home/away stats (one row of 10 ints per team) into the scraped table for one date
+    def build_scraped_content(self, team_stats: np.ndarray) -> List[List[str]]:
+        home_stats, away_stats = team_stats[:, :5], team_stats[:, 5:]
+        played = home_stats[:, :3].sum(axis=1) + away_stats[:, :3].sum(axis=1)
+        points = 3 * (home_stats[:, 0] + away_stats[:, 0]) + home_stats[:, 1] + away_stats[:, 1]
+        goals_for, goals_against = home_stats[:, 3] + away_stats[:, 3], home_stats[:, 4] + away_stats[:, 4]
+        goal_difference = goals_for - goals_against
+
+        table_order = sorted(range(self.league_size), key=lambda team: (-points[team], -goal_difference[team], -goals_for[team], self.team_names[team]))
+        scraped_content = [list(self.RAW_COLUMNS)]
+        for position, team in enumerate(table_order, start=1):
+            scraped_content.append([str(position), self.team_names[team], str(played[team]), ' '] + [str(stat) for stat in home_stats[team]] + [' '] + [str(stat) for stat in away_stats[team]] + [' ', str(goal_difference[team]), str(points[team])])
+        return scraped_content
+
+
+    # Implement SyntheticLeagueTableGenerator method for playing out one season, yielding the table after every matchday
+    def iter_season(self, season_start_year: int) -> Iterator[Tuple[str, List[List[str]]]]:
+        fixtures = self.get_fixtures()
+        team_strengths = self.random_generator.lognormal(mean=0.0, sigma=0.25, size=self.league_size)
+        team_stats = np.zeros((self.league_size, 10), dtype=np.int64)
+        self.match_results = []
+
+        for match_date, matchday in zip(self.get_match_dates(season_start_year, len(fixtures)), fixtures):
+            for home, away in matchday:
+                home_goals = int(self.random_generator.poisson(self.home_goals_mean * team_strengths[home] / team_strengths[away]))
+                away_goals = int(self.random_generator.poisson(self.away_goals_mean * team_strengths[away] / team_strengths[home]))
+                home_result, away_result = (0, 2) if home_goals > away_goals else (2, 0) if home_goals < away_goals else (1, 1)
+
+                team_stats[home, home_result] += 1
+                team_stats[home, 3:5] += (home_goals, away_goals)
+                team_stats[away, 5 + away_result] += 1
+                team_stats[away, 8:10] += (away_goals, home_goals)
+                self.match_results.append(MatchResult(match_date, self.team_names[home], self.team_names[away], home_goals, away_goals))
+
+            yield match_date, self.build_scraped_content(team_stats)
+
+
+    def generate_season(self, season_start_year: int) -> Dict[str, List[List[str]]]:
+        return dict(self.iter_season(season_start_year))
+
+
+    def render_page(self, scraped_content: List[List[str]]) -> str:
+        return ReplayPageServer.render_table_page(scraped_content, league_title=self.league_title)
+
+
+
+# Set up a SyntheticDataCorruptor class that breaks generated tables in known, recorded ways
+class SyntheticDataCorruptor:
+    """
+    Corrupts a copy of a generated 'scraped_content' so the transformer, validator, quarantine and uploaders can
+    be exercised with bad data on purpose. Each table is corrupted with probability 'corruption_rate', with one
+    of 'corruption_kinds' picked at random:
+
+    - 'blank_cell'          ->  a stat cell is emptied              (caught as a failed row check)
+    - 'non_numeric_cell'    ->  a stat cell becomes text            (caught as a failed row check)
+    - 'points_mismatch'     ->  a team's Pts is off by one          (caught by the 'points' check)
+    - 'played_mismatch'     ->  a team's P is off by one            (caught by the 'played' check)
+    - 'goal_difference'     ->  a team's GD is off by one           (caught by the 'goal_difference' check)
+    - 'duplicate_position'  ->  two teams share a position          (caught by the 'unique_positions' check)
+    - 'missing_row'         ->  a team's row is dropped             (caught by the 'row_count' check)
+    - 'truncated_row'       ->  a row loses its last cells          (caught as a failed row check)
+
+    'corrupt' returns the table together with a description of what was changed (None when it was left intact):
+    the kind, and the team whose row was corrupted - or, for 'missing_row', the team no longer in the table.
+    'duplicate_position' needs at least two rows and is not picked for smaller tables.
+    """
+
+    CORRUPTION_KINDS = ('blank_cell', 'non_numeric_cell', 'points_mismatch', 'played_mismatch', 'goal_difference', 'duplicate_position', 'missing_row', 'truncated_row')
+
+    def __init__(self, corruption_rate: float=0.1, corruption_kinds: Iterable[str]=CORRUPTION_KINDS, seed: int=None):
+        unknown_kinds = set(corruption_kinds) - set(self.CORRUPTION_KINDS)
+        if unknown_kinds:
+            raise ValueError(f'Unknown corruption kind(s) {sorted(unknown_kinds)} - choose from {self.CORRUPTION_KINDS}')
+
+        self.corruption_rate = corruption_rate
+        self.corruption_kinds = list(corruption_kinds)
+        self.random_generator = random.Random(seed)
+
+
+    # Implement SyntheticDataCorruptor method for corrupting (or passing through) one table
+    def corrupt(self, scraped_content: List[List[str]]) -> Tuple[List[List[str]], Optional[Dict]]:
+        if not self.corruption_kinds or self.random_generator.random() >= self.corruption_rate:
+            return scraped_content, None
+
+        header, corrupted_rows = scraped_content[0], [list(row) for row in scraped_content[1:]]
+        # A position can only be duplicated from another row, so single-row tables skip that kind
+        applicable_kinds = [kind for kind in self.corruption_kinds if kind != 'duplicate_position' or len(corrupted_rows) >= 2]
+        if not corrupted_rows or not applicable_kinds:
+            return scraped_content, None
+
+        corruption_kind = self.random_generator.choice(applicable_kinds)
+        row_number = self.random_generator.randrange(len(corrupted_rows))
+        corrupted_row = corrupted_rows[row_number]
+        corrupted_team = corrupted_row[1]
+        stat_positions = [position for position, column in enumerate(header) if column.strip() and column not in ('Pos', 'Team')]
+
+        if corruption_kind in ('blank_cell', 'non_numeric_cell'):
+            corrupted_row[self.random_generator.choice(stat_positions)] = '' if corruption_kind == 'blank_cell' else 'n/a'
+        elif corruption_kind in ('points_mismatch', 'played_mismatch', 'goal_difference'):
+            column_position = header.index({'points_mismatch': 'Pts', 'played_mismatch': 'P', 'goal_difference': 'GD'}[corruption_kind])
+            corrupted_row[column_position] = str(int(corrupted_row[column_position]) + self.random_generator.choice((-1, 1)))
+        elif corruption_kind == 'duplicate_position':
+            corrupted_row[0] = corrupted_rows[row_number - 1 if row_number else 1][0]
+        elif corruption_kind == 'missing_row':
+            del corrupted_rows[row_number]
+        elif corruption_kind == 'truncated_row':
+            del corrupted_row[-self.random_generator.randint(1, 3):]
+
+        return [header] + corrupted_rows, {'kind': corruption_kind, 'team': corrupted_team}
+
+
+
+# Set up a SyntheticDatasetWriter class that writes generated seasons out as replayable pages and CSV snapshots
+class SyntheticDatasetWriter:
+    """
+    Plays out 'seasons' for every generator and writes, per (league, match date), the rendered page to
+    '<target_folder>/<league>/pages/<date>.html' (loadable by ReplayPageServer.load_recorded_pages) and the
+    transformed snapshot to '<target_folder>/<league>/snapshots/<file name>_<date>.csv', in the same format
+    as the real uploads. Corrupted tables are recorded in '<target_folder>/<league>/corruptions.json'; their
+    snapshots are written as-is, without validation, so downstream code sees them too. The file name is the
+    generator's league file name (e.g. 'prem_league_table', 'bundesliga_table') unless 'file_name' is given.
+    """
+
+    def __init__(self, generators: List[SyntheticLeagueTableGenerator], target_folder: str, data_transformer: IDataTransformer, corruptor: SyntheticDataCorruptor=None, file_name: Optional[str]=None,
+                 write_pages: bool=True, write_snapshots: bool=True, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.generators = generators
+        self.target_folder = target_folder
+        self.data_transformer = data_transformer
+        self.corruptor = corruptor
+        self.file_name = file_name
+        self.write_pages = write_pages
+        self.write_snapshots = write_snapshots
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement SyntheticDatasetWriter method for generating and writing every season of every league
+    def write(self, seasons: Iterable[int]) -> Counter:
+        written_counts = Counter()
+        seasons = list(seasons)
+
+        for generator in self.generators:
+            league_folder = Path(self.target_folder) / generator.league
+            (league_folder / 'pages').mkdir(parents=True, exist_ok=True)
+            (league_folder / 'snapshots').mkdir(parents=True, exist_ok=True)
+            corruptions = {}
+
+            for season_start_year in seasons:
+                for match_date, scraped_content in generator.iter_season(season_start_year):
+                    if self.corruptor is not None:
+                        scraped_content, corruption = self.corruptor.corrupt(scraped_content)
+                        if corruption is not None:
+                            corruptions[match_date] = corruption
+                            written_counts['corrupted'] += 1
+
+                    if self.write_pages:
+                        (league_folder / 'pages' / f'{match_date}.html').write_text(generator.render_page(scraped_content), encoding='utf-8')
+                        written_counts['pages'] += 1
+                    if self.write_snapshots:
+                        snapshot_df = self.data_transformer.transform_data(StandingsColumnarBatch.from_scraped_content(scraped_content), match_date=match_date)
+                        snapshot_df.to_csv(league_folder / 'snapshots' / f'{self.file_name or generator.file_name}_{match_date}.csv', index=False)
+                        written_counts['snapshots'] += 1
+
+            with open(league_folder / 'corruptions.json', 'w') as corruptions_file:
+                json.dump(corruptions, corruptions_file, indent=2, sort_keys=True)
+            self.console_logger.log_event_as_info(f">>> Wrote synthetic {generator.league} data for season(s) {seasons} to '{league_folder}' ({len(corruptions)} corrupted table(s)) ...")
+
+        return written_counts
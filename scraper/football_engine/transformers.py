@@ -0,0 +1,302 @@
+from __future__ import annotations
+import io
+import csv
+from typing import List, Dict, Iterable, Iterator, Optional, NamedTuple
+from itertools import islice
+from collections import Counter
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.extractors import StandingsColumnarBatch, TableExtractionSpec
+
+
+
+# ================================================ DATA TRANSFORMER ================================================
+
+# Map the transformers' (de-duplicated) column names onto the warehouse columns
+STANDINGS_COLUMN_MAPPING = {
+    'Pos':      'position',
+    'Team':     'team',
+    'P':        'played',
+    'home_W':   'home_won',
+    'home_D':   'home_drawn',
+    'home_L':   'home_lost',
+    'home_GF':  'home_goals_for',
+    'home_GA':  'home_goals_against',
+    'away_W':   'away_won',
+    'away_D':   'away_drawn',
+    'away_L':   'away_lost',
+    'away_GF':  'away_goals_for',
+    'away_GA':  'away_goals_against',
+    'GD':       'goal_difference',
+    'Pts':      'points',
+}
+
+
+# Set up abstract base class for Data Transformer that defines interface for data transformers
+class IDataTransformer(ABC):
+    @abstractmethod
+    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
+        pass
+
+
+# Set up a concrete TableStandingsDataTransformer class that inherits from IDataTransformer
+class TableStandingsDataTransformer(IDataTransformer):
+    @abstractmethod
+    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
+        pass
+
+
+    # Drop spacer columns and give the repeated home/away headers unique names
+    @staticmethod
+    def get_unique_columns(columns: List[str]) -> Dict[int, str]:
+        column_counts = Counter(column for column in columns if column.strip())
+        seen_columns = Counter()
+        unique_columns = {}
+
+        for column_position, column in enumerate(columns):
+            if not column.strip():
+                continue
+            if column_counts[column] > 1:
+                unique_columns[column_position] = f"{'home' if seen_columns[column] == 0 else 'away'}_{column}"
+            else:
+                unique_columns[column_position] = column
+            seen_columns[column] += 1
+
+        return unique_columns
+
+
+
+# Set up a concrete PremierLeagueTableStandingsDataTransformer class that inherits from TableStandingsDataTransformer
+class PremierLeagueTableStandingsDataTransformer(TableStandingsDataTransformer):
+    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement PremierLeagueTableStandingsDataTransformer method for transforming data  
+    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
+
+        # Columnar batches already hold typed columns - wrap them instead of copying rows into object columns
+        if isinstance(scraped_content, StandingsColumnarBatch):
+            self.file_logger.log_event_as_debug(f'>>>> Transforming {len(scraped_content)} columnar rows of Premier League content...')
+            return scraped_content.to_dataframe(match_date)
+
+        try:
+            self.file_logger.log_event_as_debug(f'>>>> Transforming scraped Premier League content...')
+        
+            scraped_data            =   scraped_content[1:]
+            scraped_columns         =   scraped_content[0]
+
+            table_df                =   pd.DataFrame(data=scraped_data, columns=scraped_columns)
+            table_df['match_date']  =   match_date
+
+            self.file_logger.log_event_as_debug(f'>>>> Successfully transformed Premier League content...')
+        except Exception as e:
+            self.console_logger.log_event_as_error(e)
+
+        return table_df
+
+
+    # Transform a stream of scraped rows (header first) into dataframes of at most 'chunk_size' rows
+    def iter_transformed_chunks(self, scraped_rows: Iterable[List[str]], match_date: str, chunk_size: int=500) -> Iterator[pd.DataFrame]:
+        scraped_rows        =   iter(scraped_rows)
+        scraped_columns     =   next(scraped_rows, None)
+        if scraped_columns is None:
+            self.console_logger.log_event_as_warning(f'>>>> No Premier League content scraped for {match_date} ...')
+            return
+
+        chunk_counter = 0
+        while True:
+            scraped_data = list(islice(scraped_rows, chunk_size))
+            if not scraped_data:
+                break
+
+            chunk_counter           +=  1
+            chunk_df                =   pd.DataFrame(data=scraped_data, columns=scraped_columns)
+            chunk_df['match_date']  =   match_date
+            self.file_logger.log_event_as_debug(f'>>>> Transformed chunk no {chunk_counter} ({len(chunk_df)} rows) of Premier League content for {match_date}...')
+
+            yield chunk_df
+
+
+# Set up a StandingsRow record - the typed row schema of a league table, with the warehouse column names
+class StandingsRow(NamedTuple):
+    position: int
+    team: str
+    played: int
+    home_won: int
+    home_drawn: int
+    home_lost: int
+    home_goals_for: int
+    home_goals_against: int
+    away_won: int
+    away_drawn: int
+    away_lost: int
+    away_goals_for: int
+    away_goals_against: int
+    goal_difference: int
+    points: int
+    match_date: str
+
+
+# Set up a LeanStandingsTable class that holds a transformed table as typed rows instead of a dataframe
+class LeanStandingsTable:
+    """
+    Pandas-free stand-in for the transformed dataframe: the raw header (spacers, repeated home/away headers and
+    'match_date' included) plus one StandingsRow per team. 'to_csv_bytes' rebuilds the raw layout - ' ' in the
+    spacer columns - and writes it with the stdlib csv module, producing the same bytes as
+    'df.to_csv(index=False)' on the dataframe path.
+
+    A cell that is not a plain integer is kept as its original string, as on the dataframe path, so odd values
+    still reach the validator untouched.
+    """
+
+    __slots__ = ('raw_columns', 'rows', 'field_positions')
+
+    def __init__(self, raw_columns: List[str], rows: List[StandingsRow], field_positions: List[Optional[int]]):
+        self.raw_columns = raw_columns
+        self.rows = rows
+        self.field_positions = field_positions
+
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+    def __repr__(self) -> str:
+        return '\n'.join(','.join(str(cell) for cell in csv_row) for csv_row in self.iter_csv_rows())
+
+
+    @staticmethod
+    def parse_cell(cell):
+        if not isinstance(cell, str):
+            return cell
+        try:
+            value = int(cell)
+        except ValueError:
+            return cell
+        return value if str(value) == cell else cell
+
+
+    def iter_csv_rows(self) -> Iterator[list]:
+        yield self.raw_columns
+        for row in self.rows:
+            yield [' ' if field_position is None else row[field_position] for field_position in self.field_positions]
+
+
+    def to_csv_bytes(self, include_match_date: bool=True, header: bool=True) -> bytes:
+        csv_rows = islice(self.iter_csv_rows(), 0 if header else 1, None)
+        if not include_match_date:
+            kept_positions = [column_position for column_position, column in enumerate(self.raw_columns) if column != 'match_date']
+            csv_rows = ([csv_row[column_position] for column_position in kept_positions] for csv_row in csv_rows)
+
+        csv_buffer = io.StringIO()
+        csv.writer(csv_buffer, lineterminator='\n').writerows(csv_rows)
+        return csv_buffer.getvalue().encode('utf-8')
+
+
+
+# Set up a concrete PremierLeagueTableLeanStandingsTransformer class that inherits from TableStandingsDataTransformer
+class PremierLeagueTableLeanStandingsTransformer(TableStandingsDataTransformer):
+    """
+    Transforms a scraped table (rows or a StandingsColumnarBatch) into a LeanStandingsTable without importing
+    pandas - for frequent small runs, where building a dataframe for 20 rows costs more than the work itself.
+    Pairs with the lean branches of the validator and uploaders; only the standard league table layout is
+    supported, and a table with missing or extra (non-spacer) columns raises a ValueError.
+    """
+
+    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement PremierLeagueTableLeanStandingsTransformer method for transforming data into typed rows
+    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> LeanStandingsTable:
+        if isinstance(scraped_content, StandingsColumnarBatch):
+            raw_columns, scraped_rows = scraped_content.raw_columns, scraped_content.iter_rows()
+        else:
+            raw_columns, scraped_rows = scraped_content[0], scraped_content[1:]
+
+        column_mapping = STANDINGS_COLUMN_MAPPING
+        unique_columns = self.get_unique_columns(raw_columns)
+        missing_columns = [column for column in column_mapping if column not in unique_columns.values()]
+        if missing_columns:
+            raise ValueError(f'Lean transform needs the standard league table columns - missing {missing_columns}')
+
+        # A column outside the standard layout has no StandingsRow field, so it would be written out blank
+        unknown_columns = [column for column in unique_columns.values() if column not in column_mapping]
+        if unknown_columns:
+            raise ValueError(f'Lean transform only supports the standard league table columns - unknown {unknown_columns} (use the dataframe transformer)')
+
+        # Position of each StandingsRow field in the raw layout ('match_date' is the last raw column)
+        row_field_positions = {column_position: StandingsRow._fields.index(column_mapping[column]) for column_position, column in unique_columns.items() if column in column_mapping}
+        field_raw_positions = sorted(row_field_positions, key=row_field_positions.get)
+        match_date_field = StandingsRow._fields.index('match_date')
+
+        rows = []
+        for scraped_row in scraped_rows:
+            if not scraped_row:
+                continue
+            cells = [LeanStandingsTable.parse_cell(scraped_row[column_position]) if column_position < len(scraped_row) else '' for column_position in field_raw_positions]
+            rows.append(StandingsRow(*cells, match_date))
+
+        field_positions = [row_field_positions.get(column_position) for column_position in range(len(raw_columns))] + [match_date_field]
+        self.file_logger.log_event_as_debug(f'>>>> Transformed {len(rows)} rows of Premier League content into typed rows...')
+        return LeanStandingsTable(list(raw_columns) + ['match_date'], rows, field_positions)
+
+
+
+class BundesligaTableStandingsDataTransformer(TableStandingsDataTransformer):
+        pass
+
+
+class LaligaTableStandingsDataTransformer(TableStandingsDataTransformer):
+        pass
+
+
+class SerieATableStandingsDataTransformer(TableStandingsDataTransformer):
+        pass
+
+
+class Ligue1TableStandingsDataTransformer(TableStandingsDataTransformer):
+        pass
+
+
+# Set up a concrete SpecTableDataTransformer class that inherits from IDataTransformer
+class SpecTableDataTransformer(IDataTransformer):
+    """
+    Generic transformer for spec-driven tables: builds the dataframe from the header row, applies the spec's
+    column renames and type casts, and adds the 'match_date' column.
+    """
+
+    def __init__(self, extraction_spec: TableExtractionSpec, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.extraction_spec = extraction_spec
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Implement SpecTableDataTransformer method for transforming a table according to its spec
+    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
+        table_df = pd.DataFrame(data=scraped_content[1:], columns=scraped_content[0])
+        table_df = table_df.rename(columns=self.extraction_spec.column_mapping)
+
+        for column_name, column_type in self.extraction_spec.column_types.items():
+            if column_name in table_df.columns:
+                table_df[column_name] = table_df[column_name].map(column_type)
+
+        table_df['match_date'] = match_date
+        self.file_logger.log_event_as_debug(f">>>> Transformed {len(table_df)} '{self.extraction_spec.data_type}' row(s) for {match_date} ...")
+        return table_df
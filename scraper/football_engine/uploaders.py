@@ -0,0 +1,478 @@
+from __future__ import annotations
+import io
+import os
+import sqlite3
+from typing import List, Dict, Optional
+from datetime import datetime
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.config import Config
+from football_engine.resilience import ConcurrencyController, ResilientCaller
+from football_engine.transformers import LeanStandingsTable, STANDINGS_COLUMN_MAPPING, TableStandingsDataTransformer
+from football_engine.validators import TableStandingsDataValidator
+from football_engine.sinks import ISnapshotSink, LocalSnapshotSink
+from football_engine.streaming import LocalStreamingNDJSONFileWriter, S3StreamingNDJSONFileWriter
+
+
+
+# ================================================ DATA UPLOADER ================================================
+
+# Set up abstract base class for Data Loader that defines an interface for data uploaders
+class IFileUploader(ABC):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a concrete S3FileUploader class that inherits from IFileUploader
+class S3FileUploader(IFileUploader):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a concrete S3CSVFileUploader class that inherits from S3FileUploader
+class S3CSVFileUploader(S3FileUploader):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a concrete PremierLeagueTableS3CSVUploader class that inherits from S3CSVFileUploader
+class PremierLeagueTableS3CSVUploader(S3CSVFileUploader):
+
+    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger(), cfg: Config = Config(WRITE_FILES_TO_CLOUD=True), resilient_caller: ResilientCaller=None, concurrency_controller: ConcurrencyController=None):
+        self.cfg                    =   cfg
+        self.resilient_caller       =   resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        self.concurrency_controller =   concurrency_controller
+        self.file_name_prefix: str  = 'prem_league_table'
+        self.s3_client: str         =   self.cfg.S3_CLIENT
+        self.s3_bucket: str         =   self.cfg._S3_BUCKET
+        self.s3_folder: str         =   self.cfg._S3_FOLDER
+        self.s3_region: str         =   self.cfg._S3_REGION
+        self.file_logger            =   file_logger
+        self.coloured_console_logs  =   coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+
+    # Implement PremierLeagueTableS3CSVUploader method for uploading CSV files into S3 bucket
+    def upload_file(self, prem_league_df: pd.DataFrame, match_date: str):
+
+        if self.cfg.WRITE_FILES_TO_CLOUD:
+            try:
+                self.console_logger.log_event_as_debug(f">>> Saving Prem League table file into S3 folder ...")
+                S3_KEY = f"{self.s3_folder}/{self.file_name_prefix}_{match_date}.csv"
+
+                
+                self.console_logger.log_event_as_debug(f">>> Creating in-memory buffer ...")
+                CSV_BUFFER = io.StringIO()
+
+                self.console_logger.log_event_as_debug(f">>> Persisting dataframe to CSV file ...")
+                if isinstance(prem_league_df, LeanStandingsTable):
+                    CSV_BUFFER.write(prem_league_df.to_csv_bytes().decode('utf-8'))
+                else:
+                    prem_league_df.to_csv(CSV_BUFFER, index=False)
+
+                
+                self.console_logger.log_event_as_debug(f">>> Retrieving data from CSV buffer & storing as string values ...")
+                RAW_TABLE_ROWS_AS_STRING_VALUES = CSV_BUFFER.getvalue()
+                put_object = self.s3_client.put_object if self.concurrency_controller is None else self.concurrency_controller.wrap(self.s3_client.put_object)
+                self.resilient_caller.call(put_object, host=f's3://{self.s3_bucket}', operation_name='put_object', Bucket=self.s3_bucket, Key=S3_KEY, Body=RAW_TABLE_ROWS_AS_STRING_VALUES)
+            
+                self.console_logger.log_event_as_debug(f"")
+                self.console_logger.log_event_as_debug(f">>> Successfully written and loaded '{self.file_name_prefix}' file to cloud target location in S3 bucket... ")
+                self.console_logger.log_event_as_debug(f"")
+
+                # Return the S3 location so callers (e.g. the job manifest) can record where the file landed
+                return f"s3://{self.s3_bucket}/{S3_KEY}"
+
+            except Exception as e:
+                self.console_logger.log_event_as_warning(e)
+                return None
+        else:
+            self.file_logger.log_event_as_error(">>> Unable to upload to S3 bucket: Set 'WRITE_FILES_TO_CLOUD' to 'True' to upload files to S3 bucket.")
+            raise ImportError("Unable to upload to S3 bucket: Set 'WRITE_FILES_TO_CLOUD' to 'True' to upload files to S3 bucket.")
+
+
+class BundesligaTableS3CSVUploader(S3CSVFileUploader):
+    pass
+
+
+class LaligaTableS3CSVUploader(S3CSVFileUploader):
+    pass
+
+
+class SerieATableS3CSVUploader(S3CSVFileUploader):
+    pass
+
+
+class Ligue1TableS3CSVUploader(S3CSVFileUploader):
+    pass
+
+
+
+
+
+
+# Set up a concrete S3JSONFileUploader class that inherits from S3FileUploader
+class S3JSONFileUploader(S3FileUploader):
+    """
+    Uploads snapshots as newline-delimited JSON ('.ndjson', or '.ndjson.gz' with 'compress=True') for consumers
+    that ingest records line by line. Rows are encoded and compressed chunk by chunk through a streaming writer,
+    and batches larger than one part go up as a multipart upload.
+    """
+
+    def __init__(self, s3_client, s3_bucket: str, s3_folder: str, league: str='premier-league', file_name: str='prem_league_table', compress: bool=False, chunk_size: int=500, max_buffer_bytes: int=8 * 1024 * 1024, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_folder = s3_folder
+        self.league = league
+        self.file_name = file_name
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.max_buffer_bytes = max_buffer_bytes
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def get_s3_key(self, file_suffix: str) -> str:
+        return f"{self.s3_folder}/{self.file_name}_{file_suffix}.ndjson{'.gz' if self.compress else ''}"
+
+
+    # Implement S3JSONFileUploader method for streaming many snapshots into one NDJSON object
+    def upload_files(self, snapshots: Dict[str, pd.DataFrame]) -> Optional[str]:
+        match_dates = sorted(snapshots, key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+        file_suffix = match_dates[0] if len(match_dates) == 1 else f'{match_dates[0]}_to_{match_dates[-1]}'
+        streaming_writer = S3StreamingNDJSONFileWriter(s3_client=self.s3_client, s3_bucket=self.s3_bucket, s3_key=self.get_s3_key(file_suffix), league=self.league, max_buffer_bytes=self.max_buffer_bytes,
+                                                       compress=self.compress, coloured_console_logs=self.coloured_console_logs, file_logger=self.file_logger)
+        try:
+            for match_date in match_dates:
+                for snapshot_chunk in streaming_writer.iter_table_chunks(snapshots[match_date], self.chunk_size):
+                    streaming_writer.write_chunk(snapshot_chunk)
+        except Exception:
+
+            # Drop the partial upload, but let the caller see why the snapshots were not written
+            streaming_writer.abort()
+            raise
+
+        return streaming_writer.close()
+
+
+    def upload_file(self, df: pd.DataFrame, match_date: str) -> Optional[str]:
+        return self.upload_files({match_date: df})
+
+
+
+# Set up a LocalFileUploader class that inherits from IFileUploader
+class LocalFileUploader(IFileUploader):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a LocalCSVFileUploader class that inherits from LocalFileUploader
+class LocalCSVFileUploader(LocalFileUploader):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a concrete PremierLeagueTableLocalCSVUploader class that inherits from LocalCSVFileUploader
+class PremierLeagueTableLocalCSVUploader(LocalCSVFileUploader):
+    
+    def __init__(self, target_path: str=None, file_name: str='prem_league_table', coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.cfg = Config()
+        
+        if target_path is None:
+            target_path = self.cfg.LOCAL_TARGET_PATH
+        self.target_path = target_path
+
+        self.file_name = file_name
+        self.local_sink = LocalSnapshotSink(target_path=self.target_path, file_name=self.file_name, coloured_console_logs=coloured_console_logs, file_logger=file_logger)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+   # Implement PremierLeagueTableLocalCSVUploader method for uploading CSV files into local machine
+    def upload_file(self, prem_league_df: pd.DataFrame, match_date: str):
+        try:
+            self.console_logger.log_event_as_debug(f">>> Saving Prem League table file into local folder...")
+
+            # Serialise the dataframe once, then write it with an atomic write-then-rename
+            prem_league_table_file = self.local_sink.write_bytes(MultiSinkFileUploader.serialise_df(prem_league_df), match_date=match_date)
+            
+            self.console_logger.log_event_as_debug(f"")
+            self.console_logger.log_event_as_debug(f">>> Successfully written and loaded '{self.file_name}' file to local target location... ")
+            self.console_logger.log_event_as_debug(f"")
+            return prem_league_table_file
+
+        except Exception as e:
+            self.console_logger.log_event_as_error(e)
+            return None
+
+
+class BundesligaTableLocalCSVUploader(LocalFileUploader):
+    pass
+
+
+class LaligaTableLocalCSVUploader(LocalFileUploader):
+    pass
+
+
+class SerieATableLocalCSVUploader(LocalFileUploader):
+    pass
+
+
+class Ligue1TableLocalCSVUploader(LocalFileUploader):
+    pass
+
+
+
+# Set up a concrete LocalJSONFileUploader class that inherits from LocalFileUploader
+class LocalJSONFileUploader(LocalFileUploader):
+    """
+    Local counterpart of S3JSONFileUploader - writes the same NDJSON records (optionally gzipped) to
+    'target_path' through a streaming writer, renaming each file into place once it is complete.
+    """
+
+    def __init__(self, target_path: str, league: str='premier-league', file_name: str='prem_league_table', compress: bool=False, chunk_size: int=500, max_buffer_bytes: int=8 * 1024 * 1024, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.target_path = target_path
+        self.league = league
+        self.file_name = file_name
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.max_buffer_bytes = max_buffer_bytes
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    def get_file_path(self, file_suffix: str) -> str:
+        return f"{self.target_path}/{self.file_name}_{file_suffix}.ndjson{'.gz' if self.compress else ''}"
+
+
+    # Implement LocalJSONFileUploader method for streaming many snapshots into one NDJSON file
+    def upload_files(self, snapshots: Dict[str, pd.DataFrame]) -> Optional[str]:
+        match_dates = sorted(snapshots, key=lambda match_date: datetime.strptime(match_date, '%Y-%b-%d'))
+        file_suffix = match_dates[0] if len(match_dates) == 1 else f'{match_dates[0]}_to_{match_dates[-1]}'
+        streaming_writer = LocalStreamingNDJSONFileWriter(file_path=self.get_file_path(file_suffix), league=self.league, max_buffer_bytes=self.max_buffer_bytes, compress=self.compress,
+                                                          coloured_console_logs=self.coloured_console_logs, file_logger=self.file_logger)
+        try:
+            for match_date in match_dates:
+                for snapshot_chunk in streaming_writer.iter_table_chunks(snapshots[match_date], self.chunk_size):
+                    streaming_writer.write_chunk(snapshot_chunk)
+        except Exception:
+
+            # Drop the partial upload, but let the caller see why the snapshots were not written
+            streaming_writer.abort()
+            raise
+
+        return streaming_writer.close()
+
+
+    def upload_file(self, df: pd.DataFrame, match_date: str) -> Optional[str]:
+        return self.upload_files({match_date: df})
+
+
+
+# Set up a SQLiteFileUploader class that inherits from IFileUploader
+class SQLiteFileUploader(IFileUploader):
+    @abstractmethod
+    def upload_file(self):
+        pass
+
+
+# Set up a concrete TableStandingsSQLiteUploader class that inherits from SQLiteFileUploader
+class TableStandingsSQLiteUploader(SQLiteFileUploader):
+    """
+    Bulk-loads transformed standings into an embedded SQLite warehouse.
+
+    Rows are upserted on (league, match_date, team), so re-running a date replaces its rows instead of
+    duplicating them. Each call to 'upload_files' writes all of its snapshots in one transaction with a single
+    'executemany', and the date and team indexes keep time-series and per-club queries off full table scans.
+    Match dates are stored as ISO dates ('2023-04-24') so they sort and range-filter correctly in SQL.
+    """
+
+    LEAGUE: str = None
+    TABLE_NAME = 'league_table_standings'
+
+    # Map the transformer's (de-duplicated) column names onto the warehouse columns
+    COLUMN_MAPPING = STANDINGS_COLUMN_MAPPING
+
+    def __init__(self, database_path: str, league: str=None, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.database_path = database_path
+        self.league = league or self.LEAGUE
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+        self.warehouse_columns = ['league', 'match_date'] + list(self.COLUMN_MAPPING.values())
+        self._create_table()
+
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database_path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+
+    def _create_table(self):
+        database_folder = os.path.dirname(os.path.abspath(self.database_path))
+        os.makedirs(database_folder, exist_ok=True)
+
+        stat_columns = ',\n'.join(f'    {column} INTEGER' for column in self.warehouse_columns if column not in ('league', 'match_date', 'team'))
+        with closing(self._connect()) as connection, connection:
+            connection.execute(f'''
+CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+    league TEXT NOT NULL,
+    match_date TEXT NOT NULL,
+    team TEXT NOT NULL,
+{stat_columns},
+    PRIMARY KEY (league, match_date, team)
+)''')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.TABLE_NAME}_match_date ON {self.TABLE_NAME} (match_date)')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.TABLE_NAME}_team ON {self.TABLE_NAME} (team, match_date)')
+
+
+    # Convert a transformed snapshot into warehouse rows, with stats as integers and the date in ISO format
+    def _get_warehouse_rows(self, df: pd.DataFrame, match_date: str) -> List[tuple]:
+        if isinstance(df, LeanStandingsTable):
+            iso_match_date = datetime.strptime(match_date, '%Y-%b-%d').date().isoformat()
+            to_integer = lambda value: value if isinstance(value, int) else (int(TableStandingsDataValidator._to_number(value)) if TableStandingsDataValidator._to_number(value) is not None else None)
+            return [(self.league, iso_match_date, to_integer(row.position), row.team, *[to_integer(value) for value in row[2:-1]]) for row in df.rows]
+
+        unique_columns = TableStandingsDataTransformer.get_unique_columns(list(df.columns))
+        warehouse_df = df.iloc[:, list(unique_columns.keys())].set_axis(list(unique_columns.values()), axis=1)
+        warehouse_df = warehouse_df[list(self.COLUMN_MAPPING.keys())].rename(columns=self.COLUMN_MAPPING)
+
+        stat_columns = [column for column in self.COLUMN_MAPPING.values() if column != 'team']
+        warehouse_df[stat_columns] = warehouse_df[stat_columns].apply(pd.to_numeric, errors='coerce').astype('Int64')
+        warehouse_df.insert(0, 'match_date', datetime.strptime(match_date, '%Y-%b-%d').date().isoformat())
+        warehouse_df.insert(0, 'league', self.league)
+
+        warehouse_df = warehouse_df[self.warehouse_columns].astype(object).where(warehouse_df[self.warehouse_columns].notna(), None)
+        return list(warehouse_df.itertuples(index=False, name=None))
+
+
+    # Implement TableStandingsSQLiteUploader method for upserting many snapshots in one transaction
+    def upload_files(self, snapshots: Dict[str, pd.DataFrame]) -> str:
+        warehouse_rows = [row for match_date, df in snapshots.items() for row in self._get_warehouse_rows(df, match_date)]
+
+        column_names = ', '.join(self.warehouse_columns)
+        placeholders = ', '.join('?' for _ in self.warehouse_columns)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in self.warehouse_columns if column not in ('league', 'match_date', 'team'))
+        upsert_statement = f'INSERT INTO {self.TABLE_NAME} ({column_names}) VALUES ({placeholders}) ON CONFLICT (league, match_date, team) DO UPDATE SET {updates}'
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(upsert_statement, warehouse_rows)
+
+        self.console_logger.log_event_as_debug(f">>> Upserted {len(warehouse_rows)} '{self.league}' rows from {len(snapshots)} snapshot(s) into '{self.database_path}' ...")
+        return f'sqlite:///{os.path.abspath(self.database_path)}'
+
+
+    # Implement TableStandingsSQLiteUploader method for upserting a single snapshot
+    def upload_file(self, df: pd.DataFrame, match_date: str) -> Optional[str]:
+        try:
+            return self.upload_files({match_date: df})
+        except Exception as e:
+            self.console_logger.log_event_as_error(e)
+            return None
+
+
+# Set up a concrete PremierLeagueTableSQLiteUploader class that inherits from TableStandingsSQLiteUploader
+class PremierLeagueTableSQLiteUploader(TableStandingsSQLiteUploader):
+    LEAGUE = 'premier-league'
+
+
+class BundesligaTableSQLiteUploader(TableStandingsSQLiteUploader):
+    LEAGUE = 'bundesliga'
+
+
+class LaligaTableSQLiteUploader(TableStandingsSQLiteUploader):
+    LEAGUE = 'la-liga'
+
+
+class SerieATableSQLiteUploader(TableStandingsSQLiteUploader):
+    LEAGUE = 'serie-a'
+
+
+class Ligue1TableSQLiteUploader(TableStandingsSQLiteUploader):
+    LEAGUE = 'ligue-1'
+
+
+
+# ================================================ MULTI-SINK WRITER ================================================
+
+# Set up a concrete MultiSinkFileUploader class that inherits from IFileUploader
+class MultiSinkFileUploader(IFileUploader):
+    """
+    Serialises a snapshot exactly once into an in-memory byte buffer and hands that same buffer to every sink
+    concurrently. Adding another destination (or another copy in the same format) therefore costs one more
+    write, never another serialisation pass.
+    """
+
+    def __init__(self, sinks: List[ISnapshotSink], coloured_console_logs: bool=False, file_logger=FileLogger()):
+        if not sinks:
+            raise ValueError('MultiSinkFileUploader needs at least one sink to write snapshots to')
+
+        self.sinks = list(sinks)
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    @staticmethod
+    def serialise_df(df: pd.DataFrame) -> bytes:
+        if isinstance(df, LeanStandingsTable):
+            return df.to_csv_bytes()
+
+        csv_buffer = io.BytesIO()
+        df.to_csv(csv_buffer, index=False, encoding='utf-8')
+        return csv_buffer.getvalue()
+
+
+    # Implement MultiSinkFileUploader method for fanning one serialised snapshot out to every sink
+    def upload_file(self, df: pd.DataFrame, match_date: str) -> Optional[List[str]]:
+        self.console_logger.log_event_as_debug(f">>> Serialising snapshot for {match_date} once for {len(self.sinks)} sink(s) ...")
+        payload = self.serialise_df(df)
+
+        with ThreadPoolExecutor(max_workers=len(self.sinks)) as executor:
+            futures = {executor.submit(sink.write_bytes, payload, match_date): sink for sink in self.sinks}
+
+        output_locations = []
+        for future, sink in futures.items():
+            try:
+                output_locations.append(future.result())
+            except Exception as e:
+                self.console_logger.log_event_as_warning(f">>> Sink '{type(sink).__name__}' failed for {match_date}: {e}")
+
+        if len(output_locations) < len(self.sinks):
+            return None
+
+        self.console_logger.log_event_as_debug(f">>> Successfully written snapshot for {match_date} to {len(output_locations)} sink(s) ... ")
+        return output_locations
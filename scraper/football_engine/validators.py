@@ -0,0 +1,204 @@
+from __future__ import annotations
+import os
+import json
+from typing import List, Dict, Optional
+from datetime import datetime
+from collections import Counter
+from abc import ABC, abstractmethod
+from football_engine.dependencies import pd
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+from football_engine.transformers import LeanStandingsTable
+
+
+
+# ================================================ DATA VALIDATOR ================================================
+
+# Set up a custom exception raised when a scraped league table breaks one of the standings invariants
+class LeagueTableValidationError(Exception):
+    def __init__(self, match_date: str, failed_checks: Dict[str, List[str]]):
+        self.match_date = match_date
+        self.failed_checks = failed_checks
+        super().__init__(f"League table for {match_date} failed validation checks: {failed_checks}")
+
+
+# Set up abstract base class for Data Validator that defines interface for data validators
+class IDataValidator(ABC):
+    @abstractmethod
+    def validate_data(self, table_df: pd.DataFrame, match_date: str) -> pd.DataFrame:
+        pass
+
+
+# Set up a concrete TableStandingsDataValidator class that inherits from IDataValidator
+class TableStandingsDataValidator(IDataValidator):
+    """
+    Checks the league table invariants for a home-and-away table in one vectorized pass over the dataframe:
+
+        - P   = (W + D + L) at home + (W + D + L) away
+        - Pts = 3W + D across home and away
+        - GD  = GF - GA across home and away
+        - the table has exactly LEAGUE_SIZE rows
+        - every position appears once
+
+    The home and away blocks share the same column names ('W', 'D', 'L', 'GF', 'GA'), so each stat is summed
+    across every column that carries its name.
+    """
+
+    LEAGUE_SIZE: int = None
+
+    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Sum every column sharing the same header (e.g. home 'W' + away 'W'), coercing blanks/garbage to NaN
+    @staticmethod
+    def _sum_columns(table_df: pd.DataFrame, column_name: str) -> pd.Series:
+        matching_columns = table_df.loc[:, table_df.columns == column_name]
+        return matching_columns.apply(pd.to_numeric, errors='coerce').sum(axis=1, min_count=matching_columns.shape[1])
+
+
+    @staticmethod
+    def _to_number(value) -> Optional[float]:
+        if isinstance(value, int):
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+    # Run the same checks over the typed rows of a lean table, without building a dataframe
+    def get_failed_row_checks(self, lean_table: LeanStandingsTable) -> Dict[str, List[str]]:
+        failed_checks = {}
+        if self.LEAGUE_SIZE is not None and len(lean_table) != self.LEAGUE_SIZE:
+            failed_checks['row_count'] = [f'expected {self.LEAGUE_SIZE} rows, found {len(lean_table)}']
+
+        positions = []
+        for row in lean_table.rows:
+            stats = row._replace(team=0, match_date=0)._asdict()
+            stats = {field: self._to_number(value) for field, value in stats.items()}
+            won, drawn, lost = (stats[f'home_{result}'] + stats[f'away_{result}'] if stats[f'home_{result}'] is not None and stats[f'away_{result}'] is not None else None for result in ('won', 'drawn', 'lost'))
+            goals_for, goals_against = (stats[f'home_{goals}'] + stats[f'away_{goals}'] if stats[f'home_{goals}'] is not None and stats[f'away_{goals}'] is not None else None for goals in ('goals_for', 'goals_against'))
+
+            row_checks = {
+                'played':           None not in (won, drawn, lost, stats['played']) and stats['played'] == won + drawn + lost,
+                'points':           None not in (won, drawn, stats['points']) and stats['points'] == 3 * won + drawn,
+                'goal_difference':  None not in (goals_for, goals_against, stats['goal_difference']) and stats['goal_difference'] == goals_for - goals_against,
+            }
+            for check_name, check_passed in row_checks.items():
+                if not check_passed:
+                    failed_checks.setdefault(check_name, []).append(str(row.team))
+            positions.append(stats['position'])
+
+        position_counts = Counter(positions)
+        unique_position_failures = [str(row.team) for row, position in zip(lean_table.rows, positions) if position is None or position_counts[position] > 1]
+        if unique_position_failures:
+            failed_checks['unique_positions'] = unique_position_failures
+
+        return failed_checks
+
+
+    def get_failed_checks(self, table_df: pd.DataFrame) -> Dict[str, List[str]]:
+        if isinstance(table_df, LeanStandingsTable):
+            return self.get_failed_row_checks(table_df)
+
+        failed_checks = {}
+
+        if self.LEAGUE_SIZE is not None and len(table_df) != self.LEAGUE_SIZE:
+            failed_checks['row_count'] = [f'expected {self.LEAGUE_SIZE} rows, found {len(table_df)}']
+
+        required_columns = ['Pos', 'Team', 'P', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+        missing_columns = [column for column in required_columns if column not in table_df.columns]
+        if missing_columns:
+            failed_checks['missing_columns'] = missing_columns
+            return failed_checks
+
+        wins, draws, losses     =   self._sum_columns(table_df, 'W'), self._sum_columns(table_df, 'D'), self._sum_columns(table_df, 'L')
+        goals_for, goals_against =  self._sum_columns(table_df, 'GF'), self._sum_columns(table_df, 'GA')
+
+        row_checks = pd.DataFrame({
+            'played':           self._sum_columns(table_df, 'P')    ==  wins + draws + losses,
+            'points':           self._sum_columns(table_df, 'Pts')  ==  3 * wins + draws,
+            'goal_difference':  self._sum_columns(table_df, 'GD')   ==  goals_for - goals_against,
+        })
+
+        teams = table_df['Team'].astype(str).to_numpy()
+        for check_name, check_passed in row_checks.items():
+            if not check_passed.all():
+                failed_checks[check_name] = list(teams[~check_passed.to_numpy()])
+
+        positions = pd.to_numeric(table_df['Pos'], errors='coerce')
+        if positions.isna().any() or not positions.is_unique:
+            failed_checks['unique_positions'] = list(teams[positions.isna().to_numpy() | positions.duplicated(keep=False).to_numpy()])
+
+        return failed_checks
+
+
+    # Implement TableStandingsDataValidator method for failing fast on a malformed table
+    def validate_data(self, table_df: pd.DataFrame, match_date: str) -> pd.DataFrame:
+        self.file_logger.log_event_as_debug(f'>>>> Validating league table standings for {match_date} ...')
+        failed_checks = self.get_failed_checks(table_df)
+
+        if failed_checks:
+            self.console_logger.log_event_as_error(f'>>>> League table for {match_date} failed validation: {failed_checks}')
+            raise LeagueTableValidationError(match_date, failed_checks)
+
+        self.file_logger.log_event_as_debug(f'>>>> League table for {match_date} passed all validation checks ...')
+        return table_df
+
+
+# Set up a concrete PremierLeagueTableStandingsDataValidator class that inherits from TableStandingsDataValidator
+class PremierLeagueTableStandingsDataValidator(TableStandingsDataValidator):
+    LEAGUE_SIZE = 20
+
+
+class BundesligaTableStandingsDataValidator(TableStandingsDataValidator):
+    LEAGUE_SIZE = 18
+
+
+class LaligaTableStandingsDataValidator(TableStandingsDataValidator):
+    LEAGUE_SIZE = 20
+
+
+class SerieATableStandingsDataValidator(TableStandingsDataValidator):
+    LEAGUE_SIZE = 20
+
+
+class Ligue1TableStandingsDataValidator(TableStandingsDataValidator):
+    LEAGUE_SIZE = 18
+
+
+
+# Set up a LocalSnapshotQuarantine class for parking snapshots that failed validation
+class LocalSnapshotQuarantine:
+    def __init__(self, quarantine_path: str, file_name: str='prem_league_table', coloured_console_logs: bool=False, file_logger=FileLogger()):
+        self.quarantine_path = quarantine_path
+        self.file_name = file_name
+        self.file_logger = file_logger
+        self.coloured_console_logs = coloured_console_logs
+        if self.coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Write the rejected snapshot and a report of its failed checks side by side for later inspection
+    def quarantine_snapshot(self, table_df: pd.DataFrame, league: str, match_date: str, failed_checks: Dict[str, List[str]]) -> str:
+        quarantine_folder = f'{self.quarantine_path}/{league}'
+        os.makedirs(quarantine_folder, exist_ok=True)
+
+        quarantined_file = f'{quarantine_folder}/{self.file_name}_{match_date}'
+        if isinstance(table_df, LeanStandingsTable):
+            with open(f'{quarantined_file}.csv', 'wb') as quarantined_csv:
+                quarantined_csv.write(table_df.to_csv_bytes())
+        else:
+            table_df.to_csv(f'{quarantined_file}.csv', index=False)
+        with open(f'{quarantined_file}.json', 'w') as report_file:
+            json.dump({'league': league, 'match_date': match_date, 'failed_checks': failed_checks, 'quarantined_at': datetime.now().isoformat(timespec='seconds')}, report_file, indent=2)
+
+        self.console_logger.log_event_as_warning(f">>> Quarantined '{league}' table for {match_date} in '{quarantined_file}.csv' ...")
+        return f'{quarantined_file}.csv'
@@ -0,0 +1,106 @@
+from __future__ import annotations
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+from time import sleep
+from abc import ABC, abstractmethod
+from football_engine.dependencies import webdriver
+from football_engine.logger import ColouredConsoleLogger, NonColouredConsoleLogger
+from football_engine.resilience import ConcurrencyController, ResilientCaller
+
+
+
+# ================================================ WEBPAGE LOADER ================================================
+
+
+# Set up abstract base class for Webpage Loader that defines interface for webpage loaders
+class IWebPageLoader(ABC):
+    @abstractmethod
+    def load_page(self, url:str):
+        pass
+
+
+# Set up a concrete WebPageLoader class that inherits from IWebPageLoader
+class WebPageLoader(IWebPageLoader):
+    @abstractmethod
+    def load_page(self, url:str):
+        pass
+
+
+# Set up a concrete PremLeagueTableWebPageLoader class that inherits from WebPageLoader
+class PremLeagueTableWebPageLoader(WebPageLoader):
+    def __init__(self, options=None, service=None, webpage_title: str='Premier League', coloured_console_logs: bool=False, resilient_caller: ResilientCaller=None, concurrency_controller: ConcurrencyController=None):
+        if options is None:
+            options = webdriver.ChromeOptions()
+
+        self.options = options
+        self.service = service
+        self.webpage_title = webpage_title
+        self._chrome_driver = None
+        self.browser_closed = False
+        self.browser_lock = threading.Lock()
+        self.resilient_caller = resilient_caller or ResilientCaller(coloured_console_logs=coloured_console_logs)
+        self.concurrency_controller = concurrency_controller
+        self.coloured_console_logs = coloured_console_logs
+        if coloured_console_logs:
+            self.console_logger = ColouredConsoleLogger()
+        else:
+            self.console_logger = NonColouredConsoleLogger()
+
+
+    # Start the browser on first use, so a run that ends up loading no pages (e.g. an up-to-date incremental rerun) never pays for it
+    @property
+    def chrome_driver(self) -> webdriver.Chrome:
+        with self.browser_lock:
+            if self.browser_closed:
+                raise RuntimeError('The browser for this web page loader has already been shut down')
+            if self._chrome_driver is None:
+                if self.service is None:
+                    from selenium.webdriver.chrome.service import Service
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    self.service = Service(executable_path=ChromeDriverManager().install())
+                self._chrome_driver = webdriver.Chrome(service=self.service, options=self.options)
+            return self._chrome_driver
+
+
+    def quit(self):
+        with self.browser_lock:
+            self.browser_closed = True
+            if self._chrome_driver is not None:
+                self._chrome_driver.quit()
+                self._chrome_driver = None
+
+
+    # Implement PremLeagueTableWebPageLoader method to load webpage in browser, retrying slow or broken page loads
+    def load_page(self, url: str, deadline: Optional[float]=None):
+        from selenium.common.exceptions import WebDriverException
+
+        # A page with the wrong title (AssertionError) or a shut-down browser will not fix itself on a retry
+        load_page_once = self._load_page_once if self.concurrency_controller is None else self.concurrency_controller.wrap(self._load_page_once)
+        self.resilient_caller.call(load_page_once, url, host=urlparse(url).netloc, operation_name='load_page', deadline=deadline, retry_on=(WebDriverException, OSError))
+
+
+    def _load_page_once(self, url: str):
+        self.console_logger.log_event_as_debug(">>> Loading webpage using Selenium ...")
+        self.chrome_driver.get(url)
+        sleep(3)
+        
+        # Check if webpage loaded successfully (the title check comes from the league plugin)
+        assert self.webpage_title in self.chrome_driver.title, f"ERROR: Unable to load site for {self.webpage_title} ... "
+        self.console_logger.log_event_as_debug(">>> Webpage successfully loaded ...")
+
+
+class BundesligaTableWebPageLoader(WebPageLoader):
+    pass
+
+
+class LaligaTableWebPageLoader(WebPageLoader):
+    pass
+
+
+class SerieATableWebPageLoader(WebPageLoader):
+    pass
+
+
+class Ligue1TableWebPageLoader(WebPageLoader):
+    pass
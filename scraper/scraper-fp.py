@@ -1,21 +1,20 @@
-import io
 import os
-import boto3
-import pandas as pd
-from time import sleep
-from pathlib import Path
+import sys
+import argparse
 import logging, coloredlogs
 from datetime import datetime
-from functools import partial
 from dotenv import load_dotenv
-from selenium import webdriver
-from typing import List, Optional, Any, Dict
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
+from typing import Optional, Any, Dict
+from football_engine import LeaguePlugin, league_registry
+from football_engine.dependencies import boto3
+from football_engine.coordinator import FileRunLock, RunBudget, RunCoordinator, RunCancelledError, RunLockHeldError
+from football_engine.resilience import ResilientCaller
+from football_engine.profiler import StageProfiler
+from football_engine.validators import LocalSnapshotQuarantine
+from football_engine.sinks import LocalSnapshotSink, S3SnapshotSink
+from football_engine.uploaders import MultiSinkFileUploader
+from football_engine.job_runner import IScrapeJobRunner
+from football_engine.incremental import PipelineStateStore, IncrementalPipelineRunner
 
 
 
@@ -38,7 +37,7 @@ def create_file_handler(local_filepath:     str,
                         log_format:         str,
                         log_folder:         str)   -> logging.FileHandler:
     
-    file_handler = logging.FileHandler(f'{log_folder}/{local_filepath}.log', mode='w')
+    file_handler = logging.FileHandler(f'{log_folder}/{local_filepath}.log', mode='a')
     file_handler.setLevel(log_level)
     formatter = logging.Formatter(log_format)
     file_handler.setFormatter(formatter)
@@ -106,302 +105,116 @@ def create_config(aws_access_key:           str,
     }
     
     return config
-    
-    
-
-
-
-# ================================================ WEBPAGE LOADER ================================================   
-
-def load_webpage(chrome_driver:     webdriver.Chrome, 
-                 url:               str, 
-                 logger:            logging.Logger) -> webdriver.Chrome:
-    
-    log_event(logger, logging.DEBUG, ">>> Loading webpage using Selenium ...")
-    chrome_driver.get(url)
-    sleep(3)
-    return chrome_driver
-
-
-
-def check_page_title(chrome_driver:     webdriver.Chrome, 
-                     expected_title:    str, 
-                     logger:            logging.Logger) -> None:
-    
-    assert expected_title in chrome_driver.title, f"ERROR: Unable to load site for {expected_title} ... "
-    log_event(logger, logging.DEBUG, ">>> Webpage successfully loaded ...")
-
-
-
-def load_league_table(chrome_driver:    webdriver.Chrome,
-                      url:              str, 
-                      logger:           logging.Logger, 
-                      title_check:      str) -> webdriver.Chrome:
-    
-    chrome_driver = load_webpage(chrome_driver, url, logger)
-    check_page_title(chrome_driver, title_check, logger)
-    
-    return chrome_driver
-
-
-
-
-# ================================================ POPUP HANDLER ================================================
-
-def find_popup_element(chrome_driver:   webdriver.Chrome, 
-                       timeout:         int) -> WebElement:
-    wait = WebDriverWait(chrome_driver, timeout)
-
-    return wait.until(EC.presence_of_element_located((By.XPATH, '/html/body/div[8]/div[2]/div[1]/div[1]/button/i')))
-
-
-
-def close_popup(close_popup_box:    WebElement, 
-                logger:             logging.Logger) -> None:
-    close_popup_box.click()
-    log_event(logger, logging.DEBUG, f'>>>>   Closing cookie pop-up window ...')
 
 
 
-def close_popup_box_for_table_standings_webpage(chrome_driver:  webdriver.Chrome, 
-                                                logger:         logging.Logger, 
-                                                timeout:        int) -> None:
-    
-    try:
-        close_popup_box = find_popup_element(chrome_driver, timeout)
-        close_popup(close_popup_box, logger)
-    except Exception as e:
-        log_event(logger, logging.ERROR, f'No cookie pop-up window to close...let\'s begin scraping for league standings !!') 
-
-
-
-
-
-# ================================================ DATA EXTRACTOR ================================================
+def create_s3_client(aws_access_key:     str,
+                     aws_secret_key:     str,
+                     aws_region_name:    str) -> Any:
 
-
-def scrape_table_standings(chrome_driver:       webdriver.Chrome, 
-                           logger:              logging.Logger) -> Optional[WebElement]:
+    return boto3.client('s3', aws_access_key_id=aws_access_key, aws_secret_access_key=aws_secret_key, region_name=aws_region_name)
     
-    try:
-        log_event(logger, logging.DEBUG, f'>>>>   Detecting HTML elements ...')
-        return chrome_driver.find_element(By.CLASS_NAME, 'leaguetable')
     
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-        return None
 
 
 
-def scrape_table_rows(table:    Optional[WebElement], 
-                      logger:   logging.Logger)  -> List[WebElement]:
-    
-    log_event(logger, logging.DEBUG, f'>>>>   Extracting content from HTML elements ...')
-    return table.find_elements(By.XPATH, './/tr') if table else []
 
 
+# ================================================ ENGINE COMPONENTS ================================================
 
-def scrape_data_from_cells(table_row:       WebElement, 
-                           logger:          logging.Logger, 
-                           row_counter:     int) -> List[str]:
-    
-    cells       =   table_row.find_elements(By.TAG_NAME, 'td')
-    cell_data   =   [cell.text for cell in cells]
-    for i, data in enumerate(cell_data):
-        log_event(logger, logging.DEBUG, f'>>>>   Table row no "{row_counter}", Cell no "{i+1}" appended ...')
-    return cell_data
+# Set up functions that build the league's plugin components and hand them to the shared engine's job runners
 
 
+def create_webpage_loader(league_plugin:    LeaguePlugin,
+                          resilient_caller: ResilientCaller) -> Any:
 
-def scrape_data_from_rows(table_rows:   List[WebElement], 
-                          logger:       logging.Logger) -> List[List[str]]:
-    
-    return [scrape_data_from_cells(table_row, logger, i+1) for i, table_row in enumerate(table_rows) ]
+    # The browser only starts when the first page is loaded
+    return league_plugin.webpage_loader(webpage_title=league_plugin.title_check, resilient_caller=resilient_caller)
 
 
 
-def extract_data(chrome_driver:         webdriver.Chrome, 
-                 logger:                logging.Logger) -> Optional[List[List[str]]]:
-    
-    prem_league_table   =   scrape_table_standings(chrome_driver, logger)
-    table_rows          =   scrape_table_rows(prem_league_table, logger)
-    return scrape_data_from_rows(table_rows, logger)
-
-
-
-
-# ================================================ DATA TRANSFORMER ================================================
-
+def create_data_transformer(league_plugin:  LeaguePlugin,
+                            lean:           bool) -> Any:
 
-def create_dataframe(scraped_data:      List[List[str]], 
-                     scraped_columns:   List[str], 
-                     match_date:        str, 
-                     logger:            logging.Logger) -> Optional[pd.DataFrame]:
-    try:
-        log_event(logger, logging.DEBUG, '>>>> Now creating dataframe for Premier League table standings ....')
-        table_df = pd.DataFrame(data=scraped_data, columns=scraped_columns)
-        table_df['match_date'] = match_date
-        log_event(logger, logging.DEBUG, '>>>> Dataframe for Premier League table successfully created....')
-    
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-    
-    return table_df
+    # The lean transformer builds typed rows instead of a dataframe, so small runs never import pandas
+    return league_plugin.lean_data_transformer() if lean and league_plugin.has_component('lean_data_transformer') else league_plugin.data_transformer()
 
 
 
-def transform_data(scraped_content:     List[List[str]], 
-                   match_date:          str, 
-                   logger:              logging.Logger) -> pd.DataFrame:
-    try:
-        log_event(logger, logging.DEBUG, '>>>> Now transforming scraped content for Premier League table standings ....')
-        scraped_data = scraped_content[1:]
-        scraped_columns = scraped_content[0]
-        log_event(logger, logging.DEBUG, '>>>> Successfully scraped content for Premier League table standings ....')
-       
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-
-    return create_dataframe(scraped_data, scraped_columns, match_date, logger)
-
+def create_data_uploader(league_plugin:     LeaguePlugin,
+                         config:            Dict[str, Any],
+                         resilient_caller:  ResilientCaller) -> MultiSinkFileUploader:
 
-    
-    
-
-# ================================================ DATA UPLOADER ================================================
-
-
-# A. UPLOAD TO CLOUD
-
-def create_s3_key(s3_folder:    str, 
-                  file_name:    str, 
-                  match_date:   str, 
-                  logger:       logging.Logger) -> str:
-    try:
-        log_event(logger, logging.DEBUG, '>>>> Creating S3 key for Prem League table file ...')
-        s3_key = f"{s3_folder}/{file_name}_{match_date}.csv"
-        return s3_key
-    
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-
-
-
-def create_csv_buffer(logger: logging.Logger) -> io.StringIO:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Creating in-memory buffer ...")
-        return io.StringIO()
-    
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-
-
-
-def write_df_to_csv(df:             pd.DataFrame, 
-                    csv_buffer:     io.StringIO, 
-                    logger:         logging.Logger) -> None:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Persisting dataframe to CSV file ...")
-        df.to_csv(csv_buffer, index=False)
-
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-
-
-
-def get_string_values_from_buffer(csv_buffer:   io.StringIO, 
-                                  logger:       logging.Logger) -> str:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Retrieving data from CSV buffer & storing as string values ...")
-        return csv_buffer.getvalue()
-    
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-
-
-
-def upload_string_to_s3(s3_client:          Any, 
-                        s3_bucket:          str, 
-                        s3_key:             str, 
-                        string_values:      str, 
-                        logger:             logging.Logger) -> None :
-    try:
-        log_event(logger, logging.DEBUG, f">>> Preparing to upload file to S3 bucket ...")
-        s3_client.put_object(Bucket=s3_bucket, Key=s3_key, Body=string_values)
-
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
+    if config["WRITE_FILES_TO_CLOUD"]:
+        data_sink = S3SnapshotSink(s3_client=config["S3_CLIENT"], s3_bucket=config["S3_BUCKET"], s3_folder=config["S3_FOLDER"], file_name=league_plugin.file_name, resilient_caller=resilient_caller)
+    else:
+        data_sink = LocalSnapshotSink(target_path=config["LOCAL_TARGET_PATH"], file_name=league_plugin.file_name)
+    return MultiSinkFileUploader(sinks=[data_sink])
 
 
 
-def upload_df_to_s3(df:             pd.DataFrame, 
-                    match_date:     str, 
-                    file_name:      str, 
-                    config:         Dict[str, Any], 
-                    logger:         logging.Logger) -> None:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Composing final operations to begin upload to cloud ...")
-        S3_KEY                              =   create_s3_key(config["S3_FOLDER"], file_name, match_date, logger)
-        CSV_BUFFER                          =   create_csv_buffer(logger)
-        write_df_to_csv(df, CSV_BUFFER, logger)
-        RAW_TABLE_ROWS_AS_STRING_VALUES     =   get_string_values_from_buffer(CSV_BUFFER, logger)
-        
-        try:
-            upload_string_to_s3(s3_client=config["S3_CLIENT"], s3_bucket=config["S3_BUCKET"], s3_key=S3_KEY, string_values=RAW_TABLE_ROWS_AS_STRING_VALUES, logger=logger)
-            log_event(logger, logging.DEBUG, f">>> Successfully written and loaded '{file_name}' file to cloud target location in S3 bucket... ")
-        except Exception as e:
-            log_event(logger, logging.ERROR, e)
-
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
-    
+def create_job_runner(league_plugin:        LeaguePlugin,
+                      webpage_loader:       Any,
+                      data_transformer:     Any,
+                      data_uploader:        MultiSinkFileUploader,
+                      season_start_date:    str,
+                      quarantine_path:      str,
+                      stage_profiler:       StageProfiler,
+                      resilient_caller:     ResilientCaller,
+                      run_budget:           RunBudget) -> IScrapeJobRunner:
 
+    # The engine's job runner loads the page, closes the popup box, then extracts, transforms, validates and loads the table
+    return league_plugin.job_runner(webpage_loader       =   webpage_loader,
+                                    data_transformer     =   data_transformer,
+                                    data_validator       =   league_plugin.data_validator(),
+                                    snapshot_quarantine  =   LocalSnapshotQuarantine(quarantine_path=quarantine_path, file_name=league_plugin.file_name),
+                                    data_uploader        =   data_uploader,
+                                    season_start_date    =   season_start_date,
+                                    stage_profiler       =   stage_profiler,
+                                    resilient_caller     =   resilient_caller,
+                                    run_budget           =   run_budget,
+                                    popup_handler_class  =   league_plugin.popup_handler,
+                                    data_extractor_class =   league_plugin.data_extractor)
 
 
-# B. UPLOAD TO LOCAL MACHINE
 
-def create_local_file_path(target_path:     str, 
-                           file_name:       str, 
-                           match_date:      str, 
-                           logger:          logging.Logger) -> str:
-    try:
-        log_event(logger, logging.DEBUG, '>>>> Creating Prem League table filepath  ...')
-        return f"{target_path}/{file_name}_{match_date}.csv"
+def create_pipeline_runner(job_runner:              IScrapeJobRunner,
+                           pipeline_state_path:     str,
+                           pipeline_artifacts_path: str,
+                           volatile_ttl_seconds:    float) -> IncrementalPipelineRunner:
 
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
+    # Only re-run the stages whose input fingerprint or code version changed (the browser is not even started if nothing did)
+    return IncrementalPipelineRunner(job_runner             =   job_runner,
+                                     state_store            =   PipelineStateStore(state_path=pipeline_state_path),
+                                     artifacts_path         =   pipeline_artifacts_path,
+                                     volatile_ttl_seconds   =   volatile_ttl_seconds)
 
 
-def write_df_to_local_file(df:          pd.DataFrame, 
-                           file_path:   str, 
-                           logger:      logging.Logger) -> None:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Converting data frame to CSV ...")
-        df.to_csv(file_path, index=False)
 
-    except Exception as e:
-        log_event(logger, logging.ERROR, e)
+def create_run_coordinator(league:               str,
+                           run_lock_path:        str,
+                           run_budget_seconds:   float,
+                           stage_budget_shares:  Dict[str, float]) -> RunCoordinator:
 
+    # One run per league at a time, cancelled (and its browser quit) once the budget is spent or on SIGTERM/SIGINT
+    return RunCoordinator(run_lock     =   FileRunLock(lock_folder=run_lock_path, league=league, job_type='scrape'),
+                          run_budget   =   RunBudget(total_seconds=run_budget_seconds, stage_shares=stage_budget_shares))
 
 
-def upload_df_to_local_file(df:                 pd.DataFrame, 
-                            match_date:         str, 
-                            file_name:          str, 
-                            config:             Dict[str, Any], 
-                            logger:             logging.Logger) -> None:
-    try:
-        log_event(logger, logging.DEBUG, f">>> Composing final operations to begin upload to local machine ...")
-        file_path = create_local_file_path(config["LOCAL_TARGET_PATH"], file_name, match_date, logger)
 
-        try:
-            write_df_to_local_file(df, file_path, logger)
-            log_event(logger, logging.DEBUG, f">>> Successfully written and loaded '{file_name}' file to local target location... ")
-        except Exception as e:
-            log_event(logger, logging.error, e)
+def run_scrape_job(job_runner:  IScrapeJobRunner,
+                   league:      str,
+                   match_date:  str,
+                   logger:      logging.Logger) -> Optional[str]:
 
-    except Exception as e:
-        log_event(logger, logging.error, e)
+    log_event(logger, logging.DEBUG, f">>> Scraping the {league} table standings for {match_date} ...")
+    output_location, _ = job_runner.run_job(league, match_date)
+    if output_location is None:
+        log_event(logger, logging.ERROR, f">>> Unable to load the table for {match_date} into its target location ...")
+        return None
 
+    log_event(logger, logging.DEBUG, f">>> Successfully written and loaded the table for {match_date} to '{output_location}' ... ")
+    return output_location
 
 
 
@@ -411,10 +224,18 @@ def upload_df_to_local_file(df:                 pd.DataFrame,
 
 if __name__=="__main__":
 
+    # Parse command line flags
+    arg_parser = argparse.ArgumentParser(description='Scrape league table standings and load them into the target location')
+    arg_parser.add_argument('--profile', action='store_true', help='profile CPU time and memory allocations for each stage and write reports to logs/profiles/')
+    arg_parser.add_argument('--incremental', action='store_true', help='only re-run the stages whose inputs or code changed since their last run')
+    args = arg_parser.parse_args()
+
+
     # Set up constants to read into functions 
 
+    league                          =   'premier-league'
+    season_start_date               =   '2022-Jul-01'
     match_date                      =   datetime.now().strftime('%Y-%b-%d') # for today's date
-    football_url                    =   f'https://www.twtd.co.uk/league-tables/competition:premier-league/daterange/fromdate:2022-Jul-01/todate:{match_date}/type:home-and-away/'
 
     logger_name                     =   "football_scraper_fp"
     local_filepath                  =   'main_scraper'
@@ -425,15 +246,20 @@ if __name__=="__main__":
     detailed_logs                   =   False
     detailed_log_format             =   '%(asctime)s | %(levelname)s | %(message)s'
     simple_log_format               =   '%(message)s'
-    webdriver_timeout               =   5
     WRITE_FILES_TO_CLOUD            =   False
-    s3_client                       =   "s3"
+    lean_small_tables               =   True    # Transform and write the table as typed rows, without loading pandas
+    quarantine_path                 =   'temp_storage/quarantine'
+
+    pipeline_state_path             =   'temp_storage/job_manifests/pipeline_state_fp.json'
+    pipeline_artifacts_path         =   'temp_storage/pipeline_artifacts'
+    volatile_ttl_seconds            =   15 * 60     # Today's table can still change, so its scraped copy is only reused for this long
+    run_budget_seconds              =   30 * 60     # Cancel the run (and quit the browser) once it has run this long
+    stage_budget_shares             =   {'load_page': 0.1, 'close_popup': 0.01, 'extract': 0.1, 'upload': 0.05}   # Cap on each stage call, as a share of the run budget
+
 
-    options                         =   webdriver.ChromeOptions()
-    service                         =   Service(executable_path=ChromeDriverManager().install())
-    web_driver                      =   webdriver.Chrome(options=options, service=service)
-    
-    title_check                     =   "Premier League"
+
+    # Look up the league's components in the plugin registry - only this league's plugin module is imported
+    league_plugin                   =   league_registry.get(league)
 
 
 
@@ -445,6 +271,7 @@ if __name__=="__main__":
     console_handler     =   create_console_handler(coloured, log_level, detailed_logs, detailed_log_format, simple_log_format) 
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
+    stage_profiler      =   StageProfiler(profile_folder=f"logs/profiles/football_scraper_fp_{datetime.now().strftime('%Y%m%d_%H%M%S')}", enabled=args.profile)
 
 
 
@@ -458,6 +285,8 @@ if __name__=="__main__":
     aws_s3_bucket           =   os.getenv("S3_BUCKET") 
     aws_s3_folder           =   os.getenv("S3_FOLDER") 
     local_target_path       =   os.getenv("LOCAL_TARGET_PATH") 
+    run_lock_path           =   os.getenv("RUN_LOCK_PATH", "temp_storage/run_locks")
+    s3_client               =   create_s3_client(aws_access_key, aws_secret_key, aws_region_name) if WRITE_FILES_TO_CLOUD else None
     
     config                  =   create_config(aws_access_key, 
                                               aws_secret_key, 
@@ -470,37 +299,42 @@ if __name__=="__main__":
 
 
 
+    # Allow one run per league at a time and give it an overall deadline - overlapping cron runs exit straight away
 
-    # Set up Selenium Chrome driver and configuration settings  
-    chrome_driver = load_league_table(chrome_driver=web_driver, url=football_url, logger=logger, title_check=title_check)
-
-
-
-    # Close popup box on webpage
-    close_popup_box_for_table_standings_webpage(chrome_driver, timeout=webdriver_timeout, logger=logger)
-
+    run_coordinator             =   create_run_coordinator(league, run_lock_path, run_budget_seconds, stage_budget_shares)
+    try:
+        run_coordinator.acquire()
+    except RunLockHeldError as e:
+        log_event(logger, logging.ERROR, f'>>> {e}')
+        sys.exit(1)
 
 
-    # Extract data (E)
-    scraped_content          =   extract_data(chrome_driver, logger)
-    
 
+    # Set up the engine components and the job runner that drives them
 
-    # Transform data (T)
-    prem_league_df           =   transform_data(scraped_content, match_date, logger)
+    resilient_caller            =   ResilientCaller()
+    webpage_loader              =   create_webpage_loader(league_plugin, resilient_caller)
+    data_transformer            =   create_data_transformer(league_plugin, lean=lean_small_tables)
+    data_uploader               =   create_data_uploader(league_plugin, config, resilient_caller)
+    job_runner                  =   create_job_runner(league_plugin, webpage_loader, data_transformer, data_uploader, season_start_date, quarantine_path, stage_profiler, resilient_caller, run_coordinator.run_budget)
+    pipeline_runner             =   create_pipeline_runner(job_runner, pipeline_state_path, pipeline_artifacts_path, volatile_ttl_seconds) if args.incremental else None
+    run_coordinator.attach_browser(webpage_loader)
 
 
 
-    # Load data (L)
-    file_name = "prem_league_table"
 
-    if WRITE_FILES_TO_CLOUD:
-        upload_df_to_s3(prem_league_df, match_date, file_name, config, logger)
+    try:
 
-    else:
-        upload_df_to_local_file(prem_league_df, match_date, file_name, config, logger)
+        # Extract (E), transform (T) and load (L) today's table - incremental runs skip the stages that are still up to date
+        run_scrape_job(pipeline_runner or job_runner, league, match_date, logger)
 
+    except RunCancelledError as e:
+        log_event(logger, logging.ERROR, f">>> Scraping the table for {match_date} was cancelled: {e}")
 
+    finally:
 
-    # Close driver when scraping is completed 
-    chrome_driver.quit()
\ No newline at end of file
+        # Close driver when scraping is completed (a no-op if no page was loaded) and release the run lock
+        run_coordinator.release()
+    stage_profiler.write_reports()
+    if pipeline_runner is not None:
+        pipeline_runner.log_stage_outcomes()
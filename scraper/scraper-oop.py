@@ -1,693 +1,354 @@
-import io
 import os
-import boto3
-from typing import List
-import pandas as pd
-from time import sleep
-from pathlib import Path
-import logging, coloredlogs
+import sys
+import hashlib
+import argparse
+import logging
+from datetime import datetime
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support import expected_conditions as EC
-from abc import ABC, abstractmethod
+from football_engine import league_registry
+from football_engine.dependencies import boto3, pd
+from football_engine.config import Config
+from football_engine.resilience import ResilientCaller
+from football_engine.profiler import StageProfiler
+from football_engine.extractors import TableExtractionSpec
+from football_engine.transformers import SpecTableDataTransformer
+from football_engine.validators import LeagueTableValidationError, LocalSnapshotQuarantine
+from football_engine.sinks import LocalSnapshotSink, S3SnapshotSink
+from football_engine.uploaders import MultiSinkFileUploader
+from football_engine.cache import ArrowIPCSnapshotCache
+from football_engine.manifest import JSONFileJobManifest
+from football_engine.job_runner import MultiTableScrapeJobRunner, TableExtractionRoute
+from football_engine.streaming import LocalStreamingCSVFileWriter, S3StreamingCSVFileWriter, LocalStreamingNDJSONFileWriter
+from football_engine.coordinator import FileRunLock, RunBudget, RunCoordinator, RunCancelledError, RunLockHeldError
+from football_engine.incremental import PipelineStateStore, IncrementalPipelineRunner
+from football_engine.job_queue import SQLiteJobQueue, SQSJobQueue, ScrapeJobWorker
+from football_engine.change_calendar import JSONFileChangeCalendar, ChangeDateScheduler
+from football_engine.loadtest import ReplayPageServer, LoadTestHarness
+from football_engine.compaction import CompactedS3SnapshotReader, S3SnapshotCompactor
+from football_engine.live import LiveTableObserver, LiveTableStreamer
+from football_engine.synthetic import SyntheticLeagueTableGenerator, SyntheticDataCorruptor, SyntheticDatasetWriter
+from football_engine.results import ResultsStandingsJobRunner
+
+
+
+# The pipeline lives in the 'football_engine' package next to this script (shared with 'scraper-fp.py') - each
+# league's loader, popup handler, extractor, transformers, validator and uploaders come from its plugin
 
 
 
-# ================================================ LOGGER ================================================
-
-# Set up abstract base class for Logger that defines interface for logging events 
-class ILogger(ABC):
-
-    # Define abstract methods to be implemented in child classes
-    @abstractmethod
-    def log_event_as_debug(self, message: str):
-        pass
-
-    @abstractmethod
-    def log_event_as_info(self, message: str):
-        pass
-
-    @abstractmethod
-    def log_event_as_warning(self, message: str):
-        pass
-    
-    @abstractmethod
-    def log_event_as_critical(self, message: str):
-        pass
-    
-    @abstractmethod
-    def log_event_as_error(self, message: str):
-        pass
-
-
-# Set up a concrete FileLogger class that inherits from ILogger
-class FileLogger(ILogger):
-    def __init__(self, local_filepath: str = Path(__file__).stem, log_format: str='%(asctime)s | %(levelname)s | %(message)s', level=logging.DEBUG):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(level)
-        self.file_handler = logging.FileHandler('logs/scraper/' +  local_filepath + '.log', mode='w')
-        self.file_handler.setLevel(level)
-        self.formatter = logging.Formatter(log_format)
-        self.file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.file_handler)
-        
-
-    # Implement FileLogger methods to log events for different severity levels 
-    def log_event_as_debug(self, message: str):
-        self.logger.debug(message)
-
-    def log_event_as_info(self, message: str):
-        self.logger.info(message)
-
-    def log_event_as_warning(self, message: str):
-        self.logger.warning(message)
-
-    def log_event_as_critical(self, message: str):
-        self.logger.critical(message)
-    
-    def log_event_as_error(self, message: str):
-        self.logger.error(message)
-
-
-# Set up a concrete ConsoleLogger class that inherits from ILogger
-class ConsoleLogger(ILogger):
-
-    # Define abstract methods to be implemented in child classes
-    @abstractmethod
-    def log_event_as_debug(self, message: str):
-        pass
-
-    @abstractmethod
-    def log_event_as_info(self, message: str):
-        pass
-
-    @abstractmethod
-    def log_event_as_warning(self, message: str):
-        pass
-    
-    @abstractmethod
-    def log_event_as_critical(self, message: str):
-        pass
-    
-    @abstractmethod
-    def log_event_as_error(self, message: str):
-        pass
-
-
-# Set up a concrete ColouredConsoleLogger class that inherits from ConsoleLogger 
-class ColouredConsoleLogger(ConsoleLogger):
-    def __init__(self, coloured: bool =True, level=logging.DEBUG):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(level)
-        self.console_handler = logging.StreamHandler()
-        self.console_formatter = coloredlogs.ColoredFormatter(fmt    =   '%(message)s', level_styles=dict(
-                                                                                                debug           =   dict    (color  =   'white'),
-                                                                                                info            =   dict    (color  =   'green'),
-                                                                                                warning         =   dict    (color  =   'cyan'),
-                                                                                                error           =   dict    (color  =   'red',      bold    =   True,   bright      =   True),
-                                                                                                critical        =   dict    (color  =   'black',    bold    =   True,   background  =   'red')
-                                                                                            ),
-
-                                                                                    field_styles=dict(
-                                                                                        messages            =   dict    (color  =   'white')
-                                                                                    )
-                                                                                    )
-        self.coloured = coloured
-        self.console_handler.setFormatter(self.console_formatter)
-        coloredlogs.install(level=level)
-
-        if __name__=="__main__":
-            self.logger.addHandler(self.console_handler)
-
-        
-    # Implement ColouredConsoleLogger methods to log events for different severity levels 
-    def log_event_as_debug(self, message: str):
-        self.logger.debug(message)
-        
-    def log_event_as_info(self, message: str):
-        self.logger.info(message)
-
-    def log_event_as_warning(self, message: str):
-        self.logger.warning(message)
-
-    def log_event_as_critical(self, message: str):
-        self.logger.critical(message)
-    
-    def log_event_as_error(self, message: str):
-        self.logger.error(message)
-
-
-
-# Set up a concrete NonColouredConsoleLogger class that inherits from ConsoleLogger  
-class NonColouredConsoleLogger(ConsoleLogger):
-    def __init__(self, detailed_logs: bool= False, level=logging.DEBUG):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(level)
-        self.console_handler = logging.StreamHandler()
-        self.logger.addHandler(self.console_handler)
-        self.detailed_logs = detailed_logs
-        if self.detailed_logs:
-            detailed_log_format: str='%(asctime)s | %(levelname)s | %(message)s'
-            self.console_formatter = logging.Formatter(detailed_log_format)
-            self.console_handler.setFormatter(self.console_formatter)
-        else:
-            simple_log_format: str='%(message)s'
-            self.console_formatter = logging.Formatter(simple_log_format)
-            self.console_handler.setFormatter(self.console_formatter)
-        
-
-    # Implement NonColouredConsoleLogger methods to log events for different severity levels 
-    def log_event_as_debug(self, message: str):
-        self.logger.debug(message)
-        
-    def log_event_as_info(self, message: str):
-        self.logger.info(message)
-
-    def log_event_as_warning(self, message: str):
-        self.logger.warning(message)
-
-    def log_event_as_critical(self, message: str):
-        self.logger.critical(message)
-    
-    def log_event_as_error(self, message: str):
-        self.logger.error(message)
- 
-
-# ================================================ CONFIG ================================================
-
-
-# Set up a class to enable external classes to access environment variables
-class Config:
-    def __init__(self, WRITE_FILES_TO_CLOUD: bool = False):
-        self._AWS_ACCESS_KEY             =   os.getenv("ACCESS_KEY")
-        self._AWS_SECRET_KEY             =   os.getenv("SECRET_ACCESS_KEY")
-        self._S3_REGION                  =   os.getenv("REGION_NAME")
-        self._S3_BUCKET                  =   os.getenv("S3_BUCKET")
-        self._S3_FOLDER                  =   os.getenv("S3_FOLDER")
-        self.LOCAL_TARGET_PATH           =   os.getenv("LOCAL_TARGET_PATH")
-
-        # Set up constants for S3 file to be imported
-        self.S3_CLIENT                  =   boto3.client('s3', aws_access_key_id=self._AWS_ACCESS_KEY, aws_secret_access_key=self._AWS_SECRET_KEY, region_name=self._S3_REGION)
-        
-        # Add a flag for saving CSV files to the cloud 
-        self.WRITE_FILES_TO_CLOUD = WRITE_FILES_TO_CLOUD
-
-
-
-# ================================================ WEBPAGE LOADER ================================================
-
-
-# Set up abstract base class for Webpage Loader that defines interface for webpage loaders
-class IWebPageLoader(ABC):
-    @abstractmethod
-    def load_page(self, url:str):
-        pass
-
-
-# Set up a concrete WebPageLoader class that inherits from IWebPageLoader
-class WebPageLoader(IWebPageLoader):
-    @abstractmethod
-    def load_page(self, url:str):
-        pass
-
-
-# Set up a concrete PremLeagueTableWebPageLoader class that inherits from WebPageLoader
-class PremLeagueTableWebPageLoader(WebPageLoader):
-    def __init__(self, options=None, service=None, coloured_console_logs: bool=False):
-        if options is None:
-            options = webdriver.ChromeOptions()
-        if service is None:
-            service = Service(executable_path=ChromeDriverManager().install())
-
-        self.options = options
-        self.service = service
-        self.chrome_driver = webdriver.Chrome(service=self.service, options=self.options)
-        self.coloured_console_logs = coloured_console_logs
-        if coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
-        else:
-            self.console_logger = NonColouredConsoleLogger()
+# Instantiate the classes in this script
 
+if __name__=="__main__":
 
-    # Implement PremLeagueTableWebPageLoader method to load webpage in browser
-    def load_page(self, url: str):
-        webpage_title = 'Premier League'
-        self.console_logger.log_event_as_debug(">>> Loading webpage using Selenium ...")
-        self.chrome_driver.get(url)
-        sleep(3)
-        
-        # Check if webpage loaded successfully 
-        assert webpage_title in self.chrome_driver.title, f"ERROR: Unable to load site for {webpage_title} ... "
-        self.console_logger.log_event_as_debug(">>> Webpage successfully loaded ...")
+    # Parse command line flags
+    arg_parser = argparse.ArgumentParser(description='Scrape league table standings and load them into the target location')
+    arg_parser.add_argument('--profile', action='store_true', help='profile CPU time and memory allocations for each stage and write reports to logs/profiles/')
+    arg_parser.add_argument('--enqueue', action='store_true', help='add a job per match date to the shared job queue and exit')
+    arg_parser.add_argument('--worker', action='store_true', help='lease and run jobs from the shared job queue instead of the local date loop')
+    arg_parser.add_argument('--max-idle-polls', type=int, default=None, help='stop the worker after this many empty polls of the job queue (default: run forever)')
+    arg_parser.add_argument('--compact', choices=S3SnapshotCompactor.PERIODS, default=None, help='merge the daily snapshot objects in S3_FOLDER into per-month or per-season Parquet files, then exit')
+    arg_parser.add_argument('--delete-compacted', action='store_true', help='with --compact, delete the daily objects once they are compacted')
+    arg_parser.add_argument('--live', action='store_true', help="follow today's table in one open page and push only the rows that change")
+    arg_parser.add_argument('--load-test', action='store_true', help='drive the full pipeline against a local replay server and in-memory S3 at increasing concurrency, then exit')
+    arg_parser.add_argument('--generate-synthetic', action='store_true', help='write generated league tables (pages and CSV snapshots) to temp_storage/synthetic/ for offline scale testing, then exit')
+    args = arg_parser.parse_args()
 
 
-class BundesligaTableWebPageLoader(WebPageLoader):
-    pass
+    # Specify the constants for the scraper
+    local_target_path               =   os.path.abspath('temp_storage/dirty_data')
+    league                          =   'premier-league'
+    season_start_date               =   '2022-Jul-01'
+    match_dates                     =   ['2023-Apr-24']
+    stream_snapshots                =   False   # Set to True for bulk backfills to stream rows to one output file with flat memory
+    max_validation_attempts         =   3
+    cache_snapshots                 =   False   # Set to True to keep a memory-mappable Arrow copy of each snapshot (needs pyarrow)
+    load_to_warehouse               =   False   # Set to True to also upsert each snapshot into the local SQLite warehouse
+    skip_unchanged_dates            =   False   # Set to True for backfills/daily runs to only scrape the dates on which the table changed
+    incremental_stages              =   False   # Set to True to only re-run the stages whose inputs or code changed since their last run (make-style)
+    derive_from_results             =   False   # Set to True to fetch the season's results once and derive each date's table from them
+    results_page_path               =   None    # Path of the results page on the site, with {league}, {from_date} and {to_date} placeholders (not confirmed yet - needed by derive_from_results)
+    results_reconcile_dates         =   match_dates[-1:]    # Dates to also scrape and reconcile with the derived table (when deriving from results)
+    extra_table_specs               =   []      # TableExtractionSpecs of other tables on the table page (e.g. top scorers) to load from the same page load (not used with results/incremental modes)
+    lean_small_tables               =   True    # Transform/validate/write small tables as typed rows without loading pandas (not used with stream/cache/live)
+    run_budget_seconds              =   30 * 60 # Cancel the run (and quit the browser) once it has run this long
+    live_debounce_seconds           =   2.0     # Wait for the table to settle this long after a change before pushing it
+    live_refresh_seconds            =   300.0   # Reload the page if the table has not changed in place for this long
+    live_duration_seconds           =   3 * 60 * 60
+    stage_budget_shares             =   {'load_page': 0.1, 'close_popup': 0.01, 'extract': 0.1, 'upload': 0.05}   # Cap on each stage call, as a share of the run budget
+
+    # Specify the settings for --load-test
+    load_test_pages_path            =   'temp_storage/recorded_pages'   # Saved '<match date>.html' page sources (falls back to rendering the CSV snapshots)
+    load_test_concurrency_levels    =   [1, 2, 4, 8]
+    load_test_jobs_per_level        =   16
+    load_test_latency_seconds       =   0.2
+    load_test_jitter_seconds        =   0.1
+    load_test_error_rate            =   0.05
+    load_test_popup_rate            =   0.5
+    load_test_adaptive_concurrency  =   False   # Treat each level as a ceiling and let ConcurrencyControllers find the limit for page loads and uploads
+
+    # Specify the settings for --generate-synthetic
+    synthetic_target_folder         =   'temp_storage/synthetic'
+    synthetic_league_sizes          =   {'premier-league': 20}  # e.g. add 'bundesliga': 18, or raise the size for wider tables
+    synthetic_seasons               =   range(2000, 2023)
+    synthetic_corruption_rate       =   0.0     # Share of tables to corrupt on purpose (see SyntheticDataCorruptor)
+    synthetic_seed                  =   42
 
 
-class LaligaTableWebPageLoader(WebPageLoader):
-    pass
 
+    # Load environment variables to session
+    load_dotenv()
+    cfg = Config(WRITE_FILES_TO_CLOUD=True)
 
-class SerieATableWebPageLoader(WebPageLoader):
-    pass
 
+    # Look up the league's components in the plugin registry - only this league's plugin module is imported
+    league_plugin = league_registry.get(league)
 
-class Ligue1TableWebPageLoader(WebPageLoader):
-    pass
 
+    # Pick the shared job queue - SQS when JOB_QUEUE_URL is set, otherwise a local SQLite file
+    if cfg.JOB_QUEUE_URL:
+        job_queue = SQSJobQueue(sqs_client=boto3.client('sqs', aws_access_key_id=cfg._AWS_ACCESS_KEY, aws_secret_access_key=cfg._AWS_SECRET_KEY, region_name=cfg._S3_REGION), queue_url=cfg.JOB_QUEUE_URL)
+    else:
+        job_queue = SQLiteJobQueue(queue_path=cfg.JOB_QUEUE_PATH)
 
-# ================================================ POPUP HANDLER ================================================
+    if args.enqueue:
+        for match_date in match_dates:
+            job_queue.enqueue(league, match_date, data_type='league-standings')
+        sys.exit(0)
 
-# Set up abstract base class for PopUpHandler that defines interface for popup handlers
-class IPopUpHandler(ABC):
-    @abstractmethod
-    def close_popup(self):
-        pass
 
+    # Merge the small daily objects in S3 into per-month/per-season files that the snapshot reader picks up transparently
+    if args.compact:
+        snapshot_reader = CompactedS3SnapshotReader(s3_client=cfg.S3_CLIENT, s3_bucket=cfg._S3_BUCKET, s3_folder=cfg._S3_FOLDER)
+        S3SnapshotCompactor(snapshot_reader=snapshot_reader, period=args.compact).compact(delete_daily_objects=args.delete_compacted)
+        sys.exit(0)
 
-# Set up a concrete PopUpHandler class that inherits from IPopUpHandler
-class PopUpHandler(IPopUpHandler):
-    @abstractmethod
-    def close_popup(self):
-        pass
 
+    # Generate realistic tables offline - point 'load_test_pages_path' at '<synthetic_target_folder>/<league>/pages' to replay them
+    if args.generate_synthetic:
+        synthetic_generators = [SyntheticLeagueTableGenerator(league=synthetic_league, league_size=league_size, seed=synthetic_seed) for synthetic_league, league_size in synthetic_league_sizes.items()]
+        synthetic_corruptor = SyntheticDataCorruptor(corruption_rate=synthetic_corruption_rate, seed=synthetic_seed) if synthetic_corruption_rate else None
+        SyntheticDatasetWriter(generators=synthetic_generators, target_folder=synthetic_target_folder, data_transformer=league_plugin.data_transformer(), corruptor=synthetic_corruptor).write(synthetic_seasons)
+        sys.exit(0)
 
-# Set up a concrete PremLeagueTablePopUpHandler class that inherits from PopUpHandler
-class PremLeagueTablePopUpHandler(PopUpHandler):
 
-    def __init__(self, chrome_driver: webdriver.Chrome, logger: logging.Logger, coloured_console_logs: bool=False, file_logger=FileLogger()):
-        self.chrome_driver = chrome_driver
-        self.file_logger = file_logger  
-        
-        self.coloured_console_logs = coloured_console_logs
-        if coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
-        else:
-            self.console_logger = NonColouredConsoleLogger()
-        
-        self.logger = logger
-        self.logger.propagate = True
-        
-
-    # Implement PopUpHandler method for closing popup windows in browser
-    def close_popup(self):
+    # Size worker pools offline - replay recorded pages locally and upload to an in-memory S3 stand-in
+    if args.load_test:
+        recorded_pages = ReplayPageServer.load_recorded_pages(load_test_pages_path) or ReplayPageServer.render_pages_from_csv_folder(local_target_path)
+        replay_server = ReplayPageServer(recorded_pages=recorded_pages, latency_seconds=load_test_latency_seconds, jitter_seconds=load_test_jitter_seconds, error_rate=load_test_error_rate, popup_rate=load_test_popup_rate, seed=42)
+        replay_server.start()
         try:
-            wait = WebDriverWait(self.chrome_driver, 5)
-            close_popup_box = wait.until(EC.presence_of_element_located((By.XPATH, '/html/body/div[8]/div[2]/div[1]/div[1]/button/i')))
-            close_popup_box.click()
-            self.console_logger.log_event_as_debug(f'>>>>   Closing cookie pop-up window ...')
-        
-        except Exception as e:
-            self.console_logger.log_event_as_error(f'No cookie pop-up window to close...let\'s begin scraping for league standings !!')
-
-
-class BundesligaTablePopUpHandler(PopUpHandler):
-    pass
+            load_test_harness = LoadTestHarness(replay_server=replay_server, league=league, season_start_date=season_start_date, match_dates=sorted(recorded_pages), concurrency_levels=load_test_concurrency_levels, jobs_per_level=load_test_jobs_per_level,
+                                                adaptive_concurrency=load_test_adaptive_concurrency)
+            load_test_harness.run(report_path=f"logs/load_tests/{league}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        finally:
+            replay_server.stop()
+        sys.exit(0)
 
 
-class LaLigaTablePopUpHandler(PopUpHandler):
-    pass
+    # Allow one run per (league, job type) at a time and give it an overall deadline - queue workers are meant to run side by side
+    job_type = 'live' if args.live else 'stream' if stream_snapshots else 'change-dates' if skip_unchanged_dates else 'scrape'
+    run_budget = RunBudget(total_seconds=None if args.worker else live_duration_seconds + run_budget_seconds if args.live else run_budget_seconds, stage_shares=stage_budget_shares)
+    run_coordinator = RunCoordinator(run_lock=None if args.worker else FileRunLock(lock_folder=cfg.RUN_LOCK_PATH, league=league, job_type=job_type), run_budget=run_budget)
+    try:
+        run_coordinator.acquire()
+    except RunLockHeldError as e:
+        run_coordinator.console_logger.log_event_as_error(f'>>> {e}')
+        sys.exit(1)
 
 
-class SerieATablePopUpHandler(PopUpHandler):
-    pass
+    # Skip any (league, match date) units a previous run already completed - incremental runs let the stage fingerprints decide instead
+    job_manifest = JSONFileJobManifest(manifest_path=cfg.JOB_MANIFEST_PATH, coloured_console_logs=False)
+    pending_match_dates = match_dates if incremental_stages else job_manifest.get_pending_match_dates(league, match_dates)
 
-
-class Ligue1TablePopUpHandler(PopUpHandler):
-    pass
-
-
-# ================================================ DATA EXTRACTOR ================================================
-
-# Set up abstract base class for Data Extractor that defines interface for data extractors
-class IDataExtractor(ABC):
-    @abstractmethod
-    def scrape_data(self):
-        pass
-
-
-# Set up a concrete TableStandingsDataExtractor class that inherits from IDataExtractor
-class TableStandingsDataExtractor(IDataExtractor):
-    @abstractmethod
-    def scrape_data(self):
-        pass
-
-
-# Set up a concrete PremLeagueTableStandingsDataExtractor class that inherits from TableStandingsDataExtractor
-class PremLeagueTableStandingsDataExtractor(TableStandingsDataExtractor):
-
-    def __init__(self, chrome_driver: webdriver.Chrome, match_date: str, coloured_console_logs: bool=False, file_logger=FileLogger()):
-        self.chrome_driver = chrome_driver
-        self.match_date = match_date
-        self.file_logger = file_logger
-        self.coloured_console_logs = coloured_console_logs
-        if self.coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
-        else:
-            self.console_logger = NonColouredConsoleLogger()
     
-    # Implement PremLeagueTableStandingsDataExtractor method for scraping data from webpage
-    def scrape_data(self):
-        try:
-            table                   =   self.chrome_driver.find_element(By.CLASS_NAME, 'leaguetable')
-            table_rows              =   table.find_elements(By.XPATH, './/tr')
-            table_row_counter       =   0
-            scraped_content         =   []
-            self.console_logger.log_event_as_debug(f'>>>>   Extracting content from HTML elements ...')
-
-            for table_row in table_rows:
-                table_row_counter   +=  1
-                self.console_logger.log_event_as_debug(f'>>>>>>>   Table no {table_row_counter} <<<<<<  ')
-                cells           =   table_row.find_elements(By.TAG_NAME, 'td')
-                row_data        =   []
-                cell_counter    =   0
-
-                for cell in cells:
-                    cell_counter += 1
-                    row_data.append(cell.text)
-                    self.file_logger.log_event_as_debug(f'>>>>   Table row no "{table_row_counter}", Cell no "{cell_counter}" appended ...')
-                    self.file_logger.log_event_as_debug(f'>>>>   ')
-
-                    print(cell.text)
-
-                scraped_content.append(row_data)
-        except Exception as e:
-            self.console_logger.log_event_as_error(e)
-
-        return scraped_content
-
-
-
-class BundesligaTableStandingsDataExtractor(TableStandingsDataExtractor):
-    pass
-
-
-class LaligaTableStandingsDataExtractor(TableStandingsDataExtractor):
-    pass
-
-
-class SerieATableStandingsDataExtractor(TableStandingsDataExtractor):
-    pass
-
-
-class Ligue1TableStandingsDataExtractor(TableStandingsDataExtractor):
-    pass
-
-
-# ================================================ DATA TRANSFORMER ================================================
-
-# Set up abstract base class for Data Transformer that defines interface for data transformers
-class IDataTransformer(ABC):
-    @abstractmethod
-    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
-        pass
-
-
-# Set up a concrete TableStandingsDataTransformer class that inherits from IDataTransformer
-class TableStandingsDataTransformer(IDataTransformer):
-    @abstractmethod
-    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
-        pass
-
-
-
-# Set up a concrete PremierLeagueTableStandingsDataTransformer class that inherits from TableStandingsDataTransformer
-class PremierLeagueTableStandingsDataTransformer(TableStandingsDataTransformer):
-    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger()):
-        self.file_logger = file_logger
-        self.coloured_console_logs = coloured_console_logs
-        if self.coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
-        else:
-            self.console_logger = NonColouredConsoleLogger()
-
-
-    # Implement PremierLeagueTableStandingsDataTransformer method for transforming data  
-    def transform_data(self, scraped_content: List[List[str]], match_date: str) -> pd.DataFrame:
-        try:
-            self.file_logger.log_event_as_debug(f'>>>> Transforming scraped Premier League content...')
-        
-            scraped_data            =   scraped_content[1:]
-            scraped_columns         =   scraped_content[0]
-
-            table_df                =   pd.DataFrame(data=scraped_data, columns=scraped_columns)
-            table_df['match_date']  =   match_date
-
-            self.file_logger.log_event_as_debug(f'>>>> Successfully transformed Premier League content...')
-        except Exception as e:
-            self.console_logger.log_event_as_error(e)
-
-        return table_df
-
-
-class BundesligaTableStandingsDataTransformer(TableStandingsDataTransformer):
-        pass
-
 
-class LaligaTableStandingsDataTransformer(TableStandingsDataTransformer):
-        pass
 
+    # Profile each stage when running with --profile (no-op otherwise)
+    stage_profiler = StageProfiler(profile_folder=f"logs/profiles/{league}_{datetime.now().strftime('%Y%m%d_%H%M%S')}", enabled=args.profile)
 
-class SerieATableStandingsDataTransformer(TableStandingsDataTransformer):
-        pass
 
-
-class Ligue1TableStandingsDataTransformer(TableStandingsDataTransformer):
-        pass
-
-
-# ================================================ DATA UPLOADER ================================================
-
-# Set up abstract base class for Data Loader that defines an interface for data uploaders
-class IFileUploader(ABC):
-    @abstractmethod
-    def upload_file(self):
-        pass
-
-
-# Set up a concrete S3FileUploader class that inherits from IFileUploader
-class S3FileUploader(IFileUploader):
-    @abstractmethod
-    def upload_file(self):
-        pass
-
-
-# Set up a concrete S3CSVFileUploader class that inherits from S3FileUploader
-class S3CSVFileUploader(S3FileUploader):
-    @abstractmethod
-    def upload_file(self):
-        pass
-
-
-# Set up a concrete PremierLeagueTableS3CSVUploader class that inherits from S3CSVFileUploader
-class PremierLeagueTableS3CSVUploader(S3CSVFileUploader):
-
-    def __init__(self, coloured_console_logs: bool=False, file_logger=FileLogger(), cfg: Config = Config(WRITE_FILES_TO_CLOUD=True)):
-        self.cfg                    =   cfg
-        self.file_name_prefix: str  = 'prem_league_table'
-        self.s3_client: str         =   self.cfg.S3_CLIENT
-        self.s3_bucket: str         =   self.cfg._S3_BUCKET
-        self.s3_folder: str         =   self.cfg._S3_FOLDER
-        self.s3_region: str         =   self.cfg._S3_REGION
-        self.file_logger            =   file_logger
-        self.coloured_console_logs  =   coloured_console_logs
-        if self.coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
-        else:
-            self.console_logger = NonColouredConsoleLogger()
+    # Share one resilience layer (backoff, circuit breakers, outcome counters) across every stage
+    resilient_caller = ResilientCaller(coloured_console_logs=False)
 
 
+    # Load webpage 
+    webpage_loader = league_plugin.webpage_loader(webpage_title=league_plugin.title_check, resilient_caller=resilient_caller)
+    run_coordinator.attach_browser(webpage_loader)
+    logger = logging.getLogger(__name__)
+    if lean_small_tables and not (stream_snapshots or cache_snapshots or args.live):
+        data_transformer = league_plugin.lean_data_transformer(coloured_console_logs=False)
+    else:
+        data_transformer = league_plugin.data_transformer(coloured_console_logs=False)
+    data_validator = league_plugin.data_validator(coloured_console_logs=False)
+    snapshot_quarantine = LocalSnapshotQuarantine(quarantine_path=cfg.QUARANTINE_PATH, file_name=league_plugin.file_name, coloured_console_logs=False)
 
-    # Implement PremierLeagueTableS3CSVUploader method for uploading CSV files into S3 bucket
-    def upload_file(self, prem_league_df: pd.DataFrame, match_date: str):
+    # Serialise each snapshot once and fan it out to every configured target location
+    data_sinks = []
+    if cfg.WRITE_FILES_TO_CLOUD:
 
-        if self.cfg.WRITE_FILES_TO_CLOUD:
+        # Upload files into S3 bucket if WRITE_FILES_TO_CLOUD flag is True
+        data_sinks.append(S3SnapshotSink(s3_client=cfg.S3_CLIENT, s3_bucket=cfg._S3_BUCKET, s3_folder=cfg._S3_FOLDER, resilient_caller=resilient_caller))
+    
+    if cfg.WRITE_FILES_TO_LOCAL or not cfg.WRITE_FILES_TO_CLOUD:
+
+        # Upload files into local machine if WRITE_FILES_TO_LOCAL flag is True (or nothing goes to the cloud)
+        data_sinks.append(LocalSnapshotSink(target_path=cfg.LOCAL_TARGET_PATH))
+
+    data_uploader = MultiSinkFileUploader(sinks=data_sinks, coloured_console_logs=False)
+    snapshot_cache = ArrowIPCSnapshotCache(cache_path=cfg.SNAPSHOT_CACHE_PATH, coloured_console_logs=False) if cache_snapshots else None
+    warehouse_uploader = league_plugin.warehouse_uploader(database_path=cfg.SQLITE_DATABASE_PATH, coloured_console_logs=False) if load_to_warehouse else None
+    job_runner = league_plugin.job_runner(webpage_loader=webpage_loader, data_transformer=data_transformer, data_validator=data_validator, snapshot_quarantine=snapshot_quarantine, data_uploader=data_uploader, 
+                                          season_start_date=season_start_date, max_validation_attempts=max_validation_attempts, warehouse_uploader=warehouse_uploader, snapshot_cache=snapshot_cache, 
+                                          stage_profiler=stage_profiler, resilient_caller=resilient_caller, run_budget=run_budget,
+                                          popup_handler_class=league_plugin.popup_handler, data_extractor_class=league_plugin.data_extractor)
+
+    # Pull the other declared tables out of the same page load as the standings, each into its own files
+    multi_table_runner = None
+    if extra_table_specs:
+        extraction_routes = [TableExtractionRoute(TableExtractionSpec('league-standings', table_class='leaguetable'), data_transformer, data_uploader, data_validator)]
+        for extra_table_spec in extra_table_specs:
+            extra_file_name = f"{league_plugin.file_name}_{extra_table_spec.data_type.replace('-', '_')}"
+            extra_sinks = []
+            if cfg.WRITE_FILES_TO_CLOUD:
+                extra_sinks.append(S3SnapshotSink(s3_client=cfg.S3_CLIENT, s3_bucket=cfg._S3_BUCKET, s3_folder=cfg._S3_FOLDER, file_name=extra_file_name, resilient_caller=resilient_caller))
+            if cfg.WRITE_FILES_TO_LOCAL or not cfg.WRITE_FILES_TO_CLOUD:
+                extra_sinks.append(LocalSnapshotSink(target_path=cfg.LOCAL_TARGET_PATH, file_name=extra_file_name))
+            extraction_routes.append(TableExtractionRoute(extra_table_spec, SpecTableDataTransformer(extra_table_spec, coloured_console_logs=False), MultiSinkFileUploader(sinks=extra_sinks, coloured_console_logs=False)))
+
+        multi_table_runner = MultiTableScrapeJobRunner(webpage_loader=webpage_loader, extraction_routes=extraction_routes, season_start_date=season_start_date, stage_profiler=stage_profiler, 
+                                                       resilient_caller=resilient_caller, run_budget=run_budget, popup_handler_class=league_plugin.popup_handler, coloured_console_logs=False)
+
+    # Derive each date's table from one fetch of the season's results, reconciling the given dates with the scraped table
+    standings_runner = None
+    if derive_from_results:
+        standings_runner = ResultsStandingsJobRunner(job_runner=job_runner, results_path=results_page_path, reconcile_dates=results_reconcile_dates, coloured_console_logs=False)
+
+    # Only re-run the stages whose input fingerprint or code version changed (the browser is not even started if nothing did)
+    pipeline_runner = None
+    if incremental_stages:
+        pipeline_runner = IncrementalPipelineRunner(job_runner=job_runner, state_store=PipelineStateStore(state_path=cfg.PIPELINE_STATE_PATH, coloured_console_logs=False), artifacts_path=cfg.PIPELINE_ARTIFACTS_PATH, coloured_console_logs=False)
+
+
+    try:
+        if args.worker:
+
+            # Lease jobs from the shared queue until it stays empty - run as many workers on as many nodes as needed
+            job_worker = ScrapeJobWorker(job_queue=job_queue, job_runners={'league-standings': pipeline_runner or standings_runner or multi_table_runner or job_runner}, max_idle_polls=args.max_idle_polls, run_budget=run_budget)
+            job_worker.run()
+
+        elif args.live:
+
+            # Keep one page open and push only the changed rows to a local NDJSON feed (and the warehouse, if enabled)
+            live_match_date = datetime.now().strftime('%Y-%b-%d')
+            live_feed_writer = LocalStreamingNDJSONFileWriter(file_path=f'{cfg.LOCAL_TARGET_PATH}/prem_league_table_live_{live_match_date}.ndjson', league=league, atomic=False)
+            live_streamer = LiveTableStreamer(webpage_loader=webpage_loader, table_observer=LiveTableObserver(webpage_loader, debounce_seconds=live_debounce_seconds), data_transformer=data_transformer,
+                                              football_url=job_runner.get_url(league, live_match_date), match_date=live_match_date, streaming_writers=[live_feed_writer], warehouse_uploader=warehouse_uploader,
+                                              refresh_seconds=live_refresh_seconds, run_budget=run_budget)
             try:
-                self.console_logger.log_event_as_debug(f">>> Saving Prem League table file into S3 folder ...")
-                S3_KEY = f"{self.s3_folder}/{self.file_name_prefix}_{match_date}.csv"
-
-                
-                self.console_logger.log_event_as_debug(f">>> Creating in-memory buffer ...")
-                CSV_BUFFER = io.StringIO()
-
-                self.console_logger.log_event_as_debug(f">>> Persisting dataframe to CSV file ...")
-                prem_league_df.to_csv(CSV_BUFFER, index=False)
-
-                
-                self.console_logger.log_event_as_debug(f">>> Retrieving data from CSV buffer & storing as string values ...")
-                RAW_TABLE_ROWS_AS_STRING_VALUES = CSV_BUFFER.getvalue()
-                self.s3_client.put_object(Bucket=self.s3_bucket, Key=S3_KEY, Body=RAW_TABLE_ROWS_AS_STRING_VALUES)
-            
-                self.console_logger.log_event_as_debug(f"")
-                self.console_logger.log_event_as_debug(f">>> Successfully written and loaded '{self.file_name_prefix}' file to cloud target location in S3 bucket... ")
-                self.console_logger.log_event_as_debug(f"")
-
-            except Exception as e:
-                self.console_logger.log_event_as_warning(e)
-        else:
-            self.file_logger.log_event_as_error(">>> Unable to upload to S3 bucket: Set 'WRITE_FILES_TO_CLOUD' to 'True' to upload files to S3 bucket.")
-            raise ImportError("Unable to upload to S3 bucket: Set 'WRITE_FILES_TO_CLOUD' to 'True' to upload files to S3 bucket.")
-
-
-class BundesligaTableS3CSVUploader(S3CSVFileUploader):
-    pass
-
+                live_streamer.run(duration_seconds=live_duration_seconds)
+            finally:
+                live_feed_writer.close()
+
+        elif stream_snapshots and pending_match_dates:
+
+            # Stream every pending snapshot into a single output file, flushing to the target in bounded chunks
+            stream_file_name = f'{league_plugin.file_name}_{pending_match_dates[0]}_to_{pending_match_dates[-1]}.csv'
+
+            if cfg.WRITE_FILES_TO_CLOUD:
+                streaming_writer = S3StreamingCSVFileWriter(s3_client=cfg.S3_CLIENT, s3_bucket=cfg._S3_BUCKET, s3_key=f'{cfg._S3_FOLDER}/{stream_file_name}', max_buffer_bytes=cfg.STREAM_MAX_BUFFER_BYTES)
+            else:
+                streaming_writer = LocalStreamingCSVFileWriter(file_path=f'{cfg.LOCAL_TARGET_PATH}/{stream_file_name}', max_buffer_bytes=cfg.STREAM_MAX_BUFFER_BYTES)
+
+            content_hashes = {}
+            for match_date in pending_match_dates:
+                football_url = job_runner.get_url(league, match_date)
+                job_manifest.mark_started(league, match_date)
+
+                try:
+                    with stage_profiler.profile_stage('load_page'):
+                        webpage_loader.load_page(football_url, deadline=run_budget.start_stage('load_page'))
+                    with stage_profiler.profile_stage('close_popup'):
+                        popup_handler = league_plugin.popup_handler(webpage_loader.chrome_driver, logger, resilient_caller=resilient_caller)
+                        popup_handler.close_popup(wait_seconds=run_budget.get_stage_timeout_seconds('close_popup', 5))
+
+                    # Extract (E), transform (T) and stage the snapshot one chunk at a time - its rows only join the stream once it passes validation
+                    with stage_profiler.profile_stage('stream_snapshot'):
+                        data_extractor = league_plugin.data_extractor(chrome_driver=webpage_loader.chrome_driver, match_date=match_date, coloured_console_logs=False, resilient_caller=resilient_caller)
+                        content_hash = hashlib.sha256()
+                        snapshot_chunks = []
+                        streaming_writer.begin_part()
+                        for chunk_number, chunk_df in enumerate(data_transformer.iter_transformed_chunks(data_extractor.iter_scraped_rows(), match_date=match_date)):
+                            content_hash.update(JSONFileJobManifest.get_canonical_csv_bytes(chunk_df, header=chunk_number == 0))     # Same hash as the whole table in one piece
+                            streaming_writer.write_chunk(chunk_df)
+                            snapshot_chunks.append(chunk_df)
+
+                    # Validate the whole table of the date (one table is small) and quarantine it instead of streaming it if it fails
+                    snapshot_df = pd.concat(snapshot_chunks, ignore_index=True)
+                    try:
+                        job_runner.validate_snapshot(snapshot_df, match_date=match_date)
+                    except LeagueTableValidationError as validation_error:
+                        snapshot_quarantine.quarantine_snapshot(snapshot_df, league, match_date, validation_error.failed_checks)
+                        raise
+
+                    streaming_writer.commit_part()
+                    content_hashes[match_date] = content_hash.hexdigest()
+
+                except RunCancelledError as e:
+                    streaming_writer.discard_part()
+                    job_manifest.mark_failed(league, match_date, error=e)
+                    break
+
+                except Exception as e:
+                    streaming_writer.discard_part()
+                    job_manifest.mark_failed(league, match_date, error=e)
+
+
+            # Units are only complete once the whole stream has landed in the target
+            stream_error = 'Streaming upload did not complete'
+            with stage_profiler.profile_stage('upload'):
+                try:
+                    output_location = streaming_writer.close()
+                except Exception as e:
+                    output_location, stream_error = None, f'Streaming upload did not complete: {e}'
+            for match_date, content_hash in content_hashes.items():
+                if output_location is None:
+                    job_manifest.mark_failed(league, match_date, error=stream_error)
+                else:
+                    job_manifest.mark_complete(league, match_date, output_location=output_location, content_hash=content_hash)
+
+        elif skip_unchanged_dates:
+
+            # Bisect the date range for the days the table changed and point every other day at the prior snapshot
+            change_calendar = JSONFileChangeCalendar(calendar_path=cfg.CHANGE_CALENDAR_PATH, coloured_console_logs=False)
+            change_date_scheduler = ChangeDateScheduler(job_runner=job_runner, change_calendar=change_calendar, job_manifest=job_manifest, coloured_console_logs=False)
+            change_date_scheduler.run(league, match_dates)
 
-class LaligaTableS3CSVUploader(S3CSVFileUploader):
-    pass
-
-
-class SerieATableS3CSVUploader(S3CSVFileUploader):
-    pass
-
-
-class Ligue1TableS3CSVUploader(S3CSVFileUploader):
-    pass
-
-
-
-
-
-
-class S3JSONFileUploader(S3FileUploader):
-    pass
-
-
-
-# Set up a LocalFileUploader class that inherits from IFileUploader
-class LocalFileUploader(IFileUploader):
-    @abstractmethod
-    def upload_file(self):
-        pass
-
-
-# Set up a LocalCSVFileUploader class that inherits from LocalFileUploader
-class LocalCSVFileUploader(LocalFileUploader):
-    @abstractmethod
-    def upload_file(self):
-        pass
-
-
-# Set up a concrete PremierLeagueTableLocalCSVUploader class that inherits from LocalCSVFileUploader
-class PremierLeagueTableLocalCSVUploader(LocalCSVFileUploader):
-    
-    def __init__(self, target_path: str=None, file_name: str='prem_league_table', coloured_console_logs: bool=False, file_logger=FileLogger()):
-        self.cfg = Config()
-        
-        if target_path is None:
-            target_path = self.cfg.LOCAL_TARGET_PATH
-            self.target_path = target_path
-
-        self.file_name = file_name
-        self.file_logger = file_logger
-        self.coloured_console_logs = coloured_console_logs
-        if self.coloured_console_logs:
-            self.console_logger = ColouredConsoleLogger()
         else:
-            self.console_logger = NonColouredConsoleLogger()
-
-
-   # Implement PremierLeagueTableLocalCSVUploader method for uploading CSV files into local machine
-    def upload_file(self, prem_league_df: pd.DataFrame, match_date: str):
-        try:
-            self.console_logger.log_event_as_debug(f">>> Saving Prem League table file into local folder...")
 
-            prem_league_table_file = f'{self.target_path}/{self.file_name}_{match_date}'
-            prem_league_df.to_csv(f'{prem_league_table_file}.csv', index=False)
-            
-            self.console_logger.log_event_as_debug(f"")
-            self.console_logger.log_event_as_debug(f">>> Successfully written and loaded '{self.file_name}' file to local target location... ")
-            self.console_logger.log_event_as_debug(f"")
-        except Exception as e:
-            self.console_logger.log_event_as_error(e)
+            for match_date in pending_match_dates:
+                job_manifest.mark_started(league, match_date)
 
+                try:
+                    output_location, content_hash = (pipeline_runner or standings_runner or multi_table_runner or job_runner).run_job(league, match_date)
 
-        prem_league_table_file = f'{self.target_path}/{self.file_name}_{match_date}'
-        prem_league_df.to_csv(f'{prem_league_table_file}.csv', index=False)
+                    if output_location is None:
+                        job_manifest.mark_failed(league, match_date, error='Upload did not complete')
+                    else:
+                        job_manifest.mark_complete(league, match_date, output_location=output_location, content_hash=content_hash)
 
-        self.file_logger.log_event_as_debug(f"")
-        self.file_logger.log_event_as_debug(f">>> Successfully written and loaded '{self.file_name}' file to local target location... ")
-        self.file_logger.log_event_as_debug(f"")
+                except RunCancelledError as e:
+                    job_manifest.mark_failed(league, match_date, error=e)
+                    break
 
+                except Exception as e:
+                    job_manifest.mark_failed(league, match_date, error=e)
 
-class BundesligaTableLocalCSVUploader(LocalFileUploader):
-    pass
-
-
-class LaligaTableLocalCSVUploader(LocalFileUploader):
-    pass
-
-
-class SerieATableLocalCSVUploader(LocalFileUploader):
-    pass
-
-
-class Ligue1TableLocalCSVUploader(LocalFileUploader):
-    pass
-
-
-
-
-
-# Instantiate the classes in this script
-
-if __name__=="__main__":
-
-    # Specify the constants for the scraper
-    local_target_path               =   os.path.abspath('temp_storage/dirty_data')
-    match_date                      =   '2023-Apr-24'
-    football_url                    =   f'https://www.twtd.co.uk/league-tables/competition:premier-league/daterange/fromdate:2022-Jul-01/todate:{match_date}/type:home-and-away/'
-
-
-
-    # Load environment variables to session
-    load_dotenv()
-    cfg = Config(WRITE_FILES_TO_CLOUD=True)
-
-    
-
-
-    # Load webpage 
-    webpage_loader = PremLeagueTableWebPageLoader()
-    webpage_loader.load_page(football_url)
-    
-
-    # Close popup boxes if they appear on webpage
-    logger = logging.getLogger(__name__)
-    popup_handler = PremLeagueTablePopUpHandler(webpage_loader.chrome_driver, logger)
-    popup_handler.close_popup()
-
-
-    # Extract data (E)
-    data_extractor = PremLeagueTableStandingsDataExtractor(chrome_driver=webpage_loader.chrome_driver, match_date=match_date, coloured_console_logs=False)
-    prem_league_scraped_data = data_extractor.scrape_data()
-    
-
-    # Transform data (T)
-    data_transformer = PremierLeagueTableStandingsDataTransformer(coloured_console_logs=False)
-    df = data_transformer.transform_data(scraped_content=prem_league_scraped_data, match_date=match_date)
-    print(df)
-
-
-    # Load data (L)
-    if cfg.WRITE_FILES_TO_CLOUD:
-
-        # Upload files into S3 bucket if WRITE_FILES_TO_CLOUD flag is True
-        cloud_data_uploader = PremierLeagueTableS3CSVUploader(coloured_console_logs=False, cfg=cfg)
-        cloud_data_uploader.upload_file(df, match_date=match_date)
-    
-    else:
+    finally:
 
-        # Upload files into local machine if WRITE_FILES_TO_CLOUD flag is False
-        local_data_uploader = PremierLeagueTableLocalCSVUploader(coloured_console_logs=False)
-        local_data_uploader.upload_file(df, match_date=match_date)
+        # Close Selenium Chrome driver and release the run lock
+        run_coordinator.release()
 
-        
-    # Close Selenium Chrome driver 
-    webpage_loader.chrome_driver.quit()
-    
\ No newline at end of file
+    resilient_caller.log_outcome_counters()
+    stage_profiler.write_reports()
+    if pipeline_runner is not None:
+        pipeline_runner.log_stage_outcomes()
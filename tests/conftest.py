@@ -0,0 +1,34 @@
+import os
+import csv
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+# Import the engine from 'scraper/' the way the entry points do
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / 'scraper'))
+
+# The engine's loggers write to 'logs/scraper/' relative to the working folder - run the suite in a scratch folder
+# so neither the logs nor the 'temp_storage' outputs of the tests land in the repo
+WORKING_FOLDER = tempfile.mkdtemp(prefix='football-scraper-tests-')
+os.makedirs(f'{WORKING_FOLDER}/logs/scraper')
+os.chdir(WORKING_FOLDER)
+
+DIRTY_DATA_FOLDER = REPO_ROOT / 'temp_storage' / 'dirty_data'
+FIXTURES_FOLDER = Path(__file__).resolve().parent / 'fixtures'
+
+
+def pytest_sessionfinish(session, exitstatus):
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(WORKING_FOLDER, ignore_errors=True)
+
+
+@pytest.fixture
+def scraped_content():
+    """ A real scraped table (header first) as the extractor returns it - the saved snapshot minus its match_date column """
+    with open(DIRTY_DATA_FOLDER / 'prem_league_table_2023-Apr-16.csv', newline='', encoding='utf-8') as snapshot_file:
+        return [row[:-1] for row in csv.reader(snapshot_file)]
@@ -0,0 +1,59 @@
+import pytest
+
+from football_engine.transformers import PremierLeagueTableStandingsDataTransformer
+
+pytest.importorskip('pyarrow')
+from football_engine.cache import ArrowIPCSnapshotCache
+
+
+def transform(scraped_content, match_date):
+    return PremierLeagueTableStandingsDataTransformer().transform_data(scraped_content, match_date=match_date)
+
+
+@pytest.fixture
+def snapshot_cache(tmp_path):
+    return ArrowIPCSnapshotCache(cache_path=str(tmp_path / 'cache'))
+
+
+def test_cached_dates_in_range_are_read_back_as_one_table(snapshot_cache, scraped_content):
+    for match_date in ['2023-Apr-09', '2023-Apr-16', '2023-May-01']:
+        snapshot_cache.write_snapshot(transform(scraped_content, match_date), match_date=match_date)
+
+    table = snapshot_cache.read_snapshots('2023-Apr-01', '2023-Apr-30')
+
+    assert table.num_rows == 40
+    assert sorted(set(table.column('match_date').to_pylist())) == ['2023-Apr-09', '2023-Apr-16']
+    assert {'home_W', 'away_W', 'match_date'} <= set(table.column_names) and ' ' not in table.column_names
+    assert table.column('Team').to_pylist()[0] == 'Arsenal'
+
+
+def test_uncached_range_and_other_files_are_misses(snapshot_cache, scraped_content, tmp_path):
+    snapshot_cache.write_snapshot(transform(scraped_content, '2023-Apr-16'), match_date='2023-Apr-16')
+    ArrowIPCSnapshotCache(cache_path=str(tmp_path / 'cache'), file_name='laliga_table').write_snapshot(transform(scraped_content, '2023-Mar-16'), match_date='2023-Mar-16')
+    (tmp_path / 'cache' / 'prem_league_table_latest.arrow').write_bytes(b'')
+
+    assert snapshot_cache.read_snapshots('2023-Mar-01', '2023-Mar-31') is None
+    assert snapshot_cache.get_cached_match_dates('2023-Jan-01', '2023-Dec-31') == ['2023-Apr-16']
+
+
+def test_rewriting_a_date_replaces_its_cached_copy(snapshot_cache, scraped_content, tmp_path):
+    snapshot_cache.write_snapshot(transform(scraped_content, '2023-Apr-16'), match_date='2023-Apr-16')
+    corrected_content = [scraped_content[0], scraped_content[1][:-1] + ['76']] + scraped_content[2:]
+
+    snapshot_cache.write_snapshot(transform(corrected_content, '2023-Apr-16'), match_date='2023-Apr-16')
+
+    table = snapshot_cache.read_snapshots('2023-Apr-16', '2023-Apr-16')
+    assert table.num_rows == 20 and table.column('Pts').to_pylist()[0] == '76'
+    assert [path.name for path in (tmp_path / 'cache').iterdir()] == ['prem_league_table_2023-Apr-16.arrow']
+
+
+def test_corrupt_cache_file_is_dropped_and_the_rest_of_the_range_still_reads(snapshot_cache, scraped_content, tmp_path):
+    for match_date in ['2023-Apr-09', '2023-Apr-16']:
+        snapshot_cache.write_snapshot(transform(scraped_content, match_date), match_date=match_date)
+    corrupt_path = tmp_path / 'cache' / 'prem_league_table_2023-Apr-16.arrow'
+    corrupt_path.write_bytes(corrupt_path.read_bytes()[:100])
+
+    table = snapshot_cache.read_snapshots('2023-Apr-01', '2023-Apr-30')
+
+    assert table.num_rows == 20 and set(table.column('match_date').to_pylist()) == {'2023-Apr-09'}
+    assert not corrupt_path.exists()
@@ -0,0 +1,109 @@
+import pytest
+
+from football_engine.change_calendar import ChangeDateScheduler, JSONFileChangeCalendar
+from football_engine.manifest import JSONFileJobManifest
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+
+
+LEAGUE = 'premier-league'
+
+
+# Stand-in for the job runner that serves a prepared table (or raises a prepared error) per date and records every page load and upload
+class RecordingJobRunner:
+    def __init__(self, tables_by_date):
+        self.tables_by_date = tables_by_date
+        self.scraped_dates = []
+        self.loaded_dates = []
+
+    def scrape_snapshot(self, league, match_date):
+        self.scraped_dates.append(match_date)
+        if isinstance(self.tables_by_date[match_date], Exception):
+            raise self.tables_by_date[match_date]
+        return self.tables_by_date[match_date]
+
+    def load_snapshot(self, df, match_date):
+        self.loaded_dates.append(match_date)
+        return f'snapshots/{match_date}.csv', JSONFileJobManifest.compute_content_hash(df)
+
+
+def get_points_after(scraped_content, extra_points):
+    """ The scraped table with 'extra_points' added to the leader - a stand-in for the table after a match day """
+    leader_row = list(scraped_content[1])
+    leader_row[-1] = str(int(leader_row[-1]) + extra_points)
+    return [scraped_content[0], leader_row] + scraped_content[2:]
+
+
+@pytest.fixture
+def scheduler_parts(tmp_path):
+    def build(tables_by_date):
+        job_runner = RecordingJobRunner(tables_by_date)
+        job_manifest = JSONFileJobManifest(manifest_path=str(tmp_path / 'manifest.json'))
+        change_calendar = JSONFileChangeCalendar(calendar_path=str(tmp_path / 'calendar.json'))
+        return ChangeDateScheduler(job_runner=job_runner, change_calendar=change_calendar, job_manifest=job_manifest), job_runner, job_manifest
+    return build
+
+
+@pytest.mark.parametrize('transformer_class', [PremierLeagueTableStandingsDataTransformer, PremierLeagueTableLeanStandingsTransformer])
+def test_scheduler_loads_only_change_dates_for_either_table_type(scheduler_parts, scraped_content, transformer_class):
+    match_dates = ['2023-Apr-01', '2023-Apr-02', '2023-Apr-03', '2023-Apr-04', '2023-Apr-05']
+    points_by_date = [0, 0, 3, 3, 3]
+    tables_by_date = {match_date: transformer_class().transform_data(get_points_after(scraped_content, extra_points), match_date=match_date)
+                      for match_date, extra_points in zip(match_dates, points_by_date)}
+    change_date_scheduler, job_runner, job_manifest = scheduler_parts(tables_by_date)
+
+    output_locations = change_date_scheduler.run(LEAGUE, match_dates)
+
+    assert job_runner.loaded_dates == ['2023-Apr-01', '2023-Apr-03']
+    assert output_locations['2023-Apr-02'] == 'snapshots/2023-Apr-01.csv'
+    assert output_locations['2023-Apr-05'] == 'snapshots/2023-Apr-03.csv'
+    assert job_manifest.get_pending_match_dates(LEAGUE, match_dates) == []
+
+
+@pytest.mark.parametrize('change_positions', [[], [17], [3, 4, 20, 29]])
+def test_bisection_finds_every_change_date_without_probing_every_date(scheduler_parts, change_positions):
+    match_dates = [f'2023-Mar-{day:02d}' for day in range(1, 31)]
+    change_date_scheduler, _, _ = scheduler_parts({})
+    probed_dates = []
+
+    def probe_table(match_date):
+        probed_dates.append(match_date)
+        return str(sum(match_dates.index(match_date) >= change_position for change_position in change_positions))
+
+    change_dates = change_date_scheduler.find_change_dates(LEAGUE, match_dates, probe_table)
+
+    assert change_dates == [match_dates[0]] + [match_dates[change_position] for change_position in change_positions]
+    assert len(probed_dates) == len(set(probed_dates))
+    assert len(probed_dates) <= 2 + 2 * len(change_positions) * 5     # each change costs at most two probes per halving of 30 dates
+    if not change_positions:
+        assert probed_dates == [match_dates[0], match_dates[-1]]
+
+
+def test_rerun_reuses_recorded_probes_instead_of_scraping_again(scheduler_parts, scraped_content):
+    match_dates = ['2023-Apr-01', '2023-Apr-02', '2023-Apr-03']
+    tables_by_date = {match_date: PremierLeagueTableLeanStandingsTransformer().transform_data(get_points_after(scraped_content, extra_points), match_date=match_date)
+                      for match_date, extra_points in zip(match_dates, [0, 3, 3])}
+    change_date_scheduler, _, _ = scheduler_parts(tables_by_date)
+    change_date_scheduler.run(LEAGUE, match_dates)
+
+    rerun_scheduler, rerun_job_runner, _ = scheduler_parts(tables_by_date)
+    output_locations = rerun_scheduler.run(LEAGUE, match_dates)
+
+    assert rerun_job_runner.scraped_dates == [] and rerun_job_runner.loaded_dates == []
+    assert output_locations['2023-Apr-03'] == 'snapshots/2023-Apr-02.csv'
+
+
+def test_failed_probe_is_marked_failed_and_the_bisection_carries_on(scheduler_parts, scraped_content):
+    match_dates = ['2023-Apr-01', '2023-Apr-02', '2023-Apr-03', '2023-Apr-04', '2023-Apr-05']
+    tables_by_date = {match_date: PremierLeagueTableLeanStandingsTransformer().transform_data(get_points_after(scraped_content, extra_points), match_date=match_date)
+                      for match_date, extra_points in zip(match_dates, [0, 0, 3, 3, 3])}
+    tables_by_date['2023-Apr-02'] = TimeoutError('Page load timed out')
+    change_date_scheduler, job_runner, job_manifest = scheduler_parts(tables_by_date)
+
+    output_locations = change_date_scheduler.run(LEAGUE, match_dates)
+
+    assert job_runner.loaded_dates == ['2023-Apr-01', '2023-Apr-03']
+    assert output_locations['2023-Apr-02'] is None
+    assert output_locations['2023-Apr-05'] == 'snapshots/2023-Apr-03.csv'
+    assert job_manifest.get_pending_match_dates(LEAGUE, match_dates) == ['2023-Apr-02']
+    assert 'timed out' in job_manifest.get_unit(LEAGUE, '2023-Apr-02')['error']
+    assert change_date_scheduler.change_calendar.get_change_dates(LEAGUE) == ['2023-Apr-01']
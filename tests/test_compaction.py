@@ -0,0 +1,61 @@
+import pytest
+
+from football_engine.compaction import CompactedS3SnapshotReader, S3SnapshotCompactor
+from football_engine.loadtest import InMemoryS3Client
+
+from conftest import DIRTY_DATA_FOLDER
+
+
+BUCKET, FOLDER = 'football-bucket', 'snapshots'
+STREAM_KEY = f'{FOLDER}/prem_league_table_2023-Apr-16_to_2023-May-11.csv'
+
+
+@pytest.fixture
+def s3_client():
+    s3_client = InMemoryS3Client()
+    for snapshot_path in sorted(DIRTY_DATA_FOLDER.glob('prem_league_table_*.csv')):
+        s3_client.put_object(Bucket=BUCKET, Key=f'{FOLDER}/{snapshot_path.name}', Body=snapshot_path.read_bytes())
+
+    # A streamed backfill lands under the same prefix - it is not a daily snapshot
+    s3_client.put_object(Bucket=BUCKET, Key=STREAM_KEY, Body=(DIRTY_DATA_FOLDER / 'prem_league_table_2023-Apr-16.csv').read_bytes())
+    return s3_client
+
+
+def get_snapshot_reader(s3_client):
+    return CompactedS3SnapshotReader(s3_client=s3_client, s3_bucket=BUCKET, s3_folder=FOLDER)
+
+
+def test_listing_skips_objects_that_are_not_daily_snapshots(s3_client):
+    daily_objects = get_snapshot_reader(s3_client).list_daily_objects()
+
+    assert sorted(daily_objects) == sorted(path.stem.rsplit('_', 1)[1] for path in DIRTY_DATA_FOLDER.glob('prem_league_table_*.csv'))
+    assert STREAM_KEY not in daily_objects.values()
+
+
+@pytest.mark.parametrize('period', S3SnapshotCompactor.PERIODS)
+def test_compaction_round_trip_reads_back_the_same_snapshots(s3_client, period):
+    snapshot_reader = get_snapshot_reader(s3_client)
+    daily_snapshots_df = snapshot_reader.read_snapshots()
+
+    compacted_dates_by_period = S3SnapshotCompactor(snapshot_reader=snapshot_reader, period=period).compact(delete_daily_objects=True)
+    compacted_snapshots_df = snapshot_reader.read_snapshots()
+
+    assert len(daily_snapshots_df) == 6 * 20
+    assert sum(len(compacted_dates) for compacted_dates in compacted_dates_by_period.values()) == 6
+    assert compacted_snapshots_df.astype(str).equals(daily_snapshots_df.astype(str))
+    assert snapshot_reader.list_daily_objects() == {}
+    assert s3_client.get_object(Bucket=BUCKET, Key=STREAM_KEY)['Body'].read()
+
+
+def test_compaction_is_idempotent_and_merges_new_daily_objects(s3_client):
+    snapshot_reader = get_snapshot_reader(s3_client)
+    compactor = S3SnapshotCompactor(snapshot_reader=snapshot_reader, period='month')
+    compactor.compact(delete_daily_objects=True)
+
+    new_snapshot = (DIRTY_DATA_FOLDER / 'prem_league_table_2023-May-11.csv').read_bytes().replace(b'2023-May-11', b'2023-May-12')
+    s3_client.put_object(Bucket=BUCKET, Key=f'{FOLDER}/prem_league_table_2023-May-12.csv', Body=new_snapshot)
+    assert compactor.compact(delete_daily_objects=True) == {'2023-05': ['2023-May-09', '2023-May-10', '2023-May-11', '2023-May-12']}
+
+    snapshots_df = snapshot_reader.read_snapshots(start_date='2023-May-01', end_date='2023-May-31')
+    assert sorted(snapshots_df['match_date'].unique()) == ['2023-May-09', '2023-May-10', '2023-May-11', '2023-May-12']
+    assert compactor.compact() == {}
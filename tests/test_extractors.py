@@ -0,0 +1,39 @@
+from football_engine.extractors import StandingsColumnarBatch
+from football_engine.transformers import PremierLeagueTableStandingsDataTransformer
+
+
+MATCH_DATE = '2023-Apr-16'
+
+
+def test_batch_keeps_the_raw_layout_with_typed_stats(scraped_content):
+    columnar_batch = StandingsColumnarBatch.from_scraped_content(scraped_content)
+
+    assert len(columnar_batch) == 20
+    assert columnar_batch.spacer_positions == {3, 9, 15}
+    assert next(columnar_batch.iter_rows()) == [1, 'Arsenal', 30, ' ', 12, 2, 1, 42, 18, ' ', 11, 2, 2, 30, 11, ' ', 43, 73]
+    assert columnar_batch.columns[1][0] is StandingsColumnarBatch.from_scraped_content(scraped_content).columns[1][0]
+
+
+def test_non_integer_cell_turns_its_column_into_strings(scraped_content):
+    columnar_batch = StandingsColumnarBatch.from_scraped_content(scraped_content[:2])
+    columnar_batch.append_row(scraped_content[2][:2] + ['n/a'] + scraped_content[2][3:])
+
+    assert columnar_batch.columns[2] == ['30', 'n/a']
+    assert list(columnar_batch.columns[4]) == [12, 13]
+
+
+def test_dataframe_matches_the_row_path_and_owns_its_columns(scraped_content):
+    columnar_batch = StandingsColumnarBatch.from_scraped_content(scraped_content)
+    data_transformer = PremierLeagueTableStandingsDataTransformer()
+
+    columnar_df = data_transformer.transform_data(columnar_batch, match_date=MATCH_DATE)
+    rows_df = data_transformer.transform_data(scraped_content, match_date=MATCH_DATE)
+
+    assert columnar_df.to_csv(index=False) == rows_df.to_csv(index=False)
+
+    table_df = columnar_batch.to_dataframe(MATCH_DATE)
+    table_df.loc[0, 'Pts'] = 0
+    assert columnar_batch.columns[17][0] == 73
+
+    columnar_batch.append_row(scraped_content[1])
+    assert len(columnar_batch) == 21 and len(table_df) == 20
@@ -0,0 +1,118 @@
+import pytest
+
+from football_engine.incremental import IncrementalPipelineRunner, PipelineStateStore
+from football_engine.job_runner import PremLeagueTableScrapeJobRunner
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.uploaders import MultiSinkFileUploader
+from football_engine.validators import TableStandingsDataValidator
+
+
+MATCH_DATE = '2023-Apr-16'
+
+
+# Stand-ins for the page loader, pop-up handler and extractor that serve a saved table and count the scrapes
+class ServedPageLoader:
+    resilient_caller = None
+    chrome_driver = None
+
+    def load_page(self, url, deadline=None):
+        pass
+
+
+class AbsentPopUpHandler:
+    def __init__(self, chrome_driver, logger, coloured_console_logs=False, resilient_caller=None):
+        pass
+
+    def close_popup(self, wait_seconds=5):
+        pass
+
+
+class CountingExtractor:
+    scraped_content = None
+    scrape_count = 0
+
+    def __init__(self, chrome_driver, match_date, coloured_console_logs=False, resilient_caller=None):
+        pass
+
+    def scrape_data(self, deadline=None):
+        CountingExtractor.scrape_count += 1
+        return self.scraped_content
+
+
+# Stand-in for an uploader that keeps the CSV bytes of every table it was handed
+class SerialisingUploader:
+    def __init__(self):
+        self.uploaded_payloads = []
+
+    def upload_file(self, df, match_date):
+        self.uploaded_payloads.append(MultiSinkFileUploader.serialise_df(df))
+        return f'prem_league_table_{match_date}.csv'
+
+
+@pytest.fixture(params=[PremierLeagueTableStandingsDataTransformer, PremierLeagueTableLeanStandingsTransformer])
+def pipeline_parts(request, tmp_path, scraped_content, monkeypatch):
+    monkeypatch.setattr(CountingExtractor, 'scraped_content', scraped_content)
+    monkeypatch.setattr(CountingExtractor, 'scrape_count', 0)
+    monkeypatch.setattr(IncrementalPipelineRunner, 'module_source_hashes', {})
+    data_uploader = SerialisingUploader()
+    job_runner = PremLeagueTableScrapeJobRunner(webpage_loader=ServedPageLoader(), data_transformer=request.param(), data_validator=TableStandingsDataValidator(), snapshot_quarantine=None,
+                                                data_uploader=data_uploader, season_start_date='2022-Aug-01', popup_handler_class=AbsentPopUpHandler, data_extractor_class=CountingExtractor)
+
+    def build_pipeline_runner(force_stages=()):
+        return IncrementalPipelineRunner(job_runner=job_runner, state_store=PipelineStateStore(state_path=str(tmp_path / 'state.json')), artifacts_path=str(tmp_path / 'artifacts'), force_stages=force_stages)
+
+    return build_pipeline_runner, data_uploader
+
+
+def get_stage_outcomes(pipeline_runner):
+    return {stage_name: outcome for (stage_name, outcome), count in pipeline_runner.stage_outcomes.items() if count}
+
+
+def test_second_run_skips_every_stage(pipeline_parts):
+    build_pipeline_runner, data_uploader = pipeline_parts
+    build_pipeline_runner().run_job('premier-league', MATCH_DATE)
+
+    pipeline_runner = build_pipeline_runner()
+    output_location, _ = pipeline_runner.run_job('premier-league', MATCH_DATE)
+
+    assert output_location == f'prem_league_table_{MATCH_DATE}.csv'
+    assert get_stage_outcomes(pipeline_runner) == {'extract': 'skipped', 'transform': 'skipped', 'load': 'skipped'}
+    assert CountingExtractor.scrape_count == 1 and len(data_uploader.uploaded_payloads) == 1
+
+
+def test_changed_dependency_module_reruns_transform_but_not_an_unchanged_load(pipeline_parts):
+    build_pipeline_runner, data_uploader = pipeline_parts
+    build_pipeline_runner().run_job('premier-league', MATCH_DATE)
+
+    # The validator helpers are module-level functions, outside any of the transform stage's classes
+    IncrementalPipelineRunner.module_source_hashes['football_engine.validators'] = b'edited validator helpers'
+    pipeline_runner = build_pipeline_runner()
+    pipeline_runner.run_job('premier-league', MATCH_DATE)
+
+    assert get_stage_outcomes(pipeline_runner) == {'extract': 'skipped', 'transform': 'ran', 'load': 'skipped'}
+    assert CountingExtractor.scrape_count == 1 and len(data_uploader.uploaded_payloads) == 1
+
+
+def test_changed_load_module_reruns_load_from_the_csv_artifact(pipeline_parts):
+    build_pipeline_runner, data_uploader = pipeline_parts
+    build_pipeline_runner().run_job('premier-league', MATCH_DATE)
+
+    IncrementalPipelineRunner.module_source_hashes['football_engine.uploaders'] = b'edited serialise_df'
+    pipeline_runner = build_pipeline_runner()
+    _, content_hash = pipeline_runner.run_job('premier-league', MATCH_DATE)
+
+    assert get_stage_outcomes(pipeline_runner) == {'extract': 'skipped', 'transform': 'skipped', 'load': 'ran'}
+    assert data_uploader.uploaded_payloads[1] == data_uploader.uploaded_payloads[0]
+    assert content_hash == pipeline_runner.state_store.get_record('premier-league', MATCH_DATE, 'transform')['output_hash']
+    assert pipeline_runner.state_store.get_record('premier-league', MATCH_DATE, 'transform')['output_ref'].endswith('transform.csv')
+
+
+def test_changed_resilience_module_invalidates_extract_but_not_transform(pipeline_parts):
+    build_pipeline_runner, _ = pipeline_parts
+    pipeline_runner = build_pipeline_runner()
+    fingerprints = {stage_name: pipeline_runner.get_stage_fingerprint('premier-league', MATCH_DATE, 'upstream', stage_name) for stage_name in IncrementalPipelineRunner.STAGES}
+
+    IncrementalPipelineRunner.module_source_hashes['football_engine.resilience'] = b'edited retry policy'
+
+    assert pipeline_runner.get_stage_fingerprint('premier-league', MATCH_DATE, 'upstream', 'extract') != fingerprints['extract']
+    assert pipeline_runner.get_stage_fingerprint('premier-league', MATCH_DATE, 'upstream', 'transform') == fingerprints['transform']
@@ -0,0 +1,147 @@
+import pytest
+
+from football_engine import job_queue as job_queue_module
+from football_engine.coordinator import RunBudget
+from football_engine.job_queue import ScrapeJobWorker, SQLiteJobQueue
+
+
+LEAGUE = 'premier-league'
+
+
+# Stand-in for the wall clock the queue stamps its leases with
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(job_queue_module, 'time', fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def job_queue(tmp_path, clock):
+    return SQLiteJobQueue(queue_path=str(tmp_path / 'queue.sqlite'), visibility_timeout_seconds=600, retry_delay_seconds=60, max_attempts=2)
+
+
+def test_enqueue_is_idempotent_and_a_lease_hides_the_job(job_queue):
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+
+    job = job_queue.lease('worker-a')
+
+    assert (job.match_date, job.attempts) == ('2023-Apr-16', 1)
+    assert job_queue.lease('worker-b') is None
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.LEASED: 1}
+
+
+def test_expired_lease_goes_to_the_next_worker_and_the_stale_worker_cannot_acknowledge(job_queue, clock):
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+    stale_job = job_queue.lease('worker-a')
+
+    clock.now += 599
+    assert job_queue.lease('worker-b') is None
+    clock.now += 1
+    job = job_queue.lease('worker-b')
+
+    assert job.attempts == 2
+    job_queue.acknowledge(stale_job, 'worker-a')
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.LEASED: 1}
+    job_queue.acknowledge(job, 'worker-b')
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.DONE: 1}
+    assert job_queue.lease('worker-c') is None
+
+
+def test_released_job_waits_out_the_retry_delay_and_is_parked_after_max_attempts(job_queue, clock):
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+    job_queue.release(job_queue.lease('worker-a'), 'worker-a', error='Upload did not complete')
+
+    assert job_queue.lease('worker-a') is None
+    clock.now += 60
+    job_queue.release(job_queue.lease('worker-a'), 'worker-a', error='Upload did not complete')
+
+    clock.now += 60
+    assert job_queue.lease('worker-a') is None
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.FAILED: 1}
+
+
+# Stand-in for the job runner that fails the dates it is told to
+class FailingDatesJobRunner:
+    def __init__(self, failing_dates):
+        self.failing_dates = failing_dates
+
+    def run_job(self, league, match_date):
+        if match_date in self.failing_dates:
+            return None, None
+        return f'prem_league_table_{match_date}.csv', 'abc'
+
+
+def test_worker_acknowledges_successes_and_releases_failures(job_queue):
+    for match_date in ['2023-Apr-08', '2023-Apr-15', '2023-Apr-16']:
+        job_queue.enqueue(LEAGUE, match_date)
+    job_queue.enqueue(LEAGUE, '2023-Apr-16', data_type='top-scorers')
+
+    job_worker = ScrapeJobWorker(job_queue=job_queue, job_runners={'league-standings': FailingDatesJobRunner({'2023-Apr-15'})}, worker_id='worker-a', idle_sleep_seconds=0, max_idle_polls=1)
+    job_outcomes = job_worker.run()
+
+    assert job_outcomes == {'succeeded': 2, 'failed': 2}
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.DONE: 2, SQLiteJobQueue.QUEUED: 2}
+
+
+# Stand-in for the job runner of a worker that receives SIGTERM while its job is running
+class SignalledJobRunner:
+    def __init__(self, run_budget):
+        self.run_budget = run_budget
+        self.run_dates = []
+
+    def run_job(self, league, match_date):
+        self.run_dates.append(match_date)
+        self.run_budget.cancel('received signal SIGTERM')
+        self.run_budget.start_stage('upload')
+
+
+def test_cancelled_worker_stops_leasing_and_hands_its_job_back_without_an_attempt(job_queue):
+    for match_date in ['2023-Apr-08', '2023-Apr-15']:
+        job_queue.enqueue(LEAGUE, match_date)
+    run_budget = RunBudget(total_seconds=None)
+    job_runner = SignalledJobRunner(run_budget)
+
+    job_outcomes = ScrapeJobWorker(job_queue=job_queue, job_runners={'league-standings': job_runner}, worker_id='worker-a', idle_sleep_seconds=0, run_budget=run_budget).run()
+
+    assert job_outcomes == {'cancelled': 1}
+    assert job_runner.run_dates == ['2023-Apr-08']
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.QUEUED: 2}
+    assert job_queue.lease('worker-b').attempts == 1
+
+
+def test_job_that_keeps_outliving_its_lease_is_parked_after_max_attempts(job_queue, clock):
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+    job_queue.lease('worker-a')
+    clock.now += 600
+    job_queue.lease('worker-b')
+    clock.now += 600
+
+    assert job_queue.lease('worker-c') is None
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.FAILED: 1}
+
+
+def test_enqueueing_a_failed_job_queues_it_again_but_done_jobs_stay_done(job_queue, clock):
+    job_queue.enqueue(LEAGUE, '2023-Apr-15')
+    for _ in range(2):
+        job_queue.release(job_queue.lease('worker-a'), 'worker-a', error='Upload did not complete')
+        clock.now += 60
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+    job_queue.acknowledge(job_queue.lease('worker-a'), 'worker-a')
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.FAILED: 1, SQLiteJobQueue.DONE: 1}
+
+    job_queue.enqueue(LEAGUE, '2023-Apr-15')
+    job_queue.enqueue(LEAGUE, '2023-Apr-16')
+
+    job = job_queue.lease('worker-a')
+    assert (job.match_date, job.attempts) == ('2023-Apr-15', 1)
+    assert job_queue.get_status_counts() == {SQLiteJobQueue.LEASED: 1, SQLiteJobQueue.DONE: 1}
@@ -0,0 +1,156 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from football_engine.coordinator import RunBudget, RunCancelledError
+from football_engine.extractors import StandingsColumnarBatch, TableExtractionSpec
+from football_engine.incremental import IncrementalPipelineRunner, PipelineStateStore
+from football_engine.job_runner import MultiTableScrapeJobRunner, PremLeagueTableScrapeJobRunner, TableExtractionRoute
+from football_engine.loadtest import ReplayPageServer
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, SpecTableDataTransformer
+from football_engine.validators import LocalSnapshotQuarantine, TableStandingsDataValidator
+from football_engine import webpage_loader as webpage_loader_module
+
+
+TOP_SCORERS_TABLE = '<table class="topscorers"><tr><td>Player</td><td>Goals</td></tr><tr><td>Haaland</td><td>32</td></tr></table>'
+
+
+# Stand-in for the Chrome driver: serves a fixed page source and never shows the cookie pop-up
+class PageSourceDriver:
+    current_url = 'https://www.twtd.co.uk/'
+    title = 'Premier League Table | TWTD'
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+    def get(self, url):
+        self.current_url = url
+
+    def find_element(self, by, value):
+        raise NoSuchElementException(value)
+
+
+# Stand-in for the web page loader that records the deadline of every page load
+class RecordingWebPageLoader:
+    resilient_caller = None
+
+    def __init__(self, page_source):
+        self.chrome_driver = PageSourceDriver(page_source)
+        self.load_deadlines = []
+
+    def load_page(self, url, deadline=None):
+        self.load_deadlines.append(deadline)
+
+
+# Stand-in for an uploader that keeps every table it was handed
+class RecordingUploader:
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.uploaded_tables = []
+
+    def upload_file(self, df, match_date):
+        self.uploaded_tables.append(df)
+        return f'{self.file_name}_{match_date}.csv'
+
+
+@pytest.fixture
+def multi_table_parts(scraped_content):
+    page_source = ReplayPageServer.render_table_page(scraped_content).replace('</body>', f'{TOP_SCORERS_TABLE}</body>')
+    top_scorers_spec = TableExtractionSpec('top-scorers', table_class='topscorers', column_mapping={'Player': 'player', 'Goals': 'goals'}, column_types={'goals': int})
+    standings_uploader, top_scorers_uploader = RecordingUploader('prem_league_table'), RecordingUploader('prem_league_table_top_scorers')
+    extraction_routes = [TableExtractionRoute(TableExtractionSpec('league-standings', table_class='leaguetable'), PremierLeagueTableLeanStandingsTransformer(), standings_uploader, TableStandingsDataValidator()),
+                         TableExtractionRoute(top_scorers_spec, SpecTableDataTransformer(top_scorers_spec), top_scorers_uploader)]
+    return RecordingWebPageLoader(page_source), extraction_routes, standings_uploader, top_scorers_uploader
+
+
+def test_multi_table_runner_routes_every_table_from_one_page_load(multi_table_parts):
+    webpage_loader, extraction_routes, standings_uploader, top_scorers_uploader = multi_table_parts
+    run_budget = RunBudget(total_seconds=60, stage_shares={'load_page': 0.5, 'close_popup': 0.0})
+    multi_table_runner = MultiTableScrapeJobRunner(webpage_loader=webpage_loader, extraction_routes=extraction_routes, season_start_date='2022-Jul-01', run_budget=run_budget)
+
+    output_locations, content_hash = multi_table_runner.run_job('premier-league', '2023-Apr-16')
+
+    assert output_locations == ['prem_league_table_2023-Apr-16.csv', 'prem_league_table_top_scorers_2023-Apr-16.csv']
+    assert content_hash is not None
+    assert len(webpage_loader.load_deadlines) == 1 and webpage_loader.load_deadlines[0] is not None
+    assert len(standings_uploader.uploaded_tables[0].rows) == 20
+    assert top_scorers_uploader.uploaded_tables[0].to_dict('records') == [{'player': 'Haaland', 'goals': 32, 'match_date': '2023-Apr-16'}]
+
+
+def test_multi_table_runner_stops_before_loading_once_the_budget_is_cancelled(multi_table_parts):
+    webpage_loader, extraction_routes, standings_uploader, top_scorers_uploader = multi_table_parts
+    run_budget = RunBudget(total_seconds=60)
+    run_budget.cancel('SIGTERM received')
+    multi_table_runner = MultiTableScrapeJobRunner(webpage_loader=webpage_loader, extraction_routes=extraction_routes, season_start_date='2022-Jul-01', run_budget=run_budget)
+
+    with pytest.raises(RunCancelledError):
+        multi_table_runner.run_job('premier-league', '2023-Apr-16')
+
+    assert webpage_loader.load_deadlines == []
+    assert standings_uploader.uploaded_tables == [] and top_scorers_uploader.uploaded_tables == []
+
+
+# Stand-ins for another league's plugin components, recording that the runner used them
+class RecordingPopUpHandler:
+    closed_popups = []
+
+    def __init__(self, chrome_driver, logger, coloured_console_logs=False, resilient_caller=None):
+        self.chrome_driver = chrome_driver
+
+    def close_popup(self, wait_seconds=5):
+        RecordingPopUpHandler.closed_popups.append(wait_seconds)
+
+
+class QuietPopUpHandler(RecordingPopUpHandler):
+    def close_popup(self, wait_seconds=5):
+        pass
+
+
+class ScrapedContentExtractor:
+    scraped_content = None
+
+    def __init__(self, chrome_driver, match_date, coloured_console_logs=False, resilient_caller=None):
+        self.match_date = match_date
+
+    def scrape_data(self, deadline=None):
+        return self.scraped_content
+
+    def scrape_columnar(self, deadline=None):
+        return StandingsColumnarBatch.from_scraped_content(self.scraped_content)
+
+
+def test_job_runner_uses_the_popup_handler_and_extractor_it_is_given(tmp_path, scraped_content, monkeypatch):
+    monkeypatch.setattr(ScrapedContentExtractor, 'scraped_content', scraped_content)
+    RecordingPopUpHandler.closed_popups.clear()
+    data_uploader = RecordingUploader('eredivisie_table')
+    job_runner = PremLeagueTableScrapeJobRunner(webpage_loader=RecordingWebPageLoader(page_source=''), data_transformer=PremierLeagueTableLeanStandingsTransformer(), data_validator=TableStandingsDataValidator(),
+                                                snapshot_quarantine=LocalSnapshotQuarantine(quarantine_path=str(tmp_path)), data_uploader=data_uploader, season_start_date='2022-Aug-01',
+                                                popup_handler_class=RecordingPopUpHandler, data_extractor_class=ScrapedContentExtractor)
+
+    output_location, _ = job_runner.run_job('eredivisie', '2023-Apr-16')
+
+    assert output_location == 'eredivisie_table_2023-Apr-16.csv'
+    assert RecordingPopUpHandler.closed_popups == [5]
+    assert len(data_uploader.uploaded_tables[0]) == 20
+
+
+def test_extract_fingerprint_follows_the_injected_components(tmp_path):
+    fingerprints = []
+    for popup_handler_class in (RecordingPopUpHandler, QuietPopUpHandler):
+        job_runner = PremLeagueTableScrapeJobRunner(webpage_loader=RecordingWebPageLoader(page_source=''), data_transformer=PremierLeagueTableLeanStandingsTransformer(), data_validator=TableStandingsDataValidator(),
+                                                    snapshot_quarantine=None, data_uploader=RecordingUploader('eredivisie_table'), season_start_date='2022-Aug-01',
+                                                    popup_handler_class=popup_handler_class, data_extractor_class=ScrapedContentExtractor)
+        pipeline_runner = IncrementalPipelineRunner(job_runner=job_runner, state_store=PipelineStateStore(state_path=str(tmp_path / 'state.json')), artifacts_path=str(tmp_path / 'artifacts'))
+        fingerprints.append(pipeline_runner.get_stage_fingerprint('eredivisie', '2023-Apr-16', 'url', 'extract'))
+
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_webpage_loader_checks_the_title_it_is_given(monkeypatch):
+    monkeypatch.setattr(webpage_loader_module, 'sleep', lambda seconds: None)
+    webpage_loader = webpage_loader_module.PremLeagueTableWebPageLoader(webpage_title='Eredivisie')
+    webpage_loader._chrome_driver = PageSourceDriver(page_source='')
+    webpage_loader._chrome_driver.title = 'Eredivisie Table | TWTD'
+
+    webpage_loader.load_page('https://www.twtd.co.uk/league-tables/competition:eredivisie/')
+
+    assert webpage_loader._chrome_driver.current_url.endswith('competition:eredivisie/')
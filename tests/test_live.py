@@ -0,0 +1,97 @@
+import pytest
+
+from football_engine.live import LiveTableObserver, LiveTableStreamer
+from football_engine.transformers import PremierLeagueTableStandingsDataTransformer
+
+
+MATCH_DATE = '2023-Apr-16'
+
+
+# Stand-in for the Chrome driver: the observer scripts find the table and read back the prepared rows
+class ObservedTableDriver:
+    def __init__(self, rows):
+        self.rows = rows
+        self.loaded_urls = []
+
+    def execute_script(self, script, *args):
+        return self.rows if 'readRows()' in script else True
+
+
+# Stand-in for the web page loader that counts how often its browser was asked for
+class CountingWebPageLoader:
+    def __init__(self, rows):
+        self.driver = ObservedTableDriver(rows)
+        self.driver_requests = 0
+
+    @property
+    def chrome_driver(self):
+        self.driver_requests += 1
+        return self.driver
+
+    def load_page(self, url, deadline=None):
+        self.driver.loaded_urls.append(url)
+
+
+# Stand-in for a streaming writer that keeps every chunk it was handed
+class RecordingStreamingWriter:
+    def __init__(self):
+        self.chunks = []
+        self.flush_count = 0
+
+    def write_chunk(self, chunk_df):
+        self.chunks.append(chunk_df)
+
+    def flush(self):
+        self.flush_count += 1
+
+
+@pytest.fixture
+def live_parts(scraped_content):
+    webpage_loader, streaming_writer = CountingWebPageLoader(scraped_content), RecordingStreamingWriter()
+    live_streamer = LiveTableStreamer(webpage_loader=webpage_loader, table_observer=LiveTableObserver(webpage_loader), data_transformer=PremierLeagueTableStandingsDataTransformer(),
+                                      football_url='https://www.twtd.co.uk/league-tables/competition:premier-league/', match_date=MATCH_DATE, streaming_writers=[streaming_writer])
+    return live_streamer, webpage_loader, streaming_writer
+
+
+def with_points(scraped_content, row_number, points):
+    return [row[:-1] + [points] if row_position == row_number else row for row_position, row in enumerate(scraped_content)]
+
+
+def test_observer_only_asks_for_the_browser_when_it_runs_a_script(live_parts):
+    live_streamer, webpage_loader, _ = live_parts
+
+    assert webpage_loader.driver_requests == 0
+    assert live_streamer.table_observer.install()
+    assert webpage_loader.driver_requests == 1
+
+
+def test_only_rows_that_changed_since_the_last_push_are_pushed(live_parts, scraped_content):
+    live_streamer, _, streaming_writer = live_parts
+
+    assert live_streamer.push_snapshot(scraped_content) == 20
+    assert live_streamer.push_snapshot(scraped_content) == 0
+    assert live_streamer.push_snapshot(with_points(scraped_content, 2, '73')) == 1
+
+    assert len(streaming_writer.chunks) == 2 and streaming_writer.flush_count == 2
+    changed_df = streaming_writer.chunks[1]
+    assert changed_df['Team'].tolist() == [scraped_content[2][1]] and changed_df['Pts'].tolist() == [73]
+    assert {'match_date', 'observed_at'} <= set(changed_df.columns)
+
+
+def test_a_row_changed_back_is_pushed_again_and_empty_snapshots_push_nothing(live_parts, scraped_content):
+    live_streamer, _, _ = live_parts
+    live_streamer.push_snapshot(scraped_content)
+
+    assert live_streamer.push_snapshot(with_points(scraped_content, 1, '74')) == 1
+    assert live_streamer.push_snapshot(scraped_content) == 1
+    assert live_streamer.push_snapshot([]) == 0
+    assert live_streamer.push_snapshot(scraped_content[:1]) == 0
+
+
+def test_run_loads_the_page_once_and_pushes_the_initial_table(live_parts):
+    live_streamer, webpage_loader, streaming_writer = live_parts
+
+    live_outcomes = live_streamer.run(duration_seconds=0)
+
+    assert webpage_loader.driver.loaded_urls == [live_streamer.football_url]
+    assert live_outcomes['rows_pushed'] == 20 and len(streaming_writer.chunks[0]) == 20
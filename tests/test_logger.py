@@ -0,0 +1,35 @@
+import io
+import logging
+
+import pytest
+
+from football_engine.logger import ColouredConsoleLogger, FileLogger, NonColouredConsoleLogger
+
+
+@pytest.fixture
+def engine_logger(monkeypatch):
+    engine_logger = logging.getLogger('football_engine.logger')
+    monkeypatch.setattr(engine_logger, 'handlers', [handler for handler in engine_logger.handlers if isinstance(handler, logging.FileHandler)])
+    return engine_logger
+
+
+def get_console_handlers(logger):
+    return [handler for handler in logger.handlers if type(handler) is logging.StreamHandler]
+
+
+def test_console_loggers_built_by_every_component_share_one_handler(engine_logger):
+    console_loggers = [NonColouredConsoleLogger() for _ in range(5)] + [ColouredConsoleLogger() for _ in range(3)]
+    FileLogger()
+
+    assert len(get_console_handlers(engine_logger)) == 1
+    assert all(console_logger.console_handler is console_loggers[0].console_handler for console_logger in console_loggers)
+
+
+def test_each_message_reaches_the_console_once(engine_logger):
+    console_loggers = [NonColouredConsoleLogger(), NonColouredConsoleLogger(), ColouredConsoleLogger()]
+    console_output = io.StringIO()
+    console_loggers[0].console_handler.setStream(console_output)
+
+    console_loggers[-1].log_event_as_warning('>>> Sink failed for 2023-Apr-16')
+
+    assert console_output.getvalue() == '>>> Sink failed for 2023-Apr-16\n'
@@ -0,0 +1,46 @@
+import json
+
+from football_engine.manifest import JSONFileJobManifest
+
+
+LEAGUE = 'premier-league'
+MATCH_DATES = ['2023-Apr-08', '2023-Apr-15', '2023-Apr-16']
+
+
+def test_restarted_job_only_runs_units_that_did_not_complete(tmp_path):
+    manifest_path = str(tmp_path / 'manifest.json')
+    job_manifest = JSONFileJobManifest(manifest_path=manifest_path)
+    for match_date in MATCH_DATES:
+        job_manifest.mark_started(LEAGUE, match_date)
+    job_manifest.mark_complete(LEAGUE, '2023-Apr-08', output_location='prem_league_table_2023-Apr-08.csv', content_hash='abc')
+    job_manifest.mark_failed(LEAGUE, '2023-Apr-15', error='Upload did not complete')
+
+    # The third unit was still 'started' when the job died - a fresh process reads the manifest back from disk
+    restarted_manifest = JSONFileJobManifest(manifest_path=manifest_path)
+
+    assert restarted_manifest.get_pending_match_dates(LEAGUE, MATCH_DATES) == ['2023-Apr-15', '2023-Apr-16']
+    assert restarted_manifest.get_unit(LEAGUE, '2023-Apr-08')['output_location'] == 'prem_league_table_2023-Apr-08.csv'
+    assert restarted_manifest.get_pending_match_dates('bundesliga', MATCH_DATES) == MATCH_DATES
+
+
+def test_retried_unit_counts_attempts_and_clears_its_error(tmp_path):
+    job_manifest = JSONFileJobManifest(manifest_path=str(tmp_path / 'manifest.json'))
+    job_manifest.mark_started(LEAGUE, '2023-Apr-15')
+    job_manifest.mark_failed(LEAGUE, '2023-Apr-15', error='Upload did not complete')
+    job_manifest.mark_started(LEAGUE, '2023-Apr-15')
+    job_manifest.mark_complete(LEAGUE, '2023-Apr-15', output_location='prem_league_table_2023-Apr-15.csv', content_hash='abc')
+
+    unit = job_manifest.get_unit(LEAGUE, '2023-Apr-15')
+    assert (unit['status'], unit['attempts'], unit['error']) == (JSONFileJobManifest.COMPLETE, 2, None)
+
+
+def test_manifest_is_swapped_in_whole_and_unreadable_manifests_start_fresh(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    job_manifest = JSONFileJobManifest(manifest_path=str(manifest_path))
+    job_manifest.mark_started(LEAGUE, '2023-Apr-16')
+
+    assert list(json.loads(manifest_path.read_text())['units']) == [f'{LEAGUE}|2023-Apr-16']
+    assert [path.name for path in tmp_path.iterdir()] == ['manifest.json']
+
+    manifest_path.write_text('{"units": {"premier-league|2023-Apr-1')
+    assert JSONFileJobManifest(manifest_path=str(manifest_path)).get_pending_match_dates(LEAGUE, MATCH_DATES) == MATCH_DATES
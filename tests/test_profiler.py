@@ -0,0 +1,67 @@
+import pstats
+import threading
+import tracemalloc
+
+import pytest
+
+from football_engine.profiler import StageProfiler
+
+
+@pytest.fixture
+def stage_profiler(tmp_path):
+    was_tracing = tracemalloc.is_tracing()
+    yield StageProfiler(profile_folder=str(tmp_path / 'profiles'))
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def transform_rows(row_count):
+    return sum(len(str(row_number) * 10) for row_number in range(row_count))
+
+
+def upload_rows(row_count):
+    return sum(row_number * 2 for row_number in range(row_count))
+
+
+def test_stages_profiled_on_several_threads_at_once_merge_into_one_report(stage_profiler, tmp_path):
+    both_started = threading.Barrier(2)
+
+    def run_stage(stage_work):
+        with stage_profiler.profile_stage('transform'):
+            both_started.wait()
+            stage_work(50_000)
+
+    worker_threads = [threading.Thread(target=run_stage, args=(stage_work,)) for stage_work in (transform_rows, upload_rows)]
+    for worker_thread in worker_threads:
+        worker_thread.start()
+    for worker_thread in worker_threads:
+        worker_thread.join()
+    stage_profiler.write_reports()
+
+    assert len(stage_profiler.cpu_profiles) == 2
+    assert {stage_sampler.thread_id for stage_sampler in stage_profiler.stack_samplers.values()} == {worker_thread.ident for worker_thread in worker_threads}
+    profiled_functions = {function_name for _, _, function_name in pstats.Stats(str(tmp_path / 'profiles' / 'transform.prof')).stats}
+    assert {'transform_rows', 'upload_rows'} <= profiled_functions
+    assert sorted(path.name for path in (tmp_path / 'profiles').iterdir()) == ['transform.folded', 'transform.prof', 'transform_allocations.txt']
+    assert (tmp_path / 'profiles' / 'transform_allocations.txt').read_text().count('=== transform |') == 2
+
+
+def test_repeated_runs_on_one_thread_reuse_its_profile(stage_profiler, tmp_path):
+    for _ in range(3):
+        with stage_profiler.profile_stage('validate'):
+            transform_rows(1_000)
+    stage_profiler.write_reports()
+
+    assert list(stage_profiler.cpu_profiles) == [('validate', threading.get_ident())]
+    transform_calls = [call_stats for (_, _, function_name), call_stats in pstats.Stats(str(tmp_path / 'profiles' / 'validate.prof')).stats.items() if function_name == 'transform_rows']
+    assert transform_calls[0][1] == 3
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    stage_profiler = StageProfiler(profile_folder=str(tmp_path / 'profiles'), enabled=False)
+
+    with stage_profiler.profile_stage('transform'):
+        transform_rows(10)
+    stage_profiler.write_reports()
+
+    assert stage_profiler.cpu_profiles == {} and not (tmp_path / 'profiles').exists()
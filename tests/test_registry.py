@@ -0,0 +1,40 @@
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from football_engine import LeaguePlugin, league_registry
+
+
+def test_component_lookup_imports_only_its_own_modules():
+
+    # Run in a fresh interpreter, so modules imported by other tests do not count - pandas and Selenium stay lazy stubs
+    lookup_script = (
+        "import sys\n"
+        "from football_engine import league_registry\n"
+        "league_registry.get('premier-league').data_extractor\n"
+        "print(' '.join(sorted(module for module in sys.modules if module.startswith(('football_engine.', 'pandas.', 'selenium.webdriver.')))))\n"
+    )
+    completed = subprocess.run([sys.executable, '-c', lookup_script], capture_output=True, text=True, check=True,
+                               env={'PYTHONPATH': str(Path(__file__).resolve().parents[1] / 'scraper')})
+    imported_modules = set(completed.stdout.split())
+
+    assert imported_modules == {'football_engine.dependencies', 'football_engine.extractors', 'football_engine.logger', 'football_engine.plugins',
+                                'football_engine.plugins.premier_league', 'football_engine.registry', 'football_engine.resilience'}
+
+
+def test_every_registered_component_resolves():
+    league_plugin = league_registry.get('premier-league')
+
+    for component_name in league_plugin.component_paths:
+        component = league_plugin.get_component(component_name)
+        assert isinstance(component, type)
+
+
+def test_unknown_league_and_component_are_rejected():
+    with pytest.raises(KeyError):
+        league_registry.get('eredivisie')
+
+    with pytest.raises(ValueError):
+        LeaguePlugin(league='eredivisie', title_check='Eredivisie', file_name='eredivisie_table', scoreboard='football_engine.live:LiveTableObserver')
@@ -0,0 +1,270 @@
+import pytest
+
+from football_engine import resilience as resilience_module
+from football_engine import webpage_loader as webpage_loader_module
+from football_engine.resilience import CircuitBreaker, CircuitOpenError, ConcurrencyController, DeadlineExceededError, ResilientCaller
+
+
+HOST = 'www.twtd.co.uk'
+
+
+# Stand-in for the monotonic clock, moved forward by every backoff the caller sleeps through
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept_seconds = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept_seconds.append(seconds)
+        self.now += seconds
+
+
+# Stand-in for an operation that raises the prepared errors in turn, then returns 'ok'
+class FlakyOperation:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.call_count = 0
+
+    def __call__(self):
+        self.call_count += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def full_backoff(monkeypatch):
+    monkeypatch.setattr(resilience_module.random, 'uniform', lambda low, high: high)
+
+
+def build_resilient_caller(clock, **kwargs):
+    return ResilientCaller(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def get_outcomes(resilient_caller):
+    return {outcome: count for (host, outcome), count in resilient_caller.outcome_counters.items() if host == HOST}
+
+
+def test_backoff_is_jittered_within_the_capped_exponential_bound(clock):
+    resilient_caller = build_resilient_caller(clock, base_delay_seconds=1.0, max_delay_seconds=30.0)
+
+    for attempt, upper_bound in [(1, 1.0), (2, 2.0), (3, 4.0), (5, 16.0), (6, 30.0), (10, 30.0)]:
+        backoffs = [resilient_caller.get_backoff_seconds(attempt) for _ in range(200)]
+        assert all(0.0 <= backoff_seconds <= upper_bound for backoff_seconds in backoffs)
+        assert max(backoffs) > upper_bound / 2
+
+
+def test_retries_sleep_through_the_backoff_and_count_outcomes(clock, full_backoff):
+    resilient_caller = build_resilient_caller(clock, max_attempts=4, base_delay_seconds=1.0)
+    operation = FlakyOperation(OSError('reset'), OSError('reset'))
+
+    assert resilient_caller.call(operation, host=HOST) == 'ok'
+    assert resilient_caller.call(FlakyOperation(), host=HOST) == 'ok'
+
+    assert clock.slept_seconds == [1.0, 2.0]
+    assert get_outcomes(resilient_caller) == {'retry': 2, 'success_after_retry': 1, 'success': 1}
+
+
+def test_gives_up_with_the_last_error_after_max_attempts(clock, full_backoff):
+    resilient_caller = build_resilient_caller(clock, max_attempts=3, failure_threshold=10)
+    operation = FlakyOperation(OSError('first'), OSError('second'), OSError('last'))
+
+    with pytest.raises(OSError, match='last'):
+        resilient_caller.call(operation, host=HOST)
+
+    assert operation.call_count == 3
+    assert get_outcomes(resilient_caller) == {'retry': 2, 'failure': 1}
+
+
+def test_deadline_stops_a_retry_whose_backoff_would_overrun_it(clock, full_backoff):
+    resilient_caller = build_resilient_caller(clock, max_attempts=5, base_delay_seconds=1.0)
+    operation = FlakyOperation(*[OSError('timeout')] * 5)
+
+    with pytest.raises(DeadlineExceededError) as error:
+        resilient_caller.call(operation, host=HOST, deadline=2.5)
+
+    assert operation.call_count == 2 and clock.slept_seconds == [1.0]
+    assert isinstance(error.value.last_error, OSError)
+    assert get_outcomes(resilient_caller) == {'retry': 1, 'deadline_exceeded': 1}
+
+
+def test_spent_deadline_is_not_called_at_all(clock):
+    resilient_caller = build_resilient_caller(clock)
+    clock.now = 10.0
+    operation = FlakyOperation()
+
+    with pytest.raises(DeadlineExceededError):
+        resilient_caller.call(operation, host=HOST, deadline=10.0)
+
+    assert operation.call_count == 0
+
+
+def test_errors_outside_retry_on_are_raised_at_once_and_spare_the_circuit(clock):
+    resilient_caller = build_resilient_caller(clock, failure_threshold=1)
+    operation = FlakyOperation(AssertionError('wrong page title'))
+
+    with pytest.raises(AssertionError):
+        resilient_caller.call(operation, host=HOST, retry_on=(OSError,))
+
+    assert operation.call_count == 1 and clock.slept_seconds == []
+    assert resilient_caller.get_circuit_breaker(HOST).state == CircuitBreaker.CLOSED
+    assert get_outcomes(resilient_caller) == {'not_retried': 1}
+
+
+def test_circuit_breaker_opens_half_opens_and_closes(clock):
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60.0, clock=clock)
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.CLOSED and circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.OPEN and not circuit_breaker.allow_request()
+
+    clock.now = 59.0
+    assert not circuit_breaker.allow_request() and circuit_breaker.get_retry_after_seconds() == 1.0
+    clock.now = 60.0
+    assert circuit_breaker.allow_request() and circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert not circuit_breaker.allow_request()
+
+    # A failed trial re-opens the circuit for another full timeout
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.OPEN and circuit_breaker.get_retry_after_seconds() == 60.0
+
+    clock.now = 120.0
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitBreaker.CLOSED and circuit_breaker.consecutive_failures == 0
+
+
+def test_open_circuit_short_circuits_calls_until_the_reset_timeout(clock, full_backoff):
+    resilient_caller = build_resilient_caller(clock, max_attempts=1, failure_threshold=2, reset_timeout_seconds=60.0)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            resilient_caller.call(FlakyOperation(OSError('refused')), host=HOST)
+
+    operation = FlakyOperation()
+    with pytest.raises(CircuitOpenError):
+        resilient_caller.call(operation, host=HOST)
+    assert operation.call_count == 0
+
+    clock.now = 60.0
+    assert resilient_caller.call(operation, host=HOST) == 'ok'
+    assert get_outcomes(resilient_caller) == {'failure': 2, 'circuit_open': 1, 'success': 1}
+
+
+# Stand-in for the Chrome driver that always lands on another site's page
+class WrongTitleDriver:
+    title = 'Page Not Found'
+
+    def __init__(self):
+        self.loaded_urls = []
+
+    def get(self, url):
+        self.loaded_urls.append(url)
+
+
+def test_load_page_does_not_retry_a_wrong_title(clock, monkeypatch):
+    monkeypatch.setattr(webpage_loader_module, 'sleep', lambda seconds: None)
+    webpage_loader = webpage_loader_module.PremLeagueTableWebPageLoader(resilient_caller=build_resilient_caller(clock))
+    webpage_loader._chrome_driver = WrongTitleDriver()
+
+    with pytest.raises(AssertionError):
+        webpage_loader.load_page(f'https://{HOST}/league-tables/competition:premier-league/')
+
+    assert len(webpage_loader._chrome_driver.loaded_urls) == 1 and clock.slept_seconds == []
+
+
+@pytest.fixture
+def build_controller(monkeypatch):
+    monkeypatch.setattr(ConcurrencyController, 'get_memory_used_fraction', staticmethod(lambda: 0.5))
+    monkeypatch.setattr(ConcurrencyController, 'get_load_per_cpu', staticmethod(lambda: 0.5))
+
+    def build(**kwargs):
+        controller_settings = dict(name='load_page', initial_limit=2, min_limit=1, max_limit=4, target_latency_seconds=10.0, max_failure_rate=0.2, adjust_interval_seconds=0.0, min_samples=5)
+        controller_settings.update(kwargs)
+        return ConcurrencyController(**controller_settings)
+    return build
+
+
+def record_calls(controller, latency_seconds=1.0, failures=0, calls=5, peak_in_flight=None):
+    controller.samples = [(latency_seconds, call_number >= failures) for call_number in range(calls)]
+    controller.peak_in_flight = controller.limit if peak_in_flight is None else peak_in_flight
+    return controller.maybe_adjust()
+
+
+def test_healthy_controller_adds_one_slot_per_decision_up_to_max_limit(build_controller):
+    controller = build_controller(initial_limit=2, max_limit=4)
+
+    assert [record_calls(controller)['action'] for _ in range(3)] == ['increase', 'increase', 'hold']
+    assert controller.limit == 4
+    assert [decision['limit'] for decision in controller.decisions] == [3, 4, 4]
+
+
+def test_healthy_controller_holds_a_limit_it_never_reached(build_controller):
+    controller = build_controller(initial_limit=3)
+
+    decision = record_calls(controller, peak_in_flight=2)
+
+    assert (decision['action'], controller.limit) == ('hold', 3)
+
+
+def test_failures_halve_the_limit_down_to_min_limit(build_controller):
+    controller = build_controller(initial_limit=8, min_limit=1, max_limit=8)
+
+    decisions = [record_calls(controller, failures=2) for _ in range(5)]
+
+    assert [decision['limit'] for decision in decisions] == [4, 2, 1, 1, 1]
+    assert [decision['action'] for decision in decisions] == ['decrease', 'decrease', 'decrease', 'hold', 'hold']
+    assert decisions[0]['reason'] == 'failure rate 40% > 20%'
+
+
+def test_decrease_never_drops_below_min_limit(build_controller):
+    controller = build_controller(initial_limit=3, min_limit=2, max_limit=4)
+
+    assert record_calls(controller, failures=5)['limit'] == 2
+    assert record_calls(controller, failures=5)['action'] == 'hold'
+
+
+def test_slow_calls_and_host_pressure_each_lower_the_limit(build_controller, monkeypatch):
+    slow_controller = build_controller(initial_limit=4)
+    assert record_calls(slow_controller, latency_seconds=12.0)['reason'] == 'p90 latency 12.00s > 10.00s'
+
+    loaded_controller = build_controller(initial_limit=4, max_load_per_cpu=1.0)
+    monkeypatch.setattr(ConcurrencyController, 'get_load_per_cpu', staticmethod(lambda: 1.5))
+    assert record_calls(loaded_controller)['reason'] == 'load per CPU 1.50 > 1.00'
+
+    memory_controller = build_controller(initial_limit=4, max_memory_used_fraction=0.8)
+    monkeypatch.setattr(ConcurrencyController, 'get_memory_used_fraction', staticmethod(lambda: 0.9))
+    assert record_calls(memory_controller)['reason'] == 'memory in use 90% >= 80%'
+
+    assert [controller.limit for controller in (slow_controller, loaded_controller, memory_controller)] == [2, 2, 2]
+
+
+def test_no_decision_before_min_samples_and_samples_reset_after_a_change(build_controller):
+    controller = build_controller(min_samples=5)
+
+    assert record_calls(controller, calls=4) is None
+    assert record_calls(controller, calls=5)['action'] == 'increase'
+    assert controller.samples == [] and controller.maybe_adjust() is None
+
+
+def test_calls_through_slots_feed_the_decision(build_controller):
+    controller = build_controller(initial_limit=1, max_limit=2, min_samples=2)
+
+    for _ in range(2):
+        with controller.slot():
+            pass
+
+    assert controller.limit == 2 and controller.decisions[0]['action'] == 'increase'
+
+
+def test_limits_out_of_order_are_rejected(build_controller):
+    with pytest.raises(ValueError):
+        build_controller(initial_limit=5, max_limit=4)
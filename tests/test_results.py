@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from football_engine.results import MatchResult, MatchResultsExtractor, ResultsStandingsCalculator, ResultsStandingsJobRunner, StandingsReconciler
+from football_engine.synthetic import SyntheticLeagueTableGenerator
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+
+from conftest import FIXTURES_FOLDER
+
+
+# The synthetic generator ranks level teams by goals scored, then name - no head-to-head breakers
+SYNTHETIC_TIE_BREAKERS = ('points', 'goal_difference', 'goals_for', 'team')
+
+
+@pytest.fixture(scope='module')
+def synthetic_season():
+    generator = SyntheticLeagueTableGenerator(league_size=20, seed=7)
+    tables_by_date = generator.generate_season(2021)
+    return generator.match_results, tables_by_date
+
+
+def render_results_page(match_results):
+    """ Renders match results in the layout of tests/fixtures/results_page.html - a date heading, then one row per match """
+    results_rows, current_date = [], None
+    for match_result in match_results:
+        if match_result.match_date != current_date:
+            current_date = match_result.match_date
+            results_rows.append(f'<tr><td colspan="4">{current_date}</td></tr>')
+        results_rows.append(f'<tr><td>15:00</td><td>{match_result.home_team}</td><td>{match_result.home_goals}-{match_result.away_goals}</td><td>{match_result.away_team}</td></tr>')
+    return '<html><body><table class="results">' + '\n'.join(results_rows) + '</table></body></html>'
+
+
+def test_extractor_reads_the_results_fixture():
+    match_results = MatchResultsExtractor(page_source=(FIXTURES_FOLDER / 'results_page.html').read_text(encoding='utf-8')).scrape_results()
+
+    assert match_results == [
+        MatchResult('2023-Aug-12', 'Newcastle United', 'Aston Villa', 5, 1),
+        MatchResult('2023-Aug-12', 'Brighton & Hove Albion', 'Luton Town', 4, 1),
+        MatchResult('2023-Aug-12', 'Everton', 'Fulham', 0, 1),
+        MatchResult('2023-Aug-13', 'Brentford', 'Tottenham Hotspur', 2, 2),
+        MatchResult('2023-Aug-13', 'Chelsea', 'Liverpool', 1, 1),
+        MatchResult('2023-Aug-19', 'Liverpool', 'Bournemouth', 3, 1),
+    ]
+
+
+def test_calculator_rebuilds_every_table_of_the_synthetic_season(synthetic_season):
+    match_results, tables_by_date = synthetic_season
+    standings_calculator = ResultsStandingsCalculator(match_results, tie_breakers=SYNTHETIC_TIE_BREAKERS)
+
+    for match_date, scraped_content in tables_by_date.items():
+        assert standings_calculator.get_scraped_content(match_date) == scraped_content, match_date
+
+
+@pytest.mark.parametrize('transformer_class', [PremierLeagueTableStandingsDataTransformer, PremierLeagueTableLeanStandingsTransformer])
+def test_results_page_to_standings_reconciles_with_the_scraped_tables(synthetic_season, transformer_class):
+    match_results, tables_by_date = synthetic_season
+    extracted_results = MatchResultsExtractor(page_source=render_results_page(match_results)).scrape_results()
+    standings_calculator = ResultsStandingsCalculator(extracted_results, tie_breakers=SYNTHETIC_TIE_BREAKERS)
+    data_transformer, reconciler = transformer_class(), StandingsReconciler()
+
+    assert extracted_results == match_results
+    for match_date in list(tables_by_date)[::9]:
+        derived_table = standings_calculator.get_standings(match_date, data_transformer=data_transformer)
+        reconciliation_report = reconciler.reconcile(derived_table, data_transformer.transform_data(tables_by_date[match_date], match_date=match_date), match_date=match_date)
+        assert reconciliation_report['matched'], reconciliation_report
+
+
+def test_dates_between_match_days_get_the_last_table(synthetic_season):
+    match_results, tables_by_date = synthetic_season
+    standings_calculator = ResultsStandingsCalculator(match_results, tie_breakers=SYNTHETIC_TIE_BREAKERS)
+    first_date, second_date = list(tables_by_date)[:2]
+    midweek_date = (datetime.strptime(first_date, '%Y-%b-%d') + timedelta(days=3)).strftime('%Y-%b-%d')
+
+    assert datetime.strptime(midweek_date, '%Y-%b-%d') < datetime.strptime(second_date, '%Y-%b-%d')
+    assert standings_calculator.get_scraped_content(midweek_date) == tables_by_date[first_date]
+
+
+def test_results_job_runner_needs_a_results_path():
+    with pytest.raises(ValueError):
+        ResultsStandingsJobRunner(job_runner=None, results_path=None)
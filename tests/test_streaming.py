@@ -0,0 +1,164 @@
+import gzip
+import json
+
+import pytest
+
+from football_engine.loadtest import InMemoryS3Client
+from football_engine.streaming import LocalStreamingCSVFileWriter, S3MultipartUpload
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.uploaders import LocalJSONFileUploader, S3JSONFileUploader
+
+
+MATCH_DATE = '2023-Apr-16'
+
+
+def read_records(ndjson_bytes):
+    return [json.loads(line) for line in ndjson_bytes.decode('utf-8').splitlines()]
+
+
+def test_local_ndjson_upload_writes_the_same_records_for_lean_and_dataframe_tables(tmp_path, scraped_content):
+    df = PremierLeagueTableStandingsDataTransformer().transform_data(scraped_content, match_date=MATCH_DATE)
+    lean_table = PremierLeagueTableLeanStandingsTransformer().transform_data(scraped_content, match_date=MATCH_DATE)
+
+    df_path = LocalJSONFileUploader(target_path=str(tmp_path / 'df'), chunk_size=7).upload_file(df, match_date=MATCH_DATE)
+    lean_path = LocalJSONFileUploader(target_path=str(tmp_path / 'lean')).upload_file(lean_table, match_date=MATCH_DATE)
+
+    df_records, lean_records = read_records(open(df_path, 'rb').read()), read_records(open(lean_path, 'rb').read())
+    assert len(lean_records) == 20
+    assert lean_records == df_records
+    assert lean_records[0] == {'league': 'premier-league', 'position': 1, 'team': 'Arsenal', 'played': 30, 'home_won': 12, 'home_drawn': 2, 'home_lost': 1, 'home_goals_for': 42,
+                               'home_goals_against': 18, 'away_won': 11, 'away_drawn': 2, 'away_lost': 2, 'away_goals_for': 30, 'away_goals_against': 11, 'goal_difference': 43,
+                               'points': 73, 'match_date': '2023-04-16'}
+
+
+def test_s3_ndjson_upload_writes_lean_tables(scraped_content):
+    s3_client = InMemoryS3Client()
+    lean_table = PremierLeagueTableLeanStandingsTransformer().transform_data(scraped_content, match_date=MATCH_DATE)
+
+    output_location = S3JSONFileUploader(s3_client=s3_client, s3_bucket='bucket', s3_folder='snapshots').upload_file(lean_table, match_date=MATCH_DATE)
+
+    assert output_location is not None
+    ndjson_bytes = s3_client.get_object(Bucket='bucket', Key=f'snapshots/prem_league_table_{MATCH_DATE}.ndjson')['Body'].read()
+    assert len(read_records(ndjson_bytes)) == 20
+
+
+def test_ndjson_upload_raises_on_unsupported_tables_and_leaves_no_file(tmp_path, scraped_content):
+    json_uploader = LocalJSONFileUploader(target_path=str(tmp_path))
+
+    with pytest.raises(TypeError):
+        json_uploader.upload_file(scraped_content, match_date=MATCH_DATE)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_discarded_parts_leave_no_rows_and_the_header_comes_with_the_first_committed_part(tmp_path, scraped_content):
+    data_transformer = PremierLeagueTableStandingsDataTransformer()
+    streaming_writer = LocalStreamingCSVFileWriter(file_path=str(tmp_path / 'stream.csv'), max_buffer_bytes=1024)
+
+    for match_date, commit in [('2023-Apr-08', False), ('2023-Apr-15', True), ('2023-Apr-16', True)]:
+        streaming_writer.begin_part()
+        for chunk_df in data_transformer.iter_transformed_chunks(iter(scraped_content), match_date=match_date, chunk_size=7):
+            streaming_writer.write_chunk(chunk_df)
+        streaming_writer.commit_part() if commit else streaming_writer.discard_part()
+    output_location = streaming_writer.close()
+
+    csv_lines = open(output_location).read().splitlines()
+    assert csv_lines[0].startswith('Pos,Team,P')
+    assert len(csv_lines) == 41
+    assert {csv_line.rsplit(',', 1)[1] for csv_line in csv_lines[1:]} == {'2023-Apr-15', '2023-Apr-16'}
+
+
+def test_local_stream_that_fails_to_close_leaves_no_file_behind(tmp_path, scraped_content, monkeypatch):
+    streaming_writer = LocalStreamingCSVFileWriter(file_path=str(tmp_path / 'stream.csv'), max_buffer_bytes=1024)
+    streaming_writer.write_chunk(PremierLeagueTableStandingsDataTransformer().transform_data(scraped_content, match_date=MATCH_DATE))
+
+    def fail_to_write(buffer_bytes, is_last):
+        raise OSError('No space left on device')
+    monkeypatch.setattr(streaming_writer, '_write_buffer', fail_to_write)
+
+    assert streaming_writer.close() is None
+    assert not (tmp_path / 'stream.csv').exists()
+
+
+# Stand-in for S3 that keeps the size of every part and can fail a chosen multipart call
+class PartRecordingS3Client(InMemoryS3Client):
+    def __init__(self, fail_on=None, fail_on_part=None):
+        super().__init__()
+        self.part_sizes = []
+        self.upload_args = {}
+        self.fail_on = fail_on
+        self.fail_on_part = fail_on_part
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.upload_args = kwargs
+        return super().put_object(Bucket, Key, Body, **kwargs)
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.upload_args = kwargs
+        return super().create_multipart_upload(Bucket, Key, **kwargs)
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        if PartNumber == self.fail_on_part:
+            raise ConnectionError(f'part {PartNumber} was reset')
+        self.part_sizes.append(len(Body))
+        return super().upload_part(Bucket, Key, UploadId, PartNumber, Body, **kwargs)
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        if self.fail_on == 'complete_multipart_upload':
+            raise ConnectionError('complete was reset')
+        return super().complete_multipart_upload(Bucket, Key, UploadId, MultipartUpload, **kwargs)
+
+
+@pytest.fixture
+def season_snapshots(scraped_content, monkeypatch):
+    monkeypatch.setattr(S3MultipartUpload, 'MIN_PART_BYTES', 2048)
+    lean_transformer = PremierLeagueTableLeanStandingsTransformer()
+    return {f'2023-Apr-{day:02d}': lean_transformer.transform_data(scraped_content, match_date=f'2023-Apr-{day:02d}') for day in range(1, 11)}
+
+
+def get_season_object(s3_client, compress=False):
+    return s3_client.get_object(Bucket='bucket', Key=f"snapshots/prem_league_table_2023-Apr-01_to_2023-Apr-10.ndjson{'.gz' if compress else ''}")['Body'].read()
+
+
+def test_s3_ndjson_upload_rolls_over_into_parts_of_at_least_the_minimum_size(season_snapshots):
+    s3_client = PartRecordingS3Client()
+
+    output_location = S3JSONFileUploader(s3_client=s3_client, s3_bucket='bucket', s3_folder='snapshots', chunk_size=7, max_buffer_bytes=0).upload_files(season_snapshots)
+
+    assert output_location == 's3://bucket/snapshots/prem_league_table_2023-Apr-01_to_2023-Apr-10.ndjson'
+    assert len(s3_client.part_sizes) > 2 and all(part_size >= 2048 for part_size in s3_client.part_sizes[:-1])
+    assert (s3_client.request_counts['create_multipart_upload'], s3_client.request_counts['complete_multipart_upload'], s3_client.request_counts['put_object']) == (1, 1, 0)
+    records = read_records(get_season_object(s3_client))
+    assert len(records) == 200 and [record['match_date'] for record in records[::20]] == [f'2023-04-{day:02d}' for day in range(1, 11)]
+    assert s3_client.multipart_uploads == {}
+
+
+def test_s3_ndjson_upload_aborts_the_multipart_upload_when_a_part_fails(season_snapshots):
+    s3_client = PartRecordingS3Client(fail_on_part=2)
+
+    with pytest.raises(ConnectionError):
+        S3JSONFileUploader(s3_client=s3_client, s3_bucket='bucket', s3_folder='snapshots', max_buffer_bytes=0).upload_files(season_snapshots)
+
+    assert s3_client.request_counts['abort_multipart_upload'] == 1
+    assert s3_client.multipart_uploads == {} and s3_client.objects == {}
+
+
+def test_s3_ndjson_upload_aborts_the_multipart_upload_when_it_cannot_complete(season_snapshots):
+    s3_client = PartRecordingS3Client(fail_on='complete_multipart_upload')
+
+    output_location = S3JSONFileUploader(s3_client=s3_client, s3_bucket='bucket', s3_folder='snapshots', max_buffer_bytes=0).upload_files(season_snapshots)
+
+    assert output_location is None
+    assert s3_client.request_counts['abort_multipart_upload'] == 1
+    assert s3_client.multipart_uploads == {} and s3_client.objects == {}
+
+
+def test_gzip_ndjson_upload_round_trips_to_the_uncompressed_records(season_snapshots):
+    plain_client, gzip_client = PartRecordingS3Client(), PartRecordingS3Client()
+
+    S3JSONFileUploader(s3_client=plain_client, s3_bucket='bucket', s3_folder='snapshots', max_buffer_bytes=0).upload_files(season_snapshots)
+    S3JSONFileUploader(s3_client=gzip_client, s3_bucket='bucket', s3_folder='snapshots', compress=True, max_buffer_bytes=0).upload_files(season_snapshots)
+
+    compressed_object = get_season_object(gzip_client, compress=True)
+    assert gzip.decompress(compressed_object) == get_season_object(plain_client)
+    assert len(compressed_object) < len(get_season_object(plain_client))
+    assert gzip_client.upload_args == {'ContentType': 'application/x-ndjson', 'ContentEncoding': 'gzip'}
@@ -0,0 +1,62 @@
+import pytest
+
+from football_engine.synthetic import SyntheticDataCorruptor, SyntheticDatasetWriter, SyntheticLeagueTableGenerator
+from football_engine.transformers import PremierLeagueTableStandingsDataTransformer
+from football_engine.validators import PremierLeagueTableStandingsDataValidator
+
+
+MATCH_DATE = '2023-Apr-16'
+ROW_CHECKS = ('played', 'points', 'goal_difference')
+
+
+def test_writer_names_snapshots_after_each_league(tmp_path):
+    synthetic_generators = [SyntheticLeagueTableGenerator(league='premier-league', league_size=4, seed=7), SyntheticLeagueTableGenerator(league='la-liga', league_size=4, seed=7)]
+    SyntheticDatasetWriter(generators=synthetic_generators, target_folder=str(tmp_path), data_transformer=PremierLeagueTableStandingsDataTransformer(), write_pages=False).write([2023])
+
+    premier_league_files = {path.name.rsplit('_', 1)[0] for path in (tmp_path / 'premier-league' / 'snapshots').glob('*.csv')}
+    la_liga_files = {path.name.rsplit('_', 1)[0] for path in (tmp_path / 'la-liga' / 'snapshots').glob('*.csv')}
+    assert premier_league_files == {'prem_league_table'}
+    assert la_liga_files == {'la_liga_table'}
+
+
+@pytest.mark.parametrize('corruption_kind, failed_check', [
+    ('blank_cell',          None),
+    ('non_numeric_cell',    None),
+    ('points_mismatch',     'points'),
+    ('played_mismatch',     'played'),
+    ('goal_difference',     'goal_difference'),
+    ('duplicate_position',  'unique_positions'),
+    ('missing_row',         'row_count'),
+    ('truncated_row',       None),
+])
+def test_each_corruption_kind_is_caught_by_the_validator(scraped_content, corruption_kind, failed_check):
+    for seed in range(10):
+        corrupted_content, corruption = SyntheticDataCorruptor(corruption_rate=1.0, corruption_kinds=[corruption_kind], seed=seed).corrupt(scraped_content)
+        table_df = PremierLeagueTableStandingsDataTransformer().transform_data(corrupted_content, match_date=MATCH_DATE)
+
+        failed_checks = PremierLeagueTableStandingsDataValidator().get_failed_checks(table_df)
+
+        assert corruption['kind'] == corruption_kind
+        if failed_check is None:
+            assert set(failed_checks) & set(ROW_CHECKS)
+            assert any(corruption['team'] in failed_teams for check_name, failed_teams in failed_checks.items() if check_name in ROW_CHECKS)
+        else:
+            assert failed_check in failed_checks
+            if failed_check != 'row_count':
+                assert corruption['team'] in failed_checks[failed_check]
+
+
+def test_missing_row_reports_the_team_that_was_removed(scraped_content):
+    corrupted_content, corruption = SyntheticDataCorruptor(corruption_rate=1.0, corruption_kinds=['missing_row'], seed=3).corrupt(scraped_content)
+
+    remaining_teams = [row[1] for row in corrupted_content[1:]]
+    assert len(remaining_teams) == 19 and corruption['team'] not in remaining_teams
+    assert corruption['team'] in [row[1] for row in scraped_content[1:]]
+
+
+def test_duplicate_position_is_skipped_for_a_single_row_table(scraped_content):
+    single_row_content = scraped_content[:2]
+
+    assert SyntheticDataCorruptor(corruption_rate=1.0, corruption_kinds=['duplicate_position'], seed=0).corrupt(single_row_content) == (single_row_content, None)
+    corrupted_content, corruption = SyntheticDataCorruptor(corruption_rate=1.0, corruption_kinds=['duplicate_position', 'points_mismatch'], seed=0).corrupt(single_row_content)
+    assert corruption == {'kind': 'points_mismatch', 'team': 'Arsenal'}
@@ -0,0 +1,65 @@
+import pytest
+
+from football_engine.manifest import JSONFileJobManifest
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.uploaders import MultiSinkFileUploader
+
+from conftest import DIRTY_DATA_FOLDER
+
+
+MATCH_DATE = '2023-Apr-16'
+
+
+@pytest.fixture
+def transformed_tables(scraped_content):
+    return (PremierLeagueTableStandingsDataTransformer().transform_data(scraped_content, match_date=MATCH_DATE),
+            PremierLeagueTableLeanStandingsTransformer().transform_data(scraped_content, match_date=MATCH_DATE))
+
+
+def test_lean_and_dataframe_paths_write_identical_csv_bytes(transformed_tables):
+    df, lean_table = transformed_tables
+    saved_snapshot = (DIRTY_DATA_FOLDER / f'prem_league_table_{MATCH_DATE}.csv').read_bytes()
+
+    assert MultiSinkFileUploader.serialise_df(lean_table) == MultiSinkFileUploader.serialise_df(df) == saved_snapshot
+
+
+def test_lean_and_dataframe_paths_hash_the_same(transformed_tables):
+    df, lean_table = transformed_tables
+
+    assert JSONFileJobManifest.get_canonical_csv_bytes(lean_table) == JSONFileJobManifest.get_canonical_csv_bytes(df)
+    assert JSONFileJobManifest.compute_content_hash(lean_table) == JSONFileJobManifest.compute_content_hash(df)
+    assert b'match_date' not in JSONFileJobManifest.get_canonical_csv_bytes(lean_table)
+
+
+def test_content_hash_ignores_the_match_date(scraped_content):
+    lean_transformer = PremierLeagueTableLeanStandingsTransformer()
+
+    assert (JSONFileJobManifest.compute_content_hash(lean_transformer.transform_data(scraped_content, match_date='2023-Apr-16'))
+            == JSONFileJobManifest.compute_content_hash(lean_transformer.transform_data(scraped_content, match_date='2023-Apr-17')))
+
+
+def test_streamed_chunks_hash_like_the_whole_table(scraped_content, transformed_tables):
+    df, _ = transformed_tables
+    chunk_bytes = [JSONFileJobManifest.get_canonical_csv_bytes(chunk_df, header=chunk_number == 0)
+                   for chunk_number, chunk_df in enumerate(PremierLeagueTableStandingsDataTransformer().iter_transformed_chunks(iter(scraped_content), match_date=MATCH_DATE, chunk_size=7))]
+
+    assert len(chunk_bytes) > 1
+    assert b''.join(chunk_bytes) == JSONFileJobManifest.get_canonical_csv_bytes(df)
+
+
+@pytest.mark.parametrize('header_change', ['extra', 'missing'])
+def test_lean_transform_rejects_non_standard_headers(scraped_content, header_change):
+    if header_change == 'extra':
+        changed_content = [row + [cell] for row, cell in zip(scraped_content, ['Form'] + ['WWDLW'] * (len(scraped_content) - 1))]
+    else:
+        changed_content = [row[:-1] for row in scraped_content]
+
+    with pytest.raises(ValueError):
+        PremierLeagueTableLeanStandingsTransformer().transform_data(changed_content, match_date=MATCH_DATE)
+
+
+def test_lean_transform_keeps_spacer_columns_blank(transformed_tables):
+    _, lean_table = transformed_tables
+
+    assert lean_table.raw_columns.count(' ') == 3
+    assert all(csv_row[3] == ' ' for csv_row in list(lean_table.iter_csv_rows())[1:])
@@ -0,0 +1,75 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from football_engine.sinks import ISnapshotSink, LocalSnapshotSink
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.uploaders import MultiSinkFileUploader, PremierLeagueTableSQLiteUploader
+
+
+TRANSFORMER_CLASSES = [PremierLeagueTableStandingsDataTransformer, PremierLeagueTableLeanStandingsTransformer]
+
+
+def get_warehouse_rows(database_path):
+    with closing(sqlite3.connect(database_path)) as connection:
+        return connection.execute(f'SELECT * FROM {PremierLeagueTableSQLiteUploader.TABLE_NAME} ORDER BY match_date, position').fetchall()
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+def test_reloading_a_date_replaces_its_rows_instead_of_duplicating_them(tmp_path, scraped_content, transformer_class):
+    database_path = str(tmp_path / 'warehouse.sqlite')
+    warehouse_uploader = PremierLeagueTableSQLiteUploader(database_path=database_path)
+    corrected_content = [scraped_content[0], scraped_content[1][:-1] + ['76']] + scraped_content[2:]
+
+    warehouse_uploader.upload_file(transformer_class().transform_data(scraped_content, match_date='2023-Apr-16'), match_date='2023-Apr-16')
+    warehouse_uploader.upload_file(transformer_class().transform_data(scraped_content, match_date='2023-Apr-16'), match_date='2023-Apr-16')
+    output_location = warehouse_uploader.upload_file(transformer_class().transform_data(corrected_content, match_date='2023-Apr-16'), match_date='2023-Apr-16')
+
+    warehouse_rows = get_warehouse_rows(database_path)
+    assert output_location.startswith('sqlite:///')
+    assert len(warehouse_rows) == 20
+    assert warehouse_rows[0][:4] == ('premier-league', '2023-04-16', 'Arsenal', 1)
+    assert warehouse_rows[0][-1] == 76
+
+
+def test_both_table_types_load_the_same_warehouse_rows_in_one_transaction(tmp_path, scraped_content):
+    warehouse_rows = []
+    for transformer_class in TRANSFORMER_CLASSES:
+        database_path = str(tmp_path / f'{transformer_class.__name__}.sqlite')
+        snapshots = {match_date: transformer_class().transform_data(scraped_content, match_date=match_date) for match_date in ['2023-Apr-15', '2023-Apr-16']}
+        PremierLeagueTableSQLiteUploader(database_path=database_path).upload_files(snapshots)
+        warehouse_rows.append(get_warehouse_rows(database_path))
+
+    assert len(warehouse_rows[0]) == 40
+    assert warehouse_rows[0] == warehouse_rows[1]
+
+
+# Stand-in for a sink whose destination is down
+class UnreachableSink(ISnapshotSink):
+    def write_bytes(self, payload, match_date):
+        raise ConnectionError('destination unreachable')
+
+
+def test_multi_sink_uploader_needs_at_least_one_sink():
+    with pytest.raises(ValueError):
+        MultiSinkFileUploader(sinks=[])
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+def test_multi_sink_uploader_writes_the_same_bytes_to_every_sink(tmp_path, scraped_content, transformer_class):
+    df = transformer_class().transform_data(scraped_content, match_date='2023-Apr-16')
+    data_uploader = MultiSinkFileUploader(sinks=[LocalSnapshotSink(target_path=str(tmp_path / 'primary')), LocalSnapshotSink(target_path=str(tmp_path / 'backup'))])
+
+    output_locations = data_uploader.upload_file(df, match_date='2023-Apr-16')
+
+    assert output_locations == [str(tmp_path / folder / 'prem_league_table_2023-Apr-16.csv') for folder in ('primary', 'backup')]
+    assert (tmp_path / 'primary' / 'prem_league_table_2023-Apr-16.csv').read_bytes() == (tmp_path / 'backup' / 'prem_league_table_2023-Apr-16.csv').read_bytes() == MultiSinkFileUploader.serialise_df(df)
+
+
+def test_multi_sink_uploader_reports_a_failed_sink_but_keeps_the_other_writes(tmp_path, scraped_content):
+    df = PremierLeagueTableLeanStandingsTransformer().transform_data(scraped_content, match_date='2023-Apr-16')
+    data_uploader = MultiSinkFileUploader(sinks=[UnreachableSink(), LocalSnapshotSink(target_path=str(tmp_path))])
+
+    assert data_uploader.upload_file(df, match_date='2023-Apr-16') is None
+    assert (tmp_path / 'prem_league_table_2023-Apr-16.csv').read_bytes() == df.to_csv_bytes()
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from football_engine.transformers import PremierLeagueTableLeanStandingsTransformer, PremierLeagueTableStandingsDataTransformer
+from football_engine.validators import LeagueTableValidationError, LocalSnapshotQuarantine, PremierLeagueTableStandingsDataValidator
+
+
+MATCH_DATE = '2023-Apr-16'
+TRANSFORMER_CLASSES = [PremierLeagueTableStandingsDataTransformer, PremierLeagueTableLeanStandingsTransformer]
+
+
+def get_corrupted_content(scraped_content, row_number, column_position, cell_value):
+    """ The scraped table with one cell of one team's row (1 = the leader) replaced """
+    corrupted_row = list(scraped_content[row_number])
+    corrupted_row[column_position] = cell_value
+    return scraped_content[:row_number] + [corrupted_row] + scraped_content[row_number + 1:]
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+def test_real_table_passes_every_check(scraped_content, transformer_class):
+    table_df = transformer_class().transform_data(scraped_content, match_date=MATCH_DATE)
+
+    assert PremierLeagueTableStandingsDataValidator().validate_data(table_df, match_date=MATCH_DATE) is table_df
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+@pytest.mark.parametrize('column_position, cell_value, failed_check', [
+    (2,  '31',  'played'),              # P no longer equals W + D + L
+    (17, '74',  'points'),              # Pts no longer equals 3W + D
+    (16, '44',  'goal_difference'),     # GD no longer equals GF - GA
+    (4,  '',    'played'),              # a blank home 'W' cannot add up to anything
+    (0,  '2',   'unique_positions'),    # the leader shares second place
+])
+def test_broken_invariant_names_the_check_and_the_team(scraped_content, transformer_class, column_position, cell_value, failed_check):
+    table_df = transformer_class().transform_data(get_corrupted_content(scraped_content, 1, column_position, cell_value), match_date=MATCH_DATE)
+
+    with pytest.raises(LeagueTableValidationError) as validation_error:
+        PremierLeagueTableStandingsDataValidator().validate_data(table_df, match_date=MATCH_DATE)
+
+    assert 'Arsenal' in validation_error.value.failed_checks[failed_check]
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+def test_missing_row_fails_the_row_count(scraped_content, transformer_class):
+    table_df = transformer_class().transform_data(scraped_content[:-1], match_date=MATCH_DATE)
+
+    failed_checks = PremierLeagueTableStandingsDataValidator().get_failed_checks(table_df)
+
+    assert failed_checks == {'row_count': ['expected 20 rows, found 19']}
+
+
+@pytest.mark.parametrize('transformer_class', TRANSFORMER_CLASSES)
+def test_quarantine_keeps_the_table_next_to_its_failed_checks(tmp_path, scraped_content, transformer_class):
+    table_df = transformer_class().transform_data(scraped_content, match_date=MATCH_DATE)
+
+    quarantined_csv = LocalSnapshotQuarantine(quarantine_path=str(tmp_path)).quarantine_snapshot(table_df, 'premier-league', MATCH_DATE, {'points': ['Arsenal']})
+
+    assert quarantined_csv == f'{tmp_path}/premier-league/prem_league_table_{MATCH_DATE}.csv'
+    assert len(open(quarantined_csv).read().splitlines()) == 21
+    with open(quarantined_csv.replace('.csv', '.json')) as report_file:
+        assert json.load(report_file)['failed_checks'] == {'points': ['Arsenal']}